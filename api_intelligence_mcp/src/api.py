@@ -4,16 +4,18 @@ It initializes the FastAPI app, configures CORS middleware, and sets up
 the MCP server with appropriate transport protocols.
 """
 
+import json
 import webbrowser
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Callable, Optional
+from typing import AsyncGenerator, Optional
 from urllib.parse import urlparse
 
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import JSONResponse, Response
+from starlette.datastructures import Headers
 from starlette.middleware.sessions import SessionMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from api_intelligence_mcp.src.mcp_server import TemplateMCPServer
 from api_intelligence_mcp.src.oauth.handler import OAuth2Handler
@@ -55,15 +57,33 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
             oauth_service_instance = OAuthService(storage_service)
             logger.info("OAuth service initialized with dependency injection")
+
+            from api_intelligence_mcp.src.oauth.sso_client import (
+                initialize_sso_client,
+            )
+
+            await initialize_sso_client()
+
+            if settings.SSO_TOKEN_VERIFICATION_MODE == "jwt":
+                from api_intelligence_mcp.src.oauth.jwt_verifier import (
+                    initialize_jwt_verifier,
+                )
+
+                await initialize_jwt_verifier()
     except Exception as e:
         logger.critical(f"Failed to initialize storage service: {e}")
         raise
 
+    # Start tool workers before accepting connections
+    await server.tool_executor.warm_up()
+
     # Run MCP lifespan
     async with mcp_app.lifespan(app):
         logger.info("Server is ready to accept connections")
         yield
 
+    server.tool_executor.shutdown()
+
     # Cleanup storage service
     logger.info("Shutting down storage service...")
     try:
@@ -75,119 +95,153 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.error(f"Error during storage cleanup: {e}")
 
+    try:
+        from api_intelligence_mcp.src.oauth.jwt_verifier import cleanup_jwt_verifier
+        from api_intelligence_mcp.src.oauth.sso_client import cleanup_sso_client
+
+        await cleanup_jwt_verifier()
+        await cleanup_sso_client()
+    except Exception as e:
+        logger.error(f"Error during SSO client cleanup: {e}")
+
 
 app = FastAPI(lifespan=lifespan)
 
 
-class AuthorizationMiddleware(BaseHTTPMiddleware):
-    """Middleware to handle OAuth authorization for protected endpoints."""
+# Paths reachable without a bearer token
+PUBLIC_PATHS = frozenset(
+    {
+        "/.well-known/oauth-protected-resource",
+        "/.well-known/oauth-authorization-server",
+        "/docs",
+        "/redoc",
+        "/openapi.json",
+        "/auth/authorize",
+        "/auth/token",
+        "/auth/revoke",
+        "/auth/introspect",
+        "/auth/register",
+        "/auth/callback",
+        "/auth/callback/snowflake",
+        "/auth/callback/oidc",
+        "/health",
+    }
+)
+
+MCP_PATHS = frozenset({"/mcp", "/mcp/"})
+
+_UNAUTHORIZED = Response(
+    content="Unauthorized",
+    status_code=401,
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+class AuthorizationMiddleware:
+    """Middleware to handle OAuth authorization for protected endpoints.
+
+    Implemented as a plain ASGI middleware so authorized requests, including
+    streamed MCP responses, pass through to the app without extra buffering.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """Wrap the downstream ASGI app."""
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next: Callable):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process incoming requests and apply OAuth authorization checks."""
-        if not settings.ENABLE_AUTH:
-            return await call_next(request)
-
-        public_paths = {
-            "/.well-known/oauth-protected-resource",
-            "/.well-known/oauth-authorization-server",
-            "/docs",
-            "/redoc",
-            "/openapi.json",
-            "/auth/authorize",
-            "/auth/token",
-            "/auth/revoke",
-            "/auth/introspect",
-            "/auth/register",
-            "/auth/callback",
-            "/auth/callback/snowflake",
-            "/auth/callback/oidc",
-            "/health",
-        }
-
-        if request.url.path in public_paths:
-            return await call_next(request)
-
-        auth_header = request.headers.get("authorization")
+        if (
+            scope["type"] != "http"
+            or not settings.ENABLE_AUTH
+            or scope["path"] in PUBLIC_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        auth_header = Headers(scope=scope).get("authorization")
         if not auth_header:
             logger.warning(
-                "Missing Authorization header for protected route: %s", request.url.path
-            )
-            return Response(
-                content="Unauthorized",
-                status_code=401,
-                headers={"WWW-Authenticate": "Bearer"},
+                "Missing Authorization header for protected route: %s", scope["path"]
             )
+            await _UNAUTHORIZED(scope, receive, send)
+            return
 
-        token_info = OAuth2Handler.verify_authorization_header(auth_header)
+        token_info = await OAuth2Handler.verify_authorization_header(auth_header)
         if not token_info:
-            logger.warning("Invalid token for protected route: %s", request.url.path)
-            return Response(
-                content="Unauthorized",
-                status_code=401,
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+            logger.warning("Invalid token for protected route: %s", scope["path"])
+            await _UNAUTHORIZED(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+
+async def _read_body(receive: Receive) -> bytes:
+    """Read the complete request body from an ASGI receive channel."""
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
 
-        response = await call_next(request)
-        return response
+def _replay_body(body: bytes, receive: Receive) -> Receive:
+    """Return a receive channel that yields an already read body first."""
+    replayed = False
 
+    async def replay() -> Message:
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
 
-class LocalDevelopmentAuthorizationMiddleware(BaseHTTPMiddleware):
+    return replay
+
+
+class LocalDevelopmentAuthorizationMiddleware:
     """Local development authorization middleware that auto-opens browser for OAuth."""
 
-    async def dispatch(self, request: Request, call_next: Callable):
+    def __init__(self, app: ASGIApp):
+        """Wrap the downstream ASGI app."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process requests and handle local development OAuth flow."""
-        if not settings.USE_EXTERNAL_BROWSER_AUTH:
-            return await call_next(request)
-
-        public_paths = {
-            "/.well-known/oauth-protected-resource",
-            "/.well-known/oauth-authorization-server",
-            "/docs",
-            "/redoc",
-            "/openapi.json",
-            "/auth/authorize",
-            "/auth/token",
-            "/auth/revoke",
-            "/auth/introspect",
-            "/auth/register",
-            "/auth/callback",
-            "/auth/callback/snowflake",
-            "/auth/callback/oidc",
-            "/health",
-        }
-
-        if request.url.path in public_paths:
-            return await call_next(request)
-        if request.method == "POST" and request.url.path in {"/mcp", "/mcp/"}:
-            try:
-                body_bytes = await request.body()
-                import json
-
-                body = json.loads(body_bytes)
-                #! I think this is needed only for tool calls so goose or other agents can list tools with requiring auth.
-                if body.get("method") == "tools/call":
-
-                    async def receive():
-                        return {"type": "http.request", "body": body_bytes}
-
-                    request = Request(request.scope, receive)
-                else:
-                    return await call_next(request)
-            except Exception:
-                return await call_next(request)
-        else:
-            return await call_next(request)
-        global _local_development_token
+        if (
+            scope["type"] != "http"
+            or not settings.USE_EXTERNAL_BROWSER_AUTH
+            or scope["method"] != "POST"
+            or scope["path"] not in MCP_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        body_bytes = await _read_body(receive)
+        receive = _replay_body(body_bytes, receive)
+        try:
+            body = json.loads(body_bytes)
+            #! I think this is needed only for tool calls so goose or other agents can list tools with requiring auth.
+            is_tool_call = body.get("method") == "tools/call"
+        except Exception:
+            is_tool_call = False
+        if not is_tool_call:
+            await self.app(scope, receive, send)
+            return
 
         if _local_development_token:
-            request.headers.__dict__["_list"].append(
-                (b"authorization", f"Bearer {_local_development_token}".encode())
-            )
-            return await call_next(request)
+            scope = dict(scope)
+            scope["headers"] = [
+                *scope["headers"],
+                (b"authorization", f"Bearer {_local_development_token}".encode()),
+            ]
+            await self.app(scope, receive, send)
+            return
 
         try:
-            from api_intelligence_mcp.src.oauth.handler import OAuth2Handler
-
             authorization_url, state = OAuth2Handler.get_authorization_url()
 
             logger.info(
@@ -196,7 +250,7 @@ class LocalDevelopmentAuthorizationMiddleware(BaseHTTPMiddleware):
 
             webbrowser.open(authorization_url)
 
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=401,
                 content={
                     "message": "Authorization required for local development",
@@ -208,13 +262,14 @@ class LocalDevelopmentAuthorizationMiddleware(BaseHTTPMiddleware):
 
         except Exception as e:
             logger.error(f"Failed to initiate local OAuth flow: {e}")
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=500,
                 content={
                     "error": "Failed to initiate local authorization",
                     "details": str(e),
                 },
             )
+        await response(scope, receive, send)
 
 
 if settings.USE_EXTERNAL_BROWSER_AUTH and settings.ENABLE_AUTH:
@@ -8,7 +8,10 @@ import uvicorn
 from api_intelligence_mcp.src.api import app
 from api_intelligence_mcp.src.settings import settings
 from api_intelligence_mcp.src.settings import validate_config as validate_config_func
-from api_intelligence_mcp.utils.pylogger import get_python_logger, get_uvicorn_log_config
+from api_intelligence_mcp.utils.pylogger import (
+    get_python_logger,
+    get_uvicorn_log_config,
+)
 
 # Initialize logger
 logger = get_python_logger()
@@ -141,4 +144,4 @@ def run() -> None:
 
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    run()
@@ -3,8 +3,22 @@
 This module contains the main API Intelligence MCP Server class that provides
 tools for API analysis, optimization, documentation, and comparison.
 It uses FastMCP to register and manage MCP capabilities.
+
+The tools are synchronous, CPU-bound functions. They are registered through a
+``ToolExecutor`` that dispatches each call to a thread or process pool so that
+a large payload does not stall the event loop serving other MCP sessions, the
+OAuth routes and ``/health``.
 """
 
+import asyncio
+import functools
+import importlib
+import inspect
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
 from fastmcp import FastMCP
 
 from api_intelligence_mcp.src.settings import settings
@@ -12,12 +26,18 @@ from api_intelligence_mcp.src.settings import settings
 # Import API intelligence tools
 from api_intelligence_mcp.src.tools.analyze_api_response import analyze_api_response
 from api_intelligence_mcp.src.tools.compare_api_responses import compare_api_responses
+from api_intelligence_mcp.src.tools.compare_api_versions import compare_api_versions
+from api_intelligence_mcp.src.tools.compare_with_baseline import compare_with_baseline
 from api_intelligence_mcp.src.tools.generate_api_documentation import (
     generate_api_documentation,
 )
+from api_intelligence_mcp.src.tools.measure_encoding_costs import (
+    measure_encoding_costs,
+)
 from api_intelligence_mcp.src.tools.optimize_api_response_schema import (
     optimize_api_response_schema,
 )
+from api_intelligence_mcp.src.tools.save_schema_baseline import save_schema_baseline
 
 from api_intelligence_mcp.utils.pylogger import (
     force_reconfigure_all_loggers,
@@ -26,6 +46,146 @@ from api_intelligence_mcp.utils.pylogger import (
 
 logger = get_python_logger()
 
+EXECUTION_MODES = ("inline", "thread", "process")
+
+# Modules imported by every pool worker before it accepts its first call
+TOOL_MODULES = (
+    "api_intelligence_mcp.src.tools.analyze_api_response",
+    "api_intelligence_mcp.src.tools.compare_api_responses",
+    "api_intelligence_mcp.src.tools.compare_api_versions",
+    "api_intelligence_mcp.src.tools.generate_api_documentation",
+    "api_intelligence_mcp.src.tools.measure_encoding_costs",
+    "api_intelligence_mcp.src.tools.optimize_api_response_schema",
+)
+
+
+def _warm_up_worker() -> None:
+    """Pre-import the tool modules so the first dispatched call skips import cost."""
+    for module_name in TOOL_MODULES:
+        importlib.import_module(module_name)
+
+
+class ToolExecutor:
+    """Dispatch synchronous tools inline, to a thread pool or to a process pool.
+
+    The execution mode is chosen per tool: ``routes`` maps tool names to a mode
+    and every other tool uses ``default_mode``. Pools are created lazily on
+    first use so that inline-only configurations never start workers.
+    """
+
+    def __init__(
+        self,
+        default_mode: str = "process",
+        routes: Optional[Dict[str, str]] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """Initialize the executor.
+
+        Args:
+            default_mode: Execution mode for tools without an explicit route
+            routes: Per-tool execution mode overrides keyed by tool name
+            max_workers: Maximum workers per pool (defaults to the CPU count)
+
+        Raises:
+            ValueError: If a mode is not one of ``EXECUTION_MODES``
+        """
+        self.routes = dict(routes or {})
+        for mode in [default_mode, *self.routes.values()]:
+            if mode not in EXECUTION_MODES:
+                raise ValueError(
+                    f"Execution mode must be one of {list(EXECUTION_MODES)}, got {mode}"
+                )
+        self.default_mode = default_mode
+        self.max_workers = max_workers
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    def mode_for(self, tool_name: str) -> str:
+        """Return the execution mode used for the given tool."""
+        return self.routes.get(tool_name, self.default_mode)
+
+    def _get_pool(self, mode: str) -> Optional[Executor]:
+        """Return the pool for an execution mode, creating it if needed."""
+        if mode == "thread":
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="mcp-tool",
+                )
+            return self._thread_pool
+        if mode == "process":
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_warm_up_worker,
+                )
+            return self._process_pool
+        return None
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a tool function according to its configured execution mode."""
+        mode = self.mode_for(func.__name__)
+        pool = self._get_pool(mode)
+        if pool is None:
+            return func(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                pool, functools.partial(func, *args, **kwargs)
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); replace the pool so the
+            # next call gets fresh workers instead of failing forever.
+            logger.error(f"Process pool broken while running {func.__name__}")
+            self._process_pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def wrap(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a synchronous tool so that FastMCP awaits it through this executor.
+
+        The wrapper keeps the tool's name, docstring and signature so FastMCP
+        derives the same tool schema as for the bare function.
+        """
+        if (
+            inspect.iscoroutinefunction(func)
+            or self.mode_for(func.__name__) == "inline"
+        ):
+            return func
+
+        @functools.wraps(func)
+        async def dispatch(*args: Any, **kwargs: Any) -> Any:
+            return await self.run(func, *args, **kwargs)
+
+        return dispatch
+
+    async def warm_up(self) -> None:
+        """Start the process pool, if any tool uses it, and import tools in every worker.
+
+        Thread workers share the already-imported modules of this process, so
+        only the process pool needs warming.
+        """
+        if "process" not in {self.default_mode, *self.routes.values()}:
+            return
+        pool = self._get_pool("process")
+        loop = asyncio.get_running_loop()
+        # One task per worker makes the pool start all of its workers now
+        # rather than on the first real tool calls.
+        workers = self.max_workers or os.cpu_count() or 1
+        await asyncio.gather(
+            *(loop.run_in_executor(pool, _warm_up_worker) for _ in range(workers))
+        )
+        logger.info(f"Warmed up {workers} process workers for MCP tools")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down any started pools."""
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=True)
+        self._thread_pool = None
+        self._process_pool = None
+
 
 class TemplateMCPServer:
     """API Intelligence MCP Server implementation following tools-first architecture.
@@ -46,6 +206,12 @@ class TemplateMCPServer:
             # Force reconfigure all loggers after FastMCP initialization to ensure structured logging
             force_reconfigure_all_loggers(settings.PYTHON_LOG_LEVEL)
 
+            self.tool_executor = ToolExecutor(
+                default_mode=settings.TOOL_EXECUTION_MODE,
+                routes=settings.TOOL_EXECUTION_ROUTES,
+                max_workers=settings.TOOL_EXECUTOR_MAX_WORKERS,
+            )
+
             self._register_mcp_tools()
 
             logger.info("API Intelligence MCP Server initialized successfully")
@@ -63,9 +229,20 @@ class TemplateMCPServer:
         - optimize_api_response_schema: Automated schema optimization suggestions
         - generate_api_documentation: Context-aware API documentation generation
         - compare_api_responses: Smart diff analysis across API versions
+        - compare_api_versions: Schema diffs and field timeline across N versions
+        - measure_encoding_costs: Size and CPU cost of candidate wire formats
+        - save_schema_baseline: Store a response schema under a baseline ID
+        - compare_with_baseline: Diff a response against a stored baseline
+
+        The baseline tools are async (they use storage) and run on the event
+        loop; their parsing is moved to a worker thread.
         """
         # Register API intelligence tools
-        self.mcp.tool()(analyze_api_response)
-        self.mcp.tool()(optimize_api_response_schema)
-        self.mcp.tool()(generate_api_documentation)
-        self.mcp.tool()(compare_api_responses)
+        self.mcp.tool()(self.tool_executor.wrap(analyze_api_response))
+        self.mcp.tool()(self.tool_executor.wrap(optimize_api_response_schema))
+        self.mcp.tool()(self.tool_executor.wrap(generate_api_documentation))
+        self.mcp.tool()(self.tool_executor.wrap(compare_api_responses))
+        self.mcp.tool()(self.tool_executor.wrap(compare_api_versions))
+        self.mcp.tool()(self.tool_executor.wrap(measure_encoding_costs))
+        self.mcp.tool()(self.tool_executor.wrap(save_schema_baseline))
+        self.mcp.tool()(self.tool_executor.wrap(compare_with_baseline))
@@ -39,8 +39,8 @@ async def handle_callback(request: Request, oauth_service: OAuthService) -> Resp
     code = request.query_params.get("code")
     state = request.query_params.get("state")
 
-    token_set_from_code = OAuth2Handler.get_access_token_from_authorization_code_flow(
-        code, state
+    token_set_from_code = (
+        await OAuth2Handler.get_access_token_from_authorization_code_flow(code, state)
     )
 
     logger.info(f"\n\n\nAccess token: {token_set_from_code.get('access_token')}\n\n\n")
@@ -403,7 +403,7 @@ async def handle_refresh_token_grant_pydantic(
     if snowflake_refresh_token:
         try:
             snowflake_token_response = (
-                OAuth2Handler.get_access_token_from_refresh_token(
+                await OAuth2Handler.get_access_token_from_refresh_token(
                     snowflake_refresh_token
                 )
             )
@@ -564,7 +564,7 @@ async def handle_introspect(
                 },
             )
 
-        introspection_result = OAuth2Handler.introspect_token(token)
+        introspection_result = await OAuth2Handler.introspect_token(token)
         return introspection_result
 
     except HTTPException:
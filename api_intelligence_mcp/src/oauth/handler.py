@@ -3,8 +3,10 @@
 This module provides OAuth 2.0 authentication functionality including:
 - OAuth session management
 - Authorization URL generation
-- Token exchange and refresh
+- Token exchange and refresh via the async SSO client
 - Token introspection and validation
+- Local verification of JWT access tokens against a cached JWKS
+- Caching and single-flight coalescing of token verification
 """
 
 import time
@@ -13,6 +15,10 @@ from typing import Any, Dict, Optional
 import httpx
 from requests_oauthlib import OAuth2Session
 
+from api_intelligence_mcp.src.oauth.jwt_verifier import get_jwt_verifier, looks_like_jwt
+from api_intelligence_mcp.src.oauth.single_flight import SingleFlight
+from api_intelligence_mcp.src.oauth.sso_client import get_sso_client
+from api_intelligence_mcp.src.oauth.token_cache import hash_token, introspection_cache
 from api_intelligence_mcp.src.settings import settings
 from api_intelligence_mcp.utils.pylogger import get_python_logger
 
@@ -20,6 +26,9 @@ logger = get_python_logger()
 
 SCOPE = ["email", "openid", "profile", "session:role-any"]
 
+# Concurrent verifications of the same token share one introspection call
+_token_verifications = SingleFlight()
+
 
 class OAuth2Handler:
     """OAuth2 handler class for managing OAuth authentication flows."""
@@ -44,48 +53,24 @@ class OAuth2Handler:
         return authorization_url, state
 
     @staticmethod
-    def get_access_token_from_authorization_code_flow(code: str, state: str):
-        """Get access token from authorization code flow."""
-        oauth = OAuth2Handler.create_oauth_session(state=state)
-        token = oauth.fetch_token(
-            settings.SSO_TOKEN_URL,
-            code=code,
-            client_secret=settings.SSO_CLIENT_SECRET,
-            include_client_id=True,
-        )
-        return token
+    async def get_access_token_from_authorization_code_flow(code: str, state: str):
+        """Get access token from authorization code flow.
+
+        The state has already been matched by the callback route; it is kept
+        in the signature for callers of the previous synchronous API.
+        """
+        return await get_sso_client().exchange_authorization_code(code)
 
     @staticmethod
-    def get_access_token_from_refresh_token(refresh_token: str):
+    async def get_access_token_from_refresh_token(refresh_token: str):
         """Get access token using refresh token."""
-        oauth = OAuth2Handler.create_oauth_session()
-        token = oauth.refresh_token(
-            settings.SSO_TOKEN_URL,
-            refresh_token=refresh_token,
-            client_id=settings.SSO_CLIENT_ID,
-            client_secret=settings.SSO_CLIENT_SECRET,
-        )
-        return token
+        return await get_sso_client().refresh_access_token(refresh_token)
 
     @staticmethod
-    def introspect_token(token: str) -> Dict[str, Any]:
+    async def introspect_token(token: str) -> Dict[str, Any]:
         """Introspect a token using the configured SSO introspection endpoint."""
-        introspection_url = settings.SSO_INTROSPECTION_URL
-
         try:
-            response = httpx.post(
-                introspection_url,
-                data={
-                    "token": token,
-                    "client_id": settings.SSO_CLIENT_ID,
-                    "client_secret": settings.SSO_CLIENT_SECRET,
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=10.0,
-            )
-            response.raise_for_status()
-
-            introspection_data = response.json()
+            introspection_data = await get_sso_client().introspect_token(token)
             logger.debug(f"Token introspection response: {introspection_data}")
 
             return introspection_data
@@ -98,10 +83,53 @@ class OAuth2Handler:
             return {"active": False, "error": f"Unexpected error: {e}"}
 
     @staticmethod
-    def verify_access_token(token: str) -> Optional[Dict[str, Any]]:
-        """Verify an access token using RedHat's introspection endpoint."""
-        introspection_result = OAuth2Handler.introspect_token(token)
+    async def verify_access_token(token: str) -> Optional[Dict[str, Any]]:
+        """Verify an access token using RedHat's introspection endpoint.
+
+        Results are served from the introspection cache when possible, and
+        concurrent verifications of the same token share one introspection
+        call. Failed introspection calls are not cached, so an SSO outage does
+        not keep rejecting valid tokens after it recovers.
+
+        In ``jwt`` verification mode, JWT-shaped tokens are verified locally
+        against the provider's JWKS instead; opaque tokens, and JWTs arriving
+        while the JWKS cannot be fetched, still go through introspection.
+        """
+        if settings.SSO_TOKEN_VERIFICATION_MODE == "jwt" and looks_like_jwt(token):
+            try:
+                claims = await get_jwt_verifier().verify(token)
+                if claims is None:
+                    return None
+                return OAuth2Handler.validate_introspection_result(claims)
+            except Exception as e:
+                logger.error(
+                    f"Local JWT verification unavailable, using introspection: {e}"
+                )
+
+        cached, claims = introspection_cache.lookup(token)
+        if cached:
+            return claims
+
+        return await _token_verifications.do(
+            hash_token(token), lambda: OAuth2Handler._introspect_and_cache(token)
+        )
+
+    @staticmethod
+    async def _introspect_and_cache(token: str) -> Optional[Dict[str, Any]]:
+        """Introspect a token, validate the result and cache it."""
+        introspection_result = await OAuth2Handler.introspect_token(token)
+        claims = OAuth2Handler.validate_introspection_result(introspection_result)
+
+        if "error" not in introspection_result:
+            introspection_cache.store(token, claims)
+
+        return claims
 
+    @staticmethod
+    def validate_introspection_result(
+        introspection_result: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        """Return the introspection claims if they describe a usable access token."""
         if not introspection_result.get("active", False):
             logger.warning("Token is not active")
             return None
@@ -121,11 +149,19 @@ class OAuth2Handler:
         return introspection_result
 
     @staticmethod
-    def verify_authorization_header(auth_header: str) -> Optional[Dict[str, Any]]:
+    async def verify_authorization_header(auth_header: str) -> Optional[Dict[str, Any]]:
         """Verify Authorization header with Bearer token using RedHat's introspection."""
         if not auth_header or not auth_header.startswith("Bearer "):
             logger.warning("Invalid authorization header format")
             return None
 
         token = auth_header[7:]  # Remove "Bearer " prefix
-        return OAuth2Handler.verify_access_token(token)
+        return await OAuth2Handler.verify_access_token(token)
+
+    @staticmethod
+    def get_verification_stats() -> Dict[str, Any]:
+        """Return introspection cache and single-flight coalescing counters."""
+        return {
+            "cache": introspection_cache.stats(),
+            "single_flight": _token_verifications.stats(),
+        }
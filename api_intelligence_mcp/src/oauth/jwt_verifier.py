@@ -0,0 +1,259 @@
+"""Local JWT access token verification module.
+
+This module verifies signed JWT access tokens without a network round trip:
+- The provider's JSON Web Key Set (JWKS) is fetched once and cached
+- The cache is refreshed periodically in the background
+- An unknown ``kid`` triggers a rate-limited refresh to pick up key rotation
+- Signature, ``exp``, ``nbf``, ``aud`` and ``iss`` are checked locally
+
+Verified tokens are returned in the same claim shape as the SSO
+introspection endpoint (``active``, ``token_type``, ``client_id`` ...), so
+callers can treat both verification paths alike. Opaque tokens are left to
+remote introspection.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import jwt
+
+from api_intelligence_mcp.src.oauth.single_flight import SingleFlight
+from api_intelligence_mcp.src.settings import settings
+from api_intelligence_mcp.utils.pylogger import get_python_logger
+
+logger = get_python_logger(settings.PYTHON_LOG_LEVEL)
+
+_jwt_verifier: Optional["LocalJWTVerifier"] = None
+
+
+def looks_like_jwt(token: str) -> bool:
+    """Return True if the token has the three-segment shape of a JWS compact JWT."""
+    return token.count(".") == 2
+
+
+class JWKSCache:
+    """Cached JSON Web Key Set with background refresh and kid-miss rotation."""
+
+    def __init__(
+        self,
+        fetch_jwks: Callable[[], Awaitable[Dict[str, Any]]],
+        refresh_interval: float = 3600.0,
+        min_refresh_interval: float = 30.0,
+    ):
+        """Initialize the JWKS cache.
+
+        Args:
+            fetch_jwks: Coroutine function returning the provider's JWKS document
+            refresh_interval: Seconds between background refreshes
+            min_refresh_interval: Minimum seconds between refreshes triggered
+                by unknown key ids
+        """
+        self._fetch_jwks = fetch_jwks
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self._jwks: Dict[str, Dict[str, Any]] = {}
+        self._keys: Dict[Tuple[str, str], jwt.PyJWK] = {}
+        self._last_refresh: Optional[float] = None
+        self._refreshes = SingleFlight()
+        self._refresh_task: Optional["asyncio.Task[None]"] = None
+        self.refresh_count = 0
+
+    async def refresh(self) -> None:
+        """Fetch the JWKS, coalescing concurrent refreshes into one request."""
+        await self._refreshes.do("jwks", self._refresh)
+
+    async def _refresh(self) -> None:
+        document = await self._fetch_jwks()
+        jwks = {}
+        for index, jwk in enumerate(document.get("keys", [])):
+            if jwk.get("use", "sig") != "sig":
+                continue
+            jwks[jwk.get("kid") or f"#{index}"] = jwk
+        self._jwks = jwks
+        self._keys = {}
+        self._last_refresh = time.monotonic()
+        self.refresh_count += 1
+        logger.info(f"Loaded {len(jwks)} signing keys from JWKS")
+
+    async def get_key(self, kid: Optional[str], algorithm: str) -> Optional[jwt.PyJWK]:
+        """Return the signing key for a key id, refreshing the JWKS on a miss.
+
+        A token without ``kid`` is accepted only when the JWKS has exactly one
+        signing key.
+        """
+        if self._last_refresh is None:
+            await self.refresh()
+
+        jwk_kid = self._resolve_kid(kid)
+        if jwk_kid is None and self._may_refresh():
+            logger.info(f"Unknown JWT key id {kid}; refreshing JWKS")
+            await self.refresh()
+            jwk_kid = self._resolve_kid(kid)
+        if jwk_kid is None:
+            return None
+
+        cache_key = (jwk_kid, algorithm)
+        key = self._keys.get(cache_key)
+        if key is None:
+            key = jwt.PyJWK(self._jwks[jwk_kid], algorithm=algorithm)
+            self._keys[cache_key] = key
+        return key
+
+    def _resolve_kid(self, kid: Optional[str]) -> Optional[str]:
+        if kid is not None:
+            return kid if kid in self._jwks else None
+        if len(self._jwks) == 1:
+            return next(iter(self._jwks))
+        return None
+
+    def _may_refresh(self) -> bool:
+        return (
+            self._last_refresh is None
+            or time.monotonic() - self._last_refresh >= self.min_refresh_interval
+        )
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                # Keep serving the cached keys; the next cycle retries.
+                logger.error(f"Background JWKS refresh failed: {e}")
+
+    def start_background_refresh(self) -> None:
+        """Start the periodic background refresh task."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop_background_refresh(self) -> None:
+        """Stop the periodic background refresh task."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+
+class LocalJWTVerifier:
+    """Verify JWT access tokens locally against a cached JWKS."""
+
+    def __init__(
+        self,
+        jwks: JWKSCache,
+        algorithms: List[str],
+        issuer: Optional[str],
+        audience: Optional[str],
+        leeway: float = 0.0,
+    ):
+        """Initialize the verifier.
+
+        Args:
+            jwks: JWKS cache providing the signing keys
+            algorithms: Accepted signature algorithms
+            issuer: Required ``iss`` claim
+            audience: Required ``aud`` claim
+            leeway: Clock skew tolerance in seconds for ``exp`` and ``nbf``
+
+        Raises:
+            ValueError: If the issuer or audience is not set, as tokens issued
+                by the provider for other clients would then be accepted
+        """
+        if not issuer or not audience:
+            raise ValueError("Local JWT verification requires an issuer and audience")
+        self.jwks = jwks
+        self.algorithms = algorithms
+        self.issuer = issuer
+        self.audience = audience
+        self.leeway = leeway
+
+    async def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """Verify a JWT and return introspection-shaped claims, or None if invalid."""
+        try:
+            header = jwt.get_unverified_header(token)
+            algorithm = header.get("alg")
+            if algorithm not in self.algorithms:
+                logger.warning(f"JWT signed with disallowed algorithm: {algorithm}")
+                return None
+
+            key = await self.jwks.get_key(header.get("kid"), algorithm)
+            if key is None:
+                logger.warning(f"No JWKS key found for JWT key id {header.get('kid')}")
+                return None
+
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.leeway,
+                options={
+                    "require": ["exp", "iss", "aud"],
+                    "verify_aud": True,
+                    "verify_iss": True,
+                },
+            )
+        except jwt.PyJWTError as e:
+            logger.warning(f"Local JWT verification failed: {e}")
+            return None
+
+        return to_introspection_claims(claims)
+
+
+def to_introspection_claims(claims: Dict[str, Any]) -> Dict[str, Any]:
+    """Map decoded JWT claims onto the RFC 7662 introspection response shape."""
+    result = dict(claims)
+    result["active"] = True
+    result.setdefault("token_type", claims.get("typ", "Bearer"))
+    if "client_id" not in result and "azp" in claims:
+        result["client_id"] = claims["azp"]
+    if "username" not in result and "preferred_username" in claims:
+        result["username"] = claims["preferred_username"]
+    return result
+
+
+def get_jwt_verifier() -> LocalJWTVerifier:
+    """Get the shared local JWT verifier, creating it on first use."""
+    global _jwt_verifier
+    if _jwt_verifier is None:
+        from api_intelligence_mcp.src.oauth.sso_client import get_sso_client
+
+        async def fetch_jwks() -> Dict[str, Any]:
+            return await get_sso_client().fetch_jwks()
+
+        _jwt_verifier = LocalJWTVerifier(
+            JWKSCache(
+                fetch_jwks,
+                refresh_interval=settings.SSO_JWKS_REFRESH_INTERVAL_SECONDS,
+                min_refresh_interval=settings.SSO_JWKS_MIN_REFRESH_INTERVAL_SECONDS,
+            ),
+            algorithms=settings.SSO_JWT_ALGORITHMS,
+            issuer=settings.SSO_ISSUER,
+            audience=settings.SSO_AUDIENCE,
+            leeway=settings.SSO_JWT_LEEWAY_SECONDS,
+        )
+    return _jwt_verifier
+
+
+async def initialize_jwt_verifier() -> LocalJWTVerifier:
+    """Load the JWKS and start its background refresh. Call during startup."""
+    verifier = get_jwt_verifier()
+    try:
+        await verifier.jwks.refresh()
+    except Exception as e:
+        # Tokens are still verified once the SSO is reachable again.
+        logger.error(f"Initial JWKS fetch failed: {e}")
+    verifier.jwks.start_background_refresh()
+    return verifier
+
+
+async def cleanup_jwt_verifier() -> None:
+    """Stop the JWKS background refresh. Call during shutdown."""
+    global _jwt_verifier
+    if _jwt_verifier is not None:
+        await _jwt_verifier.jwks.stop_background_refresh()
+        _jwt_verifier = None
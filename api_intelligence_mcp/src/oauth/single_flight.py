@@ -0,0 +1,64 @@
+"""Single-flight call coalescing module.
+
+This module provides ``SingleFlight``, which lets concurrent callers asking
+for the same key share one in-flight coroutine instead of each starting
+their own. It is used to collapse simultaneous verifications of the same
+bearer token into a single SSO introspection call.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one shared task."""
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Run ``func`` once per key, sharing its result with concurrent callers.
+
+        The shared call runs as its own task and is shielded from callers, so
+        a cancelled caller does not cancel the call for the other waiters.
+
+        Args:
+            key: Identity of the call; concurrent calls with equal keys coalesce
+            func: Zero-argument coroutine function performing the call
+
+        Returns:
+            T: The result of the shared call (its exception is re-raised)
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.calls += 1
+        task = asyncio.ensure_future(func())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of calls currently in flight."""
+        return len(self._inflight)
+
+    def reset_stats(self) -> None:
+        """Reset the call counters."""
+        self.calls = 0
+        self.coalesced = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many calls ran and how many waiters were coalesced."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": self.in_flight,
+        }
@@ -0,0 +1,202 @@
+"""Async SSO client module.
+
+This module provides the HTTP client used to talk to the upstream SSO
+provider: token introspection, JWKS retrieval, authorization code exchange
+and refresh token grants. A single long-lived ``httpx.AsyncClient`` is shared by all
+requests so connections are kept alive and pooled, and HTTP/2 is negotiated
+when the optional ``h2`` package is installed.
+
+The client is created during application startup via
+``initialize_sso_client()`` and closed during shutdown via
+``cleanup_sso_client()``.
+"""
+
+import importlib.util
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from api_intelligence_mcp.src.settings import settings
+from api_intelligence_mcp.utils.pylogger import get_python_logger
+
+logger = get_python_logger(settings.PYTHON_LOG_LEVEL)
+
+_sso_client: Optional["SSOClient"] = None
+
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+
+def http2_available() -> bool:
+    """Return True if the h2 package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class SSOClient:
+    """Async client for the upstream SSO token and introspection endpoints."""
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """Initialize the SSO client.
+
+        Args:
+            timeout: Timeout in seconds for each SSO request
+            max_connections: Maximum concurrent connections to the SSO
+            max_keepalive_connections: Maximum idle connections kept open
+            keepalive_expiry: Seconds an idle connection is kept open
+            http2: Negotiate HTTP/2 when the h2 package is installed
+            transport: Optional transport override, mainly for tests
+        """
+        use_http2 = http2 and http2_available()
+        if http2 and not use_http2:
+            logger.info("h2 package not installed; SSO client will use HTTP/1.1")
+
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            http2=use_http2,
+            transport=transport,
+        )
+
+    @property
+    def is_closed(self) -> bool:
+        """Return True once the underlying HTTP client has been closed."""
+        return self._client.is_closed
+
+    async def _post_form(self, url: str, data: Dict[str, str]) -> Dict[str, Any]:
+        """POST a form to the SSO and return the decoded JSON response."""
+        response = await self._client.post(url, data=data, headers=_FORM_HEADERS)
+        response.raise_for_status()
+        return response.json()
+
+    async def introspect_token(self, token: str) -> Dict[str, Any]:
+        """Introspect a token at the configured SSO introspection endpoint.
+
+        Raises:
+            httpx.HTTPError: If the request fails or returns an error status
+        """
+        return await self._post_form(
+            settings.SSO_INTROSPECTION_URL,
+            {
+                "token": token,
+                "client_id": settings.SSO_CLIENT_ID,
+                "client_secret": settings.SSO_CLIENT_SECRET,
+            },
+        )
+
+    async def fetch_jwks(self) -> Dict[str, Any]:
+        """Fetch the provider's JSON Web Key Set from the configured JWKS URL.
+
+        Raises:
+            httpx.HTTPError: If the request fails or returns an error status
+        """
+        response = await self._client.get(settings.SSO_JWKS_URL)
+        response.raise_for_status()
+        return response.json()
+
+    async def _fetch_token(self, data: Dict[str, str]) -> Dict[str, Any]:
+        """Call the SSO token endpoint and add ``expires_at`` like requests-oauthlib."""
+        token = await self._post_form(
+            settings.SSO_TOKEN_URL,
+            {
+                **data,
+                "client_id": settings.SSO_CLIENT_ID,
+                "client_secret": settings.SSO_CLIENT_SECRET,
+            },
+        )
+        expires_in = token.get("expires_in")
+        if expires_in is not None:
+            token["expires_at"] = time.time() + int(expires_in)
+        return token
+
+    async def exchange_authorization_code(self, code: str) -> Dict[str, Any]:
+        """Exchange an authorization code for a token set.
+
+        Raises:
+            httpx.HTTPError: If the request fails or returns an error status
+        """
+        return await self._fetch_token(
+            {
+                "grant_type": "authorization_code",
+                "code": code,
+                "redirect_uri": settings.SSO_CALLBACK_URL,
+            }
+        )
+
+    async def refresh_access_token(self, refresh_token: str) -> Dict[str, Any]:
+        """Obtain a new token set using a refresh token.
+
+        Raises:
+            httpx.HTTPError: If the request fails or returns an error status
+        """
+        return await self._fetch_token(
+            {"grant_type": "refresh_token", "refresh_token": refresh_token}
+        )
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self._client.aclose()
+
+
+def _create_sso_client() -> SSOClient:
+    return SSOClient(
+        timeout=settings.SSO_HTTP_TIMEOUT_SECONDS,
+        max_connections=settings.SSO_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.SSO_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.SSO_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        http2=settings.SSO_HTTP2_ENABLED,
+    )
+
+
+def get_sso_client() -> SSOClient:
+    """Get the shared SSO client.
+
+    The client is normally created by ``initialize_sso_client()`` during
+    startup; if it is used before that (for example from a test client
+    without lifespan), it is created on first use.
+
+    Returns:
+        SSOClient: The shared SSO client
+    """
+    global _sso_client
+    if _sso_client is None or _sso_client.is_closed:
+        logger.debug("SSO client not initialized; creating it on first use")
+        _sso_client = _create_sso_client()
+    return _sso_client
+
+
+async def initialize_sso_client() -> SSOClient:
+    """Initialize the shared SSO client. Call this during application startup.
+
+    Returns:
+        SSOClient: The initialized SSO client
+    """
+    global _sso_client
+
+    if _sso_client is not None and not _sso_client.is_closed:
+        logger.warning("SSO client already initialized")
+        return _sso_client
+
+    _sso_client = _create_sso_client()
+    logger.info("SSO client initialized")
+    return _sso_client
+
+
+async def cleanup_sso_client() -> None:
+    """Close the shared SSO client. Call this during application shutdown."""
+    global _sso_client
+    if _sso_client is not None:
+        await _sso_client.aclose()
+        _sso_client = None
+        logger.info("SSO client closed")
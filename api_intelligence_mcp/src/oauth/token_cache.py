@@ -0,0 +1,116 @@
+"""Token introspection cache module.
+
+This module provides an in-process cache in front of remote token
+introspection. Tokens are never stored; entries are keyed by a SHA-256 hash
+of the token. Verified claims expire at the earlier of the token's ``exp``
+and a configurable TTL, and rejected tokens are cached negatively for a
+shorter TTL.
+"""
+
+import hashlib
+import json
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from api_intelligence_mcp.src.settings import settings
+from api_intelligence_mcp.utils.lru_cache import LRUCache
+
+# Rough per-entry overhead of the key and bookkeeping, added to the claim size
+_ENTRY_OVERHEAD_BYTES = 200
+
+_NEGATIVE = object()
+
+
+def hash_token(token: str) -> str:
+    """Return the cache key for a token."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenIntrospectionCache:
+    """LRU cache of token verification results keyed by token hash."""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+        max_entries: int,
+        max_bytes: Optional[int] = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            ttl_seconds: Upper bound on how long verified claims are reused;
+                0 disables caching entirely
+            negative_ttl_seconds: How long rejected tokens are remembered;
+                0 disables negative caching
+            max_entries: Maximum number of cached tokens
+            max_bytes: Maximum estimated size of all cached claims
+        """
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._cache = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if verification results are cached."""
+        return self.ttl_seconds > 0
+
+    def lookup(self, token: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Look up a token.
+
+        Returns:
+            Tuple[bool, Optional[Dict[str, Any]]]: Whether the token was cached,
+            and its claims (None for a cached rejection)
+        """
+        if not self.enabled:
+            return False, None
+        value = self._cache.get(hash_token(token))
+        if value is None:
+            return False, None
+        if value is _NEGATIVE:
+            return True, None
+        return True, value
+
+    def store(self, token: str, claims: Optional[Dict[str, Any]]) -> None:
+        """Cache a verification result; None records a rejected token."""
+        if not self.enabled:
+            return
+        key = hash_token(token)
+        if claims is None:
+            if self.negative_ttl_seconds > 0:
+                self._cache.set(
+                    key,
+                    _NEGATIVE,
+                    size=_ENTRY_OVERHEAD_BYTES,
+                    ttl=self.negative_ttl_seconds,
+                )
+            return
+
+        ttl = self.ttl_seconds
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            ttl = min(ttl, exp - time.time())
+        if ttl <= 0:
+            return
+        size = len(json.dumps(claims, default=str)) + _ENTRY_OVERHEAD_BYTES
+        self._cache.set(key, claims, size=size, ttl=ttl)
+
+    def invalidate(self, token: str) -> None:
+        """Drop any cached result for a token."""
+        self._cache.pop(hash_token(token))
+
+    def clear(self) -> None:
+        """Drop every cached result and reset the counters."""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and occupancy of the cache."""
+        return self._cache.stats()
+
+
+introspection_cache = TokenIntrospectionCache(
+    ttl_seconds=settings.SSO_INTROSPECTION_CACHE_TTL_SECONDS,
+    negative_ttl_seconds=settings.SSO_INTROSPECTION_NEGATIVE_CACHE_TTL_SECONDS,
+    max_entries=settings.SSO_INTROSPECTION_CACHE_MAX_ENTRIES,
+    max_bytes=settings.SSO_INTROSPECTION_CACHE_MAX_BYTES,
+)
@@ -1,6 +1,6 @@
 """Settings for the Template MCP Server."""
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from dotenv import load_dotenv
 from pydantic import Field
@@ -163,6 +163,154 @@ class Settings(BaseSettings):
             "description": "SSO token introspection endpoint URL",
         },
     )
+    SSO_TOKEN_VERIFICATION_MODE: str = Field(
+        default="introspection",
+        json_schema_extra={
+            "env": "SSO_TOKEN_VERIFICATION_MODE",
+            "description": "How bearer tokens are verified: remote introspection, or local JWT verification with introspection as the fallback for opaque tokens",
+            "example": "jwt",
+            "enum": ["introspection", "jwt"],
+        },
+    )
+    SSO_JWKS_URL: str = Field(
+        default="",
+        json_schema_extra={
+            "env": "SSO_JWKS_URL",
+            "description": "SSO JSON Web Key Set URL (required for jwt verification)",
+            "example": "https://sso.example.com/realms/example/protocol/openid-connect/certs",
+        },
+    )
+    SSO_ISSUER: Optional[str] = Field(
+        default=None,
+        json_schema_extra={
+            "env": "SSO_ISSUER",
+            "description": "Expected iss claim of JWT access tokens (required for jwt verification)",
+            "example": "https://sso.example.com/realms/example",
+        },
+    )
+    SSO_AUDIENCE: Optional[str] = Field(
+        default=None,
+        json_schema_extra={
+            "env": "SSO_AUDIENCE",
+            "description": "Expected aud claim of JWT access tokens (required for jwt verification)",
+            "example": "api-intelligence-mcp",
+        },
+    )
+    SSO_JWT_ALGORITHMS: List[str] = Field(
+        default=["RS256"],
+        json_schema_extra={
+            "env": "SSO_JWT_ALGORITHMS",
+            "description": "Accepted JWT signature algorithms",
+            "example": ["RS256", "ES256"],
+        },
+    )
+    SSO_JWT_LEEWAY_SECONDS: float = Field(
+        default=30.0,
+        ge=0,
+        json_schema_extra={
+            "env": "SSO_JWT_LEEWAY_SECONDS",
+            "description": "Clock skew tolerance for exp and nbf checks",
+            "example": 30,
+        },
+    )
+    SSO_JWKS_REFRESH_INTERVAL_SECONDS: float = Field(
+        default=3600.0,
+        gt=0,
+        json_schema_extra={
+            "env": "SSO_JWKS_REFRESH_INTERVAL_SECONDS",
+            "description": "Seconds between background JWKS refreshes",
+            "example": 3600,
+        },
+    )
+    SSO_JWKS_MIN_REFRESH_INTERVAL_SECONDS: float = Field(
+        default=30.0,
+        ge=0,
+        json_schema_extra={
+            "env": "SSO_JWKS_MIN_REFRESH_INTERVAL_SECONDS",
+            "description": "Minimum seconds between JWKS refreshes triggered by unknown key ids",
+            "example": 30,
+        },
+    )
+    SSO_INTROSPECTION_CACHE_TTL_SECONDS: float = Field(
+        default=60.0,
+        ge=0,
+        json_schema_extra={
+            "env": "SSO_INTROSPECTION_CACHE_TTL_SECONDS",
+            "description": "Maximum seconds a verified token is served from cache (0 disables the cache)",
+            "example": 60,
+        },
+    )
+    SSO_INTROSPECTION_NEGATIVE_CACHE_TTL_SECONDS: float = Field(
+        default=10.0,
+        ge=0,
+        json_schema_extra={
+            "env": "SSO_INTROSPECTION_NEGATIVE_CACHE_TTL_SECONDS",
+            "description": "Seconds a rejected token is served from cache (0 disables negative caching)",
+            "example": 10,
+        },
+    )
+    SSO_INTROSPECTION_CACHE_MAX_ENTRIES: int = Field(
+        default=10000,
+        ge=1,
+        json_schema_extra={
+            "env": "SSO_INTROSPECTION_CACHE_MAX_ENTRIES",
+            "description": "Maximum number of tokens kept in the introspection cache",
+            "example": 10000,
+        },
+    )
+    SSO_INTROSPECTION_CACHE_MAX_BYTES: int = Field(
+        default=16 * 1024 * 1024,
+        ge=1024,
+        json_schema_extra={
+            "env": "SSO_INTROSPECTION_CACHE_MAX_BYTES",
+            "description": "Maximum estimated size of the introspection cache in bytes",
+            "example": 16777216,
+        },
+    )
+    SSO_HTTP_TIMEOUT_SECONDS: float = Field(
+        default=10.0,
+        gt=0,
+        json_schema_extra={
+            "env": "SSO_HTTP_TIMEOUT_SECONDS",
+            "description": "Timeout in seconds for requests to the SSO",
+            "example": 10,
+        },
+    )
+    SSO_HTTP_MAX_CONNECTIONS: int = Field(
+        default=100,
+        ge=1,
+        json_schema_extra={
+            "env": "SSO_HTTP_MAX_CONNECTIONS",
+            "description": "Maximum concurrent connections in the SSO client pool",
+            "example": 100,
+        },
+    )
+    SSO_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=20,
+        ge=0,
+        json_schema_extra={
+            "env": "SSO_HTTP_MAX_KEEPALIVE_CONNECTIONS",
+            "description": "Maximum idle keep-alive connections kept to the SSO",
+            "example": 20,
+        },
+    )
+    SSO_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = Field(
+        default=30.0,
+        ge=0,
+        json_schema_extra={
+            "env": "SSO_HTTP_KEEPALIVE_EXPIRY_SECONDS",
+            "description": "Seconds an idle SSO connection is kept open",
+            "example": 30,
+        },
+    )
+    SSO_HTTP2_ENABLED: bool = Field(
+        default=True,
+        json_schema_extra={
+            "env": "SSO_HTTP2_ENABLED",
+            "description": "Use HTTP/2 for SSO requests when the h2 package is installed",
+            "example": True,
+        },
+    )
     SESSION_SECRET: Optional[str] = Field(
         default=None,
         json_schema_extra={
@@ -277,6 +425,110 @@ class Settings(BaseSettings):
             "example": "true",
         },
     )
+    TOOL_EXECUTION_MODE: str = Field(
+        default="process",
+        json_schema_extra={
+            "env": "TOOL_EXECUTION_MODE",
+            "description": "Default execution mode for CPU-bound tools",
+            "example": "process",
+            "enum": ["inline", "thread", "process"],
+        },
+    )
+    TOOL_EXECUTION_ROUTES: Dict[str, str] = Field(
+        default_factory=dict,
+        json_schema_extra={
+            "env": "TOOL_EXECUTION_ROUTES",
+            "description": "Per-tool execution mode overrides, keyed by tool name",
+            "example": {"compare_api_responses": "thread"},
+        },
+    )
+    TOOL_EXECUTOR_MAX_WORKERS: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=64,
+        json_schema_extra={
+            "env": "TOOL_EXECUTOR_MAX_WORKERS",
+            "description": "Maximum workers per tool pool (defaults to the CPU count)",
+            "example": 4,
+        },
+    )
+    TOOL_FILE_INPUT_DIR: Optional[str] = Field(
+        default=None,
+        json_schema_extra={
+            "env": "TOOL_FILE_INPUT_DIR",
+            "description": "Directory tools may read file_path inputs from (file input is disabled when unset)",
+            "example": "/data/api-dumps",
+        },
+    )
+    TOOL_FILE_OUTPUT_DIR: Optional[str] = Field(
+        default=None,
+        json_schema_extra={
+            "env": "TOOL_FILE_OUTPUT_DIR",
+            "description": "Directory tools may write output_path results to (file output is disabled when unset)",
+            "example": "/data/api-optimized",
+        },
+    )
+    TOOL_PARSE_CACHE_ENABLED: bool = Field(
+        default=True,
+        json_schema_extra={
+            "env": "TOOL_PARSE_CACHE_ENABLED",
+            "description": "Reuse parsed JSON documents across tool calls on identical payloads",
+            "example": True,
+        },
+    )
+    TOOL_PARSE_CACHE_MAX_ENTRIES: int = Field(
+        default=64,
+        ge=1,
+        json_schema_extra={
+            "env": "TOOL_PARSE_CACHE_MAX_ENTRIES",
+            "description": "Maximum parsed documents kept per process",
+            "example": 64,
+        },
+    )
+    TOOL_PARSE_CACHE_MAX_BYTES: int = Field(
+        default=256 * 1024 * 1024,
+        ge=0,
+        json_schema_extra={
+            "env": "TOOL_PARSE_CACHE_MAX_BYTES",
+            "description": "Estimated memory budget of the parsed documents kept per process",
+            "example": 268435456,
+        },
+    )
+    TOOL_COMPILED_CLEANERS_ENABLED: bool = Field(
+        default=True,
+        json_schema_extra={
+            "env": "TOOL_COMPILED_CLEANERS_ENABLED",
+            "description": "Compile shape-specific cleaning functions for payload shapes optimize_api_response_schema sees repeatedly",
+            "example": True,
+        },
+    )
+    TOOL_COMPILED_CLEANER_CACHE_MAX_ENTRIES: int = Field(
+        default=32,
+        ge=1,
+        json_schema_extra={
+            "env": "TOOL_COMPILED_CLEANER_CACHE_MAX_ENTRIES",
+            "description": "Maximum payload shapes tracked by the compiled cleaner cache per process",
+            "example": 32,
+        },
+    )
+    TOOL_BASELINE_CACHE_MAX_ENTRIES: int = Field(
+        default=128,
+        ge=1,
+        json_schema_extra={
+            "env": "TOOL_BASELINE_CACHE_MAX_ENTRIES",
+            "description": "Maximum schema baselines kept in the lookup cache",
+            "example": 128,
+        },
+    )
+    TOOL_BASELINE_CACHE_TTL_SECONDS: float = Field(
+        default=300.0,
+        ge=0,
+        json_schema_extra={
+            "env": "TOOL_BASELINE_CACHE_TTL_SECONDS",
+            "description": "Seconds a schema baseline read from storage is served from cache, so updates by other replicas are picked up",
+            "example": 300,
+        },
+    )
 
 
 def validate_config(settings: Settings) -> None:
@@ -311,6 +563,31 @@ def validate_config(settings: Settings) -> None:
             f"MCP_TRANSPORT_PROTOCOL must be one of {valid_transport_protocols}, got {settings.MCP_TRANSPORT_PROTOCOL}"
         )
 
+    # Validate token verification mode
+    valid_verification_modes = ["introspection", "jwt"]
+    if settings.SSO_TOKEN_VERIFICATION_MODE not in valid_verification_modes:
+        raise ValueError(
+            f"SSO_TOKEN_VERIFICATION_MODE must be one of {valid_verification_modes}, got {settings.SSO_TOKEN_VERIFICATION_MODE}"
+        )
+    if settings.SSO_TOKEN_VERIFICATION_MODE == "jwt":
+        for name in ("SSO_JWKS_URL", "SSO_ISSUER", "SSO_AUDIENCE"):
+            if not getattr(settings, name):
+                raise ValueError(
+                    f"{name} is required when SSO_TOKEN_VERIFICATION_MODE is jwt"
+                )
+
+    # Validate tool execution modes
+    valid_execution_modes = ["inline", "thread", "process"]
+    if settings.TOOL_EXECUTION_MODE not in valid_execution_modes:
+        raise ValueError(
+            f"TOOL_EXECUTION_MODE must be one of {valid_execution_modes}, got {settings.TOOL_EXECUTION_MODE}"
+        )
+    for tool_name, mode in settings.TOOL_EXECUTION_ROUTES.items():
+        if mode not in valid_execution_modes:
+            raise ValueError(
+                f"TOOL_EXECUTION_ROUTES[{tool_name}] must be one of {valid_execution_modes}, got {mode}"
+            )
+
 
 # Create config instance without validation (validation happens in main.py)
 settings = Settings()
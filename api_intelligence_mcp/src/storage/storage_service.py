@@ -160,6 +160,17 @@ class StorageService:
                 )
             """)
 
+            # Schema baselines of API responses, compared against by tools
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_baselines (
+                    baseline_id VARCHAR(255) PRIMARY KEY,
+                    schema JSONB NOT NULL,
+                    fingerprint VARCHAR(64) NOT NULL,
+                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+                )
+            """)
+
             # Create useful indexes
             await conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_auth_codes_expires ON oauth_authorization_codes (expires_at)"
@@ -558,3 +569,79 @@ class StorageService:
         except Exception as e:
             logger.error(f"Failed to delete refresh token: {e}")
             return False
+
+    async def store_schema_baseline(
+        self, baseline_id: str, baseline_data: Dict[str, Any]
+    ) -> bool:
+        """Store a schema baseline, replacing any baseline with the same ID."""
+        try:
+            if not self.pool:
+                return False
+
+            async with self.pool.acquire() as conn:
+                await conn.execute(
+                    """
+                    INSERT INTO schema_baselines (baseline_id, schema, fingerprint)
+                    VALUES ($1, $2, $3)
+                    ON CONFLICT (baseline_id) DO UPDATE
+                    SET schema = EXCLUDED.schema,
+                        fingerprint = EXCLUDED.fingerprint,
+                        updated_at = NOW()
+                """,
+                    baseline_id,
+                    json.dumps(baseline_data["schema"]),
+                    baseline_data["fingerprint"],
+                )
+                return True
+
+        except Exception as e:
+            logger.error(f"Failed to store schema baseline: {e}")
+            return False
+
+    async def get_schema_baseline(self, baseline_id: str) -> Optional[Dict[str, Any]]:
+        """Get a schema baseline by ID."""
+        try:
+            if not self.pool:
+                return None
+
+            async with self.pool.acquire() as conn:
+                result = await conn.fetchrow(
+                    """
+                    SELECT baseline_id, schema, fingerprint, updated_at
+                    FROM schema_baselines
+                    WHERE baseline_id = $1
+                """,
+                    baseline_id,
+                )
+
+                if result:
+                    return {
+                        "baseline_id": result["baseline_id"],
+                        "schema": json.loads(result["schema"]),
+                        "fingerprint": result["fingerprint"],
+                        "updated_at": result["updated_at"].timestamp(),
+                    }
+                return None
+
+        except Exception as e:
+            logger.error(f"Failed to get schema baseline: {e}")
+            return None
+
+    async def delete_schema_baseline(self, baseline_id: str) -> bool:
+        """Delete a schema baseline."""
+        try:
+            if not self.pool:
+                return False
+
+            async with self.pool.acquire() as conn:
+                result = await conn.execute(
+                    """
+                    DELETE FROM schema_baselines WHERE baseline_id = $1
+                """,
+                    baseline_id,
+                )
+                return result != "DELETE 0"
+
+        except Exception as e:
+            logger.error(f"Failed to delete schema baseline: {e}")
+            return False
@@ -0,0 +1,167 @@
+"""Alignment of the elements of two versions of a JSON array.
+
+Arrays are aligned on hashable element identities: either the values of an
+identity key such as ``id`` (``key_positions``), or element digests
+(``align_sequences``). Digest alignment trims the common prefix and suffix,
+then runs an exact longest common subsequence when the remaining middle
+has at most ``LCS_MAX_CELLS`` cells. Larger middles are anchored on
+elements that occur exactly once on each side, keeping the longest run of
+anchors in increasing order, which takes O(n log n) time.
+"""
+
+from bisect import bisect_left
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+# Identity keys tried, in order, when the caller does not name one
+IDENTITY_KEYS = ("id", "_id", "uuid", "key")
+
+# Largest old x new middle aligned with the exact quadratic LCS
+LCS_MAX_CELLS = 250_000
+
+Pairs = List[Tuple[int, int]]
+
+
+def key_positions(array: Sequence[Any], key: str) -> Optional[Dict[Any, int]]:
+    """Map the identity values of an array of objects to their positions.
+
+    Returns:
+        The positions by key value, or None if some element is not an object,
+        lacks the key, holds a non string/integer value or repeats a value
+    """
+    positions: Dict[Any, int] = {}
+    for position, element in enumerate(array):
+        if type(element) is not dict:
+            return None
+        value = element.get(key)
+        value_type = type(value)
+        if value_type is not str and value_type is not int:
+            return None
+        if value in positions:
+            return None
+        positions[value] = position
+    return positions
+
+
+def detect_key(
+    old: Sequence[Any], new: Sequence[Any], candidates: Sequence[str] = IDENTITY_KEYS
+) -> Optional[Tuple[str, Dict[Any, int], Dict[Any, int]]]:
+    """Return the first candidate key identifying the elements of both arrays.
+
+    Returns:
+        The key with the positions of both arrays by key value, or None
+    """
+    for key in candidates:
+        old_positions = key_positions(old, key)
+        if old_positions is None:
+            continue
+        new_positions = key_positions(new, key)
+        if new_positions is not None:
+            return key, old_positions, new_positions
+    return None
+
+
+def increasing_subsequence(values: Sequence[int]) -> List[int]:
+    """Return the positions of a longest strictly increasing subsequence."""
+    tails: List[int] = []
+    tail_positions: List[int] = []
+    previous = [-1] * len(values)
+    for position, value in enumerate(values):
+        slot = bisect_left(tails, value)
+        if slot == len(tails):
+            tails.append(value)
+            tail_positions.append(position)
+        else:
+            tails[slot] = value
+            tail_positions[slot] = position
+        previous[position] = tail_positions[slot - 1] if slot else -1
+    result = []
+    position = tail_positions[-1] if tail_positions else -1
+    while position >= 0:
+        result.append(position)
+        position = previous[position]
+    result.reverse()
+    return result
+
+
+def _lcs(old: Sequence[Hashable], new: Sequence[Hashable]) -> Pairs:
+    """Return the index pairs of an exact longest common subsequence."""
+    rows, columns = len(old), len(new)
+    # lengths[i][j] is the LCS length of old[i:] and new[j:]
+    lengths = [[0] * (columns + 1) for _ in range(rows + 1)]
+    for i in range(rows - 1, -1, -1):
+        row, below = lengths[i], lengths[i + 1]
+        item = old[i]
+        for j in range(columns - 1, -1, -1):
+            if item == new[j]:
+                row[j] = below[j + 1] + 1
+            else:
+                row[j] = below[j] if below[j] >= row[j + 1] else row[j + 1]
+    pairs = []
+    i = j = 0
+    while i < rows and j < columns:
+        if old[i] == new[j]:
+            pairs.append((i, j))
+            i += 1
+            j += 1
+        elif lengths[i + 1][j] >= lengths[i][j + 1]:
+            i += 1
+        else:
+            j += 1
+    return pairs
+
+
+def _unique_anchors(old: Sequence[Hashable], new: Sequence[Hashable]) -> Pairs:
+    """Return ordered pairs of the elements occurring once on each side."""
+    old_counts: Dict[Hashable, int] = {}
+    for item in old:
+        old_counts[item] = old_counts.get(item, 0) + 1
+    new_counts: Dict[Hashable, int] = {}
+    for item in new:
+        new_counts[item] = new_counts.get(item, 0) + 1
+    old_positions = {item: i for i, item in enumerate(old) if old_counts[item] == 1}
+    candidates = [
+        (old_positions[item], j)
+        for j, item in enumerate(new)
+        if new_counts[item] == 1 and item in old_positions
+    ]
+    kept = increasing_subsequence([i for i, _ in candidates])
+    return [candidates[position] for position in kept]
+
+
+def align_sequences(
+    old: Sequence[Hashable],
+    new: Sequence[Hashable],
+    max_cells: int = LCS_MAX_CELLS,
+) -> Tuple[Pairs, str]:
+    """Return the index pairs of equal elements kept in order on both sides.
+
+    Args:
+        old: Identities of the old elements
+        new: Identities of the new elements
+        max_cells: Largest trimmed middle aligned with the exact LCS
+
+    Returns:
+        The (old index, new index) pairs in increasing order, and ``"lcs"``
+        or ``"heuristic"`` for the method used on the middle
+    """
+    end = min(len(old), len(new))
+    start = 0
+    while start < end and old[start] == new[start]:
+        start += 1
+    old_end, new_end = len(old), len(new)
+    while old_end > start and new_end > start and old[old_end - 1] == new[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+
+    old_middle, new_middle = old[start:old_end], new[start:new_end]
+    if len(old_middle) * len(new_middle) <= max_cells:
+        middle, method = _lcs(old_middle, new_middle), "lcs"
+    else:
+        middle, method = _unique_anchors(old_middle, new_middle), "heuristic"
+
+    pairs = [(i, i) for i in range(start)]
+    pairs.extend((i + start, j + start) for i, j in middle)
+    pairs.extend(
+        (old_end + offset, new_end + offset) for offset in range(len(old) - old_end)
+    )
+    return pairs, method
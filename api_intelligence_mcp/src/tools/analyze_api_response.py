@@ -3,141 +3,574 @@
 Enhanced version with structured field inventory.
 """
 
-import json
-from typing import Any, Dict, List
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from api_intelligence_mcp.src.tools.json_stream import (
+    DEFAULT_CHUNK_SIZE,
+    JSONEventStream,
+    Source,
+    iter_chunks,
+    resolve_input_path,
+)
+from api_intelligence_mcp.src.tools.parse_cache import load_json
+from api_intelligence_mcp.src.tools.traversal import (
+    CONTAINER_KINDS,
+    ValueVisitor,
+    make_sampler,
+    walk,
+)
 from api_intelligence_mcp.utils.pylogger import get_python_logger
 
 logger = get_python_logger()
 
+# Null field and empty array paths listed in streaming mode
+MAX_STREAMED_PATHS = 1000
 
-def analyze_api_response(
-    response_json: str,
-) -> Dict[str, Any]:
-    """Analyze structure, size, and quality of an API JSON response.
+# "collapsed" reports array elements once under ``[]`` schema paths,
+# "indexed" lists every element under its ``[index]`` path
+PATH_MODES = ("collapsed", "indexed")
 
-    TOOL_NAME=analyze_api_response
-    DISPLAY_NAME=API Response Analyzer
-    USECASE=Analyze JSON API response structure and generate structured metrics, field inventory, and readable summary
-    INSTRUCTIONS=1. Provide valid JSON string, 2. Call function, 3. Receive structured analysis and summary
-    INPUT_DESCRIPTION=response_json (string): JSON API response
-    OUTPUT_DESCRIPTION=Dictionary containing metrics, full field list, suggestions, and readable summary
-    EXAMPLES=analyze_api_response('{"id":1,"name":"John"}')
-    PREREQUISITES=Valid JSON string
-    RELATED_TOOLS=optimize_api_response_schema, generate_api_documentation, compare_api_responses
-
-    CPU-bound deterministic analysis operation.
+# "records" returns one dict per field, "columnar" one list per attribute
+FIELD_FORMATS = ("records", "columnar")
+
+
+def _check_path_mode(path_mode: str) -> None:
+    if path_mode not in PATH_MODES:
+        raise ValueError(f"path_mode must be one of: {', '.join(PATH_MODES)}")
+
+
+def _check_field_format(field_format: str) -> None:
+    if field_format not in FIELD_FORMATS:
+        raise ValueError(f"field_format must be one of: {', '.join(FIELD_FORMATS)}")
+
+
+# Type codes stored in the inventory columns
+TYPE_NAMES = (
+    "object",
+    "array",
+    "string",
+    "integer",
+    "float",
+    "boolean",
+    "null",
+    "unknown",
+)
+_TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+_NULL = _TYPE_CODES["null"]
+_ARRAY = _TYPE_CODES["array"]
+_OBJECT = _TYPE_CODES["object"]
+
+
+class IndexedFieldInventory:
+    """One row per field occurrence, stored in columns.
+
+    Only the path strings are Python objects; types and depths live in
+    ``array`` columns, and records are built when the inventory is exported.
     """
-    try:
-        if not response_json or not isinstance(response_json, str):
-            raise ValueError("response_json must be a non-empty string")
-
-        data = json.loads(response_json)
-
-        null_fields: List[str] = []
-        empty_arrays: List[str] = []
-        fields: List[Dict[str, Any]] = []
-        max_depth = 0
-
-        def infer_type(value):
-            if isinstance(value, bool):
-                return "boolean"
-            if isinstance(value, int):
-                return "integer"
-            if isinstance(value, float):
-                return "float"
-            if isinstance(value, str):
-                return "string"
-            if isinstance(value, list):
-                return "array"
-            if isinstance(value, dict):
-                return "object"
-            if value is None:
-                return "null"
-            return "unknown"
-
-        def traverse(obj, parent_path="", depth=1):
-            nonlocal max_depth
-            max_depth = max(max_depth, depth)
-
-            if isinstance(obj, dict):
-                for k, v in obj.items():
-                    path = f"{parent_path}.{k}" if parent_path else k
-
-                    field_info = {
-                        "path": path,
-                        "type": infer_type(v),
-                        "depth": depth,
-                        "nullable": v is None,
-                        "is_array": isinstance(v, list),
-                        "is_object": isinstance(v, dict),
-                    }
-
-                    fields.append(field_info)
-
-                    if v is None:
-                        null_fields.append(path)
-
-                    if isinstance(v, list) and len(v) == 0:
-                        empty_arrays.append(path)
-
-                    traverse(v, path, depth + 1)
-
-            elif isinstance(obj, list):
-                for index, item in enumerate(obj):
-                    traverse(item, f"{parent_path}[{index}]", depth + 1)
-
-        traverse(data)
-
-        payload_size_kb = round(len(response_json.encode("utf-8")) / 1024, 2)
-
-        suggestions = []
-        if null_fields:
-            suggestions.append("Avoid returning null values")
-        if empty_arrays:
-            suggestions.append("Avoid returning empty arrays where possible")
-        if payload_size_kb > 100:
-            suggestions.append("Consider pagination or response compression")
-
-        # Human-readable summary
-        summary_lines = [
-            "API RESPONSE ANALYSIS SUMMARY",
-            "-" * 40,
-            f"• Total Fields: {len(fields)}",
-            f"• Payload Size: {payload_size_kb} KB",
-            f"• Maximum Nesting Depth: {max_depth}",
+
+    def __init__(self):
+        """Initialize the inventory."""
+        self._paths: List[str] = []
+        self._types = array("B")
+        self._depths = array("I")
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self._paths)
+
+    def add(self, path: str, kind: str, depth: int, weight: float = 1.0) -> None:
+        """Record one visited occurrence of a field; ``weight`` is ignored."""
+        self._paths.append(path)
+        self._types.append(_TYPE_CODES[kind])
+        self._depths.append(depth)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Return one field record per row."""
+        return [
+            {
+                "path": path,
+                "type": TYPE_NAMES[code],
+                "depth": depth,
+                "nullable": code == _NULL,
+                "is_array": code == _ARRAY,
+                "is_object": code == _OBJECT,
+            }
+            for path, code, depth in zip(self._paths, self._types, self._depths)
         ]
 
-        summary_lines.append(
-            f"• Null Fields Detected: {', '.join(null_fields) if null_fields else 'None'}"
+    def columns(self) -> Dict[str, List[Any]]:
+        """Return the rows as parallel lists; the flags follow from ``type``."""
+        return {
+            "path": list(self._paths),
+            "type": [TYPE_NAMES[code] for code in self._types],
+            "depth": self._depths.tolist(),
+        }
+
+
+class CollapsedFieldInventory:
+    """Aggregate field occurrences by schema path, one row per path.
+
+    Every element of an array shares one ``[]`` path, so the inventory grows
+    with the number of distinct paths, not with the number of array elements.
+    Observed types are kept as a bit set of type codes. Counts are weighted,
+    so that occurrences below sampled arrays are extrapolated.
+    """
+
+    def __init__(self):
+        """Initialize the inventory."""
+        self._rows: Dict[str, int] = {}
+        self._types = array("H")
+        self._counts = array("d")
+        self._null_counts = array("d")
+        self._min_depths = array("I")
+        self._max_depths = array("I")
+
+    def __len__(self) -> int:
+        """Return the number of distinct paths."""
+        return len(self._rows)
+
+    def add(self, path: str, kind: str, depth: int, weight: float = 1.0) -> None:
+        """Record ``weight`` occurrences of a field."""
+        code = _TYPE_CODES[kind]
+        row = self._rows.get(path)
+        if row is None:
+            self._rows[path] = len(self._rows)
+            self._types.append(1 << code)
+            self._counts.append(weight)
+            self._null_counts.append(weight if code == _NULL else 0.0)
+            self._min_depths.append(depth)
+            self._max_depths.append(depth)
+            return
+        self._types[row] |= 1 << code
+        self._counts[row] += weight
+        if code == _NULL:
+            self._null_counts[row] += weight
+        if depth < self._min_depths[row]:
+            self._min_depths[row] = depth
+        elif depth > self._max_depths[row]:
+            self._max_depths[row] = depth
+
+    def _type_names(self) -> Tuple[List[List[str]], List[str]]:
+        """Return the sorted observed types and the summary type of each row."""
+        observed = []
+        summary = []
+        for bits in self._types:
+            types = sorted(
+                name for code, name in enumerate(TYPE_NAMES) if bits & (1 << code)
+            )
+            non_null = [name for name in types if name != "null"]
+            if len(non_null) == 1:
+                summary.append(non_null[0])
+            else:
+                summary.append("mixed" if non_null else "null")
+            observed.append(types)
+        return observed, summary
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Return one field record per path, in order of first occurrence."""
+        observed, summary = self._type_names()
+        return [
+            {
+                "path": path,
+                "type": summary[row],
+                "types": observed[row],
+                "count": round(self._counts[row]),
+                "null_count": round(self._null_counts[row]),
+                "min_depth": self._min_depths[row],
+                "max_depth": self._max_depths[row],
+                "nullable": self._null_counts[row] > 0,
+                "is_array": bool(self._types[row] & (1 << _ARRAY)),
+                "is_object": bool(self._types[row] & (1 << _OBJECT)),
+            }
+            for path, row in self._rows.items()
+        ]
+
+    def columns(self) -> Dict[str, List[Any]]:
+        """Return the rows as parallel lists; the flags follow from ``types``."""
+        observed, summary = self._type_names()
+        return {
+            "path": list(self._rows),
+            "type": summary,
+            "types": observed,
+            "count": [round(count) for count in self._counts],
+            "null_count": [round(count) for count in self._null_counts],
+            "min_depth": self._min_depths.tolist(),
+            "max_depth": self._max_depths.tolist(),
+        }
+
+
+class FieldInventoryVisitor(ValueVisitor):
+    """Collect the field inventory, null fields, empty arrays and nesting depth.
+
+    In ``collapsed`` path mode fields are aggregated by schema path and each
+    null field or empty array path is listed once; in ``indexed`` mode every
+    field occurrence is listed under its own path. Counts are weighted by
+    the walk's ``weight`` and are estimates when the walk samples arrays.
+    """
+
+    def __init__(self, path_mode: str = "collapsed"):
+        """Initialize the visitor.
+
+        Args:
+            path_mode: ``collapsed`` or ``indexed``
+        """
+        _check_path_mode(path_mode)
+        self.path_mode = path_mode
+        self.null_field_count = 0.0
+        self.empty_array_count = 0.0
+        self.max_depth = 0
+        self._collapsed = path_mode == "collapsed"
+        self.inventory: Any = (
+            CollapsedFieldInventory() if self._collapsed else IndexedFieldInventory()
         )
+        self.field_count = 0.0
+        # Ordered sets in collapsed mode, lists in indexed mode
+        self._null_fields: Any = {} if self._collapsed else []
+        self._empty_arrays: Any = {} if self._collapsed else []
+        # (path, is_object) of each open container
+        self._open: List[Tuple[str, bool]] = []
+
+    @property
+    def fields(self) -> List[Dict[str, Any]]:
+        """Return the field inventory as records."""
+        return self.inventory.records()
+
+    def export_fields(self, field_format: str = "records") -> Any:
+        """Return the field inventory as ``records`` or ``columnar`` lists."""
+        _check_field_format(field_format)
+        if field_format == "columnar":
+            return self.inventory.columns()
+        return self.inventory.records()
+
+    @property
+    def null_fields(self) -> List[str]:
+        """Return the paths of null fields."""
+        return list(self._null_fields)
+
+    @property
+    def empty_arrays(self) -> List[str]:
+        """Return the paths of empty array fields."""
+        return list(self._empty_arrays)
+
+    def enter_value(
+        self, value: Any, kind: str, key: Any, depth: int, weight: float
+    ) -> Any:
+        """Record a field for every object member."""
+        # The root counts as depth 1
+        if depth >= self.max_depth:
+            self.max_depth = depth + 1
+
+        open_containers = self._open
+        is_container = kind in CONTAINER_KINDS
+        if not open_containers:
+            if is_container:
+                open_containers.append(("", kind == "object"))
+            return None
+
+        parent_path, in_object = open_containers[-1]
+        if in_object:
+            path = f"{parent_path}.{key}" if parent_path else str(key)
+        elif not is_container:
+            return None
+        elif self._collapsed:
+            path = f"{parent_path}[]"
+        else:
+            path = f"{parent_path}[{key}]"
+        if is_container:
+            open_containers.append((path, kind == "object"))
+        if not in_object:
+            return None
 
+        self.field_count += weight
+        self.inventory.add(path, kind, depth, weight)
+        if value is None:
+            self.null_field_count += weight
+            self._list_path(self._null_fields, path)
+        elif kind == "array" and not value:
+            self.empty_array_count += weight
+            self._list_path(self._empty_arrays, path)
+        return None
+
+    def leave_value(
+        self, value: Any, kind: str, key: Any, depth: int, weight: float
+    ) -> None:
+        """Close the path of a finished container."""
+        if kind in CONTAINER_KINDS:
+            self._open.pop()
+
+    def _list_path(self, paths: Any, path: str) -> None:
+        if self._collapsed:
+            paths[path] = None
+        else:
+            paths.append(path)
+
+
+class StreamingFieldInventory:
+    """Compute the analysis metrics from JSON parse events in bounded memory.
+
+    Only the paths of open containers are kept. At most ``max_paths`` null
+    field and empty array paths are listed; all of them are counted. In
+    ``collapsed`` path mode array indices are replaced by ``[]`` and each
+    path is listed once.
+    """
+
+    def __init__(
+        self, max_paths: int = MAX_STREAMED_PATHS, path_mode: str = "collapsed"
+    ):
+        """Initialize the inventory.
+
+        Args:
+            max_paths: Maximum null field and empty array paths listed
+            path_mode: ``collapsed`` or ``indexed``
+        """
+        _check_path_mode(path_mode)
+        self.max_paths = max_paths
+        self.path_mode = path_mode
+        self.field_count = 0
+        self.null_field_count = 0
+        self.empty_array_count = 0
+        self.max_depth = 0
+        self._null_fields: Dict[str, None] = {}
+        self._empty_arrays: Dict[str, None] = {}
+
+    @property
+    def null_fields(self) -> List[str]:
+        """Return the listed null field paths."""
+        return list(self._null_fields)
+
+    @property
+    def empty_arrays(self) -> List[str]:
+        """Return the listed empty array paths."""
+        return list(self._empty_arrays)
+
+    def consume(self, events: Iterable[Tuple[str, Any]]) -> None:
+        """Update the metrics from the parse events of one document."""
+        collapsed = self.path_mode == "collapsed"
+        # One [path, next array index or None for objects, is object member]
+        # entry per open container
+        open_containers: List[List[Any]] = []
+        key = None
+        for event, value in events:
+            if event == "map_key":
+                key = value
+                continue
+            if event == "end_map":
+                open_containers.pop()
+                continue
+            if event == "end_array":
+                path, index, is_member = open_containers.pop()
+                if index == 0 and is_member:
+                    self.empty_array_count += 1
+                    self._list_path(self._empty_arrays, path)
+                continue
+
+            # A scalar or the start of a container
+            depth = len(open_containers) + 1
+            if depth > self.max_depth:
+                self.max_depth = depth
+            is_member = False
+            if not open_containers:
+                path = ""
+            else:
+                parent = open_containers[-1]
+                parent_path, index = parent[0], parent[1]
+                if index is None:
+                    is_member = True
+                    path = f"{parent_path}.{key}" if parent_path else key
+                    self.field_count += 1
+                    if event == "value" and value is None:
+                        self.null_field_count += 1
+                        self._list_path(self._null_fields, path)
+                else:
+                    path = (
+                        f"{parent_path}[]" if collapsed else f"{parent_path}[{index}]"
+                    )
+                    parent[1] = index + 1
+
+            if event == "start_map":
+                open_containers.append([path, None, is_member])
+            elif event == "start_array":
+                open_containers.append([path, 0, is_member])
+
+    def _list_path(self, paths: Dict[str, None], path: str) -> None:
+        # Indexed paths are unique, so the dict only deduplicates collapsed ones
+        if len(paths) < self.max_paths:
+            paths[path] = None
+
+
+def analyze_stream(
+    source: Source,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    path_mode: str = "collapsed",
+) -> Dict[str, Any]:
+    """Compute the analysis metrics of a JSON document without loading it.
+
+    Args:
+        source: JSON text, UTF-8 bytes, a file path (``os.PathLike``) or an
+            iterable of text/byte chunks
+        chunk_size: Size of the chunks read from text, bytes and files
+        path_mode: ``collapsed`` or ``indexed`` null field and empty array paths
+
+    Returns:
+        Dict[str, Any]: The metrics, without the per-field inventory
+
+    Raises:
+        json.JSONDecodeError: If the input is not valid JSON
+    """
+    stream = JSONEventStream(iter_chunks(source, chunk_size))
+    inventory = StreamingFieldInventory(path_mode=path_mode)
+    inventory.consume(stream.events())
+    return {
+        "path_mode": path_mode,
+        "field_count": inventory.field_count,
+        "null_fields": inventory.null_fields,
+        "null_field_count": inventory.null_field_count,
+        "empty_arrays": inventory.empty_arrays,
+        "empty_array_count": inventory.empty_array_count,
+        "payload_size_kb": round(stream.bytes_read / 1024, 2),
+        "max_nesting_depth": inventory.max_depth,
+    }
+
+
+def _format_paths(paths: List[str], total: int, collapsed: bool) -> str:
+    if not paths:
+        return "None"
+    listed = ", ".join(paths)
+    if collapsed:
+        if total > len(paths):
+            listed += f" ({total} occurrences)"
+    elif total > len(paths):
+        listed += f" (+{total - len(paths)} more)"
+    return listed
+
+
+def _summarize(metrics: Dict[str, Any]) -> Tuple[List[str], str]:
+    """Return the optimization suggestions and readable summary for metrics."""
+    null_fields = metrics["null_fields"]
+    empty_arrays = metrics["empty_arrays"]
+    payload_size_kb = metrics["payload_size_kb"]
+
+    suggestions = []
+    if null_fields:
+        suggestions.append("Avoid returning null values")
+    if empty_arrays:
+        suggestions.append("Avoid returning empty arrays where possible")
+    if payload_size_kb > 100:
+        suggestions.append(
+            "Consider pagination or response compression; measure_encoding_costs "
+            "compares the size and CPU cost of wire formats and compression levels"
+        )
+
+    # Human-readable summary
+    summary_lines = [
+        "API RESPONSE ANALYSIS SUMMARY",
+        "-" * 40,
+        f"• Total Fields: {metrics['field_count']}",
+        f"• Payload Size: {payload_size_kb} KB",
+        f"• Maximum Nesting Depth: {metrics['max_nesting_depth']}",
+    ]
+
+    collapsed = metrics["path_mode"] == "collapsed"
+    null_paths = _format_paths(null_fields, metrics["null_field_count"], collapsed)
+    summary_lines.append(f"• Null Fields Detected: {null_paths}")
+
+    empty_paths = _format_paths(empty_arrays, metrics["empty_array_count"], collapsed)
+    summary_lines.append(f"• Empty Arrays Detected: {empty_paths}")
+
+    sampling = metrics.get("sampling")
+    if sampling and sampling["estimated"]:
         summary_lines.append(
-            f"• Empty Arrays Detected: {', '.join(empty_arrays) if empty_arrays else 'None'}"
+            f"• Sampled: {sampling['elements_visited']} of "
+            f"{sampling['elements_total']} elements in "
+            f"{sampling['arrays_sampled']} array(s); counts are estimates "
+            f"(±{sampling['margin_of_error']:.1%} at "
+            f"{sampling['confidence_level']:.0%} confidence)"
         )
 
-        if suggestions:
-            summary_lines.append("\nOptimization Suggestions:")
-            for s in suggestions:
-                summary_lines.append(f"  - {s}")
+    if suggestions:
+        summary_lines.append("\nOptimization Suggestions:")
+        for s in suggestions:
+            summary_lines.append(f"  - {s}")
+    else:
+        summary_lines.append("\nNo optimization issues detected.")
+
+    return suggestions, "\n".join(summary_lines)
+
+
+def analyze_api_response(
+    response_json: str = "",
+    streaming: bool = False,
+    file_path: Optional[str] = None,
+    path_mode: str = "collapsed",
+    field_format: str = "records",
+    sample_size: Optional[int] = None,
+    sample_seed: int = 0,
+) -> Dict[str, Any]:
+    """Analyze structure, size, and quality of an API JSON response.
+
+    TOOL_NAME=analyze_api_response
+    DISPLAY_NAME=API Response Analyzer
+    USECASE=Analyze JSON API response structure and generate structured metrics, field inventory, and readable summary; use streaming for very large payloads or files
+    INSTRUCTIONS=1. Provide valid JSON string (or a file_path), 2. Set streaming=true for payloads too large to load, 3. Optionally set path_mode="indexed" to list every array element separately, 4. Optionally set field_format="columnar" for a compact field inventory, 5. Optionally set sample_size to visit at most that many elements of each array, 6. Call function, 7. Receive structured analysis and summary
+    INPUT_DESCRIPTION=response_json (string): JSON API response, streaming (bool): compute metrics incrementally without the per-field inventory, file_path (string, optional): JSON file inside the server's TOOL_FILE_INPUT_DIR to analyze instead of response_json (always streamed), path_mode (string): "collapsed" (default) reports array elements once as items[].id with occurrence and null counts, observed types and min/max depth; "indexed" lists every field occurrence as items[0].id, items[1].id, ..., field_format (string): "records" (default) returns one dict per field, "columnar" returns one list per attribute (path, type, depth or counts) for a much smaller response, sample_size (int, optional): visit a seeded random sample of at most this many elements per array and extrapolate the counts (not in streaming mode), sample_seed (int): seed of the sample for deterministic results
+    OUTPUT_DESCRIPTION=Dictionary containing metrics, field inventory (not in streaming mode), suggestions, and readable summary
+    EXAMPLES=analyze_api_response('{"id":1,"name":"John"}'), analyze_api_response(file_path="dump.json")
+    PREREQUISITES=Valid JSON string or file
+    RELATED_TOOLS=optimize_api_response_schema, generate_api_documentation, compare_api_responses, measure_encoding_costs
+
+    CPU-bound deterministic analysis operation. Streaming mode tokenizes the
+    input incrementally, so memory stays bounded regardless of payload size.
+    Sampling bounds the cost of large homogeneous arrays by the schema size
+    instead of the row count.
+    """
+    try:
+        _check_path_mode(path_mode)
+        _check_field_format(field_format)
+        sampler = make_sampler(sample_size, sample_seed)
+        if sampler is not None and (streaming or file_path):
+            raise ValueError("sample_size is not supported in streaming mode")
+        if file_path:
+            metrics = analyze_stream(resolve_input_path(file_path), path_mode=path_mode)
+            streaming = True
         else:
-            summary_lines.append("\nNo optimization issues detected.")
+            if not response_json or not isinstance(response_json, str):
+                raise ValueError("response_json must be a non-empty string")
+
+            if streaming:
+                metrics = analyze_stream(response_json, path_mode=path_mode)
+            else:
+                data = load_json(response_json)
 
-        readable_summary = "\n".join(summary_lines)
+                inventory = FieldInventoryVisitor(path_mode)
+                walk(data, inventory, sampler=sampler)
+                metrics = {
+                    "path_mode": path_mode,
+                    "field_count": round(inventory.field_count),
+                    "null_fields": inventory.null_fields,
+                    "null_field_count": round(inventory.null_field_count),
+                    "empty_arrays": inventory.empty_arrays,
+                    "empty_array_count": round(inventory.empty_array_count),
+                    "payload_size_kb": round(
+                        len(response_json.encode("utf-8")) / 1024, 2
+                    ),
+                    "max_nesting_depth": inventory.max_depth,
+                    "fields": inventory.export_fields(field_format),
+                }
+                if sampler is not None:
+                    metrics["sampling"] = sampler.stats()
 
-        logger.info("API response analyzed successfully with full field inventory")
+        suggestions, readable_summary = _summarize(metrics)
+
+        if streaming:
+            logger.info("API response analyzed successfully in streaming mode")
+        else:
+            logger.info("API response analyzed successfully with full field inventory")
 
         return {
             "status": "success",
             "operation": "api_response_analysis",
-            "metrics": {
-                "field_count": len(fields),
-                "null_fields": null_fields,
-                "empty_arrays": empty_arrays,
-                "payload_size_kb": payload_size_kb,
-                "max_nesting_depth": max_depth,
-                "fields": fields,
-            },
+            "metrics": metrics,
             "suggestions": suggestions,
             "readable_summary": readable_summary,
             "message": "API response analyzed successfully",
@@ -149,4 +582,4 @@ def analyze_api_response(
             "status": "error",
             "error": str(e),
             "message": "Failed to analyze API response",
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,120 @@
+"""Registry of named schema baselines for compare_with_baseline.
+
+A baseline is the flattened schema (path -> type name, as produced by
+``extract_schema``) and the structural fingerprint of a reference response.
+Baselines are stored in PostgreSQL through ``StorageService`` when storage
+is initialized, and in process memory otherwise (lost on restart).
+Lookups go through an LRU cache; entries read from storage expire after
+``TOOL_BASELINE_CACHE_TTL_SECONDS`` so that updates made by other replicas
+are picked up.
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+from api_intelligence_mcp.src.settings import settings
+from api_intelligence_mcp.src.storage.storage_service import StorageService
+from api_intelligence_mcp.utils.lru_cache import LRUCache
+from api_intelligence_mcp.utils.pylogger import get_python_logger
+
+logger = get_python_logger()
+
+
+class BaselineRegistry:
+    """Save and look up schema baselines by ID."""
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl: Optional[float] = None,
+        storage: Optional[StorageService] = None,
+    ):
+        """Initialize the registry.
+
+        Args:
+            max_entries: Maximum baselines kept in the lookup cache
+            ttl: Seconds a cached baseline from storage stays valid, never
+                expiring when None
+            storage: Storage service to use; the application's storage
+                service is used when None and initialized
+        """
+        self.ttl = ttl
+        self._storage = storage
+        self._cache = LRUCache(max_entries=max_entries)
+        self._memory: Dict[str, Dict[str, Any]] = {}
+
+    async def _get_storage(self) -> Optional[StorageService]:
+        """Return the storage service, or None to keep baselines in memory."""
+        if self._storage is not None:
+            return self._storage
+        # Imported lazily like in api.py; the tools do not require OAuth setup
+        from api_intelligence_mcp.src.oauth.service import get_storage_service
+
+        try:
+            return await get_storage_service()
+        except RuntimeError:
+            return None
+
+    async def save(
+        self, baseline_id: str, schema: Dict[str, str], fingerprint: str
+    ) -> Dict[str, Any]:
+        """Save a baseline, replacing any baseline with the same ID.
+
+        Raises:
+            RuntimeError: If storage is configured and the write fails
+        """
+        baseline = {
+            "baseline_id": baseline_id,
+            "schema": schema,
+            "fingerprint": fingerprint,
+            "updated_at": time.time(),
+        }
+        storage = await self._get_storage()
+        if storage is not None:
+            if not await storage.store_schema_baseline(baseline_id, baseline):
+                raise RuntimeError(f"Failed to store schema baseline: {baseline_id}")
+            self._cache.set(baseline_id, baseline, ttl=self.ttl)
+        else:
+            self._memory[baseline_id] = baseline
+            self._cache.set(baseline_id, baseline)
+        logger.info(f"Saved schema baseline {baseline_id}")
+        return baseline
+
+    async def get(self, baseline_id: str) -> Optional[Dict[str, Any]]:
+        """Return a baseline, or None if no baseline has this ID."""
+        baseline = self._cache.get(baseline_id)
+        if baseline is not None:
+            return baseline
+        storage = await self._get_storage()
+        if storage is not None:
+            baseline = await storage.get_schema_baseline(baseline_id)
+            if baseline is not None:
+                self._cache.set(baseline_id, baseline, ttl=self.ttl)
+        else:
+            baseline = self._memory.get(baseline_id)
+            if baseline is not None:
+                self._cache.set(baseline_id, baseline)
+        return baseline
+
+    async def delete(self, baseline_id: str) -> bool:
+        """Delete a baseline; return False if no baseline has this ID."""
+        self._cache.pop(baseline_id)
+        storage = await self._get_storage()
+        if storage is not None:
+            return await storage.delete_schema_baseline(baseline_id)
+        return self._memory.pop(baseline_id, None) is not None
+
+    def clear(self) -> None:
+        """Drop the cached and in-memory baselines."""
+        self._cache.clear()
+        self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit rate and occupancy of the lookup cache."""
+        return {"memory_baselines": len(self._memory), **self._cache.stats()}
+
+
+baseline_registry = BaselineRegistry(
+    max_entries=settings.TOOL_BASELINE_CACHE_MAX_ENTRIES,
+    ttl=settings.TOOL_BASELINE_CACHE_TTL_SECONDS or None,
+)
@@ -1,73 +1,298 @@
 """API response comparison tool for the Template MCP Server."""
 
 import json
-from typing import Any, Dict, Set
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from api_intelligence_mcp.src.tools.schema_merge import (
+    MergedSchemaVisitor,
+    SchemaMerger,
+    flatten_schema,
+)
+from api_intelligence_mcp.src.tools.structural_hash import (
+    MerkleIndex,
+    diff_values,
+    load_indexed,
+)
+from api_intelligence_mcp.src.tools.traversal import kind_of, walk
 from api_intelligence_mcp.utils.pylogger import get_python_logger
 
 logger = get_python_logger()
 
+# Python type names reported for the JSON kinds
+_TYPE_NAMES = {
+    "object": "dict",
+    "array": "list",
+    "string": "str",
+    "integer": "int",
+    "float": "float",
+    "boolean": "bool",
+    "null": "NoneType",
+    "unknown": "object",
+}
+
+
+def _type_names(kinds: Iterable[str]) -> str:
+    return "|".join(sorted(_TYPE_NAMES[kind] for kind in kinds))
+
+
+def _array_schema(array: List[Any]) -> Dict[str, str]:
+    """Flatten the merged element schema of a non-empty array to ``[]`` paths."""
+    visitor = MergedSchemaVisitor()
+    walk(array, visitor)
+    return {
+        path: _type_names(kinds)
+        for path, kinds in flatten_schema(visitor.schema).items()
+    }
+
+
+def extract_schema(data: Any) -> Dict[str, str]:
+    """Map the path of every leaf value to its Python type name.
+
+    Objects are flattened in one iterative pass into a single dict. Array
+    elements are merged into one element schema and reported under ``[]``
+    paths (``items[].id``); empty arrays are ``list`` leaves. Positions
+    holding several types report them joined with ``|``.
+    """
+    schema: Dict[str, str] = {}
+    if type(data) is not dict:
+        containers = [("", iter([("", data)]))]
+    else:
+        containers = [("", iter(data.items()))]
+    while containers:
+        prefix, members = containers[-1]
+        for key, value in members:
+            path = f"{prefix}{key}"
+            value_type = type(value)
+            if value_type is dict:
+                containers.append((f"{path}.", iter(value.items())))
+                break
+            if value_type is list and value:
+                for suffix, type_name in _array_schema(value).items():
+                    schema[path + suffix] = type_name
+            else:
+                schema[path] = _TYPE_NAMES[kind_of(value)]
+        else:
+            containers.pop()
+    return schema
+
+
+def _subtree_schema(
+    path: str,
+    member_prefix: str,
+    value: Any,
+    index: MerkleIndex,
+    merger: SchemaMerger,
+) -> Dict[str, str]:
+    """Flatten a subtree from its interned shape, with paths below ``path``.
+
+    Equivalent to ``extract_schema(value)`` with the paths of the subtree's
+    members prefixed by ``member_prefix``, but built from the shapes of the
+    Merkle index, so the cost depends on the number of distinct shapes
+    rather than on the number of values.
+    """
+    shape = merger.schema(index.shape_id(value))
+    return {
+        leaf: _type_names(kinds)
+        for leaf, kinds in flatten_schema(shape, path, member_prefix).items()
+    }
+
+
+def diff_schemas(
+    old: Any, new: Any, old_index: MerkleIndex, new_index: MerkleIndex
+) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, Tuple[str, str]]]:
+    """Return the added, removed and type-changed paths between two documents.
+
+    Gives the same result as diffing ``extract_schema`` of both documents,
+    but subtrees with equal structural digests are skipped and only the
+    differing parts are flattened.
+
+    Returns:
+        Added paths and removed paths mapped to their type names, and changed
+        paths mapped to their (old, new) type names
+    """
+    old_merger = SchemaMerger(old_index.registry)
+    new_merger = SchemaMerger(new_index.registry)
+    added: Dict[str, str] = {}
+    removed: Dict[str, str] = {}
+    changed: Dict[str, Tuple[str, str]] = {}
+    # Members of the root are written ``key``, those of any other object
+    # ``path.key``, as in ``extract_schema``
+    stack = [("", "", old, new)]
+    while stack:
+        path, prefix, a, b = stack.pop()
+        if old_index.shape_digest(a) == new_index.shape_digest(b):
+            continue
+        if type(a) is dict and type(b) is dict:
+            for key, value in a.items():
+                child = f"{prefix}{key}"
+                if key in b:
+                    stack.append((child, f"{child}.", value, b[key]))
+                else:
+                    removed.update(
+                        _subtree_schema(
+                            child, f"{child}.", value, old_index, old_merger
+                        )
+                    )
+            for key, value in b.items():
+                if key not in a:
+                    child = f"{prefix}{key}"
+                    added.update(
+                        _subtree_schema(
+                            child, f"{child}.", value, new_index, new_merger
+                        )
+                    )
+            continue
+        # Arrays merge their elements, so differing arrays and mismatched
+        # kinds are flattened and compared as a whole
+        diff_flat_schemas(
+            _subtree_schema(path, prefix, a, old_index, old_merger),
+            _subtree_schema(path, prefix, b, new_index, new_merger),
+            added,
+            removed,
+            changed,
+        )
+    return added, removed, changed
+
+
+def diff_flat_schemas(
+    old_schema: Dict[str, str],
+    new_schema: Dict[str, str],
+    added: Dict[str, str],
+    removed: Dict[str, str],
+    changed: Dict[str, Tuple[str, str]],
+) -> None:
+    """Collect the differences between two flattened schemas.
+
+    Added and removed paths are stored with their type names, changed paths
+    with their (old, new) type names.
+    """
+    for field, type_name in old_schema.items():
+        new_type = new_schema.get(field)
+        if new_type is None:
+            removed[field] = type_name
+        elif new_type != type_name:
+            changed[field] = (type_name, new_type)
+    for field, type_name in new_schema.items():
+        if field not in old_schema:
+            added[field] = type_name
+
+
+def indexed_schema(data: Any, index: MerkleIndex) -> Dict[str, str]:
+    """Return ``extract_schema(data)`` built from the shapes of its Merkle index."""
+    return _subtree_schema("", "", data, index, SchemaMerger(index.registry))
+
+
+def schema_and_fingerprint(response: str) -> Tuple[Dict[str, str], str]:
+    """Return the flattened schema and structural fingerprint of a response."""
+    data, index = load_indexed(response)
+    return indexed_schema(data, index), index.fingerprint
+
+
+def format_type_changes(changed: Dict[str, Tuple[str, str]]) -> List[str]:
+    """Format changed paths as ``path: old -> new``."""
+    return [
+        f"{field}: {old_type} -> {new_type}"
+        for field, (old_type, new_type) in changed.items()
+    ]
+
+
+def _minified_size(value: Any) -> Optional[int]:
+    """Return the UTF-8 size of a value as minified JSON, or None if too deep."""
+    try:
+        text = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+    except RecursionError:
+        return None
+    return len(text.encode("utf-8"))
+
+
+def _patch_size(
+    patch: List[Dict[str, Any]], new_data: Any, new_response: str
+) -> Dict[str, Any]:
+    """Compare the size of a JSON Patch with the full new response, both minified."""
+    patch_bytes = _minified_size(patch)
+    full_bytes = _minified_size(new_data)
+    if full_bytes is None:
+        full_bytes = len(new_response.encode("utf-8"))
+    if patch_bytes is None or not full_bytes:
+        ratio = bytes_saved = None
+    else:
+        ratio = round(patch_bytes / full_bytes, 4)
+        bytes_saved = full_bytes - patch_bytes
+    return {
+        "operations": len(patch),
+        "patch_bytes": patch_bytes,
+        "full_bytes": full_bytes,
+        "ratio": ratio,
+        "bytes_saved": bytes_saved,
+    }
+
 
 def compare_api_responses(
     old_response: str,
     new_response: str,
+    compare_values: bool = True,
+    array_key: Optional[str] = None,
+    include_patch: bool = False,
 ) -> Dict[str, Any]:
     """Compare two API JSON responses for structural differences.
 
     TOOL_NAME=compare_api_responses
     DISPLAY_NAME=API Response Comparator
-    USECASE=Detect added, removed, and type-changed fields between API versions
-    INSTRUCTIONS=1. Provide old and new JSON strings, 2. Call function, 3. Receive comparison result
-    INPUT_DESCRIPTION=old_response (string), new_response (string)
-    OUTPUT_DESCRIPTION=Dictionary listing structural differences and breaking change detection
+    USECASE=Detect added, removed, and type-changed fields between API versions, including fields of array elements (items[].id), and the values that changed
+    INSTRUCTIONS=1. Provide old and new JSON strings, 2. Optionally set compare_values=False to report structural differences only, 3. Optionally name the identity key of array elements (array_key, detected from id/_id/uuid/key by default), 4. Optionally set include_patch=True for an RFC 6902 JSON Patch from old to new, 5. Call function, 6. Receive comparison result
+    INPUT_DESCRIPTION=old_response (string), new_response (string), compare_values (bool, default True), array_key (string, optional), include_patch (bool, default False)
+    OUTPUT_DESCRIPTION=Dictionary listing structural differences, value changes (replace/add/remove/move operations on paths), how arrays were aligned, breaking change detection and optionally a JSON Patch with its size against the full new response
     EXAMPLES=compare_api_responses('{"id":1}', '{"id":1,"name":"John"}')
     PREREQUISITES=Both inputs must be valid JSON strings
     RELATED_TOOLS=analyze_api_response
 
-    CPU-bound structural comparison.
+    CPU-bound structural comparison. Both documents are hashed per subtree
+    (cached with the parsed payload), and identical subtrees are skipped, so
+    near-identical responses cost time proportional to what changed. Array
+    elements are aligned by identity key or by element hashes, so inserted
+    and reordered rows are reported as such.
     """
     try:
-        old_data = json.loads(old_response)
-        new_data = json.loads(new_response)
-
-        def extract_schema(obj, parent="") -> Dict[str, str]:
-            schema = {}
-            if isinstance(obj, dict):
-                for k, v in obj.items():
-                    path = f"{parent}.{k}" if parent else k
-                    schema.update(extract_schema(v, path))
-            else:
-                schema[parent] = type(obj).__name__
-            return schema
-
-        old_schema = extract_schema(old_data)
-        new_schema = extract_schema(new_data)
+        old_data, old_index = load_indexed(old_response)
+        new_data, new_index = load_indexed(new_response)
 
-        old_fields: Set[str] = set(old_schema.keys())
-        new_fields: Set[str] = set(new_schema.keys())
+        added, removed, changed = diff_schemas(old_data, new_data, old_index, new_index)
 
-        added_fields = list(new_fields - old_fields)
-        removed_fields = list(old_fields - new_fields)
-
-        type_changes = []
-        for field in old_fields & new_fields:
-            if old_schema[field] != new_schema[field]:
-                type_changes.append(
-                    f"{field}: {old_schema[field]} -> {new_schema[field]}"
-                )
+        added_fields = list(added)
+        removed_fields = list(removed)
+        type_changes = format_type_changes(changed)
 
         breaking_changes = bool(removed_fields or type_changes)
 
-        logger.info("API responses compared successfully")
-
-        return {
+        result = {
             "status": "success",
+            "identical": old_index.digest == new_index.digest,
             "added_fields": added_fields,
             "removed_fields": removed_fields,
             "type_changes": type_changes,
             "breaking_changes_detected": breaking_changes,
-            "message": "API comparison completed successfully",
         }
+        if compare_values or include_patch:
+            values = diff_values(
+                old_data,
+                new_data,
+                old_index,
+                new_index,
+                array_key=array_key,
+                build_patch=include_patch,
+            )
+            if compare_values:
+                result["value_changes"] = values.changes
+                result["value_change_count"] = values.change_count
+                result["array_alignment"] = values.alignments
+            if include_patch:
+                result["patch"] = values.patch
+                result["patch_size"] = _patch_size(values.patch, new_data, new_response)
+
+        logger.info("API responses compared successfully")
+
+        result["message"] = "API comparison completed successfully"
+        return result
 
     except Exception as e:
         logger.error(f"Error comparing API responses: {e}")
@@ -75,4 +300,4 @@ def compare_api_responses(
             "status": "error",
             "error": str(e),
             "message": "Failed to compare API responses",
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,166 @@
+"""N-way API version comparison tool for the Template MCP Server."""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from api_intelligence_mcp.src.tools.compare_api_responses import (
+    diff_flat_schemas,
+    format_type_changes,
+    schema_and_fingerprint,
+)
+from api_intelligence_mcp.utils.pylogger import get_python_logger
+
+logger = get_python_logger()
+
+PAIR_MODES = ("consecutive", "all")
+
+Flattened = Tuple[Dict[str, str], str]
+SchemaDiff = Tuple[Dict[str, str], Dict[str, str], Dict[str, Tuple[str, str]]]
+
+
+def flatten_versions(responses: Sequence[str]) -> List[Flattened]:
+    """Parse and flatten every distinct response exactly once.
+
+    Args:
+        responses: The JSON responses, oldest first
+
+    Returns:
+        The flattened schema and structural fingerprint of each response
+    """
+    distinct = list(dict.fromkeys(responses))
+    flattened = [schema_and_fingerprint(response) for response in distinct]
+    by_response = dict(zip(distinct, flattened))
+    return [by_response[response] for response in responses]
+
+
+def _diff(old: Flattened, new: Flattened) -> SchemaDiff:
+    added: Dict[str, str] = {}
+    removed: Dict[str, str] = {}
+    changed: Dict[str, Tuple[str, str]] = {}
+    if old[1] != new[1]:
+        diff_flat_schemas(old[0], new[0], added, removed, changed)
+    return added, removed, changed
+
+
+def field_timeline(
+    labels: Sequence[str],
+    flattened: Sequence[Flattened],
+    diffs: Dict[Tuple[int, int], SchemaDiff],
+) -> Dict[str, List[Dict[str, str]]]:
+    """Return the events of every field over consecutive versions.
+
+    A field gets an ``added`` event in the first version holding it, then
+    ``type_changed`` and ``removed`` events (and ``added`` again if it
+    returns) in the versions where those happen.
+    """
+    timeline: Dict[str, List[Dict[str, str]]] = {
+        field: [{"version": labels[0], "change": "added", "type": type_name}]
+        for field, type_name in flattened[0][0].items()
+    }
+    for position in range(1, len(labels)):
+        version = labels[position]
+        added, removed, changed = diffs[position - 1, position]
+        for field, type_name in added.items():
+            timeline.setdefault(field, []).append(
+                {"version": version, "change": "added", "type": type_name}
+            )
+        for field, (old_type, new_type) in changed.items():
+            timeline[field].append(
+                {
+                    "version": version,
+                    "change": "type_changed",
+                    "from": old_type,
+                    "to": new_type,
+                }
+            )
+        for field, type_name in removed.items():
+            timeline[field].append(
+                {"version": version, "change": "removed", "type": type_name}
+            )
+    return timeline
+
+
+def compare_api_versions(
+    responses: List[str],
+    labels: Optional[List[str]] = None,
+    pairs: str = "consecutive",
+) -> Dict[str, Any]:
+    """Compare the schemas of several versions of an API response in one call.
+
+    TOOL_NAME=compare_api_versions
+    DISPLAY_NAME=API Version Comparator
+    USECASE=Track added, removed and type-changed fields across many versions of an endpoint, and see in which version each field appeared, changed or vanished
+    INSTRUCTIONS=1. Provide the JSON responses oldest first, 2. Optionally name the versions (labels, default v1..vN), 3. Optionally set pairs="all" to compare every pair instead of consecutive versions, 4. Call function, 5. Receive comparison matrix and field timeline
+    INPUT_DESCRIPTION=responses (list of strings, at least 2), labels (list of strings, optional), pairs ("consecutive" or "all", default "consecutive")
+    OUTPUT_DESCRIPTION=Dictionary with the fingerprint of each version, the structural differences of each compared pair, a matrix of change counts and a per-field timeline
+    EXAMPLES=compare_api_versions(['{"id":1}', '{"id":1,"name":"John"}', '{"id":"1","name":"John"}'])
+    PREREQUISITES=All inputs must be valid JSON strings
+    RELATED_TOOLS=compare_api_responses, compare_with_baseline
+
+    CPU-bound. Each distinct response is parsed and flattened once however
+    many pairs it takes part in, and pairs with equal structural fingerprints
+    are not diffed.
+    """
+    try:
+        if len(responses) < 2:
+            raise ValueError("At least two responses are required")
+        if pairs not in PAIR_MODES:
+            raise ValueError(
+                f"pairs must be one of {', '.join(PAIR_MODES)}, got: {pairs}"
+            )
+        if labels is None:
+            labels = [f"v{position}" for position in range(1, len(responses) + 1)]
+        elif len(labels) != len(responses):
+            raise ValueError("labels must name every response")
+        elif len(set(labels)) != len(labels):
+            raise ValueError("labels must be unique")
+
+        flattened = flatten_versions(responses)
+        count = len(flattened)
+
+        compared = [(i, i + 1) for i in range(count - 1)]
+        if pairs == "all":
+            compared = [(i, j) for i in range(count) for j in range(i + 1, count)]
+        diffs = {
+            pair: _diff(flattened[pair[0]], flattened[pair[1]]) for pair in compared
+        }
+
+        matrix: List[List[Optional[int]]] = [
+            [0 if i == j else None for j in range(count)] for i in range(count)
+        ]
+        comparisons = []
+        for (i, j), (added, removed, changed) in diffs.items():
+            type_changes = format_type_changes(changed)
+            matrix[i][j] = len(added) + len(removed) + len(changed)
+            comparisons.append(
+                {
+                    "from": labels[i],
+                    "to": labels[j],
+                    "fingerprint_matches": flattened[i][1] == flattened[j][1],
+                    "added_fields": list(added),
+                    "removed_fields": list(removed),
+                    "type_changes": type_changes,
+                    "breaking_changes_detected": bool(removed or type_changes),
+                }
+            )
+
+        logger.info(f"Compared {count} API versions ({len(comparisons)} pairs)")
+
+        return {
+            "status": "success",
+            "versions": [
+                {"label": label, "fingerprint": fingerprint, "field_count": len(schema)}
+                for label, (schema, fingerprint) in zip(labels, flattened)
+            ],
+            "comparisons": comparisons,
+            "change_matrix": matrix,
+            "field_timeline": field_timeline(labels, flattened, diffs),
+            "message": "API version comparison completed successfully",
+        }
+
+    except Exception as e:
+        logger.error(f"Error comparing API versions: {e}")
+        return {
+            "status": "error",
+            "error": str(e),
+            "message": "Failed to compare API versions",
+        }
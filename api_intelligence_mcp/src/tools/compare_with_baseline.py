@@ -0,0 +1,88 @@
+"""Baseline comparison tool for the Template MCP Server."""
+
+import asyncio
+from typing import Any, Dict, Tuple
+
+from api_intelligence_mcp.src.tools.baseline_registry import baseline_registry
+from api_intelligence_mcp.src.tools.compare_api_responses import (
+    diff_flat_schemas,
+    format_type_changes,
+    indexed_schema,
+)
+from api_intelligence_mcp.src.tools.structural_hash import load_indexed
+from api_intelligence_mcp.utils.pylogger import get_python_logger
+
+logger = get_python_logger()
+
+
+def diff_against_baseline(
+    response: str, baseline: Dict[str, Any]
+) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, Tuple[str, str]], bool]:
+    """Diff the schema of a response against a baseline.
+
+    Returns:
+        Added, removed and changed paths as from ``diff_schemas``, and whether
+        the structural fingerprints match (then nothing is flattened)
+    """
+    data, index = load_indexed(response)
+    added: Dict[str, str] = {}
+    removed: Dict[str, str] = {}
+    changed: Dict[str, Tuple[str, str]] = {}
+    matches = index.fingerprint == baseline["fingerprint"]
+    if not matches:
+        diff_flat_schemas(
+            baseline["schema"], indexed_schema(data, index), added, removed, changed
+        )
+    return added, removed, changed, matches
+
+
+async def compare_with_baseline(
+    baseline_id: str,
+    new_response: str,
+) -> Dict[str, Any]:
+    """Compare an API response with a saved schema baseline.
+
+    TOOL_NAME=compare_with_baseline
+    DISPLAY_NAME=API Schema Baseline Comparator
+    USECASE=Check a new deployment's response for added, removed and type-changed fields against a saved baseline without resending the old response
+    INSTRUCTIONS=1. Save a baseline with save_schema_baseline, 2. Provide its ID and the new JSON string, 3. Call function, 4. Receive comparison result
+    INPUT_DESCRIPTION=baseline_id (string), new_response (string)
+    OUTPUT_DESCRIPTION=Dictionary listing structural differences from the baseline and breaking change detection
+    EXAMPLES=compare_with_baseline('users-v1', '{"id":1,"name":"John","email":"j@x.io"}')
+    PREREQUISITES=A baseline saved under baseline_id, valid JSON string
+    RELATED_TOOLS=save_schema_baseline, compare_api_responses
+
+    Baselines hold schemas only, so value changes are not reported. A
+    response with the baseline's fingerprint is reported unchanged without
+    being flattened.
+    """
+    try:
+        baseline = await baseline_registry.get(baseline_id)
+        if baseline is None:
+            raise ValueError(f"Unknown baseline_id: {baseline_id}")
+
+        added, removed, changed, matches = await asyncio.to_thread(
+            diff_against_baseline, new_response, baseline
+        )
+        type_changes = format_type_changes(changed)
+
+        logger.info(f"API response compared with baseline {baseline_id}")
+
+        return {
+            "status": "success",
+            "baseline_id": baseline_id,
+            "fingerprint_matches": matches,
+            "added_fields": list(added),
+            "removed_fields": list(removed),
+            "type_changes": type_changes,
+            "breaking_changes_detected": bool(removed or type_changes),
+            "message": "Baseline comparison completed successfully",
+        }
+
+    except Exception as e:
+        logger.error(f"Error comparing with schema baseline: {e}")
+        return {
+            "status": "error",
+            "error": str(e),
+            "message": "Failed to compare with schema baseline",
+        }
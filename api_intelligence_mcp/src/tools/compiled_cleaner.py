@@ -0,0 +1,529 @@
+"""Cleaning functions of ``optimize_api_response_schema`` specialized per shape.
+
+Payloads of one endpoint share their shape: the same keys, in the same
+order, at the same places. For such payloads the generic ``CleanVisitor``
+walk spends most of its time on dispatch that a shape-specific function
+does not need, so the optimizer compiles one:
+
+- ``shape_sketch`` fingerprints a payload cheaply from the keys of its first
+  ``SKETCH_CONTAINERS`` containers; it selects the cached cleaner.
+- ``learn_shape`` merges the full shape of a payload: the keys of every
+  object position (all objects at a position must share them, in order)
+  and the element shape of every array position.
+- ``CompiledCleaner`` generates Python source for that shape, one function
+  per object and array position, with the member keys, their encoded sizes,
+  their schema path ids and the drop tests of the passes resolved at
+  compile time.
+
+Compiled cleaners check the shape as they go and raise ``ShapeMismatch`` on
+a payload they do not fit, in which case the caller falls back to the
+generic walk. They produce the same result, sizes and savings as
+``CleanVisitor``. Passes acting on whole subtrees (empty objects, tables,
+dedupe) are not compiled.
+"""
+
+import threading
+from json.encoder import encode_basestring_ascii
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from api_intelligence_mcp.src.settings import settings
+from api_intelligence_mcp.src.tools.json_stream import encode_scalar
+from api_intelligence_mcp.src.tools.optimization_passes import (
+    OptimizationPass,
+    PassSavings,
+    scalar_hooks,
+)
+from api_intelligence_mcp.src.tools.traversal import PathTable
+from api_intelligence_mcp.utils.lru_cache import LRUCache
+from api_intelligence_mcp.utils.pylogger import get_python_logger
+
+logger = get_python_logger()
+
+# Containers whose keys make up the shape sketch
+SKETCH_CONTAINERS = 32
+
+# Limits of the shapes compiled, beyond which the generic walk is used
+MAX_COMPILED_DEPTH = 64
+MAX_COMPILED_MEMBERS = 4096
+
+# Payloads of a sketch seen before a cleaner is compiled for it
+COMPILE_AFTER = 2
+
+
+class ShapeMismatch(Exception):
+    """Raised by a compiled cleaner on a payload of another shape."""
+
+
+class UnsupportedShape(Exception):
+    """Raised when a shape cannot be compiled."""
+
+
+class Shape:
+    """Merged shape of one position of a document.
+
+    ``kind`` is None where only scalars and empty containers were seen,
+    otherwise ``"object"`` with the shared ``keys`` and the shape of each
+    member, or ``"array"`` with the shape of the elements.
+    """
+
+    __slots__ = ("kind", "keys", "members", "elements")
+
+    def __init__(self):
+        """Initialize a position holding only scalars so far."""
+        self.kind: Optional[str] = None
+        self.keys: Tuple[str, ...] = ()
+        self.members: Dict[str, "Shape"] = {}
+        self.elements: Optional["Shape"] = None
+
+
+def shape_sketch(data: Any) -> Tuple:
+    """Return the keys of the first containers of a document, breadth first.
+
+    Arrays contribute whether they are empty, and only their first element
+    is visited, so the cost is bounded whatever the payload size.
+    """
+    sketch: List[Any] = []
+    queue = [data]
+    position = 0
+    while position < len(queue) and position < SKETCH_CONTAINERS:
+        value = queue[position]
+        position += 1
+        if type(value) is dict:
+            sketch.append(tuple(value))
+            queue.extend(
+                member
+                for member in value.values()
+                if type(member) is dict or type(member) is list
+            )
+        elif type(value) is list:
+            sketch.append(bool(value))
+            if value and (type(value[0]) is dict or type(value[0]) is list):
+                queue.append(value[0])
+        else:
+            sketch.append(None)
+    return tuple(sketch)
+
+
+def learn_shape(data: Any, shape: Optional[Shape] = None) -> Shape:
+    """Merge the shape of a document into ``shape``, or into a new one.
+
+    Raises:
+        UnsupportedShape: If objects at one position differ in their keys,
+            a position holds both objects and arrays, or the shape exceeds
+            the compile limits
+    """
+    root = shape or Shape()
+    stack: List[Tuple[Any, Shape, int]] = [(data, root, 0)]
+    while stack:
+        value, shape, depth = stack.pop()
+        if depth > MAX_COMPILED_DEPTH:
+            raise UnsupportedShape(f"Nesting deeper than {MAX_COMPILED_DEPTH}")
+        if type(value) is dict:
+            if not value:
+                continue
+            keys = tuple(value)
+            if shape.kind is None:
+                shape.kind = "object"
+                shape.keys = keys
+                shape.members = {key: Shape() for key in keys}
+            elif shape.kind != "object" or shape.keys != keys:
+                raise UnsupportedShape("Objects differ in their keys")
+            members = shape.members
+            for key, member in value.items():
+                if (type(member) is dict or type(member) is list) and member:
+                    stack.append((member, members[key], depth + 1))
+        elif type(value) is list:
+            if not value:
+                continue
+            if shape.kind is None:
+                shape.kind = "array"
+                shape.elements = Shape()
+            elif shape.kind != "array":
+                raise UnsupportedShape("Objects and arrays at one position")
+            elements = shape.elements
+            for element in value:
+                if (type(element) is dict or type(element) is list) and element:
+                    stack.append((element, elements, depth + 1))
+    return root
+
+
+class _Generator:
+    """Generate the source of the cleaning functions of one shape."""
+
+    def __init__(self, passes: Sequence[OptimizationPass], paths: PathTable):
+        self.paths = paths
+        self.namespace: Dict[str, Any] = {
+            "_enc": encode_scalar,
+            "_Mismatch": ShapeMismatch,
+        }
+        self.functions: List[List[str]] = []
+        self._members = 0
+        drops, rewrites = scalar_hooks(passes)
+        self.drops = [
+            (drop_pass, self._constant(f"_drop{index}", drop_pass.drops))
+            for index, drop_pass in enumerate(drops)
+        ]
+        self.rewrites = [
+            (
+                rewrite_pass.name,
+                self._constant(f"_rewrite{index}", rewrite_pass.rewrite),
+            )
+            for index, rewrite_pass in enumerate(rewrites)
+        ]
+        self.drop_empty_arrays = any(p.drops_empty_arrays for p in passes)
+        compact = any(p.compact for p in passes)
+        self.compact = compact
+        self.key_separator = 1 if compact else 2
+        self.item_separator = 1 if compact else 2
+
+    def _constant(self, name: str, value: Any) -> str:
+        self.namespace[name] = value
+        return name
+
+    def function(self, shape: Shape, path: int) -> str:
+        """Generate the function cleaning a container position; return its name."""
+        name = f"_clean{len(self.functions)}"
+        lines: List[str] = []
+        self.functions.append(lines)
+        if shape.kind == "object":
+            self._object(name, shape, path, lines)
+        else:
+            self._array(name, shape, path, lines)
+        return name
+
+    def _object(self, name: str, shape: Shape, path: int, lines: List[str]) -> None:
+        self._members += len(shape.keys)
+        if self._members > MAX_COMPILED_MEMBERS:
+            raise UnsupportedShape(f"More than {MAX_COMPILED_MEMBERS} members")
+        keys = self._constant(f"_keys{name[6:]}", shape.keys)
+        lines += [
+            f"def {name}(d, s):",
+            f"    if tuple(d) != {keys}:",
+            "        raise _Mismatch",
+            "    out = {}",
+            "    size = 0",
+            "    last = None",
+        ]
+        for key in shape.keys:
+            key_literal = repr(key)
+            member_path = self.paths.child(path, key)
+            key_size = len(encode_basestring_ascii(key))
+            lines.append(f"    v = d[{key_literal}]")
+            body = self.statements(
+                shape.members[key],
+                member_path,
+                f"out[{key_literal}] = ",
+                key_size + self.key_separator,
+                (key_literal, key, key_size),
+            )
+            lines += ["    " + line for line in body]
+        lines.append("    m = len(out)")
+        lines.append("    if m:")
+        if self.compact:
+            lines.append(f"        s.add('minify', {path}, 2 * m - 1)")
+        lines.append(
+            f"        return out, size + {self.item_separator} * m + "
+            f"{2 - self.item_separator}"
+        )
+        lines += [
+            "    if last is not None:",
+            "        s.entries[last][1] -= 2",
+            "    return out, 2",
+        ]
+
+    def _array(self, name: str, shape: Shape, path: int, lines: List[str]) -> None:
+        lines += [
+            f"def {name}(a, s):",
+            "    out = []",
+            "    size = 0",
+            "    for v in a:",
+        ]
+        body = self.statements(
+            shape.elements or Shape(), self.paths.child(path, None), "", 0, None
+        )
+        lines += ["        " + line for line in body]
+        lines += [
+            "    m = len(out)",
+            "    if m:",
+        ]
+        if self.compact:
+            lines.append(f"        s.add('minify', {path}, m - 1)")
+        lines += [
+            f"        return out, size + {self.item_separator} * m + "
+            f"{2 - self.item_separator}",
+            "    return out, 2",
+        ]
+
+    def statements(
+        self,
+        shape: Shape,
+        path: int,
+        store: str,
+        overhead: int,
+        member: Optional[Tuple[str, str, int]],
+    ) -> List[str]:
+        """Generate the statements handling the value ``v`` at a position.
+
+        Args:
+            shape: Shape of the position
+            path: Schema path id of the position
+            store: Statement prefix storing a value (``out[key] = ``), or
+                empty to append it to an array
+            overhead: Bytes added by the member's key and separator
+            member: Key literal, key and encoded key size of object members
+        """
+
+        def keep(value: str, size: str) -> List[str]:
+            if store:
+                return [f"{store}{value}", f"size += {size} + {overhead}"]
+            return [f"out.append({value})", f"size += {size}"]
+
+        def call(kind: str) -> str:
+            if shape.kind != kind:
+                return "raise _Mismatch"
+            return f"r, z = {self.function(shape, path)}(v, s)"
+
+        lines = ["t = type(v)", "if t is dict:", "    if v:"]
+        lines += [f"        {call('object')}", "    else:", "        r, z = {}, 2"]
+        lines += ["    " + line for line in keep("r", "z")]
+        lines.append("elif t is list:")
+        if member is not None and self.drop_empty_arrays:
+            key_size = member[2]
+            lines += [
+                "    if not v:",
+                f"        last = s.remove('empty_arrays', {path}, {key_size + 6})",
+                "    else:",
+                f"        {call('array')}",
+            ]
+            if shape.kind == "array":
+                lines += ["        " + line for line in keep("r", "z")]
+        else:
+            lines += ["    if v:", f"        {call('array')}", "    else:"]
+            lines.append("        r, z = [], 2")
+            lines += ["    " + line for line in keep("r", "z")]
+
+        lines.append("else:")
+        scalar: List[str] = []
+        for name, rewrite in self.rewrites:
+            scalar += [
+                f"n = {rewrite}(v)",
+                "if n is not v and n != v:",
+                f"    s.add({name!r}, {path}, len(_enc(v)) - len(_enc(n)))",
+                "    v = n",
+            ]
+        tests = []
+        if member is not None:
+            key_literal, key, key_size = member
+            for drop_pass, drop in self.drops:
+                if drop_pass.may_drop(key):
+                    test = drop_pass.drop_test or f"{drop}({key_literal}, v)"
+                    tests.append((drop_pass.name, test))
+        branch = "if"
+        for name, test in tests:
+            scalar += [
+                f"{branch} {test}:",
+                f"    last = s.remove({name!r}, {path}, {key_size + 4} + len(_enc(v)))",
+            ]
+            branch = "elif"
+        if tests:
+            scalar.append("else:")
+            scalar += ["    " + line for line in keep("v", "len(_enc(v))")]
+        else:
+            scalar += keep("v", "len(_enc(v))")
+        lines += ["    " + line for line in scalar]
+        return lines
+
+
+class CompiledCleaner:
+    """A cleaning function generated for one document shape and pass list."""
+
+    def __init__(self, shape: Shape, passes: Sequence[OptimizationPass]):
+        """Generate and compile the cleaner.
+
+        Args:
+            shape: The shape of the documents to clean (see ``learn_shape``)
+            passes: The passes to apply, all of them compilable
+
+        Raises:
+            UnsupportedShape: If the shape exceeds the compile limits
+        """
+        self.shape = shape
+        self.passes = list(passes)
+        self.paths = PathTable()
+        generator = _Generator(self.passes, self.paths)
+        root = generator.statements(shape, PathTable.ROOT, "", 0, None)
+        lines = ["def clean(v, s):", "    out = []", "    size = 0"]
+        lines += ["    " + line for line in root]
+        lines.append("    return out[0], size")
+        generator.functions.append(lines)
+        self.source = "\n\n".join("\n".join(f) for f in generator.functions) + "\n"
+        namespace = generator.namespace
+        exec(compile(self.source, "<compiled cleaner>", "exec"), namespace)
+        self._clean = namespace["clean"]
+
+    def run(self, data: Any) -> Tuple[Any, int, PassSavings]:
+        """Clean a document of the compiled shape.
+
+        Returns:
+            The cleaned document, the UTF-8 size of its JSON text and the
+            savings of each pass
+
+        Raises:
+            ShapeMismatch: If the document does not have the compiled shape
+        """
+        savings = PassSavings(self.paths)
+        result, size = self._clean(data, savings)
+        return result, size, savings
+
+
+def compilable(passes: Sequence[OptimizationPass]) -> bool:
+    """Return whether compiled cleaners support all of the passes."""
+    return all(p.compilable for p in passes)
+
+
+class CompiledCleanerCache:
+    """LRU cache of compiled cleaners by shape sketch and pass list.
+
+    A cleaner is compiled once ``COMPILE_AFTER`` payloads with the same
+    sketch were cleaned by the generic walk, so one-off shapes never pay
+    for compilation. When a cached cleaner rejects a payload, its shape is
+    widened with the payload's and recompiled, if the two merge.
+    """
+
+    def __init__(self, enabled: bool = True, max_entries: int = 32):
+        """Initialize the cache.
+
+        Args:
+            enabled: Always use the generic walk when False
+            max_entries: Maximum number of sketches tracked
+        """
+        self.enabled = enabled
+        self._cache = LRUCache(max_entries=max_entries)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.mismatches = 0
+        self.compiles = 0
+        self.unsupported = 0
+
+    def key(self, data: Any, passes: Sequence[OptimizationPass]) -> Hashable:
+        """Return the cache key of a payload and pass list."""
+        return shape_sketch(data), tuple(p.signature() for p in passes)
+
+    def lookup(
+        self, data: Any, passes: Sequence[OptimizationPass]
+    ) -> Tuple[Optional[Hashable], Optional[CompiledCleaner]]:
+        """Return the cache key of a payload and its compiled cleaner, if any.
+
+        The key is None when compiled cleaners are disabled or do not
+        support the passes.
+        """
+        if not self.enabled or not compilable(passes):
+            return None, None
+        key = self.key(data, passes)
+        entry = self._cache.get(key)
+        cleaner = entry if isinstance(entry, CompiledCleaner) else None
+        with self._lock:
+            if cleaner is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return key, cleaner
+
+    def mismatch(self, key: Hashable) -> None:
+        """Record that the cleaner cached under ``key`` rejected a payload."""
+        with self._lock:
+            self.hits -= 1
+            self.misses += 1
+            self.mismatches += 1
+
+    def learn(
+        self,
+        key: Optional[Hashable],
+        data: Any,
+        passes: Sequence[OptimizationPass],
+        rejected: Optional[CompiledCleaner] = None,
+    ) -> None:
+        """Record a payload cleaned by the generic walk under its key.
+
+        Args:
+            key: The key returned by ``lookup``; nothing is recorded if None
+            data: The payload
+            passes: The passes applied
+            rejected: The cached cleaner that rejected the payload, whose
+                shape is widened with the payload's
+        """
+        if key is None:
+            return
+        if rejected is None:
+            # Payloads seen so far, or False for unsupported shapes
+            seen = self._cache.pop(key, 0)
+            if seen is False:
+                self._cache.set(key, False)
+                return
+            if seen + 1 < COMPILE_AFTER:
+                self._cache.set(key, seen + 1)
+                return
+        try:
+            shape = learn_shape(data, _copy_shape(rejected.shape) if rejected else None)
+            cleaner = CompiledCleaner(shape, passes)
+        except UnsupportedShape as e:
+            logger.info(f"Shape not compiled: {e}")
+            with self._lock:
+                self.unsupported += 1
+            # Keep the rejected cleaner for the payloads it fits
+            if rejected is None:
+                self._cache.set(key, False)
+            return
+        self._cache.set(key, cleaner)
+        with self._lock:
+            self.compiles += 1
+
+    def clear(self) -> None:
+        """Drop every cleaner and reset the counters."""
+        self._cache.clear()
+        with self._lock:
+            self.hits = self.misses = self.mismatches = 0
+            self.compiles = self.unsupported = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit rate, compilations and occupancy of the cache."""
+        lookups = self.hits + self.misses
+        cache = self._cache.stats()
+        return {
+            "enabled": self.enabled,
+            "entries": cache["entries"],
+            "max_entries": cache["max_entries"],
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "mismatches": self.mismatches,
+            "compiles": self.compiles,
+            "unsupported_shapes": self.unsupported,
+            "evictions": cache["evictions"],
+        }
+
+
+def _copy_shape(shape: Shape) -> Shape:
+    """Return a deep copy of a shape, so widening never alters a cached one."""
+    root = Shape()
+    stack = [(shape, root)]
+    while stack:
+        source, copy = stack.pop()
+        copy.kind = source.kind
+        copy.keys = source.keys
+        if source.kind == "object":
+            copy.members = {key: Shape() for key in source.keys}
+            stack.extend(
+                (source.members[key], copy.members[key]) for key in source.keys
+            )
+        elif source.kind == "array":
+            copy.elements = Shape()
+            stack.append((source.elements, copy.elements))
+    return root
+
+
+compiled_cleaners = CompiledCleanerCache(
+    enabled=settings.TOOL_COMPILED_CLEANERS_ENABLED,
+    max_entries=settings.TOOL_COMPILED_CLEANER_CACHE_MAX_ENTRIES,
+)
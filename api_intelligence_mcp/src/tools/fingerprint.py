@@ -0,0 +1,196 @@
+"""Structural fingerprints of JSON values.
+
+A shape describes the structure of a value without its data: the kind of a
+scalar, the keys and member shapes of an object, or the set of distinct
+element shapes of an array (independent of its length and element order).
+
+``ShapeRegistry`` interns shapes as small integer ids, so values with the
+same structure share one id and can be recognized in O(1). Object shapes
+keep their keys in document order; objects that differ only in key order
+get different ids but the same fingerprint. A shape's children are always
+interned before the shape itself, so every id is larger than the ids it
+refers to. ``fingerprint`` turns an id into a stable blake2b digest that is
+the same across processes; it is computed once per distinct shape.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Tuple
+
+from api_intelligence_mcp.src.tools.traversal import (
+    CONTAINER_KINDS,
+    SKIP,
+    TreeBuilder,
+    walk,
+)
+
+# ("scalar", kind), ("object", ((key, id), ...)) in document order, or
+# ("array", (id, ...)) with the distinct element ids in ascending order
+Shape = Tuple[str, Any]
+
+FINGERPRINT_SIZE = 16
+
+# Largest number of values in an array element whose shape is computed
+# directly instead of through the walk
+INLINE_LIMIT = 64
+
+_SCALAR_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "float",
+    bool: "boolean",
+    type(None): "null",
+}
+
+
+class _InlineLimit(Exception):
+    """Raised when a value is too large or unusual to be shaped inline."""
+
+
+class ShapeRegistry:
+    """Intern shapes as integer ids and compute their fingerprints."""
+
+    def __init__(self):
+        """Initialize the registry."""
+        self._ids: Dict[Shape, int] = {}
+        self.shapes: List[Shape] = []
+        self._fingerprints: List[bytes] = []
+
+    def __len__(self) -> int:
+        """Return the number of distinct shapes."""
+        return len(self.shapes)
+
+    def intern(self, shape: Shape) -> int:
+        """Return the id of a shape, registering it if it is new."""
+        shape_id = self._ids.get(shape)
+        if shape_id is None:
+            shape_id = self._ids[shape] = len(self.shapes)
+            self.shapes.append(shape)
+        return shape_id
+
+    def scalar(self, kind: str) -> int:
+        """Return the id of a scalar shape."""
+        return self.intern(("scalar", kind))
+
+    def object(self, members: Dict[str, int]) -> int:
+        """Return the id of an object shape from its member shape ids."""
+        return self.intern(("object", tuple(members.items())))
+
+    def array(self, elements: List[int]) -> int:
+        """Return the id of an array shape from its element shape ids."""
+        return self.intern(("array", tuple(sorted(set(elements)))))
+
+    def digest(self, shape_id: int) -> bytes:
+        """Return the raw fingerprint of a shape."""
+        fingerprints = self._fingerprints
+        # Children have smaller ids, so computing in id order never recurses
+        for pending in range(len(fingerprints), shape_id + 1):
+            kind, body = self.shapes[pending]
+            h = hashlib.blake2b(kind.encode(), digest_size=FINGERPRINT_SIZE)
+            if kind == "scalar":
+                h.update(b":" + body.encode())
+            elif kind == "object":
+                for key, child in sorted(body):
+                    h.update(json.dumps(key).encode())
+                    h.update(fingerprints[child])
+            else:
+                for digest in sorted(fingerprints[child] for child in body):
+                    h.update(digest)
+            fingerprints.append(h.digest())
+        return fingerprints[shape_id]
+
+    def fingerprint(self, shape_id: int) -> str:
+        """Return the stable hex fingerprint of a shape."""
+        return self.digest(shape_id).hex()
+
+
+class ShapeVisitor(TreeBuilder):
+    """Compute the shape id of the visited document.
+
+    After the walk ``result`` holds the shape id of the document. Array
+    elements with at most ``INLINE_LIMIT`` values, typically the rows of a
+    listing, are shaped directly without visiting their values one by one.
+    """
+
+    def __init__(self, registry: ShapeRegistry):
+        """Initialize the visitor.
+
+        Args:
+            registry: Registry the shapes are interned in
+        """
+        super().__init__()
+        self.registry = registry
+        self._scalars: Dict[str, int] = {}
+        self._scalar_types = {
+            value_type: registry.scalar(kind)
+            for value_type, kind in _SCALAR_TYPES.items()
+        }
+        self._budget = 0
+
+    def enter_value(
+        self, value: Any, kind: str, key: Any, depth: int, weight: float
+    ) -> Any:
+        """Shape small array elements inline; start collecting other containers."""
+        if kind not in CONTAINER_KINDS:
+            return None
+        containers = self._containers
+        if containers and type(containers[-1]) is list:
+            self._budget = INLINE_LIMIT
+            try:
+                shape_id = self._shape(value)
+            except _InlineLimit:
+                pass
+            else:
+                containers[-1].append(shape_id)
+                return SKIP
+        containers.append({} if kind == "object" else [])
+        return None
+
+    def _shape(self, value: Any) -> int:
+        """Return the shape id of a container within the inline budget."""
+        value_type = type(value)
+        if value_type is not dict and value_type is not list:
+            raise _InlineLimit
+        self._budget -= len(value) + 1
+        if self._budget < 0:
+            raise _InlineLimit
+        scalar = self._scalar_types.get
+        shape = self._shape
+        # Scalars are resolved in place; only nested containers recurse
+        if value_type is dict:
+            members = tuple(
+                [
+                    (
+                        key,
+                        s if (s := scalar(type(member))) is not None else shape(member),
+                    )
+                    for key, member in value.items()
+                ]
+            )
+            return self.registry.intern(("object", members))
+        elements = {
+            s if (s := scalar(type(element))) is not None else shape(element)
+            for element in value
+        }
+        return self.registry.intern(("array", tuple(sorted(elements))))
+
+    def build_leaf(self, value: Any, kind: str) -> Any:
+        """Return the shape id of a scalar."""
+        shape_id = self._scalars.get(kind)
+        if shape_id is None:
+            shape_id = self._scalars[kind] = self.registry.scalar(kind)
+        return shape_id
+
+    def build_container(self, kind: str, container: Any) -> Any:
+        """Return the shape id of an object or array."""
+        if kind == "object":
+            return self.registry.object(container)
+        return self.registry.array(container)
+
+
+def shape_fingerprint(data: Any) -> str:
+    """Return the stable structural fingerprint of a parsed JSON value."""
+    registry = ShapeRegistry()
+    visitor = ShapeVisitor(registry)
+    walk(data, visitor)
+    return registry.fingerprint(visitor.result)
@@ -1,62 +1,154 @@
 """API documentation generator tool for the Template MCP Server."""
 
-import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
+from api_intelligence_mcp.src.tools.parse_cache import load_json
+from api_intelligence_mcp.src.tools.schema_merge import (
+    MergedSchema,
+    MergedSchemaVisitor,
+    render_schema,
+)
+from api_intelligence_mcp.src.tools.traversal import make_sampler, walk
 from api_intelligence_mcp.utils.pylogger import get_python_logger
 
 logger = get_python_logger()
 
+# Kinds in the order they are joined at union positions of the schema tree
+_TREE_KINDS = (
+    "object",
+    "array",
+    "string",
+    "integer",
+    "float",
+    "boolean",
+    "null",
+    "unknown",
+)
+
+# JSON Schema type names of the JSON kinds, in output order
+_JSON_SCHEMA_TYPES = {
+    "object": "object",
+    "array": "array",
+    "string": "string",
+    "integer": "integer",
+    "float": "number",
+    "boolean": "boolean",
+    "null": "null",
+}
+
+
+def _build_tree(
+    schema: MergedSchema, properties: Optional[Dict[str, Any]], items: Any
+) -> Any:
+    """Render a schema as a tree of type names, e.g. ``{"id": "integer"}``.
+
+    Objects render as their properties, with the keys of fields missing
+    from some objects suffixed with ``?``; arrays render as ``[items]`` and
+    scalars as their kinds joined with ``|``, e.g. ``"string|null"``. A
+    position holding a container and other kinds renders as
+    ``{"$type": "object|array|null", "$properties": ..., "$items": ...}``.
+    """
+    types = schema.types
+    if properties is not None:
+        marked = {}
+        for name, value in properties.items():
+            optional = f"{name}?"
+            # Left unmarked if another field already has the marked name
+            if name in schema.required or optional in properties:
+                marked[name] = value
+            else:
+                marked[optional] = value
+        properties = marked
+    if items is None and "array" in types:
+        items = "unknown"
+    if len(types) == 1 and properties is not None:
+        return properties
+    if len(types) == 1 and items is not None:
+        return [items]
+    names = "|".join(kind for kind in _TREE_KINDS if kind in types) or "unknown"
+    if properties is None and items is None:
+        return names
+    tree: Dict[str, Any] = {"$type": names}
+    if properties is not None:
+        tree["$properties"] = properties
+    if items is not None:
+        tree["$items"] = items
+    return tree
+
+
+def _build_json_schema(
+    schema: MergedSchema, properties: Optional[Dict[str, Any]], items: Any
+) -> Dict[str, Any]:
+    """Render a schema as a JSON Schema fragment."""
+    types = [name for kind, name in _JSON_SCHEMA_TYPES.items() if kind in schema.types]
+    result: Dict[str, Any] = {}
+    if types:
+        result["type"] = types[0] if len(types) == 1 else types
+    if properties is not None:
+        result["properties"] = properties
+        result["required"] = [name for name in properties if name in schema.required]
+    if items is not None:
+        result["items"] = items
+    return result
+
+
+class SchemaInferenceVisitor(MergedSchemaVisitor):
+    """Infer the merged schema of a document and render it for documentation."""
+
+    @property
+    def tree(self) -> Any:
+        """Return the schema as a tree of type names."""
+        return render_schema(self.schema, _build_tree)
+
+    @property
+    def json_schema(self) -> Dict[str, Any]:
+        """Return the schema as a JSON Schema document."""
+        return render_schema(self.schema, _build_json_schema)
+
 
 def generate_api_documentation(
     response_json: str,
+    sample_size: Optional[int] = None,
+    sample_seed: int = 0,
 ) -> Dict[str, Any]:
     """Generate schema-like documentation from JSON response.
 
     TOOL_NAME=generate_api_documentation
     DISPLAY_NAME=API Documentation Generator
-    USECASE=Infer schema and data types from API JSON response
-    INSTRUCTIONS=1. Provide valid JSON string, 2. Call function, 3. Receive inferred schema
-    INPUT_DESCRIPTION=response_json (string)
-    OUTPUT_DESCRIPTION=Dictionary containing inferred schema structure
+    USECASE=Infer schema and data types from API JSON response, merging all array elements into one schema with union types, required fields and nullability
+    INSTRUCTIONS=1. Provide valid JSON string, 2. Optionally set sample_size to infer array element schemas from a sample of that many elements, 3. Call function, 4. Receive inferred schema
+    INPUT_DESCRIPTION=response_json (string), sample_size (int, optional): merge a seeded random sample of at most this many elements per array instead of every element, sample_seed (int): seed of the sample for deterministic results
+    OUTPUT_DESCRIPTION=Dictionary containing the inferred schema tree (union types joined with "|", optional fields suffixed with "?"), the equivalent JSON Schema with required fields and null types, the structural fingerprint and, when sampling, the sampling statistics
     EXAMPLES=generate_api_documentation('{"id":1,"name":"John"}')
     PREREQUISITES=Valid JSON string
     RELATED_TOOLS=analyze_api_response
 
-    CPU-bound schema inference operation.
+    CPU-bound schema inference operation. Array elements with a shape seen
+    before are merged in O(1); sampling bounds the cost of large arrays by
+    the sample size.
     """
     try:
         if not response_json or not isinstance(response_json, str):
             raise ValueError("response_json must be a non-empty string")
+        sampler = make_sampler(sample_size, sample_seed)
+
+        data = load_json(response_json)
 
-        data = json.loads(response_json)
-
-        def infer_type(value):
-            if isinstance(value, bool):
-                return "boolean"
-            if isinstance(value, int):
-                return "integer"
-            if isinstance(value, float):
-                return "float"
-            if isinstance(value, str):
-                return "string"
-            if isinstance(value, list):
-                if value:
-                    return [infer_type(value[0])]
-                return ["unknown"]
-            if isinstance(value, dict):
-                return {k: infer_type(v) for k, v in value.items()}
-            return "unknown"
-
-        schema = infer_type(data)
+        inference = SchemaInferenceVisitor()
+        walk(data, inference, sampler=sampler)
 
         logger.info("API documentation generated successfully")
 
-        return {
+        result = {
             "status": "success",
-            "schema": schema,
+            "schema": inference.tree,
+            "json_schema": inference.json_schema,
+            "shape_fingerprint": inference.fingerprint,
             "message": "API documentation generated successfully",
         }
+        if sampler is not None:
+            result["sampling"] = sampler.stats()
+        return result
 
     except Exception as e:
         logger.error(f"Error generating API documentation: {e}")
@@ -64,4 +156,4 @@ def generate_api_documentation(
             "status": "error",
             "error": str(e),
             "message": "Failed to generate API documentation",
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,336 @@
+"""Incremental JSON tokenizer for payloads too large or too deep to load at once.
+
+``JSONEventStream`` parses JSON from a sequence of text or byte chunks and
+yields parse events instead of building a tree:
+
+- ``("start_map", None)`` / ``("end_map", None)``
+- ``("map_key", key)``
+- ``("start_array", None)`` / ``("end_array", None)``
+- ``("value", scalar)``
+
+Only the current token and the stack of open containers are held in memory,
+so memory stays bounded by the largest single token, not the payload size.
+``loads_iterative`` builds a tree from the events without recursion and is
+used for documents nested deeper than ``json.loads`` supports.
+"""
+
+import codecs
+import os
+import re
+from json import JSONDecodeError
+from json.decoder import scanstring
+from json.encoder import encode_basestring_ascii
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+from api_intelligence_mcp.src.settings import settings
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Characters of input always buffered ahead of a token, so that short tokens are
+# never split across chunks
+_LOOKAHEAD = 64
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# One token after optional whitespace: punctuation (1), a number (2, with
+# fraction 3 and exponent 4), a literal (5) or the opening quote of a string (6)
+_TOKEN = re.compile(
+    r"[ \t\n\r]*(?:"
+    r"([{}\[\]:,])"
+    r"|(-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?)"
+    r"|(true|false|null|NaN|Infinity|-Infinity)"
+    r'|(")'
+    r")"
+)
+_LITERALS = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "NaN": float("nan"),
+    "Infinity": float("inf"),
+    "-Infinity": float("-inf"),
+}
+
+# Parser states
+_VALUE, _FIRST_VALUE, _FIRST_KEY, _KEY, _COLON, _AFTER_VALUE = range(6)
+
+Event = Tuple[str, Any]
+Chunk = Union[str, bytes]
+Source = Union[str, bytes, os.PathLike, Iterable[Chunk]]
+
+
+def utf8_size(text: str) -> int:
+    """Return the UTF-8 encoded size of a text, without encoding ASCII text."""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def encode_scalar(value: Any) -> str:
+    """Encode a scalar exactly as ``json.dumps`` does with its default options."""
+    if type(value) is str:
+        return encode_basestring_ascii(value)
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if type(value) is float:
+        if value != value:
+            return "NaN"
+        if value in (float("inf"), float("-inf")):
+            return "Infinity" if value > 0 else "-Infinity"
+        return float.__repr__(value)
+    return int.__repr__(value)
+
+
+class JSONEventStream:
+    """Incremental JSON parser yielding events from a stream of chunks."""
+
+    def __init__(self, chunks: Iterable[Chunk]):
+        """Initialize the stream.
+
+        Args:
+            chunks: Text or UTF-8 encoded byte chunks of one JSON document
+        """
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self.bytes_read = 0
+
+    def _fill(self) -> None:
+        """Append at least as much input as is still buffered, or mark the end."""
+        remaining = self._buffer[self._pos :]
+        parts = [remaining]
+        added = 0
+        # Doubling the buffer keeps tokens spanning many chunks linear to read
+        while added < max(len(remaining), 1):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                parts.append(self._decoder.decode(b"", final=True))
+                self._eof = True
+                break
+            if isinstance(chunk, bytes):
+                self.bytes_read += len(chunk)
+                chunk = self._decoder.decode(chunk)
+            else:
+                self.bytes_read += utf8_size(chunk)
+            parts.append(chunk)
+            added += len(chunk)
+        self._buffer = "".join(parts)
+        self._pos = 0
+
+    def _error(self, message: str) -> JSONDecodeError:
+        return JSONDecodeError(message, self._buffer, self._pos)
+
+    def _next_token(self) -> Optional[Tuple[str, Any]]:
+        """Return the next (kind, value) token, or None at the end of input."""
+        while True:
+            buffer = self._buffer
+            match = _TOKEN.match(buffer, self._pos)
+            if match is None:
+                if not self._eof:
+                    self._fill()
+                    continue
+                self._pos = _WHITESPACE.match(buffer, self._pos).end()
+                if self._pos == len(buffer):
+                    return None
+                raise self._error("Expecting value")
+
+            end = match.end()
+            if end > len(buffer) - _LOOKAHEAD and not self._eof:
+                # A number or literal may continue in the next chunk
+                self._fill()
+                continue
+
+            group = match.lastindex
+            if group == 1:
+                self._pos = end
+                return match.group(1), None
+            if group == 2:
+                self._pos = end
+                text = match.group(2)
+                if match.group(3) is None and match.group(4) is None:
+                    return "value", int(text)
+                return "value", float(text)
+            if group == 5:
+                self._pos = end
+                return "value", _LITERALS[match.group(5)]
+
+            try:
+                value, end = scanstring(buffer, end)
+            except JSONDecodeError as e:
+                incomplete = e.msg.startswith("Unterminated string") or (
+                    e.pos >= len(buffer) - 6
+                )
+                if incomplete and not self._eof:
+                    self._fill()
+                    continue
+                raise
+            self._pos = end
+            return "string", value
+
+    def events(self) -> Iterator[Event]:
+        """Yield the parse events of the document.
+
+        Raises:
+            json.JSONDecodeError: If the input is not a single valid JSON document
+        """
+        next_token = self._next_token
+        stack: List[str] = []
+        state = _VALUE
+        while True:
+            token = next_token()
+            if token is None:
+                if state == _AFTER_VALUE and not stack:
+                    return
+                raise self._error("Unexpected end of JSON input")
+            kind, value = token
+
+            if state == _VALUE or state == _FIRST_VALUE:
+                if kind == "{":
+                    stack.append("{")
+                    yield "start_map", None
+                    state = _FIRST_KEY
+                elif kind == "[":
+                    stack.append("[")
+                    yield "start_array", None
+                    state = _FIRST_VALUE
+                elif kind == "value" or kind == "string":
+                    yield "value", value
+                    state = _AFTER_VALUE
+                elif kind == "]" and state == _FIRST_VALUE:
+                    stack.pop()
+                    yield "end_array", None
+                    state = _AFTER_VALUE
+                else:
+                    raise self._error("Expecting value")
+
+            elif state == _FIRST_KEY or state == _KEY:
+                if kind == "string":
+                    yield "map_key", value
+                    state = _COLON
+                elif kind == "}" and state == _FIRST_KEY:
+                    stack.pop()
+                    yield "end_map", None
+                    state = _AFTER_VALUE
+                else:
+                    raise self._error(
+                        "Expecting property name enclosed in double quotes"
+                    )
+
+            elif state == _COLON:
+                if kind != ":":
+                    raise self._error("Expecting ':' delimiter")
+                state = _VALUE
+
+            else:
+                if not stack:
+                    raise self._error("Extra data")
+                if kind == ",":
+                    state = _KEY if stack[-1] == "{" else _VALUE
+                elif kind == "}" and stack[-1] == "{":
+                    stack.pop()
+                    yield "end_map", None
+                elif kind == "]" and stack[-1] == "[":
+                    stack.pop()
+                    yield "end_array", None
+                else:
+                    raise self._error("Expecting ',' delimiter")
+
+    def __iter__(self) -> Iterator[Event]:
+        """Iterate over the parse events."""
+        return self.events()
+
+
+def iter_chunks(
+    source: Source, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Chunk]:
+    """Split a JSON source into chunks.
+
+    Args:
+        source: JSON text, UTF-8 bytes, a file path (``os.PathLike``) or an
+            iterable of text/byte chunks
+        chunk_size: Size of the chunks read from text, bytes and files
+    """
+    if isinstance(source, (str, bytes)):
+        for start in range(0, len(source), chunk_size):
+            yield source[start : start + chunk_size]
+    elif isinstance(source, os.PathLike):
+        with open(source, "rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+    else:
+        yield from source
+
+
+def loads_iterative(source: Source) -> Any:
+    """Parse a JSON document into Python objects without recursion.
+
+    Equivalent to ``json.loads`` for any nesting depth, but slower; use it
+    when ``json.loads`` raises ``RecursionError``.
+    """
+    containers: List[Any] = []
+    key: Any = None
+    root: Any = None
+    for event, value in JSONEventStream(iter_chunks(source)):
+        if event == "map_key":
+            key = value
+            continue
+        if event == "end_map" or event == "end_array":
+            containers.pop()
+            continue
+        if event == "start_map":
+            value = {}
+        elif event == "start_array":
+            value = []
+
+        if not containers:
+            root = value
+        elif type(containers[-1]) is dict:
+            containers[-1][key] = value
+        else:
+            containers[-1].append(value)
+
+        if event != "value":
+            containers.append(value)
+    return root
+
+
+def resolve_input_path(file_path: str) -> Path:
+    """Resolve a tool's file input against ``TOOL_FILE_INPUT_DIR``.
+
+    Raises:
+        ValueError: If file input is disabled or the path is outside the
+            allowed directory
+        FileNotFoundError: If the file does not exist
+    """
+    if not settings.TOOL_FILE_INPUT_DIR:
+        raise ValueError("file_path input is disabled; set TOOL_FILE_INPUT_DIR")
+    base = Path(settings.TOOL_FILE_INPUT_DIR).resolve()
+    path = (base / file_path).resolve()
+    if not path.is_relative_to(base):
+        raise ValueError("file_path must be inside TOOL_FILE_INPUT_DIR")
+    if not path.is_file():
+        raise FileNotFoundError(f"File not found: {file_path}")
+    return path
+
+
+def resolve_output_path(output_path: str) -> Path:
+    """Resolve a tool's file output against ``TOOL_FILE_OUTPUT_DIR``.
+
+    Raises:
+        ValueError: If file output is disabled or the path is outside the
+            allowed directory
+        FileNotFoundError: If the parent directory does not exist
+    """
+    if not settings.TOOL_FILE_OUTPUT_DIR:
+        raise ValueError("output_path is disabled; set TOOL_FILE_OUTPUT_DIR")
+    base = Path(settings.TOOL_FILE_OUTPUT_DIR).resolve()
+    path = (base / output_path).resolve()
+    if not path.is_relative_to(base) or path == base:
+        raise ValueError("output_path must be inside TOOL_FILE_OUTPUT_DIR")
+    if not path.parent.is_dir():
+        raise FileNotFoundError(f"Directory not found: {path.parent}")
+    return path
@@ -0,0 +1,232 @@
+"""Wire format measurement tool for the Template MCP Server."""
+
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from api_intelligence_mcp.src.tools.parse_cache import load_json
+from api_intelligence_mcp.src.tools.wire_formats import (
+    COMPRESSORS,
+    WireFormat,
+    check_compression_levels,
+    wire_formats,
+)
+from api_intelligence_mcp.utils.pylogger import get_python_logger
+
+logger = get_python_logger()
+
+RANK_KEYS = ("size", "encode_time", "decode_time", "total_time")
+
+MAX_REPEAT = 50
+
+# Calls of a fast step are looped until one timed sample takes this long, so
+# that the clock resolution does not dominate small payloads
+MIN_SAMPLE_SECONDS = 0.002
+
+
+def cpu_seconds(function: Callable[[Any], Any], argument: Any, repeat: int) -> float:
+    """Return the best CPU time of ``function(argument)`` over ``repeat`` samples.
+
+    CPU time of the calling thread is measured, so work of other threads and
+    processes sharing the machine is not counted.
+    """
+    clock = time.thread_time
+    start = clock()
+    function(argument)
+    first = clock() - start
+    loops = 1
+    if first < MIN_SAMPLE_SECONDS:
+        loops = min(1000, int(MIN_SAMPLE_SECONDS / max(first, 1e-7)) + 1)
+    best = first * loops
+    for _ in range(repeat):
+        start = clock()
+        for _ in range(loops):
+            function(argument)
+        best = min(best, clock() - start)
+    return best / loops
+
+
+def _rank_key(rank_by: str) -> Callable[[Dict[str, Any]], Any]:
+    if rank_by == "size":
+        return lambda row: (row["bytes"], row["total_ms"])
+    column = rank_by.replace("_time", "_ms")
+    return lambda row: (row[column], row["bytes"])
+
+
+def measure_variants(
+    data: Any,
+    formats: List[WireFormat],
+    compressors: List[str],
+    levels: List[int],
+    repeat: int,
+) -> Dict[str, Any]:
+    """Measure the encoded size and CPU time of every variant of a document.
+
+    A variant is a format, optionally followed by a compressor at a level.
+    The times of a compressed variant add the compressor's time on the
+    format's bytes to the format's own time.
+
+    Returns:
+        The measured variants, unranked, and the formats that could not
+        encode the document with the reason
+    """
+    variants: List[Dict[str, Any]] = []
+    unsupported: List[Dict[str, str]] = []
+    for wire_format in formats:
+        try:
+            encoded = wire_format.encode(data)
+            round_trip = wire_format.decode(encoded) == data
+        except Exception as e:
+            unsupported.append({"format": wire_format.name, "error": str(e)})
+            continue
+        encode = cpu_seconds(wire_format.encode, data, repeat)
+        decode = cpu_seconds(wire_format.decode, encoded, repeat)
+        base = {
+            "format": wire_format.name,
+            "implementation": wire_format.implementation,
+            "round_trip": round_trip,
+        }
+        variants.append(
+            {
+                "variant": wire_format.name,
+                **base,
+                "compression": None,
+                "level": None,
+                "bytes": len(encoded),
+                "encode_seconds": encode,
+                "decode_seconds": decode,
+            }
+        )
+        for name in compressors:
+            compress, decompress = COMPRESSORS[name]
+            for level in levels:
+                compressed = compress(encoded, level)
+                compress_seconds = cpu_seconds(
+                    lambda raw: compress(raw, level), encoded, repeat
+                )
+                variants.append(
+                    {
+                        "variant": f"{wire_format.name}+{name}-{level}",
+                        **base,
+                        "compression": name,
+                        "level": level,
+                        "bytes": len(compressed),
+                        "encode_seconds": encode + compress_seconds,
+                        "decode_seconds": decode
+                        + cpu_seconds(decompress, compressed, repeat),
+                    }
+                )
+    return {"variants": variants, "unsupported": unsupported}
+
+
+def rank_variants(
+    variants: List[Dict[str, Any]], input_bytes: int, rank_by: str = "size"
+) -> List[Dict[str, Any]]:
+    """Return the table of variants, best first, with times in milliseconds."""
+    rows = []
+    for variant in variants:
+        encode_ms = variant["encode_seconds"] * 1000
+        decode_ms = variant["decode_seconds"] * 1000
+        rows.append(
+            {
+                "variant": variant["variant"],
+                "format": variant["format"],
+                "compression": variant["compression"],
+                "level": variant["level"],
+                "implementation": variant["implementation"],
+                "bytes": variant["bytes"],
+                "percent_of_input": round(variant["bytes"] / input_bytes * 100, 2),
+                "encode_ms": round(encode_ms, 4),
+                "decode_ms": round(decode_ms, 4),
+                "total_ms": round(encode_ms + decode_ms, 4),
+                "round_trip": variant["round_trip"],
+            }
+        )
+    rows.sort(key=_rank_key(rank_by))
+    for rank, row in enumerate(rows, 1):
+        row["rank"] = rank
+    return rows
+
+
+def measure_encoding_costs(
+    response_json: str,
+    formats: Optional[List[str]] = None,
+    compressors: Optional[List[str]] = None,
+    compression_levels: Optional[List[int]] = None,
+    rank_by: str = "size",
+    repeat: int = 5,
+) -> Dict[str, Any]:
+    """Measure the size and CPU cost of candidate wire formats for a response.
+
+    TOOL_NAME=measure_encoding_costs
+    DISPLAY_NAME=API Wire Format Lab
+    USECASE=Choose the wire format and compression of an endpoint from measurements: compare encoded size and encode/decode CPU time of pretty JSON, minified JSON, MessagePack and CBOR, each raw and with gzip/zlib at several levels
+    INSTRUCTIONS=1. Provide a representative JSON response, 2. Optionally restrict formats, compressors or compression_levels, 3. Optionally set rank_by to a time column, 4. Call function, 5. Receive ranked table of variants
+    INPUT_DESCRIPTION=response_json (string), formats (list of "json_pretty", "json", "msgpack", "cbor", default all), compressors (list of "gzip", "zlib", default both, [] for none), compression_levels (list of integers 0-9, default [1, 6, 9]), rank_by ("size", "encode_time", "decode_time" or "total_time", default "size"), repeat (int 1-50, default 5): timed samples per step, the best is kept
+    OUTPUT_DESCRIPTION=Dictionary with a ranked table of variants (bytes, percent of the input size, encode/decode/total CPU milliseconds, implementation, round trip check), the best variant by each criterion, and formats that could not encode the response
+    EXAMPLES=measure_encoding_costs('{"items":[{"id":1,"name":"John"}]}'), measure_encoding_costs(response, formats=["json","msgpack"], compressors=["gzip"], compression_levels=[6], rank_by="total_time")
+    PREREQUISITES=Valid JSON string
+    RELATED_TOOLS=analyze_api_response, optimize_api_response_schema
+
+    CPU-bound. Times are CPU time of the measuring thread, best of ``repeat``
+    samples, so they are comparable between variants of one call but depend
+    on the server's hardware. MessagePack and CBOR run on the ``msgpack`` and
+    ``cbor2`` packages when installed and on slower pure-Python codecs
+    otherwise; the ``implementation`` column tells which.
+    """
+    try:
+        if not response_json or not isinstance(response_json, str):
+            raise ValueError("response_json must be a non-empty string")
+        available = wire_formats()
+        if formats is None:
+            formats = list(available)
+        unknown = set(formats) - available.keys()
+        if unknown or not formats:
+            raise ValueError(
+                f"formats must be a non-empty list of: {', '.join(available)}"
+            )
+        if compressors is None:
+            compressors = list(COMPRESSORS)
+        if set(compressors) - COMPRESSORS.keys():
+            raise ValueError(f"compressors must be any of: {', '.join(COMPRESSORS)}")
+        levels = list(check_compression_levels(compression_levels))
+        if rank_by not in RANK_KEYS:
+            raise ValueError(f"rank_by must be one of: {', '.join(RANK_KEYS)}")
+        if not 1 <= repeat <= MAX_REPEAT:
+            raise ValueError(f"repeat must be between 1 and {MAX_REPEAT}")
+
+        data = load_json(response_json)
+        measured = measure_variants(
+            data,
+            [available[name] for name in dict.fromkeys(formats)],
+            list(dict.fromkeys(compressors)),
+            levels,
+            repeat,
+        )
+        input_bytes = len(response_json.encode("utf-8"))
+        table = rank_variants(measured["variants"], input_bytes, rank_by)
+        best = {
+            key: min(table, key=_rank_key(key))["variant"] if table else None
+            for key in RANK_KEYS
+        }
+
+        logger.info(f"Measured {len(table)} wire format variants")
+
+        return {
+            "status": "success",
+            "input_bytes": input_bytes,
+            "rank_by": rank_by,
+            "timer": "thread_cpu",
+            "repeat": repeat,
+            "variants": table,
+            "best": best,
+            "unsupported": measured["unsupported"],
+            "message": "Encoding costs measured successfully",
+        }
+
+    except Exception as e:
+        logger.error(f"Error measuring encoding costs: {e}")
+        return {
+            "status": "error",
+            "error": str(e),
+            "message": "Failed to measure encoding costs",
+        }
@@ -0,0 +1,506 @@
+"""Optimization passes of the API response optimizer.
+
+A pass is one rule of ``optimize_api_response_schema``. All configured passes
+run fused in a single traversal, either of the parsed tree (``CleanVisitor``)
+or of the parse events (``StreamingCleaner``):
+
+- ``drops`` removes object members holding a scalar and ``rewrite`` replaces
+  scalars; new passes of these kinds only need to override one method.
+- Passes acting on whole containers (empty arrays and objects, tables,
+  separators, repeated subtrees) set a class flag that the traversal engines
+  implement.
+
+``PassSavings`` records the bytes each pass saved, by schema path, measured
+against ``json.dumps`` of the original document with its default
+separators, so the savings of all passes add up to exactly the difference
+between that and the optimized output.
+"""
+
+import math
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+from api_intelligence_mcp.src.tools.traversal import PathTable, TreeBuilder, walk
+
+# Removed field paths listed in the tool result
+MAX_LISTED_FIELDS = 1000
+
+# Paths with the largest savings listed in the tool result, per ranking
+MAX_LISTED_SAVINGS = 100
+
+DEFAULT_FLOAT_DIGITS = 6
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+# Keys of a table written by the table pass, in order
+TABLE_KEYS = ("columns", "rows")
+
+# Key of a reference and keys of the document written by the dedupe pass
+REF_KEY = "$ref"
+REFS_KEYS = ("data", "$refs")
+
+
+class OptimizationPass:
+    """Base class of the optimizer passes; override the hooks you need."""
+
+    name = ""
+    # Container rules implemented by the traversal engines
+    drops_empty_arrays = False
+    drops_empty_objects = False
+    tables = False
+    compact = False
+    dedupes = False
+    # Whether the streaming optimizer supports the pass
+    streamable = True
+    # Whether compiled cleaners (``compiled_cleaner``) support the pass
+    compilable = True
+    # Python expression over ``v`` equal to ``drops`` for every key, inlined
+    # by compiled cleaners instead of calling ``drops``
+    drop_test: Optional[str] = None
+
+    def drops(self, key: str, value: Any) -> bool:
+        """Return True to remove an object member holding a scalar."""
+        return False
+
+    def may_drop(self, key: str) -> bool:
+        """Return False if ``drops`` is False for every value of this key."""
+        return True
+
+    def signature(self) -> Hashable:
+        """Return a value equal for passes that transform documents alike."""
+        return self.name
+
+    def rewrite(self, value: Any) -> Any:
+        """Return the replacement of a scalar; the value itself to keep it."""
+        return value
+
+
+class NullsPass(OptimizationPass):
+    """Remove object members whose value is null."""
+
+    name = "nulls"
+    drop_test = "v is None"
+
+    def drops(self, key: str, value: Any) -> bool:
+        """Drop null members."""
+        return value is None
+
+
+class EmptyArraysPass(OptimizationPass):
+    """Remove object members whose value is an empty array."""
+
+    name = "empty_arrays"
+    drops_empty_arrays = True
+
+
+class EmptyObjectsPass(OptimizationPass):
+    """Remove object members whose value is, or is left, an empty object."""
+
+    name = "empty_objects"
+    drops_empty_objects = True
+    # Whether an object is left empty is only known after its members
+    streamable = False
+    compilable = False
+
+
+class EmptyStringsPass(OptimizationPass):
+    """Remove object members whose value is an empty string."""
+
+    name = "empty_strings"
+    drop_test = 'v == "" and type(v) is str'
+
+    def drops(self, key: str, value: Any) -> bool:
+        """Drop empty string members."""
+        return value == "" and type(value) is str
+
+
+class DefaultsPass(OptimizationPass):
+    """Remove object members holding their field's default value.
+
+    Defaults are given per field name; without them ``false``, ``0`` and
+    ``0.0`` are treated as the defaults of every field.
+    """
+
+    name = "defaults"
+
+    def __init__(self, default_values: Optional[Dict[str, Any]] = None):
+        """Initialize the pass.
+
+        Args:
+            default_values: Default scalar value by field name
+
+        Raises:
+            ValueError: If a default value is an object or array
+        """
+        if default_values is not None:
+            for key, value in default_values.items():
+                if not isinstance(value, _SCALAR_TYPES):
+                    raise ValueError(f"Default value of {key} must be a scalar")
+        self.default_values = default_values
+
+    def drops(self, key: str, value: Any) -> bool:
+        """Drop members equal to their default, with the same JSON type."""
+        if self.default_values is None:
+            return value is False or (
+                (type(value) is int or type(value) is float) and value == 0
+            )
+        if key not in self.default_values:
+            return False
+        default = self.default_values[key]
+        return type(value) is type(default) and value == default
+
+    def may_drop(self, key: str) -> bool:
+        """Only keys with a default can be dropped, or any without defaults."""
+        return self.default_values is None or key in self.default_values
+
+    def signature(self) -> Hashable:
+        """Include the defaults, with their types as ``0 == False``."""
+        if self.default_values is None:
+            return self.name
+        return self.name, tuple(
+            sorted(
+                (key, type(value).__name__, value)
+                for key, value in self.default_values.items()
+            )
+        )
+
+
+class RoundFloatsPass(OptimizationPass):
+    """Round floating point numbers to a number of decimal digits."""
+
+    name = "round_floats"
+
+    def __init__(self, float_digits: int = DEFAULT_FLOAT_DIGITS):
+        """Initialize the pass.
+
+        Args:
+            float_digits: Decimal digits kept after the point
+        """
+        if float_digits < 0:
+            raise ValueError("float_digits must not be negative")
+        self.float_digits = float_digits
+
+    def rewrite(self, value: Any) -> Any:
+        """Round finite floats."""
+        if type(value) is float and math.isfinite(value):
+            return round(value, self.float_digits)
+        return value
+
+    def signature(self) -> Hashable:
+        """Include the number of digits."""
+        return self.name, self.float_digits
+
+
+class TablePass(OptimizationPass):
+    """Rewrite arrays of same-shaped objects as tables.
+
+    An array whose elements are all objects with the same keys, in the same
+    order, becomes ``{"columns": [keys], "rows": [[values], ...]}`` where
+    that saves bytes. ``restore_tables`` reverses it; documents already
+    holding objects of that form are rejected, as they could not be told
+    apart from the tables.
+    """
+
+    name = "table"
+    tables = True
+    # Whether an array is a table is only known after its elements
+    streamable = False
+    compilable = False
+
+
+class MinifyPass(OptimizationPass):
+    """Write the output without spaces after ``,`` and ``:``."""
+
+    name = "minify"
+    compact = True
+
+
+class DedupePass(OptimizationPass):
+    """Move repeated objects and arrays into a reference table.
+
+    The output becomes ``{"data": ..., "$refs": {"r0": ...}}`` with each
+    repeated subtree replaced by ``{"$ref": "r0"}``, for the subtrees where
+    that saves bytes. ``restore_refs`` reverses it; documents already
+    holding objects of either form are rejected, as they could not be told
+    apart from the references.
+    """
+
+    name = "dedupe"
+    dedupes = True
+    streamable = False
+    compilable = False
+
+
+# Passes by name, in the order they are applied
+PASSES: Dict[str, Type[OptimizationPass]] = {
+    cls.name: cls
+    for cls in (
+        NullsPass,
+        EmptyArraysPass,
+        EmptyObjectsPass,
+        EmptyStringsPass,
+        DefaultsPass,
+        RoundFloatsPass,
+        TablePass,
+        MinifyPass,
+        DedupePass,
+    )
+}
+
+
+def is_table(value: Any) -> bool:
+    """Return whether an object has the form of a table of the table pass."""
+    if type(value) is not dict or tuple(value) != TABLE_KEYS:
+        return False
+    columns, rows = value["columns"], value["rows"]
+    if type(columns) is not list or type(rows) is not list:
+        return False
+    if not all(type(column) is str for column in columns):
+        return False
+    width = len(columns)
+    return all(type(row) is list and len(row) == width for row in rows)
+
+
+class _TableRestorer(TreeBuilder):
+    def build_container(self, kind: str, container: Any) -> Any:
+        if is_table(container):
+            columns = container["columns"]
+            return [dict(zip(columns, row)) for row in container["rows"]]
+        return container
+
+
+def restore_tables(data: Any) -> Any:
+    """Return a copy of a document with the tables of the table pass expanded.
+
+    Tables become arrays of objects again, with their keys in column order,
+    so ``restore_tables`` of the table pass output equals its input.
+    """
+    restorer = _TableRestorer()
+    walk(data, restorer)
+    return restorer.result
+
+
+def is_ref(value: Any) -> bool:
+    """Return whether an object has the form of a reference of the dedupe pass."""
+    return type(value) is dict and len(value) == 1 and REF_KEY in value
+
+
+def is_refs_document(value: Any) -> bool:
+    """Return whether a document has the form of the dedupe pass output."""
+    return (
+        type(value) is dict
+        and tuple(value) == REFS_KEYS
+        and type(value["$refs"]) is dict
+    )
+
+
+class _RefRestorer(TreeBuilder):
+    def __init__(self, refs: Dict[str, Any]):
+        TreeBuilder.__init__(self)
+        self.refs = refs
+
+    def build_container(self, kind: str, container: Any) -> Any:
+        if not is_ref(container):
+            return container
+        ref_id = container[REF_KEY]
+        if type(ref_id) is not str or ref_id not in self.refs:
+            raise ValueError(f"Unknown reference: {ref_id}")
+        # Table entries may hold references to other entries
+        restorer = _RefRestorer(self.refs)
+        walk(self.refs[ref_id], restorer)
+        return restorer.result
+
+
+def restore_refs(data: Any) -> Any:
+    """Return a copy of a document with the references of the dedupe pass expanded.
+
+    Every ``{"$ref": id}`` becomes a copy of its subtree again, so
+    ``restore_refs`` of the dedupe pass output equals its input. Documents
+    without the ``{"data": ..., "$refs": ...}`` form are returned as is, as
+    the pass leaves documents unchanged where references save no bytes.
+
+    Raises:
+        ValueError: If a reference names no entry of the table
+    """
+    if not is_refs_document(data):
+        return data
+    restorer = _RefRestorer(data["$refs"])
+    walk(data["data"], restorer)
+    return restorer.result
+
+
+def build_passes(
+    names: Iterable[str],
+    float_digits: int = DEFAULT_FLOAT_DIGITS,
+    default_values: Optional[Dict[str, Any]] = None,
+) -> List[OptimizationPass]:
+    """Instantiate the named passes in their application order.
+
+    Raises:
+        ValueError: If a name is unknown or an option is invalid
+    """
+    names = set(names)
+    unknown = names - PASSES.keys()
+    if unknown:
+        raise ValueError(
+            f"Unknown passes: {', '.join(sorted(unknown))}; "
+            f"available: {', '.join(PASSES)}"
+        )
+    passes: List[OptimizationPass] = []
+    for name, cls in PASSES.items():
+        if name not in names:
+            continue
+        if cls is RoundFloatsPass:
+            passes.append(RoundFloatsPass(float_digits))
+        elif cls is DefaultsPass:
+            passes.append(DefaultsPass(default_values))
+        else:
+            passes.append(cls())
+    return passes
+
+
+def scalar_hooks(
+    passes: Sequence[OptimizationPass],
+) -> Tuple[List[OptimizationPass], List[OptimizationPass]]:
+    """Return the passes overriding ``drops`` and those overriding ``rewrite``."""
+    drops = [p for p in passes if type(p).drops is not OptimizationPass.drops]
+    rewrites = [p for p in passes if type(p).rewrite is not OptimizationPass.rewrite]
+    return drops, rewrites
+
+
+class PassSavings:
+    """Bytes saved by each pass, aggregated by schema path.
+
+    Entries are keyed by (pass name, ``PathTable`` id) and hold the number
+    of values the pass acted on and the bytes it saved.
+    """
+
+    def __init__(self, paths: Optional[PathTable] = None):
+        """Initialize the ledger.
+
+        Args:
+            paths: Table of the path ids passed to ``add`` and ``remove``
+        """
+        self.paths = paths or PathTable()
+        self.entries: Dict[Tuple[str, int], List[int]] = {}
+        self.fields_removed_count = 0
+        self._removed: Dict[int, int] = {}
+
+    def add(self, name: str, path_id: int, size: int, count: int = 1) -> None:
+        """Record bytes saved by a pass at a path."""
+        entry = self.entries.get((name, path_id))
+        if entry is None:
+            self.entries[name, path_id] = [count, size]
+        else:
+            entry[0] += count
+            entry[1] += size
+
+    def remove(self, name: str, path_id: int, size: int) -> Tuple[str, int]:
+        """Record an object member removed by a pass; return its entry key."""
+        key = (name, path_id)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.entries[key] = [1, size]
+        else:
+            entry[0] += 1
+            entry[1] += size
+        self.fields_removed_count += 1
+        self._removed[path_id] = self._removed.get(path_id, 0) + 1
+        return key
+
+    def fields_removed(self, limit: int = MAX_LISTED_FIELDS) -> List[str]:
+        """Return the distinct schema paths of removed fields, first removal first."""
+        paths: Dict[str, None] = {}
+        for path_id in self._removed:
+            if len(paths) >= limit:
+                break
+            paths[self.paths.render(path_id)] = None
+        return list(paths)
+
+    def total(self) -> int:
+        """Return the bytes saved by all passes."""
+        return sum(size for _, size in self.entries.values())
+
+    def _ranked(
+        self, totals: Dict[int, List[int]], limit: int
+    ) -> Tuple[List[Tuple[str, List[int]]], int]:
+        """Return the largest ``[count, size]`` totals by path and how many were left out.
+
+        Only the listed ids are rendered, so the cost does not grow with the
+        number and depth of the paths that are left out. Distinct ids may
+        render alike, as schema paths skip empty keys; those listed are
+        merged.
+        """
+        # Ties go to the lower id, so to parents before their descendants
+        ranked = sorted(totals, key=lambda path_id: (-totals[path_id][1], path_id))
+        listed: Dict[str, List[int]] = {}
+        rendered = 0
+        for path_id in ranked:
+            path = self.paths.render(path_id)
+            entry = listed.get(path)
+            if entry is None:
+                if len(listed) >= limit:
+                    break
+                listed[path] = list(totals[path_id])
+            else:
+                entry[0] += totals[path_id][0]
+                entry[1] += totals[path_id][1]
+            rendered += 1
+        items = sorted(listed.items(), key=lambda item: -item[1][1])
+        return items, len(ranked) - rendered
+
+    def by_path(self, limit: int = MAX_LISTED_SAVINGS) -> Dict[str, Any]:
+        """Return the largest savings of all passes by schema path.
+
+        ``path_count`` is the number of paths with savings and ``truncated``
+        the number of them left out of ``by_path``.
+        """
+        totals: Dict[int, List[int]] = {}
+        for (_, path_id), (_, size) in self.entries.items():
+            entry = totals.get(path_id)
+            if entry is None:
+                totals[path_id] = [self._removed.get(path_id, 0), size]
+            else:
+                entry[1] += size
+        ranked, truncated = self._ranked(totals, limit)
+        return {
+            "by_path": [
+                {"path": path, "fields_removed": count, "bytes_saved": size}
+                for path, (count, size) in ranked
+            ],
+            "path_count": len(ranked) + truncated,
+            "truncated": truncated,
+        }
+
+    def by_pass(
+        self, passes: Sequence[OptimizationPass], limit: int = MAX_LISTED_SAVINGS
+    ) -> Dict[str, Any]:
+        """Return the total and largest per path savings of each pass.
+
+        As in ``by_path``, at most ``limit`` paths are listed per pass.
+        """
+        grouped: Dict[str, Dict[int, List[int]]] = {p.name: {} for p in passes}
+        for (name, path_id), totals in self.entries.items():
+            grouped[name][path_id] = totals
+        result = {}
+        for name, totals in grouped.items():
+            ranked, truncated = self._ranked(totals, limit)
+            result[name] = {
+                "bytes_saved": sum(size for _, size in totals.values()),
+                "by_path": [
+                    {"path": path, "count": count, "bytes_saved": size}
+                    for path, (count, size) in ranked
+                ],
+                "path_count": len(ranked) + truncated,
+                "truncated": truncated,
+            }
+        return result
@@ -1,71 +1,780 @@
 """API response optimization tool for the Template MCP Server."""
 
-import json
-from typing import Any, Dict
+import hashlib
+import os
+from json.encoder import encode_basestring_ascii
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
+from api_intelligence_mcp.src.tools.compiled_cleaner import (
+    ShapeMismatch,
+    compiled_cleaners,
+)
+from api_intelligence_mcp.src.tools.json_stream import (
+    DEFAULT_CHUNK_SIZE,
+    JSONEventStream,
+    Source,
+    encode_scalar,
+    iter_chunks,
+    resolve_input_path,
+    resolve_output_path,
+    utf8_size,
+)
+from api_intelligence_mcp.src.tools.optimization_passes import (
+    DEFAULT_FLOAT_DIGITS,
+    TABLE_KEYS,
+    OptimizationPass,
+    PassSavings,
+    build_passes,
+    is_ref,
+    is_refs_document,
+    is_table,
+    scalar_hooks,
+)
+from api_intelligence_mcp.src.tools.parse_cache import load_json
+from api_intelligence_mcp.src.tools.traversal import (
+    CONTAINER_KINDS,
+    SKIP,
+    PathTable,
+    TreeBuilder,
+    walk,
+)
 from api_intelligence_mcp.utils.pylogger import get_python_logger
 
 logger = get_python_logger()
 
+# (digest, parent container, key or index, path id, size) of a subtree
+# that may be moved to the reference table
+_Occurrence = Tuple[str, Any, Any, int, int]
+
+
+def pass_names(
+    remove_nulls: bool = True, remove_empty_arrays: bool = True
+) -> List[str]:
+    """Return the passes selected by the original removal flags."""
+    names = []
+    if remove_nulls:
+        names.append("nulls")
+    if remove_empty_arrays:
+        names.append("empty_arrays")
+    return names
+
+
+class _PassEngine:
+    """Pass configuration and accounting shared by the tree and stream cleaners."""
+
+    def __init__(
+        self,
+        passes: Optional[Sequence[OptimizationPass]],
+        remove_nulls: bool,
+        remove_empty_arrays: bool,
+    ):
+        if passes is None:
+            passes = build_passes(pass_names(remove_nulls, remove_empty_arrays))
+        self.passes = list(passes)
+        self._drops, self._rewrites = scalar_hooks(self.passes)
+        self._drop_empty_arrays = any(p.drops_empty_arrays for p in self.passes)
+        self._drop_empty_objects = any(p.drops_empty_objects for p in self.passes)
+        self._tables = any(p.tables for p in self.passes)
+        self._compact = any(p.compact for p in self.passes)
+        self._dedupe = any(p.dedupes for p in self.passes)
+        self._key_separator = ":" if self._compact else ": "
+        self._item_separator = "," if self._compact else ", "
+        self._key_separator_size = len(self._key_separator)
+        self._item_separator_size = len(self._item_separator)
+        self.savings = PassSavings()
+        self.paths = self.savings.paths
+        # JSON text of each distinct key
+        self._keys: Dict[str, str] = {}
+
+    @property
+    def fields_removed(self) -> List[str]:
+        """Return the distinct schema paths of the removed fields."""
+        return self.savings.fields_removed()
+
+    def _key_text(self, key: str) -> str:
+        text = self._keys.get(key)
+        if text is None:
+            text = self._keys[key] = encode_basestring_ascii(key)
+        return text
+
+    def _rewrite(self, value: Any, parent_path: Optional[int], key: Any) -> Any:
+        """Apply the rewrite passes to a scalar and record their savings."""
+        for rewrite_pass in self._rewrites:
+            new = rewrite_pass.rewrite(value)
+            if new is not value and new != value:
+                path = (
+                    PathTable.ROOT
+                    if parent_path is None
+                    else self.paths.child(parent_path, key)
+                )
+                self.savings.add(
+                    rewrite_pass.name,
+                    path,
+                    len(encode_scalar(value)) - len(encode_scalar(new)),
+                )
+                value = new
+        return value
+
+    def _remove(self, entry: List[Any], name: str, key: str, value_size: int) -> None:
+        """Record the removal of a member from the open container ``entry``.
+
+        Savings are measured with the default separators: the member's key,
+        ``": "``, its value and the ``", "`` separating it from a sibling.
+        """
+        path = self.paths.child(entry[0], key)
+        key_text = self._keys.get(key)
+        if key_text is None:
+            key_text = self._key_text(key)
+        size = len(key_text) + value_size + 4
+        entry[1] = self.savings.remove(name, path, size)
+
+    def _close(self, entry: List[Any], members: int, is_object: bool) -> None:
+        """Record the separator savings of a finished container.
+
+        ``entry`` starts with the container's path id and the removal entry
+        of its last removed member.
+        """
+        if members:
+            if self._compact:
+                # One byte per ", " and per ": "
+                saved = members - 1 + (members if is_object else 0)
+                self.savings.add("minify", entry[0], saved)
+        elif entry[1] is not None:
+            # Every member was removed, so one separator fewer was saved
+            self.savings.entries[entry[1]][1] -= 2
+
+
+class CleanVisitor(_PassEngine, TreeBuilder):
+    """Rebuild a document with the optimizer passes applied in one walk.
+
+    Without ``passes``, null fields and/or empty array fields are removed as
+    selected by the flags. The UTF-8 size of the output, ``json.dumps`` of
+    ``result`` (with compact separators under the minify pass), is counted
+    while it is built (``optimized_bytes``), and ``savings`` records the
+    bytes each pass saved by schema path. Arrays of same-shaped objects are
+    rewritten as tables when they are left, and repeated subtrees are moved
+    to the reference table when the walk finishes.
+    """
+
+    def __init__(
+        self,
+        remove_nulls: bool = True,
+        remove_empty_arrays: bool = True,
+        passes: Optional[Sequence[OptimizationPass]] = None,
+    ):
+        """Initialize the visitor.
+
+        Args:
+            remove_nulls: Drop object members whose value is null
+            remove_empty_arrays: Drop object members whose value is an empty array
+            passes: The passes to apply, instead of those selected by the flags
+        """
+        TreeBuilder.__init__(self)
+        _PassEngine.__init__(self, passes, remove_nulls, remove_empty_arrays)
+        self.optimized_bytes = 0
+        # [path id, removal entry of the last removed member, optimized_bytes
+        # when entered, occurrence log length when entered, child tokens,
+        # shared keys of the elements (None before the first, False once
+        # they differ)] of each open container
+        self._open: List[List[Any]] = []
+        # Value of the scalar being visited, after the rewrite passes
+        self._scalar: Any = None
+        self._log: List[_Occurrence] = []
+        self._seen: set = set()
+
+    def enter_value(
+        self, value: Any, kind: str, key: Any, depth: int, weight: float
+    ) -> Any:
+        """Apply the removal and rewrite passes before a value is visited."""
+        containers = self._containers
+        in_object = bool(containers) and type(containers[-1]) is dict
+        open_entries = self._open
+        if kind not in CONTAINER_KINDS:
+            if self._rewrites:
+                value = self._rewrite(
+                    value,
+                    open_entries[-1][0] if open_entries else None,
+                    key if in_object else None,
+                )
+            if in_object and self._drops:
+                for drop_pass in self._drops:
+                    if drop_pass.drops(key, value):
+                        self._remove(
+                            open_entries[-1],
+                            drop_pass.name,
+                            key,
+                            len(encode_scalar(value)),
+                        )
+                        return SKIP
+            self._scalar = value
+            return None
+
+        if in_object and self._drop_empty_arrays and kind == "array":
+            if not value:
+                self._remove(open_entries[-1], "empty_arrays", key, 2)
+                return SKIP
+        if not open_entries:
+            path = PathTable.ROOT
+        else:
+            path = self.paths.child(open_entries[-1][0], key if in_object else None)
+        open_entries.append(
+            [
+                path,
+                None,
+                self.optimized_bytes,
+                len(self._log),
+                [] if self._dedupe else None,
+                None,
+            ]
+        )
+        return TreeBuilder.enter_value(self, value, kind, key, depth, weight)
+
+    def leave_value(
+        self, value: Any, kind: str, key: Any, depth: int, weight: float
+    ) -> None:
+        """Add the finished value to its parent and count its encoded size."""
+        containers = self._containers
+        token = None
+        if kind in CONTAINER_KINDS:
+            value = containers.pop()
+            entry = self._open.pop()
+            members = len(value)
+            is_object = type(value) is dict
+            self._close(entry, members, is_object)
+            if members:
+                size = 2 + self._item_separator_size * (members - 1)
+            else:
+                size = 2
+                if (
+                    self._drop_empty_objects
+                    and is_object
+                    and containers
+                    and type(containers[-1]) is dict
+                ):
+                    self._remove(self._open[-1], "empty_objects", key, 2)
+                    return
+            if self._tables:
+                if not is_object:
+                    if entry[5] and members > 1:
+                        value = self._tabulate(value, entry)
+                elif is_table(value):
+                    raise ValueError(
+                        f"Object at {self.paths.render(entry[0]) or 'the root'} "
+                        "has the form of a table, so the table pass could not "
+                        "be reversed"
+                    )
+            if self._dedupe:
+                if is_object and (
+                    is_ref(value) or (not containers and is_refs_document(value))
+                ):
+                    raise ValueError(
+                        f"Object at {self.paths.render(entry[0]) or 'the root'} "
+                        "has the form of the dedupe pass output, so the dedupe "
+                        "pass could not be reversed"
+                    )
+                token = self._log_subtree(
+                    key, is_object, entry, self.optimized_bytes + size - entry[2]
+                )
+        else:
+            value = self._scalar
+            token = encode_scalar(value)
+            size = len(token)
+
+        # Same as TreeBuilder.leave_value, inlined as it runs for every kept value
+        if not containers:
+            self.optimized_bytes += size
+            self.result = value
+            if self._dedupe:
+                self._move_repeated_subtrees()
+            return
+        parent = containers[-1]
+        if type(parent) is dict:
+            key_text = self._keys.get(key)
+            if key_text is None:
+                key_text = self._key_text(key)
+            self.optimized_bytes += size + len(key_text) + self._key_separator_size
+            parent[key] = value
+            if self._dedupe:
+                self._open[-1][4].append(key_text + ":" + token)
+        else:
+            self.optimized_bytes += size
+            parent.append(value)
+            if self._dedupe:
+                self._open[-1][4].append(token)
+            if self._tables:
+                self._track_shape(value)
+
+    def _track_shape(self, value: Any) -> None:
+        """Check whether the elements of the open array share their keys."""
+        entry = self._open[-1]
+        shape = entry[5]
+        if shape is False:
+            return
+        if type(value) is not dict or not value:
+            entry[5] = False
+            return
+        keys = tuple(value)
+        if shape is None:
+            # Tables are not nested as rows, so restoring stays bottom-up
+            entry[5] = keys if keys != TABLE_KEYS else False
+        elif keys != shape:
+            entry[5] = False
+
+    def _tabulate(self, array: List[Any], entry: List[Any]) -> Any:
+        """Return an array of same-shaped objects as a table if that is smaller."""
+        shape = entry[5]
+        key_bytes = 0
+        for key in shape:
+            key_text = self._keys.get(key)
+            if key_text is None:
+                key_text = self._key_text(key)
+            key_bytes += len(key_text)
+        key_separator = self._key_separator_size
+        item_separator = self._item_separator_size
+        # {"columns": [keys], "rows": [...]} around rows that lose their keys
+        overhead = (
+            len('{"columns""rows"}[]')
+            + 2 * key_separator
+            + item_separator * len(shape)
+            + key_bytes
+        )
+        saved = len(array) * (key_bytes + key_separator * len(shape)) - overhead
+        if saved <= 0:
+            return array
+        rows = [list(row.values()) for row in array]
+        if self._dedupe:
+            self._remap_log(entry[3], array, rows, shape)
+        self.optimized_bytes -= saved
+        self.savings.add("table", entry[0], saved)
+        return {"columns": list(shape), "rows": rows}
+
+    def _remap_log(
+        self, mark: int, array: List[Any], rows: List[List[Any]], shape: Tuple
+    ) -> None:
+        """Point the dedupe candidates inside tabulated objects at their rows.
+
+        The objects themselves are no longer in the output, so they stop
+        being candidates.
+        """
+        positions = {id(row): position for position, row in enumerate(array)}
+        columns = {key: column for column, key in enumerate(shape)}
+        kept = []
+        for occurrence in self._log[mark:]:
+            digest, parent, key, path, size = occurrence
+            if parent is array:
+                continue
+            position = positions.get(id(parent))
+            if position is not None:
+                occurrence = (digest, rows[position], columns[key], path, size)
+            kept.append(occurrence)
+        self._log[mark:] = kept
+
+    def _log_subtree(
+        self, key: Any, is_object: bool, entry: List[Any], size: int
+    ) -> str:
+        """Digest a finished container and log it as a dedupe candidate.
+
+        The digest covers the JSON text of the container with nested
+        containers replaced by their digests. Only the first of equal
+        subtrees keeps the candidates logged inside it, as later copies are
+        replaced whole or not at all.
+        """
+        opening = "{" if is_object else "["
+        digest = hashlib.blake2b(
+            (opening + ",".join(entry[4])).encode("ascii"), digest_size=16
+        ).hexdigest()
+        containers = self._containers
+        if containers and size > len('{"$ref":"r0"}'):
+            parent = containers[-1]
+            if type(parent) is not dict:
+                key = len(parent)
+            if digest in self._seen:
+                del self._log[entry[3] :]
+            else:
+                self._seen.add(digest)
+            self._log.append((digest, parent, key, entry[0], size))
+        return "#" + digest
+
+    def _move_repeated_subtrees(self) -> None:
+        """Replace repeated subtrees with references where that saves bytes."""
+        groups: Dict[str, List[_Occurrence]] = {}
+        for occurrence in self._log:
+            groups.setdefault(occurrence[0], []).append(occurrence)
+        self._log = []
+        repeated = [group for group in groups.values() if len(group) > 1]
+        if not repeated:
+            return
+
+        key_separator = len(self._key_separator)
+        item_separator = len(self._item_separator)
+        # {"$ref": "rN"} and "rN": subtree, with the longest id
+        ref_base = len('{"$ref"}') + key_separator
+        id_size = len(f'"r{len(repeated) - 1}"')
+
+        def net(group: List[_Occurrence], id_size: int) -> int:
+            size = group[0][4]
+            entry_size = id_size + key_separator + size + item_separator
+            return len(group) * (size - ref_base - id_size) - entry_size
+
+        chosen = [group for group in repeated if net(group, id_size) > 0]
+        # {"data": ..., "$refs": {...}}; its item separator stands in for
+        # the one charged after the last table entry
+        wrapper = len('{"data""$refs"{}}') + 2 * key_separator
+        ids = [f"r{index}" for index in range(len(chosen))]
+        total = sum(net(group, len(ref_id) + 2) for group, ref_id in zip(chosen, ids))
+        if total <= wrapper:
+            return
+
+        # Take every table value before replacing any position, as the
+        # first copy of a subtree may hold replaced positions itself
+        table = {ref_id: group[0][1][group[0][2]] for group, ref_id in zip(chosen, ids)}
+        for group, ref_id in zip(chosen, ids):
+            ref = {"$ref": ref_id}
+            id_size = len(ref_id) + 2
+            size = group[0][4]
+            for _, parent, key, path, _ in group:
+                parent[key] = ref
+                self.savings.add("dedupe", path, size - ref_base - id_size)
+            self.savings.add(
+                "dedupe",
+                group[0][3],
+                -(id_size + key_separator + size + item_separator),
+                count=0,
+            )
+        self.savings.add("dedupe", PathTable.ROOT, -wrapper, count=0)
+        self.optimized_bytes -= total - wrapper
+        self.result = {"data": self.result, "$refs": table}
+
+
+class StreamingCleaner(_PassEngine):
+    """Write a document with the optimizer passes applied from parse events.
+
+    The output is identical to ``json.dumps`` of the ``CleanVisitor`` result
+    (with compact separators under the minify pass). Only one entry per open
+    container is kept, plus the key of an array member until the next event
+    shows whether the array is empty, so memory is bounded by the nesting
+    depth and ``chunk_size``. Passes that need a whole subtree (empty
+    objects, dedupe) are not supported.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[str], Any],
+        remove_nulls: bool = True,
+        remove_empty_arrays: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        passes: Optional[Sequence[OptimizationPass]] = None,
+    ):
+        """Initialize the cleaner.
+
+        Args:
+            write: Called with each chunk of the optimized JSON text
+            remove_nulls: Drop object members whose value is null
+            remove_empty_arrays: Drop object members whose value is an empty array
+            chunk_size: Characters buffered before a chunk is written
+            passes: The passes to apply, instead of those selected by the flags
+
+        Raises:
+            ValueError: If a pass does not support streaming
+        """
+        _PassEngine.__init__(self, passes, remove_nulls, remove_empty_arrays)
+        unsupported = [p.name for p in self.passes if not p.streamable]
+        if unsupported:
+            raise ValueError(
+                f"Passes not supported in streaming mode: {', '.join(unsupported)}"
+            )
+        self.write = write
+        self.chunk_size = chunk_size
+        self.bytes_written = 0
+
+    def consume(self, events: Iterable[Tuple[str, Any]]) -> None:
+        """Clean the parse events of one document and write the result."""
+        parts: List[str] = []
+        buffered = 0
+        key_separator = self._key_separator
+        item_separator = self._item_separator
+        # One [path id, removal entry of the last removed member, is object,
+        # members written] entry per open container
+        open_containers: List[List[Any]] = []
+        key = None
+        pending_key = None
+        for event, value in events:
+            if event == "map_key":
+                key = value
+                continue
+            if pending_key is not None:
+                if event == "end_array":
+                    open_containers.pop()
+                    self._remove(open_containers[-1], "empty_arrays", pending_key, 2)
+                    pending_key = None
+                    continue
+                # The array has an element, so its member is written after all
+                parent = open_containers[-2]
+                parts.append(
+                    (item_separator if parent[3] else "")
+                    + self._key_text(pending_key)
+                    + key_separator
+                    + "["
+                )
+                buffered += len(parts[-1])
+                parent[3] += 1
+                pending_key = None
+
+            if event == "end_map" or event == "end_array":
+                entry = open_containers.pop()
+                self._close(entry, entry[3], entry[2])
+                parts.append("}" if event == "end_map" else "]")
+            else:
+                parent = open_containers[-1] if open_containers else None
+                in_object = parent is not None and parent[2]
+                if event == "value":
+                    if self._rewrites:
+                        value = self._rewrite(
+                            value,
+                            parent[0] if parent is not None else None,
+                            key if in_object else None,
+                        )
+                    if in_object and self._drops_member(parent, key, value):
+                        continue
+                elif parent is None:
+                    path = PathTable.ROOT
+                else:
+                    path = self.paths.child(parent[0], key if in_object else None)
+                    if in_object and self._drop_empty_arrays and event == "start_array":
+                        open_containers.append([path, None, False, 0])
+                        pending_key = key
+                        continue
+                if parent is not None:
+                    if in_object:
+                        parts.append(
+                            (item_separator if parent[3] else "")
+                            + self._key_text(key)
+                            + key_separator
+                        )
+                    elif parent[3]:
+                        parts.append(item_separator)
+                    parent[3] += 1
+                if event == "value":
+                    parts.append(encode_scalar(value))
+                else:
+                    is_object = event == "start_map"
+                    open_containers.append([path, None, is_object, 0])
+                    parts.append("{" if is_object else "[")
+
+            buffered += len(parts[-1])
+            if buffered >= self.chunk_size:
+                self._flush(parts)
+                parts = []
+                buffered = 0
+        self._flush(parts)
+
+    def _drops_member(self, parent: List[Any], key: str, value: Any) -> bool:
+        for drop_pass in self._drops:
+            if drop_pass.drops(key, value):
+                self._remove(parent, drop_pass.name, key, len(encode_scalar(value)))
+                return True
+        return False
+
+    def _flush(self, parts: List[str]) -> None:
+        if parts:
+            chunk = "".join(parts)
+            # The output is ASCII, so characters equal UTF-8 bytes
+            self.bytes_written += len(chunk)
+            self.write(chunk)
+
+
+def clean_document(
+    data: Any, passes: Sequence[OptimizationPass]
+) -> Tuple[Any, int, PassSavings, bool]:
+    """Apply the passes to a parsed document.
+
+    Uses the compiled cleaner cached for the document's shape, and the
+    generic ``CleanVisitor`` walk on a cache miss or when the document does
+    not fit the cached cleaner's shape.
+
+    Returns:
+        The cleaned document, the UTF-8 size of its JSON text, the savings of
+        each pass and whether a compiled cleaner was used
+    """
+    key, compiled = compiled_cleaners.lookup(data, passes)
+    if compiled is not None:
+        try:
+            return (*compiled.run(data), True)
+        except ShapeMismatch:
+            compiled_cleaners.mismatch(key)
+    cleaner = CleanVisitor(passes=passes)
+    walk(data, cleaner)
+    compiled_cleaners.learn(key, data, passes, rejected=compiled)
+    return cleaner.result, cleaner.optimized_bytes, cleaner.savings, False
+
+
+def _size_report(
+    passes: Sequence[OptimizationPass],
+    savings: PassSavings,
+    original_bytes: int,
+    optimized_bytes: int,
+) -> Dict[str, Any]:
+    """Return the sizes, removed fields and savings of an optimization."""
+    original_size = round(original_bytes / 1024, 2)
+    optimized_size = round(optimized_bytes / 1024, 2)
+    by_path = savings.by_path()
+    return {
+        "passes": [p.name for p in passes],
+        "fields_removed": savings.fields_removed(),
+        "fields_removed_count": savings.fields_removed_count,
+        "original_size_kb": original_size,
+        "optimized_size_kb": optimized_size,
+        "size_reduction_kb": round(original_size - optimized_size, 2),
+        "original_size_bytes": original_bytes,
+        "optimized_size_bytes": optimized_bytes,
+        "bytes_saved_by_path": by_path["by_path"],
+        "bytes_saved_by_path_count": by_path["path_count"],
+        "bytes_saved_by_path_truncated": by_path["truncated"],
+        "pass_savings": savings.by_pass(passes),
+    }
+
+
+def optimize_stream(
+    source: Source,
+    write: Callable[[str], Any],
+    remove_nulls: bool = True,
+    remove_empty_arrays: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    passes: Optional[Sequence[OptimizationPass]] = None,
+) -> Dict[str, Any]:
+    """Write the optimized form of a JSON document without loading it.
+
+    Args:
+        source: JSON text, UTF-8 bytes, a file path (``os.PathLike``) or an
+            iterable of text/byte chunks
+        write: Called with each chunk of the optimized JSON text
+        remove_nulls: Drop object members whose value is null
+        remove_empty_arrays: Drop object members whose value is an empty array
+        chunk_size: Size of the chunks read and written
+        passes: The passes to apply, instead of those selected by the flags
+
+    Returns:
+        Dict[str, Any]: The removed fields, sizes and savings, without the
+        document
+
+    Raises:
+        json.JSONDecodeError: If the input is not valid JSON
+        ValueError: If a pass does not support streaming
+    """
+    cleaner = StreamingCleaner(
+        write, remove_nulls, remove_empty_arrays, chunk_size, passes=passes
+    )
+    stream = JSONEventStream(iter_chunks(source, chunk_size))
+    cleaner.consume(stream.events())
+    return _size_report(
+        cleaner.passes, cleaner.savings, stream.bytes_read, cleaner.bytes_written
+    )
+
+
+def _optimize_to_file(
+    source: Source, output_path: str, **options: Any
+) -> Dict[str, Any]:
+    """Stream the optimized document into a file inside ``TOOL_FILE_OUTPUT_DIR``.
+
+    The file is written under a temporary name and renamed when complete, so
+    readers never see a partial document.
+    """
+    path = resolve_output_path(output_path)
+    partial = path.with_name(f".{path.name}.partial")
+    try:
+        with open(partial, "w", encoding="utf-8") as f:
+            result = optimize_stream(source, f.write, **options)
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
+    result["output_path"] = output_path
+    return result
+
 
 def optimize_api_response_schema(
-    response_json: str,
+    response_json: str = "",
     remove_nulls: bool = True,
     remove_empty_arrays: bool = True,
+    streaming: bool = False,
+    file_path: Optional[str] = None,
+    output_path: Optional[str] = None,
+    passes: Optional[List[str]] = None,
+    float_digits: int = DEFAULT_FLOAT_DIGITS,
+    default_values: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """Optimize API response by removing unnecessary fields.
 
     TOOL_NAME=optimize_api_response_schema
     DISPLAY_NAME=API Response Optimizer
-    USECASE=Clean API JSON by removing null fields and empty arrays
-    INSTRUCTIONS=1. Provide valid JSON string, 2. Configure removal flags, 3. Receive optimized JSON
-    INPUT_DESCRIPTION=response_json (string), remove_nulls (bool), remove_empty_arrays (bool)
-    OUTPUT_DESCRIPTION=Dictionary with optimized JSON and size comparison
-    EXAMPLES=optimize_api_response_schema('{"id":1,"name":null}')
-    PREREQUISITES=Valid JSON string
+    USECASE=Clean API JSON by removing null fields, empty arrays and other redundant data, or by writing listings as column/row tables, with the bytes saved by each optimization pass; use streaming for very large payloads or files
+    INSTRUCTIONS=1. Provide valid JSON string (or a file_path), 2. Configure removal flags, or pick the optimization passes to run, 3. Set streaming=true for payloads too large to load, optionally with an output_path to write the result to, 4. Receive optimized JSON
+    INPUT_DESCRIPTION=response_json (string), remove_nulls (bool), remove_empty_arrays (bool), streaming (bool): clean incrementally and return the optimized JSON text in chunks, file_path (string, optional): JSON file inside the server's TOOL_FILE_INPUT_DIR to optimize instead of response_json (always streamed), output_path (string, optional): file inside the server's TOOL_FILE_OUTPUT_DIR to write the optimized JSON to instead of returning it (always streamed), passes (list of strings, optional): passes to run instead of the removal flags, among nulls, empty_arrays, empty_objects, empty_strings, defaults, round_floats, table, minify and dedupe (empty_objects, table and dedupe are not available in streaming mode), float_digits (int, default 6): digits kept by round_floats, default_values (object, optional): default scalar value by field name for the defaults pass (false and 0 when omitted)
+    OUTPUT_DESCRIPTION=Dictionary with optimized JSON (a parsed object, or optimized_chunks / output_path in streaming mode), size comparison, the paths of the removed fields, the paths with the largest byte savings (at most 100, with the number of paths) and the bytes saved by pass with at most 100 paths each, and whether a compiled cleaner was used with the stats of the compiled cleaner cache of the worker that served the call
+    EXAMPLES=optimize_api_response_schema('{"id":1,"name":null}'), optimize_api_response_schema(response_json, passes=["nulls", "empty_objects", "round_floats", "minify", "dedupe"], float_digits=2), optimize_api_response_schema(file_path="dump.json", output_path="dump.min.json")
+    PREREQUISITES=Valid JSON string or file
     RELATED_TOOLS=analyze_api_response
 
-    CPU-bound transformation operation.
+    CPU-bound transformation operation. All passes run in a single traversal
+    that also counts the output size, so the savings are exact without
+    serializing the result. Payload shapes seen repeatedly are cleaned by a
+    compiled, shape-specific function (see ``compiled_cleaner``). Streaming
+    mode tokenizes the input and writes the cleaned output as it goes, so
+    memory stays bounded regardless of payload size when reading from and
+    writing to files.
+
+    The compiled cleaner cache lives in the worker serving the call, and
+    ``compiled_cleaner_cache`` reports that worker's cache only. In the
+    default ``process`` execution mode each pool worker sees a shape twice
+    before compiling it; routing the tool to ``thread`` mode
+    (``TOOL_EXECUTION_ROUTES``) shares one cache across calls.
     """
     try:
-        if not response_json or not isinstance(response_json, str):
-            raise ValueError("response_json must be a non-empty string")
+        if passes is None:
+            passes = pass_names(remove_nulls, remove_empty_arrays)
+        selected = build_passes(passes, float_digits, default_values)
 
-        data = json.loads(response_json)
+        if file_path or output_path:
+            streaming = True
+        if streaming:
+            if file_path:
+                source: Source = resolve_input_path(file_path)
+            elif not response_json or not isinstance(response_json, str):
+                raise ValueError("response_json must be a non-empty string")
+            else:
+                source = response_json
+            if output_path:
+                result = _optimize_to_file(source, output_path, passes=selected)
+            else:
+                chunks: List[str] = []
+                result = optimize_stream(source, chunks.append, passes=selected)
+                result["optimized_chunks"] = chunks
 
-        fields_removed = []
+            logger.info("API response optimized successfully in streaming mode")
 
-        def clean(obj):
-            if isinstance(obj, dict):
-                new_dict = {}
-                for k, v in obj.items():
-                    if remove_nulls and v is None:
-                        fields_removed.append(k)
-                        continue
-                    if remove_empty_arrays and isinstance(v, list) and len(v) == 0:
-                        fields_removed.append(k)
-                        continue
-                    new_dict[k] = clean(v)
-                return new_dict
-            elif isinstance(obj, list):
-                return [clean(item) for item in obj]
-            else:
-                return obj
+            return {
+                "status": "success",
+                "streaming": True,
+                **result,
+                "message": "API response optimized successfully",
+            }
 
-        original_size = round(len(response_json.encode("utf-8")) / 1024, 2)
-        optimized_data = clean(data)
-        optimized_json = json.dumps(optimized_data)
-        optimized_size = round(len(optimized_json.encode("utf-8")) / 1024, 2)
+        if not response_json or not isinstance(response_json, str):
+            raise ValueError("response_json must be a non-empty string")
+
+        data = load_json(response_json)
+
+        optimized, optimized_bytes, savings, compiled = clean_document(data, selected)
 
         logger.info("API response optimized successfully")
 
         return {
             "status": "success",
-            "optimized_response": optimized_data,
-            "fields_removed": fields_removed,
-            "original_size_kb": original_size,
-            "optimized_size_kb": optimized_size,
-            "size_reduction_kb": round(original_size - optimized_size, 2),
+            "optimized_response": optimized,
+            **_size_report(
+                selected, savings, utf8_size(response_json), optimized_bytes
+            ),
+            "compiled_cleaner": compiled,
+            "compiled_cleaner_cache": compiled_cleaners.stats(),
             "message": "API response optimized successfully",
         }
 
@@ -75,4 +784,4 @@ def optimize_api_response_schema(
             "status": "error",
             "error": str(e),
             "message": "Failed to optimize API response",
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,127 @@
+"""Shared parsed-document cache for the API intelligence tools.
+
+Agents often run several tools on the same payload (analyze, then optimize,
+then document). ``load_json`` parses each distinct payload once and hands
+every later call the cached tree, keyed by a BLAKE2b hash of the content.
+
+Documents nested deeper than ``json.loads`` supports are parsed with the
+iterative parser from ``json_stream`` instead.
+
+Cached trees are shared between calls and MUST be treated as read-only by the
+tools. ``ParseCache.derive`` keeps values computed from a tree, such as the
+Merkle hash index of ``structural_hash``, next to it so they are built once per
+payload and evicted together with the tree. The cache lives in the process
+that runs the tool, so with the process pool each worker keeps its own cache.
+"""
+
+import hashlib
+import json
+from typing import Any, Callable, Dict, Optional
+
+from api_intelligence_mcp.src.settings import settings
+from api_intelligence_mcp.src.tools.json_stream import loads_iterative
+from api_intelligence_mcp.utils.lru_cache import LRUCache
+
+# Parsed Python objects take several times the memory of their JSON text
+_PARSED_SIZE_FACTOR = 8
+
+
+def content_key(text: str) -> str:
+    """Return the cache key for a JSON document."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _parse(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except RecursionError:
+        return loads_iterative(text)
+
+
+class _Document:
+    """A cached parsed tree and the values derived from it."""
+
+    __slots__ = ("data", "derived")
+
+    def __init__(self, data: Any):
+        self.data = data
+        self.derived: Dict[str, Any] = {}
+
+
+class ParseCache:
+    """LRU cache of parsed JSON documents bounded by an estimated memory budget."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_entries: int = 64,
+        max_bytes: Optional[int] = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            enabled: Parse on every call when False
+            max_entries: Maximum number of parsed documents kept
+            max_bytes: Estimated memory budget of all parsed documents
+        """
+        self.enabled = enabled
+        self._cache = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+
+    def load(self, text: str) -> Any:
+        """Parse a JSON document, reusing the tree of an identical earlier one.
+
+        Raises:
+            json.JSONDecodeError: If the text is not valid JSON
+        """
+        return self._document(text).data
+
+    def derive(self, text: str, name: str, build: Callable[[Any], Any]) -> Any:
+        """Return ``build(tree)`` for a document, computed once per cached tree.
+
+        Derived values are not counted towards ``max_bytes``; they are dropped
+        when their tree is evicted.
+
+        Args:
+            text: The JSON document
+            name: Name of the derived value, unique per ``build`` function
+            build: Function computing the value from the parsed tree
+
+        Raises:
+            json.JSONDecodeError: If the text is not valid JSON
+        """
+        document = self._document(text)
+        value = document.derived.get(name)
+        if value is None:
+            value = document.derived[name] = build(document.data)
+        return value
+
+    def _document(self, text: str) -> _Document:
+        if not self.enabled:
+            return _Document(_parse(text))
+
+        key = content_key(text)
+        document = self._cache.get(key)
+        if document is None:
+            document = _Document(_parse(text))
+            self._cache.set(key, document, size=len(text) * _PARSED_SIZE_FACTOR)
+        return document
+
+    def clear(self) -> None:
+        """Drop every parsed document and reset the counters."""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit rate, evictions and occupancy of the cache."""
+        return {"enabled": self.enabled, **self._cache.stats()}
+
+
+parse_cache = ParseCache(
+    enabled=settings.TOOL_PARSE_CACHE_ENABLED,
+    max_entries=settings.TOOL_PARSE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.TOOL_PARSE_CACHE_MAX_BYTES,
+)
+
+
+def load_json(text: str) -> Any:
+    """Parse a tool's JSON input through the shared parse cache."""
+    return parse_cache.load(text)
@@ -0,0 +1,55 @@
+"""Schema baseline registration tool for the Template MCP Server."""
+
+import asyncio
+from typing import Any, Dict
+
+from api_intelligence_mcp.src.tools.baseline_registry import baseline_registry
+from api_intelligence_mcp.src.tools.compare_api_responses import (
+    schema_and_fingerprint,
+)
+from api_intelligence_mcp.utils.pylogger import get_python_logger
+
+logger = get_python_logger()
+
+
+async def save_schema_baseline(
+    baseline_id: str,
+    response: str,
+) -> Dict[str, Any]:
+    """Save the schema of an API response as a named baseline.
+
+    TOOL_NAME=save_schema_baseline
+    DISPLAY_NAME=API Schema Baseline Saver
+    USECASE=Record the schema of a reference API response once so later responses can be checked against it without resending it
+    INSTRUCTIONS=1. Provide a baseline ID and the reference JSON string, 2. Call function, 3. Use the ID with compare_with_baseline
+    INPUT_DESCRIPTION=baseline_id (string), response (string)
+    OUTPUT_DESCRIPTION=Dictionary with the baseline ID, its structural fingerprint and field count
+    EXAMPLES=save_schema_baseline('users-v1', '{"id":1,"name":"John"}')
+    PREREQUISITES=Valid JSON string
+    RELATED_TOOLS=compare_with_baseline, compare_api_responses
+
+    The response is parsed and flattened in a worker thread; only the
+    flattened schema and the fingerprint are stored.
+    """
+    try:
+        if not baseline_id:
+            raise ValueError("baseline_id must not be empty")
+
+        schema, fingerprint = await asyncio.to_thread(schema_and_fingerprint, response)
+        await baseline_registry.save(baseline_id, schema, fingerprint)
+
+        return {
+            "status": "success",
+            "baseline_id": baseline_id,
+            "fingerprint": fingerprint,
+            "field_count": len(schema),
+            "message": f"Schema baseline {baseline_id} saved successfully",
+        }
+
+    except Exception as e:
+        logger.error(f"Error saving schema baseline: {e}")
+        return {
+            "status": "error",
+            "error": str(e),
+            "message": "Failed to save schema baseline",
+        }
@@ -0,0 +1,248 @@
+"""Merged schemas of the values found at each position of a JSON document.
+
+``SchemaMerger`` turns the shapes interned by a ``ShapeRegistry`` into
+``MergedSchema`` trees in which the elements of every array are folded into
+one element schema: observed kinds are united, keys missing from some
+objects become optional and nullable positions include ``"null"``. Each
+distinct shape is converted once and each pair of distinct schemas merged
+once, so repeated array elements cost nothing after the first.
+
+``MergedSchemaVisitor`` computes the merged schema of a document in one
+walk; ``render_schema`` renders a schema bottom-up and ``flatten_schema``
+lists its leaf paths, both without recursion.
+"""
+
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from api_intelligence_mcp.src.tools.fingerprint import ShapeRegistry, ShapeVisitor
+from api_intelligence_mcp.src.tools.traversal import CONTAINER_KINDS
+
+_ARRAY_KIND = frozenset({"array"})
+
+
+class MergedSchema:
+    """The merged schema of every value seen at one position of a document.
+
+    ``types`` holds all observed kinds, so a field that is sometimes null
+    contains ``"null"``. ``properties``/``required`` are set when objects
+    were seen, ``items`` when non-empty arrays were seen. Instances are
+    shared between merges and must not be modified once built.
+    """
+
+    __slots__ = ("types", "properties", "required", "items")
+
+    def __init__(
+        self,
+        types: FrozenSet[str] = frozenset(),
+        properties: Optional[Dict[str, "MergedSchema"]] = None,
+        required: FrozenSet[str] = frozenset(),
+        items: Optional["MergedSchema"] = None,
+    ):
+        """Initialize the schema.
+
+        Args:
+            types: Observed kinds
+            properties: Schemas of the members of objects, by key
+            required: Keys present in every object
+            items: Merged schema of the array elements
+        """
+        self.types = types
+        self.properties = properties
+        self.required = required
+        self.items = items
+
+    def children(self) -> List["MergedSchema"]:
+        """Return the property schemas and the item schema."""
+        children = list(self.properties.values()) if self.properties else []
+        if self.items is not None:
+            children.append(self.items)
+        return children
+
+
+class SchemaMerger:
+    """Build merged schemas of interned shapes.
+
+    Schemas are memoized by shape id and merges by the pair of schemas, so
+    each distinct shape is converted and each pair of distinct schemas is
+    merged only once, however many elements share them.
+    """
+
+    def __init__(self, registry: ShapeRegistry):
+        """Initialize the merger.
+
+        Args:
+            registry: Registry the shapes were interned in
+        """
+        self.registry = registry
+        self._schemas: List[MergedSchema] = []
+        self._merges: Dict[Tuple[int, int], MergedSchema] = {}
+
+    def schema(self, shape_id: int) -> MergedSchema:
+        """Return the merged schema of a shape."""
+        schemas = self._schemas
+        # Children have smaller ids, so building in id order never recurses
+        for pending in range(len(schemas), shape_id + 1):
+            kind, body = self.registry.shapes[pending]
+            if kind == "scalar":
+                schema = MergedSchema(frozenset((body,)))
+            elif kind == "object":
+                schema = MergedSchema(
+                    frozenset(("object",)),
+                    properties={key: schemas[child] for key, child in body},
+                    required=frozenset(key for key, _ in body),
+                )
+            else:
+                items = None
+                for child in body:
+                    items = (
+                        schemas[child]
+                        if items is None
+                        else self.merge(items, schemas[child])
+                    )
+                schema = MergedSchema(frozenset(("array",)), items=items)
+            schemas.append(schema)
+        return schemas[shape_id]
+
+    def merge(self, first: MergedSchema, second: MergedSchema) -> MergedSchema:
+        """Return the union of two schemas.
+
+        Keys missing from either side become optional; children present on
+        both sides are merged iteratively, reusing memoized merges.
+        """
+        key = (id(first), id(second))
+        merged = self._merges.get(key)
+        if merged is not None:
+            return merged
+
+        merged = MergedSchema()
+        stack = [(merged, first, second)]
+        while stack:
+            target, a, b = stack.pop()
+            target.types = a.types | b.types
+
+            if a.properties is None or b.properties is None:
+                source = a if a.properties is not None else b
+                target.properties = source.properties
+                target.required = source.required
+            else:
+                properties = dict(a.properties)
+                for name, schema in b.properties.items():
+                    current = properties.get(name)
+                    if current is None or current is schema:
+                        properties[name] = schema
+                    else:
+                        properties[name] = self._pending(stack, current, schema)
+                target.properties = properties
+                target.required = a.required & b.required
+
+            if a.items is None or b.items is None or a.items is b.items:
+                target.items = a.items if a.items is not None else b.items
+            else:
+                target.items = self._pending(stack, a.items, b.items)
+
+        self._merges[key] = merged
+        return merged
+
+    def _pending(
+        self, stack: List[Any], first: MergedSchema, second: MergedSchema
+    ) -> MergedSchema:
+        """Return the memoized merge of two children, or queue it."""
+        merged = self._merges.get((id(first), id(second)))
+        if merged is None:
+            merged = self._merges[(id(first), id(second))] = MergedSchema()
+            stack.append((merged, first, second))
+        return merged
+
+
+def render_schema(
+    schema: MergedSchema,
+    build: Callable[[MergedSchema, Optional[Dict[str, Any]], Any], Any],
+) -> Any:
+    """Render a merged schema bottom-up without recursion.
+
+    ``build(schema, properties, items)`` renders one schema from the rendered
+    properties (None without objects) and the rendered items (None without
+    array elements). Schemas shared by several positions are rendered once.
+    """
+    rendered: Dict[int, Any] = {}
+    stack = [schema]
+    while stack:
+        current = stack[-1]
+        if id(current) in rendered:
+            stack.pop()
+            continue
+        pending = [child for child in current.children() if id(child) not in rendered]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        properties = None
+        if current.properties is not None:
+            properties = {
+                name: rendered[id(child)] for name, child in current.properties.items()
+            }
+        items = rendered[id(current.items)] if current.items is not None else None
+        rendered[id(current)] = build(current, properties, items)
+    return rendered[id(schema)]
+
+
+class MergedSchemaVisitor(ShapeVisitor):
+    """Compute the merged schema of the visited document.
+
+    Every visited array element contributes to its array's element schema.
+    Elements are reduced to interned shapes first, so elements with a shape
+    seen before cost no merging at all.
+    """
+
+    def __init__(self):
+        """Initialize the visitor."""
+        super().__init__(ShapeRegistry())
+        self.merger = SchemaMerger(self.registry)
+
+    @property
+    def schema(self) -> MergedSchema:
+        """Return the merged schema of the visited document."""
+        return self.merger.schema(self.result)
+
+    @property
+    def fingerprint(self) -> str:
+        """Return the structural fingerprint of the visited document."""
+        return self.registry.fingerprint(self.result)
+
+
+def flatten_schema(
+    schema: MergedSchema, path: str = "", member_prefix: str = ""
+) -> Dict[str, FrozenSet[str]]:
+    """Map the path of every leaf position of a schema to its observed kinds.
+
+    Objects are descended into with ``.key`` paths and array elements with
+    ``[]`` paths, as in ``extract_schema``: the members of the root are
+    written ``member_prefix + key`` and those of every other object
+    ``path + "." + key``, so members with empty keys keep their dot. A
+    position is a leaf if it held scalars, or arrays that were always empty;
+    container kinds with children are not reported. All paths are written
+    into one dict in a single iterative pass.
+
+    Args:
+        schema: Merged schema to flatten
+        path: Path of the schema's root
+        member_prefix: Prefix of the paths of the root's members
+    """
+    flat: Dict[str, FrozenSet[str]] = {}
+    stack = [(path, member_prefix, schema)]
+    while stack:
+        path, prefix, current = stack.pop()
+        kinds = current.types - CONTAINER_KINDS
+        if current.items is None and "array" in current.types:
+            kinds = kinds | _ARRAY_KIND
+        if kinds:
+            flat[path] = kinds
+        if current.items is not None:
+            items = f"{path}[]"
+            stack.append((items, f"{items}.", current.items))
+        if current.properties:
+            stack.extend(
+                (f"{prefix}{name}", f"{prefix}{name}.", child)
+                for name, child in reversed(current.properties.items())
+            )
+    return flat
@@ -0,0 +1,527 @@
+"""Merkle hashes of JSON subtrees and a diff that skips identical subtrees.
+
+``MerkleIndex`` hashes a parsed document bottom-up in one iterative pass and
+keeps two digests for every object and array:
+
+- a structural digest, the shape fingerprint from ``fingerprint`` (keys and
+  kinds, independent of values, key order and array lengths), and
+- a value digest over the canonical content (object key order ignored).
+
+Two subtrees with equal value digests are identical, and two with equal
+structural digests have the same flattened schema, so diffs only descend
+where digests differ and cost grows with the changed region rather than the
+document size. Indexes are built once per payload through the shared parse
+cache (see ``load_indexed``).
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from api_intelligence_mcp.src.tools.alignment import (
+    IDENTITY_KEYS,
+    align_sequences,
+    detect_key,
+    increasing_subsequence,
+)
+from api_intelligence_mcp.src.tools.fingerprint import (
+    _SCALAR_TYPES,
+    INLINE_LIMIT,
+    ShapeRegistry,
+    _InlineLimit,
+)
+from api_intelligence_mcp.src.tools.parse_cache import parse_cache
+from api_intelligence_mcp.src.tools.traversal import kind_of
+
+DIGEST_SIZE = 16
+
+# Value changes listed by diff_values; all of them are counted
+MAX_VALUE_CHANGES = 1000
+
+# Arrays needing more moves are replaced as a whole in the JSON Patch
+MAX_PATCH_MOVES = 1000
+
+
+def _encode(value: Any) -> bytes:
+    """Return the canonical encoding of a scalar; repr() keeps types apart."""
+    return repr(value).encode("utf-8", "surrogatepass")
+
+
+_canonical_json = json.JSONEncoder(
+    sort_keys=True, separators=(",", ":"), check_circular=False
+).encode
+
+
+def _json_digest(container: Any) -> bytes:
+    """Return the value digest of a small container from its canonical JSON."""
+    text = _canonical_json(container)
+    return hashlib.blake2b(b"j" + text.encode(), digest_size=DIGEST_SIZE).digest()
+
+
+class MerkleIndex:
+    """Structural and value digests of every container of one document.
+
+    Containers with more than ``INLINE_LIMIT`` values are hashed bottom-up
+    and their digests stored by container identity. Smaller subtrees, such
+    as the rows of a listing, are hashed in one step from their canonical
+    JSON text; digests of the containers inside them are computed on demand.
+    Whether a subtree is inlined depends only on its content, so equal
+    subtrees always get equal digests. The index is only valid for the exact
+    tree it was built from and keeps that tree alive.
+    """
+
+    def __init__(self, data: Any):
+        """Hash a parsed document.
+
+        Args:
+            data: The parsed JSON document
+        """
+        self.data = data
+        self.registry = ShapeRegistry()
+        self._scalar_shapes = {
+            value_type: self.registry.scalar(kind)
+            for value_type, kind in _SCALAR_TYPES.items()
+        }
+        self._budget = 0
+        # id(container) -> (shape id, value digest)
+        self._containers: Dict[int, Tuple[int, bytes]] = {}
+        self._build(data)
+
+    def _scalar_shape(self, value: Any) -> int:
+        shape_id = self._scalar_shapes.get(type(value))
+        if shape_id is None:
+            shape_id = self.registry.scalar(kind_of(value))
+        return shape_id
+
+    def _inline(self, container: Any) -> Optional[Tuple[int, bytes]]:
+        """Hash a small container in one step, or return None if it is large."""
+        self._budget = INLINE_LIMIT
+        try:
+            shape_id = self._shape(container)
+        except _InlineLimit:
+            return None
+        return shape_id, _json_digest(container)
+
+    def _shape(self, value: Any) -> int:
+        """Return the shape id of a container within the inline budget."""
+        value_type = type(value)
+        if value_type is not dict and value_type is not list:
+            raise _InlineLimit
+        self._budget -= len(value) + 1
+        if self._budget < 0:
+            raise _InlineLimit
+        scalar = self._scalar_shapes.get
+        shape = self._shape
+        if value_type is dict:
+            members = tuple(
+                [
+                    (
+                        key,
+                        s if (s := scalar(type(member))) is not None else shape(member),
+                    )
+                    for key, member in value.items()
+                ]
+            )
+            return self.registry.intern(("object", members))
+        elements = {
+            s if (s := scalar(type(element))) is not None else shape(element)
+            for element in value
+        }
+        return self.registry.intern(("array", tuple(sorted(elements))))
+
+    def _build(self, data: Any) -> None:
+        """Hash every large container bottom-up with an explicit stack."""
+        if type(data) is not dict and type(data) is not list:
+            return
+        registry = self.registry
+        containers = self._containers
+        scalar_shapes = self._scalar_shapes
+        inline = self._inline
+        entry = inline(data)
+        if entry is not None:
+            containers[id(data)] = entry
+            return
+        # [container, remaining children, member shapes, content parts, key of
+        # the child container being hashed]
+        frames: List[List[Any]] = [_frame(data)]
+        while frames:
+            frame = frames[-1]
+            is_object = type(frame[0]) is dict
+            members, parts = frame[2], frame[3]
+            for key, child in frame[1]:
+                child_type = type(child)
+                if child_type is dict or child_type is list:
+                    entry = inline(child)
+                    if entry is None:
+                        frame[4] = key
+                        frames.append(_frame(child))
+                        break
+                    containers[id(child)] = entry
+                    shape_id, digest = entry
+                    encoded = b"#" + digest
+                else:
+                    shape_id = scalar_shapes.get(child_type)
+                    if shape_id is None:
+                        shape_id = self._scalar_shape(child)
+                    encoded = _encode(child)
+                if is_object:
+                    members[key] = shape_id
+                    parts.append(_encode(key) + b"=" + encoded)
+                else:
+                    members.append(shape_id)
+                    parts.append(encoded)
+            else:
+                frames.pop()
+                container = frame[0]
+                if is_object:
+                    parts.sort()
+                    shape_id = registry.object(members)
+                    digest = hashlib.blake2b(
+                        b"{" + b",".join(parts), digest_size=DIGEST_SIZE
+                    ).digest()
+                else:
+                    shape_id = registry.array(members)
+                    digest = hashlib.blake2b(
+                        b"[" + b",".join(parts), digest_size=DIGEST_SIZE
+                    ).digest()
+                containers[id(container)] = (shape_id, digest)
+                if frames:
+                    parent = frames[-1]
+                    if type(parent[0]) is dict:
+                        parent[2][parent[4]] = shape_id
+                        parent[3].append(_encode(parent[4]) + b"=#" + digest)
+                    else:
+                        parent[2].append(shape_id)
+                        parent[3].append(b"#" + digest)
+
+    def _entry(self, container: Any) -> Tuple[int, bytes]:
+        entry = self._containers.get(id(container))
+        if entry is None:
+            # Inside an inlined subtree, so small enough to hash directly
+            self._budget = float("inf")
+            entry = self._shape(container), _json_digest(container)
+        return entry
+
+    def shape_id(self, value: Any) -> int:
+        """Return the shape id of a value of the indexed document."""
+        if type(value) is dict or type(value) is list:
+            return self._entry(value)[0]
+        return self._scalar_shape(value)
+
+    def shape_digest(self, value: Any) -> bytes:
+        """Return the structural digest of a value of the indexed document."""
+        return self.registry.digest(self.shape_id(value))
+
+    def value_digest(self, value: Any) -> bytes:
+        """Return the value digest of a container, or a scalar's encoding."""
+        if type(value) is dict or type(value) is list:
+            return self._entry(value)[1]
+        return _encode(value)
+
+    @property
+    def fingerprint(self) -> str:
+        """Return the structural fingerprint of the document."""
+        return self.shape_digest(self.data).hex()
+
+    @property
+    def digest(self) -> str:
+        """Return the value digest of the document."""
+        return hashlib.blake2b(
+            self.value_digest(self.data), digest_size=DIGEST_SIZE
+        ).hexdigest()
+
+
+def _frame(container: Any) -> List[Any]:
+    if type(container) is dict:
+        return [container, iter(container.items()), {}, [], None]
+    return [container, enumerate(container), [], [], None]
+
+
+def load_indexed(text: str) -> Tuple[Any, MerkleIndex]:
+    """Parse a JSON document and return it with its Merkle index.
+
+    Both are cached in the shared parse cache, so comparing against the same
+    payload again skips parsing and hashing.
+
+    Raises:
+        json.JSONDecodeError: If the text is not valid JSON
+    """
+    index = parse_cache.derive(text, "merkle_index", MerkleIndex)
+    return index.data, index
+
+
+def _escape(key: str) -> str:
+    """Escape an object key as a JSON Pointer reference token (RFC 6901)."""
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def join_path(prefix: str, key: Any, is_index: bool) -> str:
+    """Return the path of a child: ``prefix.key`` or ``prefix[index]``."""
+    if is_index:
+        return f"{prefix}[{key}]"
+    return f"{prefix}.{key}" if prefix else str(key)
+
+
+class ValueDiff:
+    """Instance-level differences between two indexed documents.
+
+    Changes are operations on paths: ``replace`` (a different value or
+    type), ``add``, ``remove`` and ``move`` (an element of a keyed array
+    that changed position, from ``from``). Paths of removed elements refer
+    to the old document, all other paths to the new one. Identical subtrees
+    are recognized by their value digests and skipped without being visited.
+
+    Array elements are aligned by an identity key when one identifies the
+    elements of both versions, and otherwise by their digests, so inserted
+    or reordered rows do not show up as changes of every following row.
+
+    With ``build_patch`` the same pass also produces ``patch``, an RFC 6902
+    JSON Patch turning the old document into the new one. Its operations
+    are ordered to apply sequentially: within an array, removals from the
+    end come first, then moves, then additions in ascending order, then the
+    edits of the elements at their new positions.
+    """
+
+    def __init__(
+        self,
+        max_changes: int = MAX_VALUE_CHANGES,
+        array_key: Optional[str] = None,
+        build_patch: bool = False,
+    ):
+        """Initialize the diff.
+
+        Args:
+            max_changes: Maximum changes listed; all of them are counted
+            array_key: Identity key of array elements; detected from
+                ``IDENTITY_KEYS`` when None
+            build_patch: Also build the complete JSON Patch in ``patch``
+        """
+        self.max_changes = max_changes
+        self.identity_keys = (array_key,) if array_key else IDENTITY_KEYS
+        self.changes: List[Dict[str, Any]] = []
+        self.change_count = 0
+        self.subtrees_skipped = 0
+        self.alignments = {"keyed": 0, "lcs": 0, "heuristic": 0}
+        self.patch: Optional[List[Dict[str, Any]]] = [] if build_patch else None
+
+    def _record(
+        self,
+        op: str,
+        path: str,
+        old: Any = None,
+        new: Any = None,
+        source: Optional[str] = None,
+    ) -> None:
+        self.change_count += 1
+        if len(self.changes) >= self.max_changes:
+            return
+        change: Dict[str, Any] = {"op": op, "path": path}
+        if op == "move":
+            change["from"] = source
+        elif op != "add":
+            change["old"] = old
+        if op == "add" or op == "replace":
+            change["new"] = new
+        self.changes.append(change)
+
+    def compare(
+        self,
+        old: Any,
+        new: Any,
+        old_index: MerkleIndex,
+        new_index: MerkleIndex,
+        path: str = "",
+    ) -> None:
+        """Record the differences between two values of the indexed documents."""
+        patch = self.patch
+        # (path, JSON pointer or None when no patch is built below, old, new)
+        stack = [(path, "" if patch is not None else None, old, new)]
+        while stack:
+            path, pointer, a, b = stack.pop()
+            a_type, b_type = type(a), type(b)
+            if a_type is dict and b_type is dict:
+                if old_index.value_digest(a) == new_index.value_digest(b):
+                    self.subtrees_skipped += 1
+                    continue
+                pending = []
+                for key, value in a.items():
+                    child = join_path(path, key, False)
+                    child_pointer = (
+                        None if pointer is None else pointer + "/" + _escape(key)
+                    )
+                    if key in b:
+                        pending.append((child, child_pointer, value, b[key]))
+                    else:
+                        self._record("remove", child, old=value)
+                        if child_pointer is not None:
+                            patch.append({"op": "remove", "path": child_pointer})
+                for key, value in b.items():
+                    if key not in a:
+                        self._record("add", join_path(path, key, False), new=value)
+                        if pointer is not None:
+                            patch.append(
+                                {
+                                    "op": "add",
+                                    "path": pointer + "/" + _escape(key),
+                                    "value": value,
+                                }
+                            )
+                stack.extend(reversed(pending))
+            elif a_type is list and b_type is list:
+                if old_index.value_digest(a) == new_index.value_digest(b):
+                    self.subtrees_skipped += 1
+                    continue
+                changed, pointer = self.align(path, pointer, a, b, old_index, new_index)
+                stack.extend(
+                    (
+                        join_path(path, j, True),
+                        None if pointer is None else f"{pointer}/{j}",
+                        a[i],
+                        b[j],
+                    )
+                    for i, j in reversed(changed)
+                )
+            elif a_type is not b_type or a != b:
+                self._record("replace", path, old=a, new=b)
+                if pointer is not None:
+                    patch.append({"op": "replace", "path": pointer, "value": b})
+
+    def align(
+        self,
+        path: str,
+        pointer: Optional[str],
+        old: List[Any],
+        new: List[Any],
+        old_index: MerkleIndex,
+        new_index: MerkleIndex,
+    ) -> Tuple[List[Tuple[int, int]], Optional[str]]:
+        """Record added, removed and moved elements of two differing arrays.
+
+        Returns:
+            The (old, new) index pairs of aligned elements that differ, in new
+            order (aligned identical elements are skipped), and the pointer
+            to build the patch of those elements under, or None if the patch
+            replaces the whole array
+        """
+        if not old or not new:
+            pairs: List[Tuple[int, int]] = []
+            changed = pairs
+        elif keyed := detect_key(old, new, self.identity_keys):
+            self.alignments["keyed"] += 1
+            _, old_positions, new_positions = keyed
+            pairs = [
+                (old_positions[value], j)
+                for value, j in new_positions.items()
+                if value in old_positions
+            ]
+            old_digest, new_digest = old_index.value_digest, new_index.value_digest
+            changed = [
+                (i, j) for i, j in pairs if old_digest(old[i]) != new_digest(new[j])
+            ]
+        else:
+            old_digests = [old_index.value_digest(element) for element in old]
+            new_digests = [new_index.value_digest(element) for element in new]
+            anchors, method = align_sequences(old_digests, new_digests)
+            self.alignments[method] += 1
+            pairs, changed = self._pair_gaps(anchors, len(old), len(new))
+        self.subtrees_skipped += len(pairs) - len(changed)
+
+        matched_old = {i for i, _ in pairs}
+        matched_new = {j for _, j in pairs}
+        removed = [i for i in range(len(old) - 1, -1, -1) if i not in matched_old]
+        added = [j for j in range(len(new)) if j not in matched_new]
+        in_order = set(increasing_subsequence([i for i, _ in pairs]))
+        moved = [position for position in range(len(pairs)) if position not in in_order]
+
+        # Removals are recorded from the end so that each index stays valid
+        for i in removed:
+            self._record("remove", join_path(path, i, True), old=old[i])
+        for j in added:
+            self._record("add", join_path(path, j, True), new=new[j])
+        for position in moved:
+            i, j = pairs[position]
+            self._record(
+                "move", join_path(path, j, True), source=join_path(path, i, True)
+            )
+
+        if pointer is not None:
+            if len(moved) > MAX_PATCH_MOVES:
+                self.patch.append({"op": "replace", "path": pointer, "value": new})
+                return changed, None
+            self._patch_array(pointer, new, pairs, removed, added, moved)
+        return changed, pointer
+
+    def _patch_array(
+        self,
+        pointer: str,
+        new: List[Any],
+        pairs: List[Tuple[int, int]],
+        removed: List[int],
+        added: List[int],
+        moved: List[int],
+    ) -> None:
+        """Append the patch operations restructuring one array."""
+        patch = self.patch
+        patch.extend({"op": "remove", "path": f"{pointer}/{i}"} for i in removed)
+        if moved:
+            # Matched elements in their old order, as left by the removals;
+            # each moved element is placed right after its new predecessor
+            current = sorted(i for i, _ in pairs)
+            for position in moved:
+                element = pairs[position][0]
+                source = current.index(element)
+                current.pop(source)
+                target = current.index(pairs[position - 1][0]) + 1 if position else 0
+                current.insert(target, element)
+                if source != target:
+                    patch.append(
+                        {
+                            "op": "move",
+                            "from": f"{pointer}/{source}",
+                            "path": f"{pointer}/{target}",
+                        }
+                    )
+        patch.extend(
+            {"op": "add", "path": f"{pointer}/{j}", "value": new[j]} for j in added
+        )
+
+    @staticmethod
+    def _pair_gaps(
+        anchors: List[Tuple[int, int]], old_length: int, new_length: int
+    ) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """Pair unmatched elements by position between consecutive anchors.
+
+        Elements between two equal anchors are most likely edited versions
+        of each other; the surplus of the longer side is added or removed.
+
+        Returns:
+            All aligned pairs, and the pairs of unequal elements among them
+        """
+        pairs = []
+        changed = []
+        previous_i = previous_j = -1
+        for i, j in [*anchors, (old_length, new_length)]:
+            gap = min(i - previous_i, j - previous_j) - 1
+            if gap > 0:
+                edited = [(previous_i + k, previous_j + k) for k in range(1, gap + 1)]
+                pairs.extend(edited)
+                changed.extend(edited)
+            if i < old_length:
+                pairs.append((i, j))
+            previous_i, previous_j = i, j
+        return pairs, changed
+
+
+def diff_values(
+    old: Any,
+    new: Any,
+    old_index: MerkleIndex,
+    new_index: MerkleIndex,
+    max_changes: int = MAX_VALUE_CHANGES,
+    array_key: Optional[str] = None,
+    build_patch: bool = False,
+) -> ValueDiff:
+    """Return the instance-level differences between two indexed documents."""
+    diff = ValueDiff(max_changes, array_key, build_patch)
+    diff.compare(old, new, old_index, new_index)
+    return diff
@@ -0,0 +1,529 @@
+"""Iterative traversal engine shared by the API intelligence tools.
+
+``walk`` visits a parsed JSON document depth first with an explicit stack,
+so nesting depth is bounded by memory rather than the interpreter's
+recursion limit. Each value is visited once and its ``kind`` is resolved
+through a single type lookup; any number of visitors receive
+``enter``/``leave`` events from that one pass.
+
+A ``Visitor`` receives every value wrapped in a ``Node``, which knows its
+parent and resolves paths on demand. A ``ValueVisitor`` receives the value,
+kind, key, depth and weight as arguments instead; walked alone it is called
+without allocating a ``Node`` per value, which is the cheaper protocol for
+the tools' hot visitors.
+
+A visitor that returns ``SKIP`` from ``enter`` receives neither the node's
+children nor its ``leave`` event; subtrees that every visitor skips are not
+walked at all.
+
+With a ``ReservoirSampler`` the walk visits at most ``max_elements`` elements
+of every array. Each node carries the ``weight`` of the elements it stands
+for, so visitors can extrapolate counts to the whole document.
+"""
+
+import math
+import random
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+SKIP = object()
+
+CONTAINER_KINDS = frozenset({"object", "array"})
+
+_KINDS = {
+    dict: "object",
+    list: "array",
+    str: "string",
+    int: "integer",
+    float: "float",
+    bool: "boolean",
+    type(None): "null",
+}
+
+
+def kind_of(value: Any) -> str:
+    """Return the JSON kind of a value: object, array, string, integer, ..."""
+    kind = _KINDS.get(type(value))
+    if kind is not None:
+        return kind
+    # Subclasses of the builtin types, e.g. OrderedDict
+    if isinstance(value, bool):
+        return "boolean"
+    for base, base_kind in _KINDS.items():
+        if isinstance(value, base):
+            return base_kind
+    return "unknown"
+
+
+class Node:
+    """A value being visited together with its position in the document."""
+
+    __slots__ = (
+        "value",
+        "kind",
+        "key",
+        "depth",
+        "parent",
+        "weight",
+        "_path",
+        "_schema_path",
+    )
+
+    def __init__(
+        self,
+        value: Any,
+        key: Any = None,
+        parent: Optional["Node"] = None,
+        depth: int = 0,
+        weight: float = 1.0,
+    ):
+        """Initialize the node.
+
+        Args:
+            value: The JSON value
+            key: Object key or array index of the value in its parent
+            parent: Node of the containing object or array, None for the root
+            depth: Number of containers above the value (0 for the root)
+            weight: Number of values in the document this node stands for;
+                above 1 below sampled arrays
+        """
+        self.value = value
+        self.kind = _KINDS.get(type(value)) or kind_of(value)
+        self.key = key
+        self.parent = parent
+        self.depth = depth
+        self.weight = weight
+        self._path: Optional[str] = None
+        self._schema_path: Optional[str] = None
+
+    @property
+    def path(self) -> str:
+        """Return the dotted path of the value, e.g. ``items[0].id``."""
+        if self._path is None:
+            parent = self.parent
+            if parent is None or parent._path is not None:
+                self._path = _join_path(self, parent and parent._path, self.key)
+            else:
+                _resolve_paths(self, "_path")
+        return self._path
+
+    @property
+    def schema_path(self) -> str:
+        """Return the path with array indices collapsed, e.g. ``items[].id``.
+
+        All elements of an array share one schema path, so the number of
+        distinct schema paths grows with the shape of a document, not its size.
+        """
+        if self._schema_path is None:
+            parent = self.parent
+            if parent is None or parent._schema_path is not None:
+                self._schema_path = _join_path(self, parent and parent._schema_path, "")
+            else:
+                _resolve_paths(self, "_schema_path", "")
+        return self._schema_path
+
+    @property
+    def in_object(self) -> bool:
+        """Return True if the value is a field of an object."""
+        return self.parent is not None and self.parent.kind == "object"
+
+
+def _join_path(node: Node, parent_path: Optional[str], index: Any) -> str:
+    """Return a node's path from its parent's already resolved path.
+
+    Array elements are addressed as ``[index]``; pass ``""`` as the index to
+    build schema paths.
+    """
+    parent = node.parent
+    if parent is None:
+        return ""
+    if parent.kind == "array":
+        return f"{parent_path}[{index}]"
+    if parent_path:
+        return f"{parent_path}.{node.key}"
+    return str(node.key)
+
+
+def _resolve_paths(node: Node, slot: str, index: Any = None) -> None:
+    """Resolve a path slot of a node and its uncached ancestors.
+
+    Ancestors are resolved top-down without recursion. ``index`` overrides
+    the array index used in the path; None uses each node's key.
+    """
+    chain = []
+    current: Optional[Node] = node
+    while current is not None and getattr(current, slot) is None:
+        chain.append(current)
+        current = current.parent
+    for current in reversed(chain):
+        parent = current.parent
+        parent_path = getattr(parent, slot) if parent is not None else None
+        setattr(
+            current,
+            slot,
+            _join_path(current, parent_path, current.key if index is None else index),
+        )
+
+
+class PathTable:
+    """Intern schema paths as integer ids built from (parent id, key) pairs.
+
+    ``Node.schema_path`` caches a string on every ancestor, which costs time
+    and memory quadratic in the depth of deeply nested documents. Visitors
+    that only report a few paths can instead keep one id per open container
+    and render the strings of the reported ids at the end.
+    """
+
+    ROOT = 0
+
+    def __init__(self):
+        """Initialize the table with the root path."""
+        self._ids: Dict[Tuple[int, Any], int] = {}
+        self._entries: List[Tuple[int, Any]] = [(-1, None)]
+
+    def child(self, parent_id: int, key: Any) -> int:
+        """Return the id of an object member's path, or of array elements' for None."""
+        entry = (parent_id, key)
+        path_id = self._ids.get(entry)
+        if path_id is None:
+            path_id = self._ids[entry] = len(self._entries)
+            self._entries.append(entry)
+        return path_id
+
+    def render(self, path_id: int) -> str:
+        """Return the schema path of an id, as ``Node.schema_path`` spells it."""
+        keys = []
+        while path_id > self.ROOT:
+            path_id, key = self._entries[path_id]
+            keys.append(key)
+        parts: List[str] = []
+        # Whether the parts written so far spell a non-empty path
+        written = False
+        for key in reversed(keys):
+            if key is None:
+                parts.append("[]")
+                written = True
+            elif written:
+                parts.append(f".{key}")
+            else:
+                parts.append(str(key))
+                written = key != ""
+        return "".join(parts)
+
+
+class Visitor:
+    """Base class for traversal visitors; override the events you need."""
+
+    def enter(self, node: Node) -> Any:
+        """Handle a value before its children; return ``SKIP`` to prune it."""
+        return None
+
+    def leave(self, node: Node) -> None:
+        """Handle a value after all its children."""
+
+
+class ValueVisitor(Visitor):
+    """Base class for visitors that receive values instead of nodes.
+
+    Events carry the value, its kind, its key or index in the parent (None
+    for the root), its depth and its weight, as on ``Node``. A visitor that
+    needs paths or parents tracks the open containers itself. In a walk with
+    other visitors the events are forwarded from the shared nodes.
+    """
+
+    def enter_value(
+        self, value: Any, kind: str, key: Any, depth: int, weight: float
+    ) -> Any:
+        """Handle a value before its children; return ``SKIP`` to prune it."""
+        return None
+
+    def leave_value(
+        self, value: Any, kind: str, key: Any, depth: int, weight: float
+    ) -> None:
+        """Handle a value after all its children."""
+
+    def enter(self, node: Node) -> Any:
+        """Forward a node's enter event to ``enter_value``."""
+        return self.enter_value(
+            node.value, node.kind, node.key, node.depth, node.weight
+        )
+
+    def leave(self, node: Node) -> None:
+        """Forward a node's leave event to ``leave_value``."""
+        self.leave_value(node.value, node.kind, node.key, node.depth, node.weight)
+
+
+def _children(
+    value: Any, kind: str, weight: float
+) -> Tuple[Iterator[Tuple[Any, Any]], float]:
+    """Return the children of a container and the weight of each of them."""
+    if kind == "object":
+        return iter(value.items()), weight
+    return enumerate(value), weight
+
+
+class ReservoirSampler:
+    """Choose the elements of large arrays that a walk visits.
+
+    Arrays longer than ``max_elements`` are reduced to a uniform random
+    sample of that many elements, kept in document order. Indices are drawn
+    with reservoir sampling (Li's Algorithm L), whose cost grows with the
+    sample size and only logarithmically with the array length. One seeded
+    generator is shared by the whole walk, so results are deterministic.
+    """
+
+    # z-score of the reported confidence level
+    CONFIDENCE_LEVEL = 0.95
+    _Z = 1.96
+
+    def __init__(self, max_elements: int, seed: int = 0):
+        """Initialize the sampler.
+
+        Args:
+            max_elements: Maximum elements visited per array
+            seed: Seed of the random generator
+        """
+        if max_elements < 1:
+            raise ValueError("max_elements must be at least 1")
+        self.max_elements = max_elements
+        self.seed = seed
+        self._random = random.Random(seed)
+        self.arrays_sampled = 0
+        self.elements_total = 0
+        self.elements_visited = 0
+        self._largest_sampled = 0
+
+    def _uniform(self) -> float:
+        """Return a random number in the open interval (0, 1)."""
+        value = self._random.random()
+        while value == 0.0:
+            value = self._random.random()
+        return value
+
+    def sample(self, length: int) -> List[int]:
+        """Return the sorted indices of the elements to visit."""
+        k = self.max_elements
+        if length <= k:
+            return list(range(length))
+
+        reservoir = list(range(k))
+        w = math.exp(math.log(self._uniform()) / k)
+        index = k - 1
+        while w < 1.0:
+            index += int(math.log(self._uniform()) / math.log1p(-w)) + 1
+            if index >= length:
+                break
+            reservoir[self._random.randrange(k)] = index
+            w *= math.exp(math.log(self._uniform()) / k)
+        reservoir.sort()
+
+        self.arrays_sampled += 1
+        self.elements_total += length
+        self.elements_visited += k
+        if length > self._largest_sampled:
+            self._largest_sampled = length
+        return reservoir
+
+    def children(
+        self, value: Any, kind: str, weight: float
+    ) -> Tuple[Iterator[Tuple[Any, Any]], float]:
+        """Return the children to visit and the weight of each of them."""
+        if kind == "object" or len(value) <= self.max_elements:
+            return _children(value, kind, weight)
+        indices = self.sample(len(value))
+        weight = weight * len(value) / len(indices)
+        return ((index, value[index]) for index in indices), weight
+
+    def margin_of_error(self) -> float:
+        """Return the worst-case margin of error of sampled proportions.
+
+        This bounds, at ``CONFIDENCE_LEVEL``, the error of any share (e.g.
+        the null rate of a field) estimated from a single sampled array,
+        including the finite population correction.
+        """
+        length = self._largest_sampled
+        if not length:
+            return 0.0
+        k = self.max_elements
+        correction = math.sqrt((length - k) / (length - 1))
+        return self._Z * math.sqrt(0.25 / k) * correction
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the sampling parameters and how much was sampled."""
+        return {
+            "max_elements": self.max_elements,
+            "seed": self.seed,
+            "arrays_sampled": self.arrays_sampled,
+            "elements_total": self.elements_total,
+            "elements_visited": self.elements_visited,
+            "estimated": self.arrays_sampled > 0,
+            "confidence_level": self.CONFIDENCE_LEVEL,
+            "margin_of_error": round(self.margin_of_error(), 4),
+        }
+
+
+class _Fanout(Visitor):
+    """Deliver the events of one walk to several visitors.
+
+    Tracks which visitors entered each open container so that a visitor
+    that skipped a node hears nothing more from its subtree.
+    """
+
+    def __init__(self, visitors: Tuple[Visitor, ...]):
+        self._handlers = [(visitor.enter, visitor.leave) for visitor in visitors]
+        self._open: List[List[Tuple[Callable, Callable]]] = [self._handlers]
+        self._scalar: List[Tuple[Callable, Callable]] = []
+
+    def enter(self, node: Node) -> Any:
+        handlers = self._open[-1]
+        entered = [pair for pair in handlers if pair[0](node) is not SKIP]
+        if not entered:
+            return SKIP
+        if len(entered) == len(handlers):
+            entered = handlers
+        if node.kind in CONTAINER_KINDS:
+            self._open.append(entered)
+        else:
+            # walk() leaves a scalar right after entering it
+            self._scalar = entered
+        return None
+
+    def leave(self, node: Node) -> None:
+        if node.kind in CONTAINER_KINDS:
+            handlers = self._open.pop()
+        else:
+            handlers = self._scalar
+        for _, leave in handlers:
+            leave(node)
+
+
+def make_sampler(
+    sample_size: Optional[int], sample_seed: int
+) -> Optional[ReservoirSampler]:
+    """Return the sampler for a tool's sample options; None disables sampling."""
+    if sample_size is None:
+        return None
+    if sample_size < 1:
+        raise ValueError("sample_size must be at least 1")
+    return ReservoirSampler(sample_size, sample_seed)
+
+
+def walk(
+    data: Any, *visitors: Visitor, sampler: Optional[ReservoirSampler] = None
+) -> None:
+    """Visit every value of a document once, depth first, with all visitors.
+
+    With a ``sampler`` only a sample of the elements of large arrays is
+    visited; values below sampled arrays carry the matching ``weight``. A
+    single ``ValueVisitor`` is walked without ``Node`` objects.
+    """
+    children = _children if sampler is None else sampler.children
+    if len(visitors) == 1 and isinstance(visitors[0], ValueVisitor):
+        _walk_values(data, visitors[0], children)
+        return
+    visitor = visitors[0] if len(visitors) == 1 else _Fanout(visitors)
+    enter = visitor.enter
+    leave = visitor.leave
+
+    root = Node(data)
+    if enter(root) is SKIP:
+        return
+    if root.kind not in CONTAINER_KINDS:
+        leave(root)
+        return
+
+    stack = [(root, *children(root.value, root.kind, root.weight))]
+    while stack:
+        parent, items, weight = stack[-1]
+        depth = parent.depth + 1
+        for key, value in items:
+            node = Node(value, key, parent, depth, weight)
+            if enter(node) is SKIP:
+                continue
+            if node.kind in CONTAINER_KINDS:
+                stack.append((node, *children(value, node.kind, weight)))
+                break
+            leave(node)
+        else:
+            stack.pop()
+            leave(parent)
+
+
+def _walk_values(data: Any, visitor: ValueVisitor, children: Callable) -> None:
+    """Walk a document like ``walk`` with the events of a ``ValueVisitor``."""
+    enter = visitor.enter_value
+    leave = visitor.leave_value
+    kinds = _KINDS
+
+    kind = kinds.get(type(data)) or kind_of(data)
+    if enter(data, kind, None, 0, 1.0) is SKIP:
+        return
+    if kind not in CONTAINER_KINDS:
+        leave(data, kind, None, 0, 1.0)
+        return
+
+    # (value, kind, key, weight, children, weight of the children)
+    stack = [(data, kind, None, 1.0, *children(data, kind, 1.0))]
+    while stack:
+        parent, parent_kind, parent_key, parent_weight, items, weight = stack[-1]
+        depth = len(stack)
+        for key, value in items:
+            kind = kinds.get(type(value)) or kind_of(value)
+            if enter(value, kind, key, depth, weight) is SKIP:
+                continue
+            if kind in CONTAINER_KINDS:
+                stack.append((value, kind, key, weight, *children(value, kind, weight)))
+                break
+            leave(value, kind, key, depth, weight)
+        else:
+            stack.pop()
+            leave(parent, parent_kind, parent_key, depth - 1, parent_weight)
+
+
+class TreeBuilder(ValueVisitor):
+    """Base class for visitors that build a new tree from the one visited.
+
+    Objects and arrays are rebuilt from the results of their non-skipped
+    children; ``build_leaf`` and ``build_container`` customize the values.
+    The new tree is available as ``result`` after the walk.
+    """
+
+    def __init__(self):
+        """Initialize the builder."""
+        self._containers: List[Any] = []
+        self.result: Any = None
+
+    def build_leaf(self, value: Any, kind: str) -> Any:
+        """Return the new value for a scalar; the value itself by default."""
+        return value
+
+    def build_container(self, kind: str, container: Any) -> Any:
+        """Return the new value for a rebuilt object or array."""
+        return container
+
+    def enter_value(
+        self, value: Any, kind: str, key: Any, depth: int, weight: float
+    ) -> Any:
+        """Start a new container for objects and arrays."""
+        if kind == "object":
+            self._containers.append({})
+        elif kind == "array":
+            self._containers.append([])
+        return None
+
+    def leave_value(
+        self, value: Any, kind: str, key: Any, depth: int, weight: float
+    ) -> None:
+        """Add the finished value to its parent container."""
+        containers = self._containers
+        if kind in CONTAINER_KINDS:
+            value = self.build_container(kind, containers.pop())
+        else:
+            value = self.build_leaf(value, kind)
+        if not containers:
+            self.result = value
+            return
+        parent = containers[-1]
+        if type(parent) is dict:
+            parent[key] = value
+        else:
+            parent.append(value)
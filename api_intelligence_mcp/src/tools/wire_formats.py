@@ -0,0 +1,464 @@
+"""Wire formats compared by the ``measure_encoding_costs`` tool.
+
+A format is a codec turning a parsed JSON document into bytes and back:
+pretty and minified JSON, MessagePack and CBOR. The binary formats use the
+``msgpack`` and ``cbor2`` packages when they are installed and the
+pure-Python codecs of this module otherwise. The pure-Python codecs only
+cover the JSON data model (objects with string keys, arrays, strings,
+numbers, booleans and null) and, like ``traversal.walk``, use an explicit
+stack instead of recursion so deep documents do not hit the recursion
+limit.
+
+Compressors (gzip and zlib) apply on top of any format's bytes.
+"""
+
+import gzip
+import importlib
+import importlib.util
+import json
+import struct
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Encoder = Callable[[Any], bytes]
+Decoder = Callable[[bytes], Any]
+
+_UINT64_LIMIT = 1 << 64
+
+# Key of a decoded object member whose key is not read yet
+_NO_KEY = object()
+
+_pack_float = struct.Struct(">d").pack
+_unpack_float = struct.Struct(">d").unpack_from
+
+
+def _optional_module(name: str) -> Any:
+    """Return an installed optional package, or None."""
+    if importlib.util.find_spec(name) is None:
+        return None
+    return importlib.import_module(name)
+
+
+def _check_key(key: Any) -> str:
+    if type(key) is not str:
+        raise TypeError(f"Object keys must be strings, got {type(key).__name__}")
+    return key
+
+
+class _Container:
+    """An array or object being decoded, with the items it still expects."""
+
+    __slots__ = ("value", "remaining", "key")
+
+    def __init__(self, value: Any, remaining: int):
+        self.value = value
+        self.remaining = remaining
+        self.key: Any = _NO_KEY
+
+
+def _decode_items(read_item: Callable[[], Tuple[int, Any]], data: bytes) -> Any:
+    """Assemble the items of a binary document into a JSON document.
+
+    ``read_item`` returns the next item as ``(kind, value)``: kind 0 for a
+    scalar, 1 for the head of an array of ``value`` elements and 2 for the
+    head of an object of ``value`` members.
+    """
+    stack: List[_Container] = []
+    while True:
+        kind, value = read_item()
+        if kind == 1:
+            container = _Container([], value)
+        elif kind == 2:
+            container = _Container({}, value)
+        else:
+            container = None
+        if container is not None:
+            if container.remaining:
+                stack.append(container)
+                continue
+            value = container.value
+        # Attach the finished value, closing the containers it completes
+        while True:
+            if not stack:
+                return value
+            parent = stack[-1]
+            if type(parent.value) is dict:
+                if parent.key is _NO_KEY:
+                    parent.key = _check_key(value)
+                    break
+                parent.value[parent.key] = value
+                parent.key = _NO_KEY
+            else:
+                parent.value.append(value)
+            parent.remaining -= 1
+            if parent.remaining:
+                break
+            value = stack.pop().value
+
+
+class _Reader:
+    """Cursor over the bytes of a binary document."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.position = 0
+
+    def take(self, size: int) -> bytes:
+        """Return the next ``size`` bytes."""
+        start = self.position
+        end = start + size
+        if end > len(self.data):
+            raise ValueError("Truncated document")
+        self.position = end
+        return self.data[start:end]
+
+    def byte(self) -> int:
+        """Return the next byte."""
+        if self.position >= len(self.data):
+            raise ValueError("Truncated document")
+        value = self.data[self.position]
+        self.position += 1
+        return value
+
+    def uint(self, size: int) -> int:
+        """Return the next big-endian unsigned integer of ``size`` bytes."""
+        return int.from_bytes(self.take(size), "big")
+
+    def finish(self, value: Any) -> Any:
+        """Return the decoded document, rejecting trailing bytes."""
+        if self.position != len(self.data):
+            raise ValueError("Extra data after the document")
+        return value
+
+
+def msgpack_encode(data: Any) -> bytes:
+    """Encode a JSON document as MessagePack.
+
+    Floats are written as float64 and integers in their smallest encoding,
+    as the ``msgpack`` package does by default.
+
+    Raises:
+        OverflowError: If an integer does not fit in 64 bits
+        TypeError: If the document holds a value outside the JSON data model
+    """
+    out = bytearray()
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is str:
+            raw = value.encode("utf-8")
+            size = len(raw)
+            if size < 32:
+                out.append(0xA0 | size)
+            elif size < 0x100:
+                out += b"\xd9" + size.to_bytes(1, "big")
+            elif size < 0x10000:
+                out += b"\xda" + size.to_bytes(2, "big")
+            else:
+                out += b"\xdb" + size.to_bytes(4, "big")
+            out += raw
+        elif kind is int:
+            if 0 <= value < 0x80:
+                out.append(value)
+            elif -32 <= value < 0:
+                out.append(value & 0xFF)
+            elif value > 0:
+                if value < 0x100:
+                    out += b"\xcc" + value.to_bytes(1, "big")
+                elif value < 0x10000:
+                    out += b"\xcd" + value.to_bytes(2, "big")
+                elif value < 0x100000000:
+                    out += b"\xce" + value.to_bytes(4, "big")
+                elif value < _UINT64_LIMIT:
+                    out += b"\xcf" + value.to_bytes(8, "big")
+                else:
+                    raise OverflowError("Integer too large for MessagePack")
+            elif value >= -0x80:
+                out += b"\xd0" + value.to_bytes(1, "big", signed=True)
+            elif value >= -0x8000:
+                out += b"\xd1" + value.to_bytes(2, "big", signed=True)
+            elif value >= -0x80000000:
+                out += b"\xd2" + value.to_bytes(4, "big", signed=True)
+            elif value >= -(1 << 63):
+                out += b"\xd3" + value.to_bytes(8, "big", signed=True)
+            else:
+                raise OverflowError("Integer too large for MessagePack")
+        elif kind is float:
+            out += b"\xcb" + _pack_float(value)
+        elif value is None:
+            out.append(0xC0)
+        elif value is False:
+            out.append(0xC2)
+        elif value is True:
+            out.append(0xC3)
+        elif kind is list:
+            size = len(value)
+            if size < 16:
+                out.append(0x90 | size)
+            elif size < 0x10000:
+                out += b"\xdc" + size.to_bytes(2, "big")
+            else:
+                out += b"\xdd" + size.to_bytes(4, "big")
+            stack.extend(reversed(value))
+        elif kind is dict:
+            size = len(value)
+            if size < 16:
+                out.append(0x80 | size)
+            elif size < 0x10000:
+                out += b"\xde" + size.to_bytes(2, "big")
+            else:
+                out += b"\xdf" + size.to_bytes(4, "big")
+            for key, member in reversed(value.items()):
+                stack.append(member)
+                stack.append(_check_key(key))
+        else:
+            raise TypeError(f"Cannot encode {kind.__name__} as MessagePack")
+    return bytes(out)
+
+
+def msgpack_decode(data: bytes) -> Any:
+    """Decode a MessagePack document of the JSON data model.
+
+    Raises:
+        ValueError: If the bytes are not such a document
+    """
+    reader = _Reader(data)
+
+    def read_item() -> Tuple[int, Any]:
+        head = reader.byte()
+        if head < 0x80:
+            return 0, head
+        if head >= 0xE0:
+            return 0, head - 0x100
+        if head < 0x90:
+            return 2, head & 0x0F
+        if head < 0xA0:
+            return 1, head & 0x0F
+        if head < 0xC0:
+            return 0, reader.take(head & 0x1F).decode("utf-8")
+        if head == 0xC0:
+            return 0, None
+        if head == 0xC2:
+            return 0, False
+        if head == 0xC3:
+            return 0, True
+        if head == 0xCA:
+            return 0, struct.unpack(">f", reader.take(4))[0]
+        if head == 0xCB:
+            return 0, _unpack_float(reader.take(8))[0]
+        if 0xCC <= head <= 0xCF:
+            return 0, reader.uint(1 << (head - 0xCC))
+        if 0xD0 <= head <= 0xD3:
+            size = 1 << (head - 0xD0)
+            return 0, int.from_bytes(reader.take(size), "big", signed=True)
+        if 0xD9 <= head <= 0xDB:
+            size = reader.uint(1 << (head - 0xD9))
+            return 0, reader.take(size).decode("utf-8")
+        if head in (0xDC, 0xDD):
+            return 1, reader.uint(2 if head == 0xDC else 4)
+        if head in (0xDE, 0xDF):
+            return 2, reader.uint(2 if head == 0xDE else 4)
+        raise ValueError(f"Unsupported MessagePack type 0x{head:02x}")
+
+    return reader.finish(_decode_items(read_item, data))
+
+
+def _cbor_head(out: bytearray, major: int, value: int) -> None:
+    major <<= 5
+    if value < 24:
+        out.append(major | value)
+    elif value < 0x100:
+        out.append(major | 24)
+        out.append(value)
+    elif value < 0x10000:
+        out.append(major | 25)
+        out += value.to_bytes(2, "big")
+    elif value < 0x100000000:
+        out.append(major | 26)
+        out += value.to_bytes(4, "big")
+    else:
+        out.append(major | 27)
+        out += value.to_bytes(8, "big")
+
+
+def cbor_encode(data: Any) -> bytes:
+    """Encode a JSON document as CBOR (RFC 8949).
+
+    Floats are written as float64 and integers beyond 64 bits as bignums
+    (tags 2 and 3), as the ``cbor2`` package does by default.
+
+    Raises:
+        TypeError: If the document holds a value outside the JSON data model
+    """
+    out = bytearray()
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is str:
+            raw = value.encode("utf-8")
+            _cbor_head(out, 3, len(raw))
+            out += raw
+        elif kind is int:
+            major = 0
+            if value < 0:
+                major = 1
+                value = -1 - value
+            if value < _UINT64_LIMIT:
+                _cbor_head(out, major, value)
+            else:
+                raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+                _cbor_head(out, 6, 2 + major)
+                _cbor_head(out, 2, len(raw))
+                out += raw
+        elif kind is float:
+            out.append(0xFB)
+            out += _pack_float(value)
+        elif value is None:
+            out.append(0xF6)
+        elif value is False:
+            out.append(0xF4)
+        elif value is True:
+            out.append(0xF5)
+        elif kind is list:
+            _cbor_head(out, 4, len(value))
+            stack.extend(reversed(value))
+        elif kind is dict:
+            _cbor_head(out, 5, len(value))
+            for key, member in reversed(value.items()):
+                stack.append(member)
+                stack.append(_check_key(key))
+        else:
+            raise TypeError(f"Cannot encode {kind.__name__} as CBOR")
+    return bytes(out)
+
+
+def cbor_decode(data: bytes) -> Any:
+    """Decode a definite-length CBOR document of the JSON data model.
+
+    Raises:
+        ValueError: If the bytes are not such a document
+    """
+    reader = _Reader(data)
+
+    def argument(info: int) -> int:
+        if info < 24:
+            return info
+        if info > 27:
+            raise ValueError("Indefinite lengths are not supported")
+        return reader.uint(1 << (info - 24))
+
+    def read_item() -> Tuple[int, Any]:
+        head = reader.byte()
+        major, info = head >> 5, head & 0x1F
+        if major == 0:
+            return 0, argument(info)
+        if major == 1:
+            return 0, -1 - argument(info)
+        if major == 3:
+            return 0, reader.take(argument(info)).decode("utf-8")
+        if major == 4:
+            return 1, argument(info)
+        if major == 5:
+            return 2, argument(info)
+        if major == 6:
+            tag = argument(info)
+            inner = reader.byte()
+            if tag not in (2, 3) or inner >> 5 != 2:
+                raise ValueError(f"Unsupported CBOR tag {tag}")
+            value = int.from_bytes(reader.take(argument(inner & 0x1F)), "big")
+            return 0, value if tag == 2 else -1 - value
+        if head == 0xF4:
+            return 0, False
+        if head == 0xF5:
+            return 0, True
+        if head == 0xF6:
+            return 0, None
+        if head == 0xF9:
+            return 0, struct.unpack(">e", reader.take(2))[0]
+        if head == 0xFA:
+            return 0, struct.unpack(">f", reader.take(4))[0]
+        if head == 0xFB:
+            return 0, _unpack_float(reader.take(8))[0]
+        raise ValueError(f"Unsupported CBOR item 0x{head:02x}")
+
+    return reader.finish(_decode_items(read_item, data))
+
+
+class WireFormat:
+    """A named codec and the implementation it runs on."""
+
+    def __init__(
+        self, name: str, encode: Encoder, decode: Decoder, implementation: str
+    ):
+        """Initialize the format.
+
+        Args:
+            name: Format name used in variant names
+            encode: Function turning a document into bytes
+            decode: Function turning the bytes back into the document
+            implementation: Package or ``pure-python`` codec running the format
+        """
+        self.name = name
+        self.encode = encode
+        self.decode = decode
+        self.implementation = implementation
+
+
+def _json_pretty(data: Any) -> bytes:
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _json_minified(data: Any) -> bytes:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def wire_formats(prefer_packages: bool = True) -> Dict[str, WireFormat]:
+    """Return the wire formats by name.
+
+    Args:
+        prefer_packages: Use the ``msgpack`` and ``cbor2`` packages when
+            installed; otherwise always use the pure-Python codecs
+    """
+    msgpack = _optional_module("msgpack") if prefer_packages else None
+    cbor2 = _optional_module("cbor2") if prefer_packages else None
+    formats = [
+        WireFormat("json_pretty", _json_pretty, json.loads, "json"),
+        WireFormat("json", _json_minified, json.loads, "json"),
+        WireFormat("msgpack", msgpack_encode, msgpack_decode, "pure-python")
+        if msgpack is None
+        else WireFormat(
+            "msgpack",
+            msgpack.packb,
+            lambda raw: msgpack.unpackb(raw, raw=False, strict_map_key=False),
+            "msgpack",
+        ),
+        WireFormat("cbor", cbor_encode, cbor_decode, "pure-python")
+        if cbor2 is None
+        else WireFormat("cbor", cbor2.dumps, cbor2.loads, "cbor2"),
+    ]
+    return {wire_format.name: wire_format for wire_format in formats}
+
+
+# Compressors by name: compress(data, level) and decompress(data)
+COMPRESSORS: Dict[str, Tuple[Callable[[bytes, int], bytes], Decoder]] = {
+    "gzip": (lambda raw, level: gzip.compress(raw, level, mtime=0), gzip.decompress),
+    "zlib": (zlib.compress, zlib.decompress),
+}
+
+DEFAULT_COMPRESSION_LEVELS = (1, 6, 9)
+
+
+def check_compression_levels(levels: Optional[List[int]]) -> Tuple[int, ...]:
+    """Return the compression levels to measure.
+
+    Raises:
+        ValueError: If a level is outside 0-9
+    """
+    if levels is None:
+        return DEFAULT_COMPRESSION_LEVELS
+    for level in levels:
+        if type(level) is not int or not 0 <= level <= 9:
+            raise ValueError(f"Compression levels must be integers 0-9, got: {level}")
+    return tuple(dict.fromkeys(levels))
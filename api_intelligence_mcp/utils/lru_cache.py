@@ -0,0 +1,146 @@
+"""Bounded, thread-safe LRU cache utility for the Template MCP server."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+
+
+class _Entry(NamedTuple):
+    value: Any
+    size: int
+    expires_at: Optional[float]
+
+
+class LRUCache:
+    """Least-recently-used cache bounded by entry count and an estimated byte size.
+
+    Entries may carry an absolute expiry time (``time.monotonic()`` based) and
+    a caller-estimated size. Inserting beyond either bound evicts the least
+    recently used entries. Hit, miss, eviction and expiration counters are kept
+    for ``stats()``.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: Optional[int] = None):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept
+            max_bytes: Maximum total of entry sizes kept, unbounded when None
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default when absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        size: int = 0,
+        ttl: Optional[float] = None,
+    ) -> bool:
+        """Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            size: Estimated size of the entry in bytes
+            ttl: Seconds until the entry expires, never when None
+
+        Returns:
+            bool: False if the entry alone exceeds ``max_bytes`` and was not stored
+        """
+        if self.max_bytes is not None and size > self.max_bytes:
+            return False
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, size, expires_at)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return True
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove and return the value for key."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._remove(key)
+            return entry.value
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def __len__(self) -> int:
+        """Return the number of entries, including not yet purged expired ones."""
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return True if key is cached, without touching recency or counters."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (
+                entry.expires_at is None or entry.expires_at > time.monotonic()
+            )
+
+    @property
+    def size_bytes(self) -> int:
+        """Return the total estimated size of cached entries."""
+        return self._bytes
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters and occupancy."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
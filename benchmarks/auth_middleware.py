@@ -0,0 +1,142 @@
+"""Microbenchmark of the per-request overhead of the authorization middleware.
+
+Compares the pure ASGI ``AuthorizationMiddleware`` with an equivalent
+``BaseHTTPMiddleware`` implementation (the previous design) by driving the
+ASGI apps directly, without a server or network in between. Token
+verification is stubbed so only the middleware cost is measured.
+
+Usage:
+    python -m benchmarks.auth_middleware [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Callable
+from unittest.mock import patch
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api_intelligence_mcp.src import api
+
+
+class BaseHTTPAuthorizationMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware-based authorization check."""
+
+    async def dispatch(self, request: Request, call_next: Callable):
+        """Apply the same checks as ``api.AuthorizationMiddleware``."""
+        public_paths = set(api.PUBLIC_PATHS)
+        if request.url.path in public_paths:
+            return await call_next(request)
+        auth_header = request.headers.get("authorization")
+        if not auth_header:
+            return Response("Unauthorized", status_code=401)
+        if not await api.OAuth2Handler.verify_authorization_header(auth_header):
+            return Response("Unauthorized", status_code=401)
+        return await call_next(request)
+
+
+async def endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    """Answer with a small body, or a 16-chunk stream on /mcp/stream."""
+    if scope["path"] == "/mcp/stream":
+
+        async def chunks():
+            for _ in range(16):
+                yield b"data: {}\n\n"
+
+        response = StreamingResponse(chunks(), media_type="text/event-stream")
+    else:
+        response = PlainTextResponse("ok")
+    await response(scope, receive, send)
+
+
+def make_scope(path: str) -> Scope:
+    """Build an HTTP request scope with a bearer token."""
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"authorization", b"Bearer benchmark-token"),
+            (b"content-type", b"application/json"),
+        ],
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+
+
+async def call(app: ASGIApp, path: str) -> None:
+    """Send one request through the app and drain the response."""
+    body_sent = False
+
+    async def receive() -> Message:
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"{}", "more_body": False}
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        pass
+
+    await app(make_scope(path), receive, send)
+
+
+async def measure(app: ASGIApp, path: str, requests: int) -> float:
+    """Return the mean time per request in microseconds."""
+    for _ in range(min(requests, 500)):
+        await call(app, path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, path)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main(requests: int) -> None:
+    """Run the benchmark and print a comparison table."""
+    apps = {
+        "none": endpoint,
+        "BaseHTTPMiddleware": BaseHTTPAuthorizationMiddleware(endpoint),
+        "pure ASGI": api.AuthorizationMiddleware(endpoint),
+    }
+    paths = ["/health", "/mcp", "/mcp/stream"]
+
+    results = {}
+    for name, app in apps.items():
+        for path in paths:
+            results[name, path] = await measure(app, path, requests)
+
+    print(f"{'middleware':<20}" + "".join(f"{path:>22}" for path in paths))
+    for name in apps:
+        row = ""
+        for path in paths:
+            total = results[name, path]
+            overhead = total - results["none", path]
+            row += f"{total:>10.1f}us (+{overhead:>6.1f})"
+        print(f"{name:<20}{row}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    async def verified(auth_header: str) -> dict:
+        return {"active": True, "sub": "benchmark"}
+
+    with (
+        patch.object(api.settings, "ENABLE_AUTH", True),
+        patch.object(api.OAuth2Handler, "verify_authorization_header", verified),
+    ):
+        asyncio.run(main(args.requests))
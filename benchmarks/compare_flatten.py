@@ -0,0 +1,100 @@
+"""Benchmark of the schema flattening used by compare_api_responses.
+
+Compares ``extract_schema`` with the previous recursive implementation,
+which built a dict per level and merged it into its parent, on deep and wide
+synthetic payloads. The previous implementation treats arrays as leaves,
+while ``extract_schema`` also flattens the merged array element schema, so
+the listing payload measures extra work done rather than the same output.
+
+Usage:
+    python -m benchmarks.compare_flatten [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+from typing import Any, Callable, Dict
+
+from api_intelligence_mcp.src.tools.compare_api_responses import extract_schema
+
+
+def previous_extract_schema(obj: Any, parent: str = "") -> Dict[str, str]:
+    """The previous recursive flattening of compare_api_responses."""
+    schema = {}
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            path = f"{parent}.{k}" if parent else k
+            schema.update(previous_extract_schema(v, path))
+    else:
+        schema[parent] = type(obj).__name__
+    return schema
+
+
+def deep(depth: int, width: int = 4) -> Dict[str, Any]:
+    """Build objects nested ``depth`` levels with ``width`` leaves per level."""
+    data: Dict[str, Any] = {f"leaf{i}": i for i in range(width)}
+    for level in range(depth):
+        data = {"child": data, **{f"leaf{i}": level for i in range(width)}}
+    return data
+
+
+def wide(keys: int) -> Dict[str, Any]:
+    """Build a two-level object with ``keys`` leaves in total."""
+    groups = max(keys // 100, 1)
+    return {
+        f"group{g}": {f"field{f}": f for f in range(keys // groups)}
+        for g in range(groups)
+    }
+
+
+def listing(rows: int) -> Dict[str, Any]:
+    """Build a listing response of ``rows`` structurally similar rows."""
+    return {
+        "items": [
+            {
+                "id": i,
+                "name": f"item {i}",
+                "price": i / 10 if i % 7 else None,
+                "tags": ["a", "b"][: i % 3],
+                "owner": {"id": i % 50, "email": "owner@example.com"},
+            }
+            for i in range(rows)
+        ],
+        "next": None,
+    }
+
+
+def measure(func: Callable[[Any], Any], data: Any, repeat: int) -> float:
+    """Return the best time of ``repeat`` runs in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(repeat: int) -> None:
+    """Run the benchmark and print a comparison table."""
+    # Deep payloads exceed the default limit in the recursive implementation
+    sys.setrecursionlimit(10000)
+    payloads = {
+        "deep 500": deep(500),
+        "deep 2000": deep(2000),
+        "wide 100k": wide(100_000),
+        "listing 20k rows": listing(20_000),
+    }
+
+    print(f"{'payload':<20}{'previous':>12}{'current':>12}{'paths':>10}")
+    for name, data in payloads.items():
+        previous = measure(previous_extract_schema, data, repeat)
+        current = measure(extract_schema, data, repeat)
+        paths = len(extract_schema(data))
+        print(f"{name:<20}{previous:>10.1f}ms{current:>10.1f}ms{paths:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.repeat)
@@ -0,0 +1,182 @@
+"""Benchmark of the traversals of the analyze and optimize tools.
+
+Compares the visitors walked by ``analyze_api_response`` and
+``optimize_api_response_schema`` with the recursive traversals of the tools
+before the traversal engine, on a listing and a deep synthetic payload. The
+previous traversals are copied from the baseline tools. The current
+visitors do more (per-path inventory rows, byte accounting, pass savings),
+so the comparison bounds the cost of that work rather than measuring the
+same output. A walk of a no-op ``Visitor``, which receives a ``Node`` per
+value, against a no-op ``ValueVisitor`` shows what the node-free walk saves.
+
+Usage:
+    python -m benchmarks.traversal_walk [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from api_intelligence_mcp.src.tools.analyze_api_response import (
+    FieldInventoryVisitor,
+)
+from api_intelligence_mcp.src.tools.optimize_api_response_schema import CleanVisitor
+from api_intelligence_mcp.src.tools.traversal import ValueVisitor, Visitor, walk
+
+
+def previous_analyze(data: Any) -> List[Dict[str, Any]]:
+    """The previous recursive traversal of analyze_api_response."""
+    null_fields: List[str] = []
+    empty_arrays: List[str] = []
+    fields: List[Dict[str, Any]] = []
+    max_depth = 0
+
+    def infer_type(value):
+        if isinstance(value, bool):
+            return "boolean"
+        if isinstance(value, int):
+            return "integer"
+        if isinstance(value, float):
+            return "float"
+        if isinstance(value, str):
+            return "string"
+        if isinstance(value, list):
+            return "array"
+        if isinstance(value, dict):
+            return "object"
+        if value is None:
+            return "null"
+        return "unknown"
+
+    def traverse(obj, parent_path="", depth=1):
+        nonlocal max_depth
+        max_depth = max(max_depth, depth)
+
+        if isinstance(obj, dict):
+            for k, v in obj.items():
+                path = f"{parent_path}.{k}" if parent_path else k
+                fields.append(
+                    {
+                        "path": path,
+                        "type": infer_type(v),
+                        "depth": depth,
+                        "nullable": v is None,
+                        "is_array": isinstance(v, list),
+                        "is_object": isinstance(v, dict),
+                    }
+                )
+                if v is None:
+                    null_fields.append(path)
+                if isinstance(v, list) and len(v) == 0:
+                    empty_arrays.append(path)
+                traverse(v, path, depth + 1)
+
+        elif isinstance(obj, list):
+            for index, item in enumerate(obj):
+                traverse(item, f"{parent_path}[{index}]", depth + 1)
+
+    traverse(data)
+    return fields
+
+
+def previous_optimize(data: Any) -> Any:
+    """The previous recursive cleaning of optimize_api_response_schema."""
+    fields_removed = []
+
+    def clean(obj):
+        if isinstance(obj, dict):
+            new_dict = {}
+            for k, v in obj.items():
+                if v is None:
+                    fields_removed.append(k)
+                    continue
+                if isinstance(v, list) and len(v) == 0:
+                    fields_removed.append(k)
+                    continue
+                new_dict[k] = clean(v)
+            return new_dict
+        elif isinstance(obj, list):
+            return [clean(item) for item in obj]
+        else:
+            return obj
+
+    return clean(data)
+
+
+def current_analyze(data: Any) -> None:
+    """Walk the field inventory visitor of analyze_api_response."""
+    walk(data, FieldInventoryVisitor())
+
+
+def current_optimize(data: Any) -> None:
+    """Walk the generic cleaning visitor of optimize_api_response_schema."""
+    walk(data, CleanVisitor())
+
+
+def listing(rows: int) -> Dict[str, Any]:
+    """Build a listing response of ``rows`` structurally similar rows."""
+    return {
+        "items": [
+            {
+                "id": i,
+                "name": f"item {i}",
+                "price": i / 10 if i % 7 else None,
+                "tags": ["a", "b"][: i % 3],
+                "owner": {"id": i % 50, "email": "owner@example.com"},
+                "notes": None,
+            }
+            for i in range(rows)
+        ],
+        "next": None,
+    }
+
+
+def deep(depth: int, width: int = 4) -> Dict[str, Any]:
+    """Build objects nested ``depth`` levels with ``width`` leaves per level."""
+    data: Dict[str, Any] = {f"leaf{i}": i for i in range(width)}
+    for level in range(depth):
+        data = {"child": data, **{f"leaf{i}": level for i in range(width)}}
+    return data
+
+
+def measure(func: Callable[[Any], Any], data: Any, repeat: int) -> float:
+    """Return the best time of ``repeat`` runs in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(repeat: int) -> None:
+    """Run the benchmark and print a comparison table."""
+    # Deep payloads exceed the default limit in the recursive implementations
+    sys.setrecursionlimit(10000)
+    payloads = {
+        "listing 40k rows": listing(40_000),
+        "deep 2000": deep(2000),
+    }
+    cases = {
+        "analyze": (previous_analyze, current_analyze),
+        "optimize": (previous_optimize, current_optimize),
+        "no-op walk": (
+            lambda data: walk(data, Visitor()),
+            lambda data: walk(data, ValueVisitor()),
+        ),
+    }
+
+    print(f"{'payload':<20}{'case':<14}{'previous':>12}{'current':>12}")
+    for name, data in payloads.items():
+        for case, (previous, current) in cases.items():
+            previous_ms = measure(previous, data, repeat)
+            current_ms = measure(current, data, repeat)
+            print(f"{name:<20}{case:<14}{previous_ms:>10.1f}ms{current_ms:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.repeat)
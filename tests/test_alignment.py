@@ -0,0 +1,63 @@
+"""Tests for array element alignment."""
+
+from api_intelligence_mcp.src.tools.alignment import (
+    align_sequences,
+    detect_key,
+    increasing_subsequence,
+)
+
+
+class TestAlignSequences:
+    """Test digest alignment of array elements."""
+
+    def test_exact_lcs(self):
+        """Test that small middles are aligned with an exact LCS."""
+        # Act
+        pairs, method = align_sequences(list("xabcdy"), list("xbadcy"))
+
+        # Assert
+        assert method == "lcs"
+        assert len(pairs) == 4
+        assert pairs[0] == (0, 0) and pairs[-1] == (5, 5)
+
+    def test_heuristic_above_cutoff(self):
+        """Test that large middles are anchored on unique elements in order."""
+        # Arrange
+        old = list(range(1000))
+        new = [-1] + old[:500] + [-2] + old[500:]
+
+        # Act
+        pairs, method = align_sequences(old, new, max_cells=100)
+
+        # Assert
+        assert method == "heuristic"
+        assert len(pairs) == 1000
+        assert all(old[i] == new[j] for i, j in pairs)
+
+    def test_increasing_subsequence(self):
+        """Test the positions of a longest increasing subsequence."""
+        assert increasing_subsequence([3, 1, 2, 5, 4, 6]) == [1, 2, 4, 5]
+        assert increasing_subsequence([]) == []
+
+
+class TestDetectKey:
+    """Test identity key detection."""
+
+    def test_detects_unique_key(self):
+        """Test that the first key unique on both sides is used."""
+        # Arrange
+        old = [{"id": 1, "uuid": "a"}, {"id": 1, "uuid": "b"}]
+        new = [{"id": 2, "uuid": "b"}]
+
+        # Act
+        key, old_positions, new_positions = detect_key(old, new)
+
+        # Assert
+        assert key == "uuid"
+        assert old_positions == {"a": 0, "b": 1}
+        assert new_positions == {"b": 0}
+
+    def test_no_key(self):
+        """Test arrays whose elements cannot be identified."""
+        assert detect_key([1, 2], [2, 3]) is None
+        assert detect_key([{"id": True}], [{"id": True}]) is None
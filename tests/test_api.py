@@ -1,9 +1,14 @@
 """Tests for the API module."""
 
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
 
+from api_intelligence_mcp.src import api as api_module
 from api_intelligence_mcp.src.api import app
 
 
@@ -164,3 +169,169 @@ class TestAPI:
 
         # All should work without errors
         assert True
+
+
+async def echo(request: Request) -> JSONResponse:
+    """Echo the request body and authorization header."""
+    body = await request.body()
+    return JSONResponse(
+        {
+            "body": body.decode(),
+            "authorization": request.headers.get("authorization"),
+        }
+    )
+
+
+def make_client(middleware_class) -> TestClient:
+    """Build a test client for a small app wrapped in the given middleware."""
+    inner = Starlette(
+        routes=[
+            Route("/mcp", echo, methods=["GET", "POST"]),
+            Route("/health", echo),
+        ]
+    )
+    return TestClient(middleware_class(inner))
+
+
+class TestAuthorizationMiddleware:
+    """Test the ASGI authorization middleware."""
+
+    @patch("api_intelligence_mcp.src.api.settings")
+    def test_public_path_skips_auth(self, mock_settings):
+        """Test that public paths are served without a token."""
+        # Arrange
+        mock_settings.ENABLE_AUTH = True
+        client = make_client(api_module.AuthorizationMiddleware)
+
+        # Act
+        response = client.get("/health")
+
+        # Assert
+        assert response.status_code == 200
+
+    @patch("api_intelligence_mcp.src.api.settings")
+    def test_missing_header_rejected(self, mock_settings):
+        """Test that protected paths require an Authorization header."""
+        # Arrange
+        mock_settings.ENABLE_AUTH = True
+        client = make_client(api_module.AuthorizationMiddleware)
+
+        # Act
+        response = client.post("/mcp", content=b"{}")
+
+        # Assert
+        assert response.status_code == 401
+        assert response.headers["www-authenticate"] == "Bearer"
+
+    @patch("api_intelligence_mcp.src.api.settings")
+    def test_valid_token_passes_body_through(self, mock_settings):
+        """Test that authorized requests reach the app with their body intact."""
+        # Arrange
+        mock_settings.ENABLE_AUTH = True
+        client = make_client(api_module.AuthorizationMiddleware)
+
+        with patch.object(
+            api_module.OAuth2Handler,
+            "verify_authorization_header",
+            AsyncMock(return_value={"sub": "user123"}),
+        ) as mock_verify:
+            # Act
+            response = client.post(
+                "/mcp", content=b'{"a": 1}', headers={"Authorization": "Bearer t"}
+            )
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["body"] == '{"a": 1}'
+        mock_verify.assert_awaited_once_with("Bearer t")
+
+    @patch("api_intelligence_mcp.src.api.settings")
+    def test_invalid_token_rejected(self, mock_settings):
+        """Test that requests with an invalid token are rejected."""
+        # Arrange
+        mock_settings.ENABLE_AUTH = True
+        client = make_client(api_module.AuthorizationMiddleware)
+
+        with patch.object(
+            api_module.OAuth2Handler,
+            "verify_authorization_header",
+            AsyncMock(return_value=None),
+        ):
+            # Act
+            response = client.post("/mcp", headers={"Authorization": "Bearer bad"})
+
+        # Assert
+        assert response.status_code == 401
+
+    @patch("api_intelligence_mcp.src.api.settings")
+    def test_auth_disabled(self, mock_settings):
+        """Test that all requests pass when auth is disabled."""
+        # Arrange
+        mock_settings.ENABLE_AUTH = False
+        client = make_client(api_module.AuthorizationMiddleware)
+
+        # Act
+        response = client.post("/mcp")
+
+        # Assert
+        assert response.status_code == 200
+
+
+class TestLocalDevelopmentAuthorizationMiddleware:
+    """Test the local development authorization middleware."""
+
+    @patch("api_intelligence_mcp.src.api.settings")
+    def test_non_tool_call_passes_through(self, mock_settings):
+        """Test that MCP requests other than tool calls need no token."""
+        # Arrange
+        mock_settings.USE_EXTERNAL_BROWSER_AUTH = True
+        client = make_client(api_module.LocalDevelopmentAuthorizationMiddleware)
+
+        # Act
+        response = client.post("/mcp", content=b'{"method": "tools/list"}')
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["body"] == '{"method": "tools/list"}'
+
+    @patch("api_intelligence_mcp.src.api.settings")
+    def test_tool_call_gets_local_token(self, mock_settings):
+        """Test that tool calls are forwarded with the local development token."""
+        # Arrange
+        mock_settings.USE_EXTERNAL_BROWSER_AUTH = True
+        client = make_client(api_module.LocalDevelopmentAuthorizationMiddleware)
+
+        with patch.object(api_module, "_local_development_token", "dev_token"):
+            # Act
+            response = client.post("/mcp", content=b'{"method": "tools/call"}')
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {
+            "body": '{"method": "tools/call"}',
+            "authorization": "Bearer dev_token",
+        }
+
+    @patch("api_intelligence_mcp.src.api.webbrowser")
+    @patch("api_intelligence_mcp.src.api.settings")
+    def test_tool_call_without_token_opens_browser(self, mock_settings, mock_browser):
+        """Test that tool calls without a token start the browser OAuth flow."""
+        # Arrange
+        mock_settings.USE_EXTERNAL_BROWSER_AUTH = True
+        client = make_client(api_module.LocalDevelopmentAuthorizationMiddleware)
+
+        with (
+            patch.object(api_module, "_local_development_token", None),
+            patch.object(
+                api_module.OAuth2Handler,
+                "get_authorization_url",
+                return_value=("https://sso.example.com/auth", "state"),
+            ),
+        ):
+            # Act
+            response = client.post("/mcp", content=b'{"method": "tools/call"}')
+
+        # Assert
+        assert response.status_code == 401
+        assert response.json()["authorization_url"] == "https://sso.example.com/auth"
+        mock_browser.open.assert_called_once_with("https://sso.example.com/auth")
@@ -0,0 +1,116 @@
+"""Tests for schema baselines."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+from api_intelligence_mcp.src.tools.baseline_registry import (
+    BaselineRegistry,
+    baseline_registry,
+)
+from api_intelligence_mcp.src.tools.compare_api_responses import (
+    extract_schema,
+    schema_and_fingerprint,
+)
+from api_intelligence_mcp.src.tools.compare_with_baseline import compare_with_baseline
+from api_intelligence_mcp.src.tools.save_schema_baseline import save_schema_baseline
+
+RESPONSE = {"items": [{"id": 1, "name": "a", "tags": []}], "next": None}
+
+
+class TestBaselineRegistry:
+    """Test the BaselineRegistry class."""
+
+    def test_memory_fallback(self):
+        """Test that baselines are kept in memory without storage."""
+        # Arrange
+        registry = BaselineRegistry()
+
+        async def run():
+            await registry.save("v1", {"id": "int"}, "abc")
+            found = await registry.get("v1")
+            registry._cache.clear()
+            reloaded = await registry.get("v1")
+            deleted = await registry.delete("v1")
+            return found, reloaded, deleted, await registry.get("v1")
+
+        # Act
+        found, reloaded, deleted, missing = asyncio.run(run())
+
+        # Assert
+        assert found["schema"] == {"id": "int"}
+        assert reloaded == found
+        assert deleted is True
+        assert missing is None
+
+    def test_storage_lookups_cached(self):
+        """Test that baselines are stored and read through the LRU cache."""
+        # Arrange
+        storage = AsyncMock()
+        storage.store_schema_baseline.return_value = True
+        storage.get_schema_baseline.return_value = {
+            "baseline_id": "v1",
+            "schema": {"id": "int"},
+            "fingerprint": "abc",
+        }
+        registry = BaselineRegistry(storage=storage)
+
+        async def run():
+            await registry.save("v0", {"id": "str"}, "def")
+            return [await registry.get("v1") for _ in range(3)]
+
+        # Act
+        results = asyncio.run(run())
+
+        # Assert
+        storage.store_schema_baseline.assert_awaited_once()
+        storage.get_schema_baseline.assert_awaited_once_with("v1")
+        assert results[2]["fingerprint"] == "abc"
+        assert registry.stats()["hits"] == 2
+        assert registry.stats()["memory_baselines"] == 0
+
+
+class TestBaselineTools:
+    """Test the save_schema_baseline and compare_with_baseline tools."""
+
+    def test_schema_matches_extract_schema(self):
+        """Test that the saved schema is the compare_api_responses schema."""
+        schema, fingerprint = schema_and_fingerprint(json.dumps(RESPONSE))
+
+        assert schema == extract_schema(RESPONSE)
+        assert len(fingerprint) == 32
+
+    def test_compare_with_baseline(self):
+        """Test comparing responses with a saved baseline."""
+        # Arrange
+        baseline_registry.clear()
+        changed = {"items": [{"id": "1", "tags": []}], "next": None, "page": 2}
+
+        async def run():
+            saved = await save_schema_baseline("users-v1", json.dumps(RESPONSE))
+            same = await compare_with_baseline("users-v1", json.dumps(RESPONSE))
+            diff = await compare_with_baseline("users-v1", json.dumps(changed))
+            return saved, same, diff
+
+        # Act
+        saved, same, diff = asyncio.run(run())
+        baseline_registry.clear()
+
+        # Assert
+        assert saved["status"] == "success"
+        assert saved["field_count"] == 4
+        assert same["fingerprint_matches"] is True
+        assert same["breaking_changes_detected"] is False
+        assert diff["added_fields"] == ["page"]
+        assert diff["removed_fields"] == ["items[].name"]
+        assert diff["type_changes"] == ["items[].id: int -> str"]
+        assert diff["breaking_changes_detected"] is True
+
+    def test_unknown_baseline(self):
+        """Test comparing with a baseline that was never saved."""
+        # Act
+        result = asyncio.run(compare_with_baseline("missing", "{}"))
+
+        # Assert
+        assert result["status"] == "error"
+        assert "missing" in result["error"]
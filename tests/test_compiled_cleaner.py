@@ -0,0 +1,179 @@
+"""Tests for the shape-specialized cleaners of the response optimizer."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from api_intelligence_mcp.src.tools.compiled_cleaner import (
+    COMPILE_AFTER,
+    CompiledCleaner,
+    CompiledCleanerCache,
+    ShapeMismatch,
+    UnsupportedShape,
+    learn_shape,
+    shape_sketch,
+)
+from api_intelligence_mcp.src.tools.optimization_passes import build_passes
+from api_intelligence_mcp.src.tools.optimize_api_response_schema import (
+    CleanVisitor,
+    clean_document,
+    optimize_api_response_schema,
+)
+from api_intelligence_mcp.src.tools.traversal import walk
+
+
+def listing(count, offset=0):
+    """Build a listing response whose rows all have the same keys."""
+    return {
+        "items": [
+            {
+                "id": offset + index,
+                "name": f"user {index}" if index % 3 else "",
+                "email": None if index % 2 else "a@example.com",
+                "score": index / 7,
+                "tags": [] if index % 2 else ["new"],
+                "meta": {"active": bool(index % 2), "notes": []},
+            }
+            for index in range(count)
+        ],
+        "next": None,
+    }
+
+
+ALL_PASSES = [
+    "nulls",
+    "empty_arrays",
+    "empty_strings",
+    "defaults",
+    "round_floats",
+    "minify",
+]
+
+
+class TestCompiledCleaner:
+    """Test the CompiledCleaner class."""
+
+    @pytest.mark.parametrize("names", [["nulls", "empty_arrays"], ALL_PASSES])
+    def test_matches_generic_walk(self, names):
+        """Test that a compiled cleaner gives the generic walk's result."""
+        # Arrange
+        passes = build_passes(names, float_digits=2)
+        cleaner = CompiledCleaner(learn_shape(listing(5)), passes)
+        data = listing(9, offset=100)
+        generic = CleanVisitor(passes=passes)
+        walk(data, generic)
+
+        # Act
+        result, size, savings = cleaner.run(data)
+
+        # Assert
+        assert json.dumps(result) == json.dumps(generic.result)
+        assert size == generic.optimized_bytes
+        assert savings.fields_removed() == generic.fields_removed
+        assert savings.by_path() == generic.savings.by_path()
+        assert savings.by_pass(passes) == generic.savings.by_pass(passes)
+
+    def test_rejects_other_shapes(self):
+        """Test that payloads of another shape raise ShapeMismatch."""
+        # Arrange
+        cleaner = CompiledCleaner(learn_shape(listing(3)), build_passes(["nulls"]))
+        renamed = listing(3)
+        renamed["items"][2] = {"id": 1}
+        nested = listing(3)
+        nested["next"] = {"cursor": "abc"}
+
+        # Act / Assert
+        for data in (renamed, nested, [listing(1)]):
+            with pytest.raises(ShapeMismatch):
+                cleaner.run(data)
+
+    def test_unsupported_shapes(self):
+        """Test that positions mixing object keys are not compiled."""
+        # Act / Assert
+        with pytest.raises(UnsupportedShape):
+            learn_shape([{"id": 1}, {"id": 2, "extra": True}])
+        with pytest.raises(UnsupportedShape):
+            learn_shape([{"id": 1}, [1]])
+
+
+class TestCompiledCleanerCache:
+    """Test the CompiledCleanerCache class."""
+
+    def test_compiles_hot_shapes(self):
+        """Test that a shape is compiled once seen repeatedly, then reused."""
+        # Arrange
+        passes = build_passes(["nulls", "empty_arrays"])
+        payloads = [listing(count) for count in range(2, COMPILE_AFTER + 7)]
+
+        # Act
+        with patch(
+            "api_intelligence_mcp.src.tools.optimize_api_response_schema."
+            "compiled_cleaners",
+            CompiledCleanerCache(max_entries=4),
+        ) as cache:
+            used = [clean_document(data, passes)[3] for data in payloads]
+
+        # Assert
+        assert used == [False] * COMPILE_AFTER + [True] * 5
+        stats = cache.stats()
+        assert stats["compiles"] == 1
+        assert stats["hits"] == 5
+        assert stats["misses"] == COMPILE_AFTER
+
+    def test_widens_on_mismatch(self):
+        """Test that a rejected payload widens the shape of the cleaner."""
+        # Arrange
+        cache = CompiledCleanerCache()
+        passes = build_passes(["nulls"])
+        scalars = {"items": [{"id": 1, "owner": None}]}
+        # Differs from the scalars past the first row, so in the same sketch
+        objects = {"items": [{"id": 1, "owner": None}, {"id": 2, "owner": {"n": 1}}]}
+        for _ in range(COMPILE_AFTER):
+            key, _ = cache.lookup(scalars, passes)
+            cache.learn(key, scalars, passes)
+
+        # Act
+        key, rejected = cache.lookup(objects, passes)
+        with pytest.raises(ShapeMismatch):
+            rejected.run(objects)
+        cache.mismatch(key)
+        cache.learn(key, objects, passes, rejected=rejected)
+        _, widened = cache.lookup(scalars, passes)
+
+        # Assert
+        assert widened.run(objects)[0] == {"items": [{"id": 1}, objects["items"][1]]}
+        assert widened.run(scalars)[0] == {"items": [{"id": 1}]}
+        assert cache.stats()["mismatches"] == 1
+        assert cache.stats()["compiles"] == 2
+
+    def test_sketch_is_bounded(self):
+        """Test that the sketch only reads the first element of arrays."""
+        # Act / Assert
+        assert shape_sketch(listing(2)) == shape_sketch(listing(500))
+        assert shape_sketch(listing(2)) != shape_sketch({"items": []})
+
+    def test_tool_reports_cache_stats(self):
+        """Test that the optimizer reports whether a compiled cleaner ran."""
+        # Arrange
+        response_json = json.dumps(listing(4))
+
+        # Act
+        with patch(
+            "api_intelligence_mcp.src.tools.optimize_api_response_schema."
+            "compiled_cleaners",
+            CompiledCleanerCache(),
+        ):
+            results = [
+                optimize_api_response_schema(response_json)
+                for _ in range(COMPILE_AFTER + 1)
+            ]
+
+        # Assert
+        assert [result["compiled_cleaner"] for result in results] == (
+            [False] * COMPILE_AFTER + [True]
+        )
+        assert results[-1]["compiled_cleaner_cache"]["hits"] == 1
+        generic, compiled = results[0], results[-1]
+        for field in ("optimized_response", "fields_removed", "pass_savings"):
+            assert compiled[field] == generic[field]
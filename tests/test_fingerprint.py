@@ -0,0 +1,66 @@
+"""Tests for structural fingerprints."""
+
+from api_intelligence_mcp.src.tools import fingerprint
+from api_intelligence_mcp.src.tools.fingerprint import (
+    ShapeRegistry,
+    ShapeVisitor,
+    shape_fingerprint,
+)
+from api_intelligence_mcp.src.tools.traversal import walk
+
+
+class TestShapeFingerprint:
+    """Test the shape registry and fingerprints."""
+
+    def test_fingerprint_ignores_data(self):
+        """Test that values with the same structure share a fingerprint."""
+        # Arrange
+        first = {"id": 1, "tags": ["a", "b"], "owner": {"name": "x"}}
+        second = {"id": 2, "tags": ["c"], "owner": {"name": "y"}}
+
+        # Act & Assert
+        assert shape_fingerprint(first) == shape_fingerprint(second)
+        assert shape_fingerprint(first) != shape_fingerprint({"id": "1"})
+        assert len(shape_fingerprint(first)) == 32
+
+    def test_fingerprint_ignores_key_and_element_order(self):
+        """Test that key order and array element order do not matter."""
+        assert shape_fingerprint({"a": 1, "b": "x"}) == shape_fingerprint(
+            {"b": "y", "a": 2}
+        )
+        assert shape_fingerprint([1, "x", 1]) == shape_fingerprint(["y", 2])
+
+    def test_fingerprint_is_stable(self):
+        """Test that fingerprints do not depend on the process or registry."""
+        assert shape_fingerprint({"id": 1}) == "5daf55d995b834ac12d6c95bf308a21e"
+
+    def test_repeated_shapes_interned_once(self):
+        """Test that identical rows are interned as one shape."""
+        # Arrange
+        registry = ShapeRegistry()
+        visitor = ShapeVisitor(registry)
+        rows = [{"id": i, "tags": ["a"] * (i % 3)} for i in range(1000)]
+
+        # Act
+        walk({"rows": rows}, visitor)
+
+        # Assert
+        kinds = [kind for kind, _ in registry.shapes]
+        assert kinds.count("object") == 3
+        assert registry.shapes[visitor.result][0] == "object"
+
+    def test_inline_shapes_match_walked_shapes(self, monkeypatch):
+        """Test that inline shaping gives the same ids as the walk."""
+        # Arrange
+        data = [{"a": [1, {"b": None}], "c": {}}, [[], [True]], "x"]
+        inline = ShapeVisitor(ShapeRegistry())
+        walk(data, inline)
+        monkeypatch.setattr(fingerprint, "INLINE_LIMIT", 0)
+        walked = ShapeVisitor(ShapeRegistry())
+
+        # Act
+        walk(data, walked)
+
+        # Assert
+        assert inline.registry.shapes == walked.registry.shapes
+        assert inline.result == walked.result
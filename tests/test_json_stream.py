@@ -0,0 +1,137 @@
+"""Tests for the incremental JSON tokenizer."""
+
+import json
+
+import pytest
+
+from api_intelligence_mcp.src.tools.analyze_api_response import analyze_stream
+from api_intelligence_mcp.src.tools.json_stream import (
+    JSONEventStream,
+    iter_chunks,
+    loads_iterative,
+)
+
+DOCUMENT = {
+    "id": 123456789,
+    "price": -1.5e3,
+    "name": 'Ünïcødé "quoted" \\ ☃',
+    "flags": [True, False, None],
+    "nested": {"empty": {}, "list": []},
+}
+
+
+def split(data, size):
+    """Split text or bytes into chunks of the given size."""
+    return [data[start : start + size] for start in range(0, len(data), size)]
+
+
+class TestJSONEventStream:
+    """Test the JSONEventStream class."""
+
+    def test_events(self):
+        """Test the event sequence of a small document."""
+        # Act
+        events = list(JSONEventStream(['{"a": [1, "x"], "b": {}}']))
+
+        # Assert
+        assert events == [
+            ("start_map", None),
+            ("map_key", "a"),
+            ("start_array", None),
+            ("value", 1),
+            ("value", "x"),
+            ("end_array", None),
+            ("map_key", "b"),
+            ("start_map", None),
+            ("end_map", None),
+            ("end_map", None),
+        ]
+
+    @pytest.mark.parametrize("size", [1, 2, 7, 1024])
+    def test_tokens_split_across_chunks(self, size):
+        """Test that tokens split at any chunk boundary parse correctly."""
+        # Arrange
+        text = json.dumps(DOCUMENT, ensure_ascii=False)
+
+        # Act
+        from_text = loads_iterative(split(text, size))
+        from_bytes = loads_iterative(split(text.encode("utf-8"), size))
+
+        # Assert
+        assert from_text == DOCUMENT
+        assert from_bytes == DOCUMENT
+
+    def test_bytes_read(self):
+        """Test that the UTF-8 size of the input is counted."""
+        # Arrange
+        text = json.dumps(DOCUMENT, ensure_ascii=False)
+        stream = JSONEventStream(split(text, 5))
+
+        # Act
+        list(stream)
+
+        # Assert
+        assert stream.bytes_read == len(text.encode("utf-8"))
+
+    @pytest.mark.parametrize(
+        "text",
+        ["", "{", "[1,]", '{"a" 1}', '{"a": 1,}', "[1 2]", "1 2", "tru", '"abc', "01"],
+    )
+    def test_invalid_json_raises(self, text):
+        """Test that invalid documents raise JSONDecodeError like json.loads."""
+        with pytest.raises(json.JSONDecodeError):
+            loads_iterative(split(text, 1))
+
+    def test_loads_iterative_deep_nesting(self):
+        """Test parsing nesting far beyond the json.loads limit."""
+        # Arrange
+        depth = 100000
+        text = "[" * depth + "]" * depth
+
+        # Act
+        data = loads_iterative(text)
+
+        # Assert
+        for _ in range(depth - 1):
+            data = data[0]
+        assert data == []
+
+    def test_iter_chunks_file(self, tmp_path):
+        """Test reading a file source in chunks."""
+        # Arrange
+        path = tmp_path / "payload.json"
+        path.write_text(json.dumps(DOCUMENT))
+
+        # Act
+        chunks = list(iter_chunks(path, chunk_size=16))
+
+        # Assert
+        assert all(isinstance(chunk, bytes) for chunk in chunks)
+        assert loads_iterative(path) == DOCUMENT
+
+
+class TestAnalyzeStream:
+    """Test streaming analysis of chunked sources."""
+
+    def test_chunk_iterator(self):
+        """Test analysis of a generated chunk stream."""
+
+        # Arrange
+        def chunks():
+            yield '{"items": ['
+            for index in range(1000):
+                yield ("," if index else "") + json.dumps({"id": index, "v": None})
+            yield "]}"
+
+        # Act
+        metrics = analyze_stream(chunks())
+        indexed = analyze_stream(chunks(), path_mode="indexed")
+
+        # Assert
+        assert metrics["field_count"] == 2001
+        assert metrics["null_field_count"] == 1000
+        assert metrics["null_fields"] == ["items[].v"]
+        assert metrics["max_nesting_depth"] == 4
+        assert indexed["null_field_count"] == 1000
+        assert len(indexed["null_fields"]) == 1000
+        assert indexed["null_fields"][0] == "items[0].v"
@@ -0,0 +1,300 @@
+"""Tests for local JWT access token verification."""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from api_intelligence_mcp.src.oauth import handler, jwt_verifier
+from api_intelligence_mcp.src.oauth.handler import OAuth2Handler
+from api_intelligence_mcp.src.oauth.jwt_verifier import (
+    JWKSCache,
+    LocalJWTVerifier,
+    looks_like_jwt,
+)
+from api_intelligence_mcp.src.oauth.token_cache import introspection_cache
+
+ISSUER = "https://sso.example.com/realms/example"
+AUDIENCE = "api-intelligence-mcp"
+
+
+def make_key(kid: str):
+    """Generate an RSA key pair and its public JWK."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return private_key, jwk
+
+
+def make_token(private_key, kid: str, omit=(), **overrides) -> str:
+    """Sign an access token with the given key, without the ``omit`` claims."""
+    claims = {
+        "sub": "user123",
+        "iss": ISSUER,
+        "aud": AUDIENCE,
+        "azp": "client123",
+        "preferred_username": "jdoe",
+        "exp": int(time.time()) + 300,
+        **overrides,
+    }
+    for claim in omit:
+        del claims[claim]
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture(scope="module")
+def signing_key():
+    """RSA signing key shared by the tests in this module."""
+    return make_key("key-1")
+
+
+def make_verifier(jwks_documents, **kwargs):
+    """Build a verifier whose JWKS fetches return the given documents in turn."""
+    fetch = AsyncMock(side_effect=jwks_documents)
+    cache = JWKSCache(fetch, min_refresh_interval=kwargs.pop("min_refresh", 0))
+    verifier = LocalJWTVerifier(
+        cache,
+        algorithms=["RS256"],
+        issuer=kwargs.pop("issuer", ISSUER),
+        audience=kwargs.pop("audience", AUDIENCE),
+    )
+    return verifier, fetch
+
+
+class TestLocalJWTVerifier:
+    """Test the LocalJWTVerifier class."""
+
+    def test_looks_like_jwt(self):
+        """Test that only three-segment tokens are treated as JWTs."""
+        assert looks_like_jwt("a.b.c")
+        assert not looks_like_jwt("opaque-token")
+
+    @pytest.mark.asyncio
+    async def test_valid_token(self, signing_key):
+        """Test that a valid token yields introspection-shaped claims."""
+        # Arrange
+        private_key, jwk = signing_key
+        verifier, fetch = make_verifier([{"keys": [jwk]}])
+
+        # Act
+        claims = await verifier.verify(make_token(private_key, "key-1"))
+
+        # Assert
+        assert claims["active"] is True
+        assert claims["sub"] == "user123"
+        assert claims["client_id"] == "client123"
+        assert claims["username"] == "jdoe"
+        assert claims["token_type"] == "Bearer"
+        assert fetch.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_keys_are_reused(self, signing_key):
+        """Test that the JWKS is fetched once for repeated verifications."""
+        # Arrange
+        private_key, jwk = signing_key
+        verifier, fetch = make_verifier([{"keys": [jwk]}])
+
+        # Act
+        for _ in range(3):
+            assert await verifier.verify(make_token(private_key, "key-1"))
+
+        # Assert
+        assert fetch.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_token(self, signing_key):
+        """Test that expired tokens are rejected."""
+        # Arrange
+        private_key, jwk = signing_key
+        verifier, _ = make_verifier([{"keys": [jwk]}])
+        token = make_token(private_key, "key-1", exp=int(time.time()) - 60)
+
+        # Act & Assert
+        assert await verifier.verify(token) is None
+
+    @pytest.mark.asyncio
+    async def test_wrong_audience_and_issuer(self, signing_key):
+        """Test that aud and iss mismatches are rejected."""
+        # Arrange
+        private_key, jwk = signing_key
+        verifier, _ = make_verifier([{"keys": [jwk]}])
+
+        # Act & Assert
+        assert await verifier.verify(make_token(private_key, "key-1", aud="x")) is None
+        assert await verifier.verify(make_token(private_key, "key-1", iss="x")) is None
+
+    @pytest.mark.asyncio
+    async def test_missing_audience_and_issuer(self, signing_key):
+        """Test that tokens without aud or iss claims are rejected."""
+        # Arrange
+        private_key, jwk = signing_key
+        verifier, _ = make_verifier([{"keys": [jwk]}])
+
+        # Act & Assert
+        for claim in ("aud", "iss"):
+            token = make_token(private_key, "key-1", omit=[claim])
+            assert await verifier.verify(token) is None
+
+    @pytest.mark.parametrize("missing", ["issuer", "audience"])
+    def test_requires_audience_and_issuer(self, missing):
+        """Test that a verifier cannot be built without the expected iss and aud."""
+        # Act & Assert
+        for value in (None, ""):
+            with pytest.raises(ValueError, match="requires an issuer and audience"):
+                make_verifier([], **{missing: value})
+
+    @pytest.mark.asyncio
+    async def test_disallowed_algorithm(self, signing_key):
+        """Test that tokens signed with a non-allowlisted algorithm are rejected."""
+        # Arrange
+        _, jwk = signing_key
+        verifier, fetch = make_verifier([{"keys": [jwk]}])
+        token = jwt.encode(
+            {"sub": "user123", "exp": int(time.time()) + 300},
+            "secret" * 6,
+            algorithm="HS256",
+            headers={"kid": "key-1"},
+        )
+
+        # Act & Assert
+        assert await verifier.verify(token) is None
+        fetch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_refreshes_jwks(self, signing_key):
+        """Test that a rotated key is picked up by refreshing on a kid miss."""
+        # Arrange
+        _, old_jwk = signing_key
+        new_private_key, new_jwk = make_key("key-2")
+        verifier, fetch = make_verifier([{"keys": [old_jwk]}, {"keys": [new_jwk]}])
+        await verifier.jwks.refresh()
+
+        # Act
+        claims = await verifier.verify(make_token(new_private_key, "key-2"))
+
+        # Assert
+        assert claims["sub"] == "user123"
+        assert fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_refresh_is_rate_limited(self, signing_key):
+        """Test that repeated unknown kids do not refetch within the interval."""
+        # Arrange
+        private_key, jwk = signing_key
+        verifier, fetch = make_verifier([{"keys": [jwk]}], min_refresh=60)
+
+        # Act
+        result = await verifier.verify(make_token(private_key, "unknown"))
+        await verifier.verify(make_token(private_key, "unknown"))
+
+        # Assert
+        assert result is None
+        assert fetch.await_count == 1
+
+
+class TestHandlerJWTMode:
+    """Test OAuth2Handler.verify_access_token in jwt verification mode."""
+
+    @pytest.fixture(autouse=True)
+    def jwt_mode(self):
+        """Switch the handler to jwt verification mode."""
+        introspection_cache.clear()
+        with patch.object(handler.settings, "SSO_TOKEN_VERIFICATION_MODE", "jwt"):
+            yield
+        introspection_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_jwt_verified_locally(self, signing_key):
+        """Test that JWTs are verified without calling introspection."""
+        # Arrange
+        private_key, jwk = signing_key
+        verifier, _ = make_verifier([{"keys": [jwk]}])
+
+        with (
+            patch.object(handler, "get_jwt_verifier", return_value=verifier),
+            patch.object(OAuth2Handler, "introspect_token") as mock_introspect,
+        ):
+            # Act
+            claims = await OAuth2Handler.verify_access_token(
+                make_token(private_key, "key-1")
+            )
+
+        # Assert
+        assert claims["sub"] == "user123"
+        mock_introspect.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_opaque_token_falls_back_to_introspection(self):
+        """Test that opaque tokens are still introspected remotely."""
+        # Arrange
+        introspection = {
+            "active": True,
+            "token_type": "Bearer",
+            "exp": int(time.time()) + 300,
+        }
+
+        with (
+            patch.object(handler, "get_jwt_verifier") as mock_get_verifier,
+            patch.object(
+                OAuth2Handler, "introspect_token", return_value=introspection
+            ) as mock_introspect,
+        ):
+            # Act
+            claims = await OAuth2Handler.verify_access_token("opaque-token")
+
+        # Assert
+        assert claims == introspection
+        mock_introspect.assert_awaited_once_with("opaque-token")
+        mock_get_verifier.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_jwks_outage_falls_back_to_introspection(self, signing_key):
+        """Test that JWTs are introspected when the JWKS cannot be fetched."""
+        # Arrange
+        private_key, _ = signing_key
+        verifier, _ = make_verifier(ConnectionError("SSO unreachable"))
+        introspection = {
+            "active": True,
+            "token_type": "Bearer",
+            "exp": int(time.time()) + 300,
+        }
+
+        with (
+            patch.object(handler, "get_jwt_verifier", return_value=verifier),
+            patch.object(
+                OAuth2Handler, "introspect_token", return_value=introspection
+            ) as mock_introspect,
+        ):
+            # Act
+            claims = await OAuth2Handler.verify_access_token(
+                make_token(private_key, "key-1")
+            )
+
+        # Assert
+        assert claims == introspection
+        mock_introspect.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_audience_and_issuer(self, signing_key):
+        """Test that without expected aud and iss no JWT is accepted locally."""
+        # Arrange
+        private_key, _ = signing_key
+        token = make_token(private_key, "key-1", aud="other-client", iss="x")
+
+        with (
+            patch.object(jwt_verifier, "_jwt_verifier", None),
+            patch.object(jwt_verifier.settings, "SSO_ISSUER", None),
+            patch.object(jwt_verifier.settings, "SSO_AUDIENCE", None),
+            patch.object(
+                OAuth2Handler, "introspect_token", return_value={"active": False}
+            ) as mock_introspect,
+        ):
+            # Act
+            claims = await OAuth2Handler.verify_access_token(token)
+
+        # Assert
+        assert claims is None
+        mock_introspect.assert_awaited_once_with(token)
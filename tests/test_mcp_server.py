@@ -0,0 +1,107 @@
+"""Tests for the MCP server tool execution layer."""
+
+import inspect
+import threading
+
+import pytest
+
+from api_intelligence_mcp.src.mcp_server import ToolExecutor
+from api_intelligence_mcp.src.tools.analyze_api_response import analyze_api_response
+
+
+def current_thread_name(value: int) -> str:
+    """Return the name of the thread running the call."""
+    return threading.current_thread().name
+
+
+class TestToolExecutor:
+    """Test the ToolExecutor class."""
+
+    def test_invalid_mode_rejected(self):
+        """Test that unknown execution modes are rejected."""
+        with pytest.raises(ValueError, match="Execution mode must be one of"):
+            ToolExecutor(default_mode="gpu")
+
+        with pytest.raises(ValueError, match="Execution mode must be one of"):
+            ToolExecutor(default_mode="thread", routes={"analyze_api_response": "x"})
+
+    def test_mode_for_uses_routes(self):
+        """Test per-tool routing overrides the default mode."""
+        # Arrange
+        executor = ToolExecutor(
+            default_mode="process", routes={"compare_api_responses": "thread"}
+        )
+
+        # Assert
+        assert executor.mode_for("compare_api_responses") == "thread"
+        assert executor.mode_for("analyze_api_response") == "process"
+
+    def test_wrap_inline_returns_original(self):
+        """Test that inline tools are registered unchanged."""
+        # Arrange
+        executor = ToolExecutor(default_mode="inline")
+
+        # Act
+        wrapped = executor.wrap(analyze_api_response)
+
+        # Assert
+        assert wrapped is analyze_api_response
+
+    def test_wrap_preserves_signature(self):
+        """Test that dispatched tools keep the metadata FastMCP relies on."""
+        # Arrange
+        executor = ToolExecutor(default_mode="thread")
+
+        # Act
+        wrapped = executor.wrap(analyze_api_response)
+
+        # Assert
+        assert inspect.iscoroutinefunction(wrapped)
+        assert wrapped.__name__ == "analyze_api_response"
+        assert wrapped.__doc__ == analyze_api_response.__doc__
+        assert inspect.signature(wrapped) == inspect.signature(analyze_api_response)
+
+    @pytest.mark.asyncio
+    async def test_thread_mode_runs_off_event_loop(self):
+        """Test that thread-routed tools run in the tool thread pool."""
+        # Arrange
+        executor = ToolExecutor(default_mode="thread", max_workers=1)
+
+        # Act
+        try:
+            thread_name = await executor.run(current_thread_name, 1)
+        finally:
+            executor.shutdown()
+
+        # Assert
+        assert thread_name.startswith("mcp-tool")
+
+    @pytest.mark.asyncio
+    async def test_process_mode_runs_tool(self):
+        """Test that process-routed tools run and return their result."""
+        # Arrange
+        executor = ToolExecutor(default_mode="process", max_workers=1)
+        wrapped = executor.wrap(analyze_api_response)
+
+        # Act
+        try:
+            await executor.warm_up()
+            result = await wrapped('{"id": 1, "email": null}')
+        finally:
+            executor.shutdown()
+
+        # Assert
+        assert result["status"] == "success"
+        assert result["metrics"]["null_fields"] == ["email"]
+
+    @pytest.mark.asyncio
+    async def test_inline_mode_runs_in_caller(self):
+        """Test that inline tools run on the calling thread."""
+        # Arrange
+        executor = ToolExecutor(default_mode="inline")
+
+        # Act
+        thread_name = await executor.run(current_thread_name, 1)
+
+        # Assert
+        assert thread_name == threading.current_thread().name
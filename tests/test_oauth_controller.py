@@ -36,8 +36,8 @@ class TestOAuthControllerHandleCallback:
         with patch(
             "api_intelligence_mcp.src.oauth.controller.OAuth2Handler"
         ) as mock_handler:
-            mock_handler.get_access_token_from_authorization_code_flow.return_value = (
-                mock_token
+            mock_handler.get_access_token_from_authorization_code_flow = AsyncMock(
+                return_value=mock_token
             )
 
             # Create mock OAuth service with dependency injection
@@ -80,9 +80,9 @@ class TestOAuthControllerHandleCallback:
         with patch(
             "api_intelligence_mcp.src.oauth.controller.OAuth2Handler"
         ) as mock_handler:
-            mock_handler.get_access_token_from_authorization_code_flow.return_value = {
-                "access_token": "token"
-            }
+            mock_handler.get_access_token_from_authorization_code_flow = AsyncMock(
+                return_value={"access_token": "token"}
+            )
 
             # Create mock OAuth service
             oauth_service = AsyncMock(spec=OAuthService)
@@ -116,8 +116,8 @@ class TestOAuthControllerHandleCallback:
                 "api_intelligence_mcp.src.oauth.controller.api_module", create=True
             ) as mock_api_module,
         ):
-            mock_handler.get_access_token_from_authorization_code_flow.return_value = (
-                mock_token
+            mock_handler.get_access_token_from_authorization_code_flow = AsyncMock(
+                return_value=mock_token
             )
 
             # Create mock OAuth service
@@ -1016,11 +1016,13 @@ class TestRefreshTokenGrantEdgeCases:
         with patch(
             "api_intelligence_mcp.src.oauth.controller.OAuth2Handler"
         ) as mock_handler:
-            mock_handler.get_access_token_from_refresh_token.return_value = {
-                "access_token": "new_snowflake_access_token",
-                "refresh_token": "new_snowflake_refresh_token",
-                "expires_in": 7200,
-            }
+            mock_handler.get_access_token_from_refresh_token = AsyncMock(
+                return_value={
+                    "access_token": "new_snowflake_access_token",
+                    "refresh_token": "new_snowflake_refresh_token",
+                    "expires_in": 7200,
+                }
+            )
 
             result = await controller.handle_refresh_token_grant_pydantic(
                 token_request, oauth_service
@@ -1059,8 +1061,8 @@ class TestRefreshTokenGrantEdgeCases:
         with patch(
             "api_intelligence_mcp.src.oauth.controller.OAuth2Handler"
         ) as mock_handler:
-            mock_handler.get_access_token_from_refresh_token.side_effect = Exception(
-                "Snowflake error"
+            mock_handler.get_access_token_from_refresh_token = AsyncMock(
+                side_effect=Exception("Snowflake error")
             )
 
             result = await controller.handle_refresh_token_grant_pydantic(
@@ -1,9 +1,23 @@
+import asyncio
 import time
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import httpx
+import pytest
 
+from api_intelligence_mcp.src.oauth import handler
 from api_intelligence_mcp.src.oauth.handler import SCOPE, OAuth2Handler
+from api_intelligence_mcp.src.oauth.sso_client import SSOClient
+from api_intelligence_mcp.src.oauth.token_cache import introspection_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_introspection_cache():
+    """Start every test with an empty introspection cache."""
+    introspection_cache.clear()
+    handler._token_verifications.reset_stats()
+    yield
+    introspection_cache.clear()
 
 
 class TestOAuth2Handler:
@@ -15,7 +29,9 @@ class TestOAuth2Handler:
         mock_settings.SSO_CLIENT_ID = "test_client_id"
         mock_settings.SSO_CALLBACK_URL = "http://localhost:3000/callback"
 
-        with patch("api_intelligence_mcp.src.oauth.handler.OAuth2Session") as mock_oauth:
+        with patch(
+            "api_intelligence_mcp.src.oauth.handler.OAuth2Session"
+        ) as mock_oauth:
             mock_session = Mock()
             mock_oauth.return_value = mock_session
 
@@ -35,7 +51,9 @@ class TestOAuth2Handler:
         mock_settings.SSO_CLIENT_ID = "test_client_id"
         mock_settings.SSO_CALLBACK_URL = "http://localhost:3000/callback"
 
-        with patch("api_intelligence_mcp.src.oauth.handler.OAuth2Session") as mock_oauth:
+        with patch(
+            "api_intelligence_mcp.src.oauth.handler.OAuth2Session"
+        ) as mock_oauth:
             mock_session = Mock()
             mock_oauth.return_value = mock_session
 
@@ -62,113 +80,84 @@ class TestOAuth2Handler:
         assert auth_url == "http://auth.url"
         assert state == "state123"
 
-    @patch("api_intelligence_mcp.src.oauth.handler.settings")
-    @patch("api_intelligence_mcp.src.oauth.handler.OAuth2Handler.create_oauth_session")
-    def test_get_access_token_from_authorization_code_flow(
-        self, mock_create_session, mock_settings
-    ):
+    @patch("api_intelligence_mcp.src.oauth.handler.get_sso_client")
+    @pytest.mark.asyncio
+    async def test_get_access_token_from_authorization_code_flow(self, mock_get_client):
         """Test getting access token from authorization code flow."""
-        mock_settings.SSO_CLIENT_SECRET = "test_secret"
-
-        mock_session = Mock()
+        mock_client = Mock()
         mock_token = {"access_token": "token123", "token_type": "Bearer"}
-        mock_session.fetch_token.return_value = mock_token
-        mock_create_session.return_value = mock_session
+        mock_client.exchange_authorization_code = AsyncMock(return_value=mock_token)
+        mock_get_client.return_value = mock_client
 
-        result = OAuth2Handler.get_access_token_from_authorization_code_flow(
+        result = await OAuth2Handler.get_access_token_from_authorization_code_flow(
             "code123", "state123"
         )
 
-        mock_create_session.assert_called_once_with(state="state123")
-        mock_session.fetch_token.assert_called_once_with(
-            mock_settings.SSO_TOKEN_URL,
-            code="code123",
-            client_secret="test_secret",
-            include_client_id=True,
-        )
+        mock_client.exchange_authorization_code.assert_awaited_once_with("code123")
         assert result == mock_token
 
-    @patch("api_intelligence_mcp.src.oauth.handler.settings")
-    @patch("api_intelligence_mcp.src.oauth.handler.OAuth2Handler.create_oauth_session")
-    def test_get_access_token_from_refresh_token(
-        self, mock_create_session, mock_settings
-    ):
+    @patch("api_intelligence_mcp.src.oauth.handler.get_sso_client")
+    @pytest.mark.asyncio
+    async def test_get_access_token_from_refresh_token(self, mock_get_client):
         """Test getting access token from refresh token."""
-        mock_settings.SSO_CLIENT_ID = "client123"
-        mock_settings.SSO_CLIENT_SECRET = "secret123"
-
-        mock_session = Mock()
+        mock_client = Mock()
         mock_token = {"access_token": "new_token123", "token_type": "Bearer"}
-        mock_session.refresh_token.return_value = mock_token
-        mock_create_session.return_value = mock_session
+        mock_client.refresh_access_token = AsyncMock(return_value=mock_token)
+        mock_get_client.return_value = mock_client
 
-        result = OAuth2Handler.get_access_token_from_refresh_token("refresh123")
+        result = await OAuth2Handler.get_access_token_from_refresh_token("refresh123")
 
-        mock_create_session.assert_called_once_with()
-        mock_session.refresh_token.assert_called_once_with(
-            mock_settings.SSO_TOKEN_URL,
-            refresh_token="refresh123",
-            client_id="client123",
-            client_secret="secret123",
-        )
+        mock_client.refresh_access_token.assert_awaited_once_with("refresh123")
         assert result == mock_token
 
-    @patch("api_intelligence_mcp.src.oauth.handler.settings")
-    @patch("api_intelligence_mcp.src.oauth.handler.httpx.post")
-    def test_introspect_token_success(self, mock_post, mock_settings):
+    @patch("api_intelligence_mcp.src.oauth.handler.get_sso_client")
+    @pytest.mark.asyncio
+    async def test_introspect_token_success(self, mock_get_client):
         """Test successful token introspection."""
-        mock_settings.SSO_CLIENT_ID = "client123"
-        mock_settings.SSO_CLIENT_SECRET = "secret123"
-
-        mock_response = Mock()
-        mock_response.raise_for_status.return_value = None
-        mock_response.json.return_value = {"active": True, "sub": "user123"}
-        mock_post.return_value = mock_response
-
-        result = OAuth2Handler.introspect_token("token123")
-
-        mock_post.assert_called_once_with(
-            mock_settings.SSO_INTROSPECTION_URL,
-            data={
-                "token": "token123",
-                "client_id": "client123",
-                "client_secret": "secret123",
-            },
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-            timeout=10.0,
+        mock_client = Mock()
+        mock_client.introspect_token = AsyncMock(
+            return_value={"active": True, "sub": "user123"}
         )
+        mock_get_client.return_value = mock_client
+
+        result = await OAuth2Handler.introspect_token("token123")
+
+        mock_client.introspect_token.assert_awaited_once_with("token123")
         assert result == {"active": True, "sub": "user123"}
 
-    @patch("api_intelligence_mcp.src.oauth.handler.settings")
-    @patch("api_intelligence_mcp.src.oauth.handler.httpx.post")
-    def test_introspect_token_http_error(self, mock_post, mock_settings):
+    @patch("api_intelligence_mcp.src.oauth.handler.get_sso_client")
+    @pytest.mark.asyncio
+    async def test_introspect_token_http_error(self, mock_get_client):
         """Test token introspection with HTTP error."""
-        mock_settings.SSO_CLIENT_ID = "client123"
-        mock_settings.SSO_CLIENT_SECRET = "secret123"
-
-        mock_post.side_effect = httpx.HTTPError("Connection failed")
+        mock_client = Mock()
+        mock_client.introspect_token = AsyncMock(
+            side_effect=httpx.HTTPError("Connection failed")
+        )
+        mock_get_client.return_value = mock_client
 
-        result = OAuth2Handler.introspect_token("token123")
+        result = await OAuth2Handler.introspect_token("token123")
 
         assert result["active"] is False
         assert "Introspection failed" in result["error"]
 
-    @patch("api_intelligence_mcp.src.oauth.handler.settings")
-    @patch("api_intelligence_mcp.src.oauth.handler.httpx.post")
-    def test_introspect_token_unexpected_error(self, mock_post, mock_settings):
+    @patch("api_intelligence_mcp.src.oauth.handler.get_sso_client")
+    @pytest.mark.asyncio
+    async def test_introspect_token_unexpected_error(self, mock_get_client):
         """Test token introspection with unexpected error."""
-        mock_settings.SSO_CLIENT_ID = "client123"
-        mock_settings.SSO_CLIENT_SECRET = "secret123"
-
-        mock_post.side_effect = Exception("Unexpected error")
+        mock_client = Mock()
+        mock_client.introspect_token = AsyncMock(
+            side_effect=Exception("Unexpected error")
+        )
+        mock_get_client.return_value = mock_client
 
-        result = OAuth2Handler.introspect_token("token123")
+        result = await OAuth2Handler.introspect_token("token123")
 
         assert result["active"] is False
         assert "Unexpected error" in result["error"]
 
     @patch("api_intelligence_mcp.src.oauth.handler.OAuth2Handler.introspect_token")
-    def test_verify_access_token_active(self, mock_introspect):
+    @pytest.mark.asyncio
+    async def test_verify_access_token_active(self, mock_introspect):
         """Test verifying an active access token."""
         mock_introspect.return_value = {
             "active": True,
@@ -177,24 +166,26 @@ class TestOAuth2Handler:
             "sub": "user123",
         }
 
-        result = OAuth2Handler.verify_access_token("token123")
+        result = await OAuth2Handler.verify_access_token("token123")
 
         mock_introspect.assert_called_once_with("token123")
         assert result["active"] is True
         assert result["sub"] == "user123"
 
     @patch("api_intelligence_mcp.src.oauth.handler.OAuth2Handler.introspect_token")
-    def test_verify_access_token_inactive(self, mock_introspect):
+    @pytest.mark.asyncio
+    async def test_verify_access_token_inactive(self, mock_introspect):
         """Test verifying an inactive token."""
         mock_introspect.return_value = {"active": False}
 
-        result = OAuth2Handler.verify_access_token("token123")
+        result = await OAuth2Handler.verify_access_token("token123")
 
         mock_introspect.assert_called_once_with("token123")
         assert result is None
 
     @patch("api_intelligence_mcp.src.oauth.handler.OAuth2Handler.introspect_token")
-    def test_verify_access_token_expired(self, mock_introspect):
+    @pytest.mark.asyncio
+    async def test_verify_access_token_expired(self, mock_introspect):
         """Test verifying an expired token."""
         mock_introspect.return_value = {
             "active": True,
@@ -202,12 +193,13 @@ class TestOAuth2Handler:
             "token_type": "Bearer",
         }
 
-        result = OAuth2Handler.verify_access_token("token123")
+        result = await OAuth2Handler.verify_access_token("token123")
 
         assert result is None
 
     @patch("api_intelligence_mcp.src.oauth.handler.OAuth2Handler.introspect_token")
-    def test_verify_access_token_invalid_type(self, mock_introspect):
+    @pytest.mark.asyncio
+    async def test_verify_access_token_invalid_type(self, mock_introspect):
         """Test verifying token with invalid type."""
         mock_introspect.return_value = {
             "active": True,
@@ -215,12 +207,13 @@ class TestOAuth2Handler:
             "token_type": "refresh_token",
         }
 
-        result = OAuth2Handler.verify_access_token("token123")
+        result = await OAuth2Handler.verify_access_token("token123")
 
         assert result is None
 
     @patch("api_intelligence_mcp.src.oauth.handler.OAuth2Handler.introspect_token")
-    def test_verify_access_token_no_expiry(self, mock_introspect):
+    @pytest.mark.asyncio
+    async def test_verify_access_token_no_expiry(self, mock_introspect):
         """Test verifying token without expiry."""
         mock_introspect.return_value = {
             "active": True,
@@ -228,33 +221,100 @@ class TestOAuth2Handler:
             "sub": "user123",
         }
 
-        result = OAuth2Handler.verify_access_token("token123")
+        result = await OAuth2Handler.verify_access_token("token123")
 
         assert result["active"] is True
         assert result["sub"] == "user123"
 
+    @patch("api_intelligence_mcp.src.oauth.handler.OAuth2Handler.introspect_token")
+    @pytest.mark.asyncio
+    async def test_verify_access_token_uses_cache(self, mock_introspect):
+        """Test that repeated verification of a token hits the cache."""
+        mock_introspect.return_value = {
+            "active": True,
+            "exp": time.time() + 3600,
+            "token_type": "Bearer",
+            "sub": "user123",
+        }
+
+        first = await OAuth2Handler.verify_access_token("token123")
+        second = await OAuth2Handler.verify_access_token("token123")
+
+        mock_introspect.assert_called_once_with("token123")
+        assert first == second
+        assert introspection_cache.stats()["hits"] == 1
+
+    @patch("api_intelligence_mcp.src.oauth.handler.OAuth2Handler.introspect_token")
+    @pytest.mark.asyncio
+    async def test_verify_access_token_negative_cache(self, mock_introspect):
+        """Test that inactive tokens are cached negatively."""
+        mock_introspect.return_value = {"active": False}
+
+        assert await OAuth2Handler.verify_access_token("token123") is None
+        assert await OAuth2Handler.verify_access_token("token123") is None
+
+        mock_introspect.assert_called_once_with("token123")
+
+    @patch("api_intelligence_mcp.src.oauth.handler.OAuth2Handler.introspect_token")
+    @pytest.mark.asyncio
+    async def test_verify_access_token_does_not_cache_failures(self, mock_introspect):
+        """Test that failed introspection calls are retried rather than cached."""
+        mock_introspect.return_value = {
+            "active": False,
+            "error": "Introspection failed",
+        }
+
+        await OAuth2Handler.verify_access_token("token123")
+        await OAuth2Handler.verify_access_token("token123")
+
+        assert mock_introspect.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_verify_access_token_coalesces_concurrent_calls(self):
+        """Test that concurrent verifications of a token share one introspection."""
+
+        async def slow_introspect(token):
+            await asyncio.sleep(0.01)
+            return {"active": True, "token_type": "Bearer", "sub": "user123"}
+
+        with patch(
+            "api_intelligence_mcp.src.oauth.handler.OAuth2Handler.introspect_token",
+            side_effect=slow_introspect,
+        ) as mock_introspect:
+            results = await asyncio.gather(
+                *(OAuth2Handler.verify_access_token("token123") for _ in range(10))
+            )
+
+        assert mock_introspect.await_count == 1
+        assert all(result["sub"] == "user123" for result in results)
+        stats = OAuth2Handler.get_verification_stats()
+        assert stats["single_flight"]["calls"] == 1
+        assert stats["single_flight"]["coalesced"] == 9
+
     @patch("api_intelligence_mcp.src.oauth.handler.OAuth2Handler.verify_access_token")
-    def test_verify_authorization_header_valid(self, mock_verify):
+    @pytest.mark.asyncio
+    async def test_verify_authorization_header_valid(self, mock_verify):
         """Test verifying valid authorization header."""
         mock_verify.return_value = {"active": True, "sub": "user123"}
 
-        result = OAuth2Handler.verify_authorization_header("Bearer token123")
+        result = await OAuth2Handler.verify_authorization_header("Bearer token123")
 
         mock_verify.assert_called_once_with("token123")
         assert result["active"] is True
 
-    def test_verify_authorization_header_invalid_format(self):
+    @pytest.mark.asyncio
+    async def test_verify_authorization_header_invalid_format(self):
         """Test verifying invalid authorization header format."""
         # Test missing header
-        result = OAuth2Handler.verify_authorization_header("")
+        result = await OAuth2Handler.verify_authorization_header("")
         assert result is None
 
         # Test None header
-        result = OAuth2Handler.verify_authorization_header(None)
+        result = await OAuth2Handler.verify_authorization_header(None)
         assert result is None
 
         # Test wrong format
-        result = OAuth2Handler.verify_authorization_header("Basic token123")
+        result = await OAuth2Handler.verify_authorization_header("Basic token123")
         assert result is None
 
     def test_scope_constant(self):
@@ -267,47 +327,66 @@ class TestOAuth2HandlerIntegration:
     """Integration tests for OAuth2Handler."""
 
     @patch("api_intelligence_mcp.src.oauth.handler.settings")
+    @patch("api_intelligence_mcp.src.oauth.sso_client.settings")
     @patch("api_intelligence_mcp.src.oauth.handler.OAuth2Session")
-    @patch("api_intelligence_mcp.src.oauth.handler.httpx.post")
-    def test_full_oauth_flow_simulation(
-        self, mock_post, mock_oauth_session, mock_settings
+    @pytest.mark.asyncio
+    async def test_full_oauth_flow_simulation(
+        self, mock_oauth_session, mock_client_settings, mock_settings
     ):
-        """Test a full OAuth flow simulation."""
+        """Test a full OAuth flow simulation against a mocked SSO."""
         # Setup
-        mock_settings.SSO_CLIENT_ID = "client123"
-        mock_settings.SSO_CLIENT_SECRET = "secret123"
-        mock_settings.SSO_CALLBACK_URL = "http://localhost:3000/callback"
+        for configured in (mock_settings, mock_client_settings):
+            configured.SSO_CLIENT_ID = "client123"
+            configured.SSO_CLIENT_SECRET = "secret123"
+            configured.SSO_CALLBACK_URL = "http://localhost:3000/callback"
+            configured.SSO_TOKEN_URL = "https://sso.example.com/token"
+            configured.SSO_INTROSPECTION_URL = "https://sso.example.com/introspect"
 
         # Mock OAuth session
         mock_session = Mock()
         mock_session.authorization_url.return_value = ("http://auth.url", "state123")
-        mock_session.fetch_token.return_value = {
-            "access_token": "token123",
-            "refresh_token": "refresh123",
-        }
         mock_oauth_session.return_value = mock_session
 
-        # Mock introspection
-        mock_response = Mock()
-        mock_response.raise_for_status.return_value = None
-        mock_response.json.return_value = {
-            "active": True,
-            "exp": time.time() + 3600,
-            "token_type": "Bearer",
-        }
-        mock_post.return_value = mock_response
+        # Mock SSO endpoints
+        def sso_handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/token":
+                return httpx.Response(
+                    200,
+                    json={
+                        "access_token": "token123",
+                        "refresh_token": "refresh123",
+                        "expires_in": 300,
+                    },
+                )
+            return httpx.Response(
+                200,
+                json={
+                    "active": True,
+                    "exp": time.time() + 3600,
+                    "token_type": "Bearer",
+                },
+            )
 
-        # Test authorization URL generation
-        auth_url, state = OAuth2Handler.get_authorization_url()
-        assert auth_url == "http://auth.url"
-        assert state == "state123"
+        client = SSOClient(transport=httpx.MockTransport(sso_handler))
 
-        # Test token exchange
-        token = OAuth2Handler.get_access_token_from_authorization_code_flow(
-            "code123", state
-        )
-        assert token["access_token"] == "token123"
+        with patch(
+            "api_intelligence_mcp.src.oauth.handler.get_sso_client",
+            return_value=client,
+        ):
+            # Test authorization URL generation
+            auth_url, state = OAuth2Handler.get_authorization_url()
+            assert auth_url == "http://auth.url"
+            assert state == "state123"
+
+            # Test token exchange
+            token = await OAuth2Handler.get_access_token_from_authorization_code_flow(
+                "code123", state
+            )
+            assert token["access_token"] == "token123"
+            assert token["expires_at"] > time.time()
+
+            # Test token verification
+            verification = await OAuth2Handler.verify_access_token("token123")
+            assert verification["active"] is True
 
-        # Test token verification
-        verification = OAuth2Handler.verify_access_token("token123")
-        assert verification["active"] is True
+        await client.aclose()
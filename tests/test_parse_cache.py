@@ -0,0 +1,125 @@
+"""Tests for the shared parsed-document cache."""
+
+import json
+
+import pytest
+
+from api_intelligence_mcp.src.tools.analyze_api_response import analyze_api_response
+from api_intelligence_mcp.src.tools.generate_api_documentation import (
+    generate_api_documentation,
+)
+from api_intelligence_mcp.src.tools.parse_cache import ParseCache, parse_cache
+
+
+class TestParseCache:
+    """Test the ParseCache class."""
+
+    def test_identical_payload_parsed_once(self):
+        """Test that an identical payload reuses the parsed tree."""
+        # Arrange
+        cache = ParseCache(max_entries=4)
+        payload = '{"id": 1, "tags": ["a", "b"]}'
+
+        # Act
+        first = cache.load(payload)
+        second = cache.load(payload)
+
+        # Assert
+        assert first == {"id": 1, "tags": ["a", "b"]}
+        assert second is first
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_null_document_cached(self):
+        """Test that the JSON null document is cached like any other value."""
+        # Arrange
+        cache = ParseCache(max_entries=4)
+
+        # Act
+        cache.load("null")
+        result = cache.load("null")
+
+        # Assert
+        assert result is None
+        assert cache.stats()["hits"] == 1
+
+    def test_memory_budget_evicts(self):
+        """Test that the estimated memory budget evicts old documents."""
+        # Arrange
+        payload = json.dumps({"data": "x" * 100})
+        cache = ParseCache(max_entries=10, max_bytes=len(payload) * 8 * 2)
+
+        # Act
+        for index in range(3):
+            cache.load(json.dumps({"data": str(index) * 100}))
+
+        # Assert
+        stats = cache.stats()
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 1
+
+    def test_disabled_cache_parses_every_time(self):
+        """Test that a disabled cache does not keep documents."""
+        # Arrange
+        cache = ParseCache(enabled=False)
+
+        # Act
+        first = cache.load('{"id": 1}')
+        second = cache.load('{"id": 1}')
+
+        # Assert
+        assert first == second
+        assert first is not second
+        assert cache.stats()["entries"] == 0
+
+    def test_invalid_json_not_cached(self):
+        """Test that invalid payloads raise and are not cached."""
+        # Arrange
+        cache = ParseCache()
+
+        # Act & Assert
+        with pytest.raises(json.JSONDecodeError):
+            cache.load("{invalid")
+        assert cache.stats()["entries"] == 0
+
+    def test_derived_value_built_once(self):
+        """Test that a derived value is computed once per cached tree."""
+        # Arrange
+        cache = ParseCache(max_entries=1)
+        calls = []
+
+        def build(data):
+            calls.append(data)
+            return len(data)
+
+        # Act
+        first = cache.derive('{"a": 1}', "size", build)
+        second = cache.derive('{"a": 1}', "size", build)
+        cache.load("[]")
+        third = cache.derive('{"a": 1}', "size", build)
+
+        # Assert
+        assert first == second == third == 1
+        assert len(calls) == 2
+
+
+class TestSharedParseCache:
+    """Test that the tools share one parse cache."""
+
+    def test_tools_reuse_parsed_payload(self):
+        """Test that a second tool on the same payload skips parsing."""
+        # Arrange
+        parse_cache.clear()
+        payload = '{"id": 1, "name": "John", "email": null}'
+
+        # Act
+        analysis = analyze_api_response(payload)
+        docs = generate_api_documentation(payload)
+
+        # Assert
+        assert analysis["status"] == "success"
+        assert docs["status"] == "success"
+        assert parse_cache.stats()["hits"] == 1
+        parse_cache.clear()
@@ -161,3 +161,24 @@ class TestValidateConfig:
             settings = Settings()
             settings.MCP_TRANSPORT_PROTOCOL = protocol
             validate_config(settings)  # Should not raise
+
+    def test_jwt_mode_requires_issuer_and_audience(self):
+        """Test that jwt verification mode needs the expected iss and aud."""
+        # Arrange
+        configured = {
+            "SSO_JWKS_URL": "https://sso.example.com/certs",
+            "SSO_ISSUER": "https://sso.example.com/realms/example",
+            "SSO_AUDIENCE": "api-intelligence-mcp",
+        }
+
+        # Act & Assert
+        for missing in configured:
+            settings = Settings()
+            settings.SSO_TOKEN_VERIFICATION_MODE = "jwt"
+            for name, value in configured.items():
+                setattr(settings, name, None if name == missing else value)
+            with pytest.raises(ValueError, match=f"{missing} is required"):
+                validate_config(settings)
+        for name, value in configured.items():
+            setattr(settings, name, value)
+        validate_config(settings)  # Should not raise
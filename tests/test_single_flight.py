@@ -0,0 +1,89 @@
+"""Tests for single-flight call coalescing."""
+
+import asyncio
+
+import pytest
+
+from api_intelligence_mcp.src.oauth.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test the SingleFlight class."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test that concurrent calls with one key run the function once."""
+        # Arrange
+        flight = SingleFlight()
+        executions = 0
+
+        async def call():
+            nonlocal executions
+            executions += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        # Act
+        results = await asyncio.gather(*(flight.do("key", call) for _ in range(5)))
+
+        # Assert
+        assert results == ["result"] * 5
+        assert executions == 1
+        assert flight.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+    @pytest.mark.asyncio
+    async def test_different_keys_do_not_coalesce(self):
+        """Test that calls with different keys run independently."""
+        # Arrange
+        flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0)
+            return 1
+
+        # Act
+        await asyncio.gather(flight.do("a", call), flight.do("b", call))
+
+        # Assert
+        assert flight.stats()["calls"] == 2
+        assert flight.stats()["coalesced"] == 0
+
+    @pytest.mark.asyncio
+    async def test_exception_shared_with_waiters(self):
+        """Test that every waiter receives the shared call's exception."""
+        # Arrange
+        flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        # Act
+        results = await asyncio.gather(
+            *(flight.do("key", call) for _ in range(3)), return_exceptions=True
+        )
+
+        # Assert
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert flight.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        """Test that cancelling one waiter leaves the shared call running."""
+        # Arrange
+        flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("key", call))
+        second = asyncio.ensure_future(flight.do("key", call))
+        await asyncio.sleep(0)
+
+        # Act
+        first.cancel()
+        result = await second
+
+        # Assert
+        assert result == "done"
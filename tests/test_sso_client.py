@@ -0,0 +1,148 @@
+"""Tests for the async SSO client."""
+
+from unittest.mock import patch
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from api_intelligence_mcp.src.oauth import sso_client
+from api_intelligence_mcp.src.oauth.sso_client import SSOClient
+
+
+def form_of(request: httpx.Request) -> dict:
+    """Decode the form body of a captured request."""
+    return {k: v[0] for k, v in parse_qs(request.content.decode()).items()}
+
+
+@pytest.fixture
+def sso_settings():
+    """Patch the SSO settings used by the client."""
+    with patch("api_intelligence_mcp.src.oauth.sso_client.settings") as mock_settings:
+        mock_settings.SSO_CLIENT_ID = "client123"
+        mock_settings.SSO_CLIENT_SECRET = "secret123"
+        mock_settings.SSO_CALLBACK_URL = "http://localhost:3000/callback"
+        mock_settings.SSO_TOKEN_URL = "https://sso.example.com/token"
+        mock_settings.SSO_INTROSPECTION_URL = "https://sso.example.com/introspect"
+        yield mock_settings
+
+
+class TestSSOClient:
+    """Test the SSOClient class."""
+
+    @pytest.mark.asyncio
+    async def test_introspect_token(self, sso_settings):
+        """Test that introspection posts the token and client credentials."""
+        # Arrange
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"active": True, "sub": "user123"})
+
+        client = SSOClient(transport=httpx.MockTransport(handler))
+
+        # Act
+        result = await client.introspect_token("token123")
+        await client.aclose()
+
+        # Assert
+        assert result == {"active": True, "sub": "user123"}
+        assert str(requests[0].url) == "https://sso.example.com/introspect"
+        assert form_of(requests[0]) == {
+            "token": "token123",
+            "client_id": "client123",
+            "client_secret": "secret123",
+        }
+
+    @pytest.mark.asyncio
+    async def test_exchange_authorization_code(self, sso_settings):
+        """Test the authorization code grant request and expires_at."""
+        # Arrange
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(
+                200, json={"access_token": "token123", "expires_in": 300}
+            )
+
+        client = SSOClient(transport=httpx.MockTransport(handler))
+
+        # Act
+        token = await client.exchange_authorization_code("code123")
+        await client.aclose()
+
+        # Assert
+        assert token["access_token"] == "token123"
+        assert "expires_at" in token
+        assert form_of(requests[0]) == {
+            "grant_type": "authorization_code",
+            "code": "code123",
+            "redirect_uri": "http://localhost:3000/callback",
+            "client_id": "client123",
+            "client_secret": "secret123",
+        }
+
+    @pytest.mark.asyncio
+    async def test_refresh_access_token(self, sso_settings):
+        """Test the refresh token grant request."""
+        # Arrange
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"access_token": "new_token"})
+
+        client = SSOClient(transport=httpx.MockTransport(handler))
+
+        # Act
+        token = await client.refresh_access_token("refresh123")
+        await client.aclose()
+
+        # Assert
+        assert token == {"access_token": "new_token"}
+        assert form_of(requests[0])["grant_type"] == "refresh_token"
+        assert form_of(requests[0])["refresh_token"] == "refresh123"
+
+    @pytest.mark.asyncio
+    async def test_error_status_raises(self, sso_settings):
+        """Test that SSO error responses raise httpx errors."""
+        # Arrange
+        client = SSOClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(401))
+        )
+
+        # Act & Assert
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.exchange_authorization_code("code123")
+        await client.aclose()
+
+    def test_http2_requires_h2(self):
+        """Test that HTTP/2 is only requested when h2 is installed."""
+        with (
+            patch.object(sso_client, "http2_available", return_value=False),
+            patch(
+                "api_intelligence_mcp.src.oauth.sso_client.httpx.AsyncClient"
+            ) as mock_client,
+        ):
+            SSOClient(http2=True)
+
+        assert mock_client.call_args.kwargs["http2"] is False
+
+
+class TestSSOClientLifecycle:
+    """Test the shared SSO client lifecycle helpers."""
+
+    @pytest.mark.asyncio
+    async def test_initialize_and_cleanup(self):
+        """Test that the shared client is created once and closed on cleanup."""
+        # Act
+        client = await sso_client.initialize_sso_client()
+        same_client = sso_client.get_sso_client()
+        await sso_client.cleanup_sso_client()
+
+        # Assert
+        assert client is same_client
+        assert client.is_closed
+        assert sso_client._sso_client is None
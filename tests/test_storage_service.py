@@ -931,6 +931,84 @@ class TestRefreshTokenMethods:
         mock_conn.execute.assert_called_once()
 
 
+class TestSchemaBaselineMethods:
+    """Test schema baseline methods."""
+
+    @pytest.mark.asyncio
+    async def test_store_schema_baseline_success(self):
+        """Test storing a schema baseline."""
+        service = StorageService()
+        mock_conn = AsyncMock()
+        mock_pool = AsyncMock()
+
+        class AsyncContextManagerMock:
+            def __init__(self, return_value):
+                self.return_value = return_value
+
+            async def __aenter__(self):
+                return self.return_value
+
+            async def __aexit__(self, exc_type, exc_val, exc_tb):
+                return None
+
+        def acquire():
+            return AsyncContextManagerMock(mock_conn)
+
+        mock_pool.acquire = acquire
+        service.pool = mock_pool
+
+        result = await service.store_schema_baseline(
+            "users-v1", {"schema": {"id": "int"}, "fingerprint": "abc"}
+        )
+
+        assert result is True
+        args = mock_conn.execute.call_args[0]
+        assert args[1:] == ("users-v1", '{"id": "int"}', "abc")
+
+    @pytest.mark.asyncio
+    async def test_get_schema_baseline_success(self):
+        """Test getting a schema baseline."""
+        service = StorageService()
+        mock_conn = AsyncMock()
+        mock_conn.fetchrow.return_value = {
+            "baseline_id": "users-v1",
+            "schema": '{"id": "int"}',
+            "fingerprint": "abc",
+            "updated_at": datetime.now(timezone.utc),
+        }
+        mock_pool = AsyncMock()
+
+        class AsyncContextManagerMock:
+            def __init__(self, return_value):
+                self.return_value = return_value
+
+            async def __aenter__(self):
+                return self.return_value
+
+            async def __aexit__(self, exc_type, exc_val, exc_tb):
+                return None
+
+        def acquire():
+            return AsyncContextManagerMock(mock_conn)
+
+        mock_pool.acquire = acquire
+        service.pool = mock_pool
+
+        result = await service.get_schema_baseline("users-v1")
+
+        assert result["schema"] == {"id": "int"}
+        assert result["fingerprint"] == "abc"
+
+    @pytest.mark.asyncio
+    async def test_schema_baseline_methods_no_pool(self):
+        """Test schema baseline methods without a pool."""
+        service = StorageService()
+
+        assert await service.store_schema_baseline("b", {}) is False
+        assert await service.get_schema_baseline("b") is None
+        assert await service.delete_schema_baseline("b") is False
+
+
 class TestStorageServiceIntegration:
     """Integration tests for StorageService."""
 
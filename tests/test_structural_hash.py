@@ -0,0 +1,306 @@
+"""Tests for Merkle hashes and the structural diff."""
+
+import copy
+import json
+
+from api_intelligence_mcp.src.tools.compare_api_responses import (
+    compare_api_responses,
+    diff_schemas,
+    extract_schema,
+    indexed_schema,
+)
+from api_intelligence_mcp.src.tools.parse_cache import parse_cache
+from api_intelligence_mcp.src.tools.structural_hash import (
+    MerkleIndex,
+    diff_values,
+    load_indexed,
+)
+
+
+def listing(rows):
+    """Build a listing large enough to be hashed bottom-up."""
+    return {
+        "items": [
+            {"id": i, "name": f"item {i}", "owner": {"id": i % 3}, "tags": ["a"]}
+            for i in range(rows)
+        ]
+    }
+
+
+def apply_patch(document, patch):
+    """Apply an RFC 6902 patch of add/remove/replace/move operations."""
+    document = copy.deepcopy(document)
+
+    def locate(pointer):
+        tokens = [
+            token.replace("~1", "/").replace("~0", "~")
+            for token in pointer.split("/")[1:]
+        ]
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token) if type(parent) is list else token]
+        last = tokens[-1]
+        return parent, int(last) if type(parent) is list else last
+
+    for operation in patch:
+        op = operation["op"]
+        if operation["path"] == "":
+            document = copy.deepcopy(operation["value"])
+            continue
+        if op == "move":
+            parent, key = locate(operation["from"])
+            value = parent.pop(key)
+        elif op != "remove":
+            value = copy.deepcopy(operation["value"])
+        parent, key = locate(operation["path"])
+        if op == "remove":
+            del parent[key]
+        elif op == "replace" or type(parent) is dict:
+            parent[key] = value
+        else:
+            parent.insert(key, value)
+    return document
+
+
+class TestMerkleIndex:
+    """Test the MerkleIndex class."""
+
+    def test_digests_ignore_key_order(self):
+        """Test that key order changes neither digest."""
+        # Arrange
+        first = MerkleIndex(listing(40))
+        reordered = {
+            "items": [dict(reversed(row.items())) for row in listing(40)["items"]]
+        }
+
+        # Act
+        second = MerkleIndex(reordered)
+
+        # Assert
+        assert first.digest == second.digest
+        assert first.fingerprint == second.fingerprint
+
+    def test_value_digest_distinguishes_types(self):
+        """Test that equal-looking values of different types differ."""
+        digests = {MerkleIndex({"v": value}).digest for value in [1, 1.0, True, "1"]}
+
+        assert len(digests) == 4
+
+    def test_structural_digest_ignores_values(self):
+        """Test that subtrees with the same structure share a shape digest."""
+        # Arrange
+        data = listing(40)
+        index = MerkleIndex(data)
+        rows = data["items"]
+
+        # Act & Assert
+        assert index.shape_digest(rows[0]) == index.shape_digest(rows[1])
+        assert index.value_digest(rows[0]) != index.value_digest(rows[1])
+        assert index.value_digest(rows[0]["owner"]) == index.value_digest(
+            rows[3]["owner"]
+        )
+
+    def test_index_cached_with_parsed_payload(self):
+        """Test that the index is built once per payload."""
+        # Arrange
+        parse_cache.clear()
+        text = json.dumps(listing(5))
+
+        # Act
+        data, index = load_indexed(text)
+        again_data, again_index = load_indexed(text)
+
+        # Assert
+        assert again_index is index
+        assert again_data is data
+        assert parse_cache.stats()["hits"] == 1
+        parse_cache.clear()
+
+
+class TestStructuralDiff:
+    """Test the schema and value diffs."""
+
+    def test_value_changes(self):
+        """Test that changed, added and removed values are reported by path."""
+        # Arrange
+        old = listing(40)
+        new = listing(41)
+        new["items"][7]["name"] = "renamed"
+        del new["items"][9]["tags"]
+        new["items"][12]["owner"]["region"] = "eu"
+
+        # Act
+        diff = diff_values(old, new, MerkleIndex(old), MerkleIndex(new))
+
+        # Assert
+        assert diff.changes == [
+            {"op": "add", "path": "items[40]", "new": new["items"][40]},
+            {
+                "op": "replace",
+                "path": "items[7].name",
+                "old": "item 7",
+                "new": "renamed",
+            },
+            {"op": "remove", "path": "items[9].tags", "old": ["a"]},
+            {"op": "add", "path": "items[12].owner.region", "new": "eu"},
+        ]
+        assert diff.change_count == 4
+        assert diff.subtrees_skipped == 41
+
+    def test_change_list_capped(self):
+        """Test that changes beyond the limit are counted but not listed."""
+        # Arrange
+        old = {f"field{i}": i for i in range(100)}
+        new = {f"field{i}": -i - 1 for i in range(100)}
+
+        # Act
+        diff = diff_values(old, new, MerkleIndex(old), MerkleIndex(new), max_changes=10)
+
+        # Assert
+        assert len(diff.changes) == 10
+        assert diff.change_count == 100
+
+    def test_inserted_and_reordered_rows_aligned_by_key(self):
+        """Test that keyed rows are matched by identity, not position."""
+        # Arrange
+        old = listing(40)
+        new = listing(40)
+        rows = new["items"]
+        rows.insert(0, {"id": 99, "name": "new", "owner": {"id": 0}, "tags": []})
+        rows[5], rows[6] = rows[6], rows[5]
+        rows[20]["name"] = "renamed"
+
+        # Act
+        diff = diff_values(old, new, MerkleIndex(old), MerkleIndex(new))
+
+        # Assert
+        assert diff.alignments["keyed"] == 1
+        assert [change["op"] for change in diff.changes] == ["add", "move", "replace"]
+        assert diff.changes[1] == {"op": "move", "path": "items[5]", "from": "items[5]"}
+        assert diff.changes[2]["path"] == "items[20].name"
+
+    def test_inserted_rows_aligned_by_hash(self):
+        """Test that rows without an identity key are aligned by content."""
+        # Arrange
+        old = [{"name": f"row {i}"} for i in range(30)]
+        new = old[:10] + [{"name": "inserted"}] + old[10:]
+        new[25] = {"name": "edited"}
+
+        # Act
+        diff = diff_values(old, new, MerkleIndex(old), MerkleIndex(new))
+
+        # Assert
+        assert diff.alignments["lcs"] == 1
+        assert diff.changes == [
+            {"op": "add", "path": "[10]", "new": {"name": "inserted"}},
+            {"op": "replace", "path": "[25].name", "old": "row 24", "new": "edited"},
+        ]
+
+    def test_schema_diff_matches_full_flatten(self):
+        """Test that skipping identical subtrees gives the full-flatten result."""
+        # Arrange
+        old = listing(40)
+        new = listing(40)
+        new["items"][5]["owner"]["id"] = "x"
+        new["items"][6]["extra"] = None
+        new["meta"] = {"page": 1}
+
+        # Act
+        added, removed, changed = diff_schemas(
+            old, new, MerkleIndex(old), MerkleIndex(new)
+        )
+
+        # Assert
+        old_schema, new_schema = extract_schema(old), extract_schema(new)
+        assert set(added) == set(new_schema) - set(old_schema)
+        assert set(removed) == set(old_schema) - set(new_schema)
+        assert changed == {"items[].owner.id": ("int", "int|str")}
+
+    def test_schema_paths_of_empty_keys(self):
+        """Test that every flattening writes members with empty keys alike."""
+        # Arrange
+        old = {"": {"b": 1}, "x": {"": "s"}, "items": [{"": {"c": None}}]}
+        new = {"": {"b": "1"}, "x": 1, "items": [{"": {"c": True}}]}
+
+        # Act
+        added, removed, changed = diff_schemas(
+            old, new, MerkleIndex(old), MerkleIndex(new)
+        )
+
+        # Assert
+        assert extract_schema(old) == {
+            ".b": "int",
+            "x.": "str",
+            "items[]..c": "NoneType",
+        }
+        assert indexed_schema(old, MerkleIndex(old)) == extract_schema(old)
+        assert added == {"x": "int"}
+        assert removed == {"x.": "str"}
+        assert changed == {
+            ".b": ("int", "str"),
+            "items[]..c": ("NoneType", "bool"),
+        }
+
+    def test_compare_deep_nesting(self):
+        """Test comparing documents nested beyond the recursion limit."""
+        # Arrange
+        old = '{"child": ' * 5000 + '{"leaf": 1}' + "}" * 5000
+        new = '{"child": ' * 5000 + '{"leaf": 2}' + "}" * 5000
+
+        # Act
+        result = compare_api_responses(old, new)
+
+        # Assert
+        assert result["status"] == "success"
+        assert result["type_changes"] == []
+        assert result["value_change_count"] == 1
+        assert result["value_changes"][0]["path"].endswith("child.leaf")
+
+
+class TestJSONPatch:
+    """Test the RFC 6902 patch built with the diff."""
+
+    def test_patch_transforms_old_into_new(self):
+        """Test that applying the patch in order yields the new document."""
+        # Arrange
+        old = listing(40)
+        old["meta"] = {"a/b": 1, "c~d": 2}
+        new = copy.deepcopy(old)
+        rows = new["items"]
+        rows.insert(3, {"id": 99, "name": "new", "owner": {"id": 0}, "tags": []})
+        rows[10], rows[20] = rows[20], rows[10]
+        del rows[30]
+        rows[5]["tags"].append("b")
+        new["meta"] = {"a/b": 2}
+
+        # Act
+        diff = diff_values(
+            old, new, MerkleIndex(old), MerkleIndex(new), build_patch=True
+        )
+
+        # Assert
+        assert apply_patch(old, diff.patch) == new
+        assert {"op": "remove", "path": "/meta/c~0d"} in diff.patch
+        assert {"op": "replace", "path": "/meta/a~1b", "value": 2} in diff.patch
+
+    def test_patch_size_reported(self):
+        """Test that the tool reports the patch size against the full payload."""
+        # Arrange
+        old = listing(200)
+        new = copy.deepcopy(old)
+        new["items"][50]["name"] = "renamed"
+
+        # Act
+        result = compare_api_responses(
+            json.dumps(old), json.dumps(new), compare_values=False, include_patch=True
+        )
+
+        # Assert
+        assert result["patch"] == [
+            {"op": "replace", "path": "/items/50/name", "value": "renamed"}
+        ]
+        size = result["patch_size"]
+        assert size["operations"] == 1
+        assert size["patch_bytes"] < size["full_bytes"]
+        assert size["ratio"] < 0.01
+        assert "value_changes" not in result
@@ -0,0 +1,93 @@
+"""Tests for the token introspection cache."""
+
+import time
+
+from api_intelligence_mcp.src.oauth.token_cache import (
+    TokenIntrospectionCache,
+    hash_token,
+)
+
+
+class TestTokenIntrospectionCache:
+    """Test the TokenIntrospectionCache class."""
+
+    def test_hash_token_does_not_contain_token(self):
+        """Test that cache keys are hashes rather than raw tokens."""
+        key = hash_token("secret-token")
+
+        assert "secret-token" not in key
+        assert len(key) == 64
+
+    def test_positive_entry(self):
+        """Test that verified claims are served from cache."""
+        # Arrange
+        cache = TokenIntrospectionCache(60, 10, max_entries=10)
+        claims = {"active": True, "sub": "user123", "exp": time.time() + 3600}
+
+        # Act
+        cache.store("token123", claims)
+        cached, result = cache.lookup("token123")
+
+        # Assert
+        assert cached is True
+        assert result == claims
+        assert cache.stats()["hits"] == 1
+
+    def test_negative_entry(self):
+        """Test that rejected tokens are cached as negative entries."""
+        # Arrange
+        cache = TokenIntrospectionCache(60, 10, max_entries=10)
+
+        # Act
+        cache.store("bad-token", None)
+        cached, result = cache.lookup("bad-token")
+
+        # Assert
+        assert cached is True
+        assert result is None
+
+    def test_negative_caching_disabled(self):
+        """Test that a zero negative TTL disables negative caching."""
+        # Arrange
+        cache = TokenIntrospectionCache(60, 0, max_entries=10)
+
+        # Act
+        cache.store("bad-token", None)
+
+        # Assert
+        assert cache.lookup("bad-token") == (False, None)
+
+    def test_expired_claims_not_cached(self):
+        """Test that claims whose exp has passed are never stored."""
+        # Arrange
+        cache = TokenIntrospectionCache(60, 10, max_entries=10)
+
+        # Act
+        cache.store("token123", {"active": True, "exp": time.time() - 1})
+
+        # Assert
+        assert cache.lookup("token123") == (False, None)
+
+    def test_disabled_cache(self):
+        """Test that a zero TTL disables the cache."""
+        # Arrange
+        cache = TokenIntrospectionCache(0, 10, max_entries=10)
+
+        # Act
+        cache.store("token123", {"active": True})
+
+        # Assert
+        assert cache.enabled is False
+        assert cache.lookup("token123") == (False, None)
+
+    def test_invalidate(self):
+        """Test that invalidate drops a cached token."""
+        # Arrange
+        cache = TokenIntrospectionCache(60, 10, max_entries=10)
+        cache.store("token123", {"active": True})
+
+        # Act
+        cache.invalidate("token123")
+
+        # Assert
+        assert cache.lookup("token123") == (False, None)
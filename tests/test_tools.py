@@ -7,12 +7,25 @@ from unittest.mock import Mock, patch
 import pytest
 
 from api_intelligence_mcp.src.tools.analyze_api_response import analyze_api_response
-from api_intelligence_mcp.src.tools.compare_api_responses import compare_api_responses
+from api_intelligence_mcp.src.tools.compare_api_responses import (
+    compare_api_responses,
+    extract_schema,
+)
+from api_intelligence_mcp.src.tools.compare_api_versions import compare_api_versions
 from api_intelligence_mcp.src.tools.generate_api_documentation import (
     generate_api_documentation,
 )
+from api_intelligence_mcp.src.tools.measure_encoding_costs import (
+    measure_encoding_costs,
+)
+from api_intelligence_mcp.src.tools.optimization_passes import (
+    MAX_LISTED_SAVINGS,
+    restore_refs,
+    restore_tables,
+)
 from api_intelligence_mcp.src.tools.optimize_api_response_schema import (
     optimize_api_response_schema,
+    optimize_stream,
 )
 
 
@@ -57,10 +70,176 @@ class TestAnalyzeAPIResponse:
         # Assert
         assert result["status"] == "error"
 
+    def test_analyze_api_response_streaming_matches_full(self):
+        """Test that streaming mode computes the same metrics."""
+        # Arrange
+        response_json = json.dumps(
+            {"items": [{"id": 1, "tags": [], "note": None}], "meta": {"x": None}}
+        )
+
+        # Act
+        full = analyze_api_response(response_json)
+        streamed = analyze_api_response(response_json, streaming=True)
+
+        # Assert
+        assert streamed["status"] == "success"
+        assert "fields" not in streamed["metrics"]
+        for key in [
+            "field_count",
+            "null_fields",
+            "empty_arrays",
+            "payload_size_kb",
+            "max_nesting_depth",
+        ]:
+            assert streamed["metrics"][key] == full["metrics"][key]
+        assert streamed["metrics"]["null_field_count"] == 2
+        assert streamed["readable_summary"] == full["readable_summary"]
+
+    def test_analyze_api_response_collapses_array_paths(self):
+        """Test that array elements are reported once per schema path."""
+        # Arrange
+        response_json = json.dumps(
+            {"items": [{"id": i, "note": None if i % 2 else "x"} for i in range(50)]}
+        )
+
+        # Act
+        result = analyze_api_response(response_json)
+
+        # Assert
+        metrics = result["metrics"]
+        assert metrics["field_count"] == 101
+        assert metrics["null_fields"] == ["items[].note"]
+        assert metrics["null_field_count"] == 25
+        assert [field["path"] for field in metrics["fields"]] == [
+            "items",
+            "items[].id",
+            "items[].note",
+        ]
+        note = metrics["fields"][2]
+        assert note["count"] == 50
+        assert note["null_count"] == 25
+        assert note["types"] == ["null", "string"]
+        assert note["type"] == "string"
+        assert note["min_depth"] == note["max_depth"] == 3
+
+    def test_analyze_api_response_indexed_paths(self):
+        """Test that indexed path mode lists every array element."""
+        # Arrange
+        response_json = '{"items": [{"id": 1}, {"id": null}]}'
+
+        # Act
+        result = analyze_api_response(response_json, path_mode="indexed")
+        invalid = analyze_api_response(response_json, path_mode="flat")
+
+        # Assert
+        metrics = result["metrics"]
+        assert [field["path"] for field in metrics["fields"]] == [
+            "items",
+            "items[0].id",
+            "items[1].id",
+        ]
+        assert metrics["null_fields"] == ["items[1].id"]
+        assert invalid["status"] == "error"
+        assert "path_mode" in invalid["error"]
+
+    def test_analyze_api_response_columnar_fields(self):
+        """Test that the columnar field format matches the records."""
+        # Arrange
+        response_json = '{"id": 1, "tags": [], "items": [{"id": null}, {"id": 2}]}'
+
+        # Act
+        records = analyze_api_response(response_json, path_mode="indexed")
+        columnar = analyze_api_response(
+            response_json, path_mode="indexed", field_format="columnar"
+        )
+        invalid = analyze_api_response(response_json, field_format="rows")
+
+        # Assert
+        fields = records["metrics"]["fields"]
+        assert columnar["metrics"]["fields"] == {
+            "path": [field["path"] for field in fields],
+            "type": [field["type"] for field in fields],
+            "depth": [field["depth"] for field in fields],
+        }
+        assert columnar["metrics"]["fields"]["type"][3] == "null"
+        assert invalid["status"] == "error"
+        assert "field_format" in invalid["error"]
+
+    def test_analyze_api_response_sampling(self):
+        """Test that sampling visits a bounded sample and extrapolates counts."""
+        # Arrange
+        response_json = json.dumps(
+            {"items": [{"id": i, "note": None if i % 2 else "x"} for i in range(1000)]}
+        )
+
+        # Act
+        first = analyze_api_response(response_json, sample_size=100, sample_seed=3)
+        second = analyze_api_response(response_json, sample_size=100, sample_seed=3)
+        streamed = analyze_api_response(response_json, streaming=True, sample_size=5)
+
+        # Assert
+        assert first == second
+        metrics = first["metrics"]
+        assert metrics["sampling"]["elements_visited"] == 100
+        assert metrics["sampling"]["estimated"] is True
+        assert metrics["field_count"] == 2001
+        note = metrics["fields"][2]
+        assert note["count"] == 1000
+        assert 300 <= note["null_count"] <= 700
+        assert "counts are estimates" in first["readable_summary"]
+        assert streamed["status"] == "error"
+
+    def test_analyze_api_response_file_path(self, tmp_path):
+        """Test streaming analysis of a file inside the input directory."""
+        # Arrange
+        (tmp_path / "dump.json").write_text('{"id": 1, "email": null}')
+
+        with patch(
+            "api_intelligence_mcp.src.tools.json_stream.settings"
+        ) as mock_settings:
+            mock_settings.TOOL_FILE_INPUT_DIR = str(tmp_path)
+
+            # Act
+            result = analyze_api_response(file_path="dump.json")
+            outside = analyze_api_response(file_path="../etc/passwd")
+
+        # Assert
+        assert result["status"] == "success"
+        assert result["metrics"]["null_fields"] == ["email"]
+        assert outside["status"] == "error"
+        assert "inside TOOL_FILE_INPUT_DIR" in outside["error"]
+
+    def test_analyze_api_response_file_path_disabled(self):
+        """Test that file input is rejected unless an input directory is set."""
+        with patch(
+            "api_intelligence_mcp.src.tools.json_stream.settings"
+        ) as mock_settings:
+            mock_settings.TOOL_FILE_INPUT_DIR = None
+
+            result = analyze_api_response(file_path="dump.json")
+
+        assert result["status"] == "error"
+        assert "disabled" in result["error"]
+
+    def test_analyze_api_response_deep_nesting(self):
+        """Test that payloads nested deeper than json.loads supports are analyzed."""
+        # Arrange
+        response_json = '{"a": ' * 3000 + "null" + "}" * 3000
+
+        # Act
+        result = analyze_api_response(response_json)
+
+        # Assert
+        assert result["status"] == "success"
+        assert result["metrics"]["max_nesting_depth"] == 3001
+        assert result["metrics"]["field_count"] == 3000
+
 
 class TestOptimizeAPIResponseSchema:
     """Test the optimize_api_response_schema tool."""
 
+    ADDRESS = {"street": "1 Long Street Name", "city": "Pune", "zip": "411001"}
+
     def test_optimize_removes_nulls(self):
         """Test that null fields are removed."""
         # Arrange
@@ -99,6 +278,359 @@ class TestOptimizeAPIResponseSchema:
         assert result["size_reduction_kb"] >= 0
         assert result["original_size_kb"] > result["optimized_size_kb"]
 
+    def test_optimize_counts_bytes_by_path(self):
+        """Test that sizes equal the encoded JSON and savings are ranked by path."""
+        # Arrange
+        data = {
+            "id": 1,
+            "név": "Zoë",
+            "items": [
+                {"sku": "a", "note": None, "tags": []},
+                {"sku": "b", "note": None, "tags": ["x"]},
+                {"note": None},
+            ],
+            "meta": None,
+        }
+        response_json = json.dumps(data, indent=2, ensure_ascii=False)
+
+        # Act
+        result = optimize_api_response_schema(response_json)
+
+        # Assert
+        optimized = json.dumps(result["optimized_response"])
+        assert result["original_size_bytes"] == len(response_json.encode("utf-8"))
+        assert result["optimized_size_bytes"] == len(optimized.encode("utf-8"))
+        assert result["bytes_saved_by_path"] == [
+            # The last object loses its only member, and with it no separator
+            {"path": "items[].note", "fields_removed": 3, "bytes_saved": 40},
+            {"path": "meta", "fields_removed": 1, "bytes_saved": 14},
+            {"path": "items[].tags", "fields_removed": 1, "bytes_saved": 12},
+        ]
+        saved = sum(entry["bytes_saved"] for entry in result["bytes_saved_by_path"])
+        assert saved == len(json.dumps(data)) - len(optimized)
+        assert result["bytes_saved_by_path_count"] == 3
+        assert result["bytes_saved_by_path_truncated"] == 0
+
+    def test_optimize_caps_bytes_by_path(self):
+        """Test that only the paths with the largest savings are listed, per pass too."""
+        # Arrange
+        wide = {f"field{i}": None for i in range(MAX_LISTED_SAVINGS + 50)}
+        wide["id"] = 1
+        deep = '{"pad": [1, 2], "child": ' * 5000 + "[1, 2]" + "}" * 5000
+
+        # Act
+        wide_result = optimize_api_response_schema(json.dumps(wide))
+        deep_result = optimize_api_response_schema(deep, passes=["minify"])
+
+        # Assert
+        listed = wide_result["bytes_saved_by_path"]
+        assert len(listed) == MAX_LISTED_SAVINGS
+        assert wide_result["bytes_saved_by_path_count"] == MAX_LISTED_SAVINGS + 50
+        assert wide_result["bytes_saved_by_path_truncated"] == 50
+        # Longer keys save more, so the shortest ones are left out
+        paths = {entry["path"] for entry in listed}
+        assert {f"field{i}" for i in range(100, MAX_LISTED_SAVINGS + 50)} <= paths
+        assert not paths & {f"field{i}" for i in range(10)}
+        assert len(deep_result["bytes_saved_by_path"]) == MAX_LISTED_SAVINGS
+        assert deep_result["bytes_saved_by_path_count"] == 10001
+        minify = deep_result["pass_savings"]["minify"]
+        assert len(minify["by_path"]) == MAX_LISTED_SAVINGS
+        assert minify["path_count"] == 10001
+        assert minify["truncated"] == 10001 - MAX_LISTED_SAVINGS
+        # Ties are listed outermost first
+        assert minify["by_path"][:2] == [
+            {"path": "", "count": 1, "bytes_saved": 3},
+            {"path": "child", "count": 1, "bytes_saved": 3},
+        ]
+        assert minify["bytes_saved"] == (
+            deep_result["original_size_bytes"] - deep_result["optimized_size_bytes"]
+        )
+
+    def test_optimize_extended_passes(self):
+        """Test that each pass reports the exact bytes it saved by path."""
+        # Arrange
+        data = {
+            "id": 7,
+            "label": "",
+            "active": False,
+            "score": 0.123456789,
+            "meta": {"extra": {"note": None}},
+            "items": [{"sku": "a", "qty": 0}, {"sku": "b", "qty": 2}],
+        }
+        passes = [
+            "nulls",
+            "empty_objects",
+            "empty_strings",
+            "defaults",
+            "round_floats",
+            "minify",
+        ]
+
+        # Act
+        result = optimize_api_response_schema(
+            json.dumps(data), passes=passes, float_digits=2
+        )
+
+        # Assert
+        optimized = json.dumps(result["optimized_response"], separators=(",", ":"))
+        assert result["optimized_response"] == {
+            "id": 7,
+            "score": 0.12,
+            "items": [{"sku": "a"}, {"sku": "b", "qty": 2}],
+        }
+        assert result["passes"] == passes
+        assert result["fields_removed"] == [
+            "label",
+            "active",
+            "meta.extra.note",
+            "meta.extra",
+            "meta",
+            "items[].qty",
+        ]
+        assert result["optimized_size_bytes"] == len(optimized)
+        savings = result["pass_savings"]
+        assert savings["round_floats"]["by_path"] == [
+            {"path": "score", "count": 1, "bytes_saved": 7}
+        ]
+        assert savings["empty_objects"]["bytes_saved"] == len('"meta": {"extra": {}}, ')
+        total = sum(entry["bytes_saved"] for entry in savings.values())
+        assert total == len(json.dumps(data)) - len(optimized)
+
+    def test_optimize_dedupe_round_trip(self):
+        """Test that repeated subtrees move to a reference table losslessly."""
+        # Arrange
+        address = {"street": "1 Long Street Name", "city": "Pune", "zip": "411001"}
+        data = {"users": [{"id": i, "address": dict(address)} for i in range(4)]}
+
+        # Act
+        result = optimize_api_response_schema(json.dumps(data), passes=["dedupe"])
+
+        # Assert
+        optimized = result["optimized_response"]
+        assert optimized["$refs"] == {"r0": address}
+        users = optimized["data"]["users"]
+        assert all(user["address"] == {"$ref": "r0"} for user in users)
+        assert restore_refs(optimized) == data
+        assert result["optimized_size_bytes"] == len(json.dumps(optimized))
+        assert result["pass_savings"]["dedupe"]["bytes_saved"] == len(
+            json.dumps(data)
+        ) - len(json.dumps(optimized))
+
+    def test_optimize_dedupe_nested_references_round_trip(self):
+        """Test that references inside the reference table are expanded too."""
+        # Arrange
+        address = {"street": "1 Long Street Name", "city": "Pune", "zip": "411001"}
+        owner = {"name": "A long enough owner name", "address": address}
+        data = {
+            "deliveries": {"home": dict(address), "work": dict(address)},
+            "accounts": [{"owner": owner}, {"owner": owner}, {"owner": owner}],
+        }
+
+        # Act
+        result = optimize_api_response_schema(
+            json.dumps(data), passes=["dedupe", "table"]
+        )
+
+        # Assert
+        optimized = result["optimized_response"]
+        assert len(optimized["$refs"]) > 1
+        assert restore_tables(restore_refs(optimized)) == data
+
+    @pytest.mark.parametrize(
+        "data, path",
+        [
+            ({"w": {"$ref": "r0"}, "a": [ADDRESS] * 3}, "w"),
+            ({"w": {"$ref": "r0", "note": None}}, "w"),
+            ({"data": {}, "$refs": {}}, "the root"),
+        ],
+    )
+    def test_optimize_dedupe_rejects_lookalikes(self, data, path):
+        """Test that input already shaped like dedupe output is rejected."""
+        # Act
+        result = optimize_api_response_schema(
+            json.dumps(data), passes=["nulls", "dedupe"]
+        )
+
+        # Assert
+        assert result["status"] == "error"
+        assert (
+            f"Object at {path} has the form of the dedupe pass output"
+            in (result["error"])
+        )
+
+    def test_optimize_dedupe_skips_unprofitable_tables(self):
+        """Test that small repeats are left inline."""
+        # Act
+        result = optimize_api_response_schema(
+            '{"a": {"x": 1}, "b": {"x": 1}}', passes=["dedupe"]
+        )
+
+        # Assert
+        assert result["optimized_response"] == {"a": {"x": 1}, "b": {"x": 1}}
+        assert result["pass_savings"]["dedupe"]["bytes_saved"] == 0
+
+    def test_optimize_table_round_trip(self):
+        """Test that arrays of same-shaped objects become reversible tables."""
+        # Arrange
+        data = {
+            "users": [{"id": i, "name": f"user {i}", "active": True} for i in range(3)],
+            "mixed": [{"id": 1}, {"id": 2, "extra": True}],
+            "single": [{"id": 1, "name": "only"}],
+        }
+
+        # Act
+        result = optimize_api_response_schema(json.dumps(data), passes=["table"])
+
+        # Assert
+        optimized = result["optimized_response"]
+        assert optimized["users"] == {
+            "columns": ["id", "name", "active"],
+            "rows": [[0, "user 0", True], [1, "user 1", True], [2, "user 2", True]],
+        }
+        assert optimized["mixed"] == data["mixed"]
+        assert optimized["single"] == data["single"]
+        assert restore_tables(optimized) == data
+        assert result["pass_savings"]["table"]["by_path"] == [
+            {
+                "path": "users",
+                "count": 1,
+                "bytes_saved": len(json.dumps(data)) - len(json.dumps(optimized)),
+            }
+        ]
+
+    def test_optimize_table_rejects_lookalikes(self):
+        """Test that objects already shaped like tables are rejected."""
+        # Act
+        result = optimize_api_response_schema(
+            '{"report": {"columns": ["a"], "rows": [[1], [2]]}}', passes=["table"]
+        )
+
+        # Assert
+        assert result["status"] == "error"
+        assert "Object at report has the form of a table" in result["error"]
+
+    def test_optimize_invalid_passes(self):
+        """Test that unknown and non-streamable passes are reported as errors."""
+        # Act
+        unknown = optimize_api_response_schema('{"id": 1}', passes=["gzip"])
+        streamed = optimize_api_response_schema(
+            '{"id": 1}', passes=["dedupe"], streaming=True
+        )
+
+        # Assert
+        assert unknown["status"] == "error"
+        assert "Unknown passes: gzip" in unknown["error"]
+        assert streamed["status"] == "error"
+        assert "not supported in streaming mode: dedupe" in streamed["error"]
+
+    def test_optimize_streaming_with_passes(self):
+        """Test that streamable passes give the same text and savings as the tree."""
+        # Arrange
+        response_json = json.dumps(
+            {"a": "", "b": [1.23456, {"c": 0, "d": []}], "e": [], "f": {"g": None}},
+            indent=2,
+        )
+        passes = ["nulls", "empty_arrays", "empty_strings", "defaults"]
+        passes += ["round_floats", "minify"]
+
+        # Act
+        full = optimize_api_response_schema(response_json, passes=passes)
+        streamed = optimize_api_response_schema(
+            response_json, passes=passes, float_digits=6, streaming=True
+        )
+
+        # Assert
+        assert "".join(streamed["optimized_chunks"]) == json.dumps(
+            full["optimized_response"], separators=(",", ":")
+        )
+        assert streamed["pass_savings"] == full["pass_savings"]
+        assert streamed["fields_removed"] == full["fields_removed"]
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 64 * 1024])
+    def test_optimize_streaming_matches_full(self, chunk_size):
+        """Test that streaming writes the JSON text of the full optimization."""
+        # Arrange
+        response_json = json.dumps(
+            {
+                "id": 1,
+                "name": "Zoë",
+                "email": None,
+                "tags": [],
+                "items": [{"a": None, "b": [[]], "c": [1.5, None]}, [], {}],
+                "meta": {"d": [], "e": None},
+            },
+            indent=2,
+        )
+        full = optimize_api_response_schema(response_json)
+
+        # Act
+        chunks = []
+        streamed = optimize_stream(response_json, chunks.append, chunk_size=chunk_size)
+        tool = optimize_api_response_schema(response_json, streaming=True)
+
+        # Assert
+        assert "".join(chunks) == json.dumps(full["optimized_response"])
+        assert streamed["fields_removed"] == full["fields_removed"]
+        assert streamed["fields_removed_count"] == 5
+        assert streamed["original_size_kb"] == full["original_size_kb"]
+        assert streamed["optimized_size_kb"] == full["optimized_size_kb"]
+        assert tool["status"] == "success"
+        assert (
+            json.loads("".join(tool["optimized_chunks"]))
+            == (full["optimized_response"])
+        )
+
+    def test_optimize_streaming_file_to_file(self, tmp_path):
+        """Test streaming a file inside the input directory into the output directory."""
+        # Arrange
+        (tmp_path / "in").mkdir()
+        (tmp_path / "out").mkdir()
+        (tmp_path / "in" / "dump.json").write_text('{"id": 1, "email": null}')
+
+        with patch(
+            "api_intelligence_mcp.src.tools.json_stream.settings"
+        ) as mock_settings:
+            mock_settings.TOOL_FILE_INPUT_DIR = str(tmp_path / "in")
+            mock_settings.TOOL_FILE_OUTPUT_DIR = str(tmp_path / "out")
+
+            # Act
+            result = optimize_api_response_schema(
+                file_path="dump.json", output_path="dump.min.json"
+            )
+            outside = optimize_api_response_schema(
+                '{"id": 1}', output_path="../in/dump.json"
+            )
+
+        # Assert
+        assert result["status"] == "success"
+        assert result["fields_removed"] == ["email"]
+        assert result["output_path"] == "dump.min.json"
+        assert "optimized_chunks" not in result
+        assert (tmp_path / "out" / "dump.min.json").read_text() == '{"id": 1}'
+        assert [p.name for p in (tmp_path / "out").iterdir()] == ["dump.min.json"]
+        assert outside["status"] == "error"
+        assert "inside TOOL_FILE_OUTPUT_DIR" in outside["error"]
+
+    def test_optimize_streaming_invalid_json_leaves_no_file(self, tmp_path):
+        """Test that a failed stream does not leave a partial output file."""
+        with patch(
+            "api_intelligence_mcp.src.tools.json_stream.settings"
+        ) as mock_settings:
+            mock_settings.TOOL_FILE_OUTPUT_DIR = str(tmp_path)
+
+            result = optimize_api_response_schema(
+                '{"id": 1, "items": [1, 2', output_path="out.json"
+            )
+            mock_settings.TOOL_FILE_OUTPUT_DIR = None
+            disabled_result = optimize_api_response_schema(
+                '{"id": 1}', output_path="out.json"
+            )
+
+        assert result["status"] == "error"
+        assert list(tmp_path.iterdir()) == []
+        assert disabled_result["status"] == "error"
+        assert "disabled" in disabled_result["error"]
+
 
 class TestGenerateAPIDocumentation:
     """Test the generate_api_documentation tool."""
@@ -136,6 +668,72 @@ class TestGenerateAPIDocumentation:
         # Assert
         assert result["status"] == "error"
 
+    def test_generate_documentation_merges_array_elements(self):
+        """Test that every array element contributes to the element schema."""
+        # Arrange
+        items = [{"id": 1, "note": None}] * 1000 + [
+            {"id": "a-2", "note": "x", "extra": [1]}
+        ]
+        response_json = json.dumps({"items": items})
+
+        # Act
+        result = generate_api_documentation(response_json)
+
+        # Assert
+        assert result["status"] == "success"
+        assert result["schema"] == {
+            "items": [
+                {"id": "string|integer", "note": "string|null", "extra?": ["integer"]}
+            ]
+        }
+        element = result["json_schema"]["properties"]["items"]["items"]
+        assert element["properties"]["id"]["type"] == ["string", "integer"]
+        assert element["properties"]["note"]["type"] == ["string", "null"]
+        assert element["required"] == ["id", "note"]
+        assert len(result["shape_fingerprint"]) == 32
+
+    def test_generate_documentation_union_positions(self):
+        """Test that every kind at a position is documented, containers included."""
+        # Arrange
+        response_json = json.dumps(
+            {"values": [True, {"a": 1}, None, [1]], "owner": None, "empty": []}
+        )
+
+        # Act
+        result = generate_api_documentation(response_json)
+
+        # Assert
+        assert result["schema"] == {
+            "values": [
+                {
+                    "$type": "object|array|boolean|null",
+                    "$properties": {"a": "integer"},
+                    "$items": "integer",
+                }
+            ],
+            "owner": "null",
+            "empty": ["unknown"],
+        }
+
+    def test_generate_documentation_sampling(self):
+        """Test that sampled array elements are merged into one schema."""
+        # Arrange
+        items = [{"id": i, "note": None} for i in range(100)]
+        items[50] = {"id": 50, "note": "x", "extra": True}
+        response_json = json.dumps({"items": items})
+
+        # Act
+        result = generate_api_documentation(response_json, sample_size=100)
+        sampled = generate_api_documentation(response_json, sample_size=10)
+
+        # Assert
+        assert result["schema"] == {
+            "items": [{"id": "integer", "note": "string|null", "extra?": "boolean"}]
+        }
+        assert result["sampling"]["arrays_sampled"] == 0
+        assert sampled["sampling"]["elements_visited"] == 10
+        assert sampled["schema"]["items"][0]["id"] == "integer"
+
 
 class TestCompareAPIResponses:
     """Test the compare_api_responses tool."""
@@ -179,3 +777,238 @@ class TestCompareAPIResponses:
 
         # Assert
         assert result["status"] == "error"
+
+
+class TestExtractSchema:
+    """Test the flattening used by compare_api_responses."""
+
+    def test_extract_schema_descends_into_arrays(self):
+        """Test that array elements are merged under [] paths."""
+        # Arrange
+        data = {
+            "items": [{"id": 1, "tags": []}, {"id": "2", "tags": ["a"]}],
+            "empty": [],
+            "meta": {"next": None},
+        }
+
+        # Act
+        schema = extract_schema(data)
+
+        # Assert
+        assert schema == {
+            "items[].id": "int|str",
+            "items[].tags[]": "str",
+            "empty": "list",
+            "meta.next": "NoneType",
+        }
+
+    def test_extract_schema_deep_nesting(self):
+        """Test flattening nesting far beyond the recursion limit."""
+        # Arrange
+        data = {"leaf": 1}
+        for _ in range(5000):
+            data = {"child": data}
+
+        # Act
+        schema = extract_schema(data)
+
+        # Assert
+        assert schema == {".".join(["child"] * 5000 + ["leaf"]): "int"}
+
+    def test_compare_reports_array_element_fields(self):
+        """Test that fields inside array elements are compared."""
+        # Act
+        result = compare_api_responses(
+            '{"items": [{"id": 1, "name": "a"}]}', '{"items": [{"id": "1"}]}'
+        )
+
+        # Assert
+        assert result["removed_fields"] == ["items[].name"]
+        assert result["type_changes"] == ["items[].id: int -> str"]
+        assert result["breaking_changes_detected"] is True
+
+    def test_compare_reports_value_changes(self):
+        """Test that value changes are reported unless disabled."""
+        # Arrange
+        old = '{"id": 1, "name": "John"}'
+        new = '{"id": 1, "name": "Jane"}'
+
+        # Act
+        result = compare_api_responses(old, new)
+        structural = compare_api_responses(old, new, compare_values=False)
+
+        # Assert
+        assert result["identical"] is False
+        assert result["added_fields"] == []
+        assert result["value_changes"] == [
+            {"op": "replace", "path": "name", "old": "John", "new": "Jane"}
+        ]
+        assert "value_changes" not in structural
+
+
+class TestCompareAPIVersions:
+    """Test the compare_api_versions tool."""
+
+    VERSIONS = [
+        '{"id": 1, "name": "John"}',
+        '{"id": 1, "name": "John", "email": "j@x.io"}',
+        '{"id": "1", "name": "John", "email": "j@x.io"}',
+        '{"id": "1", "email": "j@x.io"}',
+    ]
+
+    def test_compare_consecutive_versions(self):
+        """Test the pairwise diffs, matrix and field timeline of consecutive versions."""
+        # Act
+        result = compare_api_versions(self.VERSIONS)
+
+        # Assert
+        assert result["status"] == "success"
+        assert [v["label"] for v in result["versions"]] == ["v1", "v2", "v3", "v4"]
+        comparisons = result["comparisons"]
+        assert [(c["from"], c["to"]) for c in comparisons] == [
+            ("v1", "v2"),
+            ("v2", "v3"),
+            ("v3", "v4"),
+        ]
+        assert comparisons[0]["added_fields"] == ["email"]
+        assert comparisons[1]["type_changes"] == ["id: int -> str"]
+        assert comparisons[2]["removed_fields"] == ["name"]
+        assert result["change_matrix"][0] == [0, 1, None, None]
+        assert result["change_matrix"][2][3] == 1
+        assert result["field_timeline"]["id"] == [
+            {"version": "v1", "change": "added", "type": "int"},
+            {"version": "v3", "change": "type_changed", "from": "int", "to": "str"},
+        ]
+        assert result["field_timeline"]["name"][-1] == {
+            "version": "v4",
+            "change": "removed",
+            "type": "str",
+        }
+
+    def test_compare_all_pairs_with_labels(self):
+        """Test that every pair is compared and identical structures match."""
+        # Act
+        result = compare_api_versions(
+            [self.VERSIONS[0], '{"id": 2, "name": "Jane"}', self.VERSIONS[2]],
+            labels=["2023", "2024", "2025"],
+            pairs="all",
+        )
+
+        # Assert
+        assert result["status"] == "success"
+        assert len(result["comparisons"]) == 3
+        first = result["comparisons"][0]
+        assert (first["from"], first["to"]) == ("2023", "2024")
+        assert first["fingerprint_matches"] is True
+        assert first["breaking_changes_detected"] is False
+        assert result["change_matrix"][0][2] == 2
+        assert result["change_matrix"][2][0] is None
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"responses": ['{"id": 1}']},
+            {"responses": ['{"id": 1}', '{"id": 2}'], "pairs": "some"},
+            {"responses": ['{"id": 1}', '{"id": 2}'], "labels": ["a"]},
+            {"responses": ['{"id": 1}', '{"id": 2}'], "labels": ["a", "a"]},
+            {"responses": ['{"id": 1}', "{invalid"]},
+        ],
+    )
+    def test_compare_versions_invalid_input(self, kwargs):
+        """Test that invalid input is reported as an error."""
+        # Act
+        result = compare_api_versions(**kwargs)
+
+        # Assert
+        assert result["status"] == "error"
+
+
+class TestMeasureEncodingCosts:
+    """Test the measure_encoding_costs tool."""
+
+    RESPONSE = json.dumps(
+        {
+            "items": [
+                {"id": index, "name": f"user {index}", "active": index % 2 == 0}
+                for index in range(50)
+            ],
+            "next": None,
+        }
+    )
+
+    def test_measure_all_variants(self):
+        """Test that every format is measured raw and at every compression level."""
+        # Act
+        result = measure_encoding_costs(self.RESPONSE, repeat=1)
+
+        # Assert
+        assert result["status"] == "success"
+        table = result["variants"]
+        assert len(table) == 4 * (1 + 2 * 3)
+        assert [row["rank"] for row in table] == list(range(1, len(table) + 1))
+        sizes = [row["bytes"] for row in table]
+        assert sizes == sorted(sizes)
+        assert all(row["round_trip"] for row in table)
+        by_variant = {row["variant"]: row for row in table}
+        assert by_variant["json"]["bytes"] < by_variant["json_pretty"]["bytes"]
+        assert by_variant["msgpack"]["bytes"] < by_variant["json"]["bytes"]
+        assert by_variant["json+gzip-9"]["bytes"] < by_variant["json"]["bytes"]
+        assert by_variant["cbor+zlib-6"]["encode_ms"] >= by_variant["cbor"]["encode_ms"]
+        assert result["best"]["size"] == table[0]["variant"]
+        assert result["unsupported"] == []
+
+    def test_measure_selected_variants_by_time(self):
+        """Test restricting the variants and ranking them by a time column."""
+        # Act
+        result = measure_encoding_costs(
+            self.RESPONSE,
+            formats=["json", "msgpack"],
+            compressors=["gzip"],
+            compression_levels=[6],
+            rank_by="total_time",
+            repeat=1,
+        )
+
+        # Assert
+        assert result["status"] == "success"
+        table = result["variants"]
+        assert {row["variant"] for row in table} == {
+            "json",
+            "json+gzip-6",
+            "msgpack",
+            "msgpack+gzip-6",
+        }
+        times = [row["total_ms"] for row in table]
+        assert times == sorted(times)
+
+    def test_measure_reports_unsupported_formats(self):
+        """Test that a format unable to encode the response is listed, not fatal."""
+        # Act
+        result = measure_encoding_costs(
+            json.dumps({"id": 2**70}), compressors=[], repeat=1
+        )
+
+        # Assert
+        assert result["status"] == "success"
+        assert [row["format"] for row in result["unsupported"]] == ["msgpack"]
+        assert "msgpack" not in {row["format"] for row in result["variants"]}
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"response_json": ""},
+            {"response_json": "{invalid"},
+            {"response_json": "{}", "formats": ["xml"]},
+            {"response_json": "{}", "compressors": ["brotli"]},
+            {"response_json": "{}", "compression_levels": [11]},
+            {"response_json": "{}", "rank_by": "speed"},
+            {"response_json": "{}", "repeat": 0},
+        ],
+    )
+    def test_measure_invalid_input(self, kwargs):
+        """Test that invalid input is reported as an error."""
+        # Act
+        result = measure_encoding_costs(**kwargs)
+
+        # Assert
+        assert result["status"] == "error"
@@ -0,0 +1,267 @@
+"""Tests for the iterative traversal engine."""
+
+from collections import OrderedDict
+
+from api_intelligence_mcp.src.tools import traversal
+from api_intelligence_mcp.src.tools.analyze_api_response import FieldInventoryVisitor
+from api_intelligence_mcp.src.tools.generate_api_documentation import (
+    SchemaInferenceVisitor,
+)
+from api_intelligence_mcp.src.tools.optimize_api_response_schema import CleanVisitor
+from api_intelligence_mcp.src.tools.traversal import (
+    SKIP,
+    PathTable,
+    ReservoirSampler,
+    ValueVisitor,
+    Visitor,
+    kind_of,
+    walk,
+)
+
+
+class RecordingVisitor(Visitor):
+    """Record enter/leave events as (event, path) tuples."""
+
+    def __init__(self, skip_paths=()):
+        self.events = []
+        self.skip_paths = set(skip_paths)
+
+    def enter(self, node):
+        self.events.append(("enter", node.path))
+        if node.path in self.skip_paths:
+            return SKIP
+        return None
+
+    def leave(self, node):
+        self.events.append(("leave", node.path))
+
+
+class RecordingValueVisitor(ValueVisitor):
+    """Record value events as (event, kind, key, depth, weight) tuples."""
+
+    def __init__(self):
+        self.events = []
+
+    def enter_value(self, value, kind, key, depth, weight):
+        self.events.append(("enter", kind, key, depth, weight))
+        return SKIP if key == "skipped" else None
+
+    def leave_value(self, value, kind, key, depth, weight):
+        self.events.append(("leave", kind, key, depth, weight))
+
+
+def nested(depth):
+    """Build a document nested ``depth`` objects deep."""
+    data = {"leaf": None}
+    for _ in range(depth):
+        data = {"child": data}
+    return data
+
+
+SAMPLE = {
+    "id": 1,
+    "name": None,
+    "tags": [],
+    "items": [{"id": 1, "price": 9.5}, {"id": 2, "price": None}],
+    "meta": {"active": True, "extra": {}},
+}
+
+
+class TestTraversal:
+    """Test the walk function and Node."""
+
+    def test_kind_of(self):
+        """Test kind resolution, including bool before int and subclasses."""
+        assert kind_of(True) == "boolean"
+        assert kind_of(1) == "integer"
+        assert kind_of(1.5) == "float"
+        assert kind_of(None) == "null"
+        assert kind_of(OrderedDict()) == "object"
+        assert kind_of(object()) == "unknown"
+
+    def test_event_order_and_paths(self):
+        """Test depth-first enter/leave order and generated paths."""
+        # Arrange
+        visitor = RecordingVisitor()
+
+        # Act
+        walk({"a": [1, {"b": 2}]}, visitor)
+
+        # Assert
+        assert visitor.events == [
+            ("enter", ""),
+            ("enter", "a"),
+            ("enter", "a[0]"),
+            ("leave", "a[0]"),
+            ("enter", "a[1]"),
+            ("enter", "a[1].b"),
+            ("leave", "a[1].b"),
+            ("leave", "a[1]"),
+            ("leave", "a"),
+            ("leave", ""),
+        ]
+
+    def test_value_visitor_walked_without_nodes(self, monkeypatch):
+        """Test that a lone value visitor gets the events of a shared walk."""
+        # Arrange
+        data = {"a": [1, {"b": None}], "skipped": {"c": 2}, "rows": [[0]] * 10}
+        alone = RecordingValueVisitor()
+        shared = RecordingValueVisitor()
+        walk(data, shared, Visitor(), sampler=ReservoirSampler(4, seed=3))
+        monkeypatch.setattr(traversal, "Node", None)
+
+        # Act
+        walk(data, alone, sampler=ReservoirSampler(4, seed=3))
+
+        # Assert
+        assert alone.events == shared.events
+        assert alone.events[:4] == [
+            ("enter", "object", None, 0, 1.0),
+            ("enter", "array", "a", 1, 1.0),
+            ("enter", "integer", 0, 2, 1.0),
+            ("leave", "integer", 0, 2, 1.0),
+        ]
+        assert ("enter", "object", "skipped", 1, 1.0) in alone.events
+        assert ("enter", "integer", "c", 2, 1.0) not in alone.events
+        assert ("leave", "integer", 0, 3, 2.5) in alone.events
+        assert alone.events[-1] == ("leave", "object", None, 0, 1.0)
+
+    def test_schema_paths(self):
+        """Test that schema paths collapse array indices."""
+        # Arrange
+        visitor = RecordingVisitor()
+        schema_paths = []
+        visitor.leave = lambda node: schema_paths.append(node.schema_path)
+
+        # Act
+        walk([{"a": [[1]]}, {"a": []}], visitor)
+
+        # Assert
+        assert schema_paths == ["[].a[][]", "[].a[]", "[].a", "[]", "[].a", "[]", ""]
+
+    def test_path_table(self):
+        """Test that interned path ids render as schema paths."""
+        # Arrange
+        paths = PathTable()
+
+        # Act
+        items = paths.child(PathTable.ROOT, "items")
+        element = paths.child(items, None)
+        nested = paths.child(paths.child(element, "tags"), None)
+
+        # Assert
+        assert paths.child(items, None) == element
+        assert paths.render(PathTable.ROOT) == ""
+        assert paths.render(element) == "items[]"
+        assert paths.render(nested) == "items[].tags[]"
+        assert (
+            paths.render(paths.child(paths.child(PathTable.ROOT, None), "a")) == "[].a"
+        )
+
+    def test_skip_is_per_visitor(self):
+        """Test that a skipping visitor does not prune other visitors."""
+        # Arrange
+        skipping = RecordingVisitor(skip_paths={"a"})
+        full = RecordingVisitor()
+
+        # Act
+        walk({"a": {"b": 1}, "c": 2}, skipping, full)
+
+        # Assert
+        assert skipping.events == [
+            ("enter", ""),
+            ("enter", "a"),
+            ("enter", "c"),
+            ("leave", "c"),
+            ("leave", ""),
+        ]
+        assert ("enter", "a.b") in full.events
+
+    def test_deep_nesting(self):
+        """Test that nesting far beyond the recursion limit is handled."""
+        # Arrange
+        data = nested(30000)
+        inference = SchemaInferenceVisitor()
+        cleaner = CleanVisitor()
+
+        # Act
+        walk(data, inference, cleaner)
+
+        # Assert
+        assert cleaner.fields_removed == [".".join(["child"] * 30000 + ["leaf"])]
+        assert inference.tree["child"]["child"]["child"] is not None
+
+    def test_deep_nesting_paths(self):
+        """Test field paths and depths of a deeply nested document."""
+        # Arrange
+        inventory = FieldInventoryVisitor()
+
+        # Act
+        walk(nested(5000), inventory)
+
+        # Assert
+        assert inventory.max_depth == 5002
+        assert len(inventory.fields) == 5001
+        assert inventory.null_fields == [".".join(["child"] * 5000 + ["leaf"])]
+
+    def test_combined_pass_matches_separate_passes(self):
+        """Test that visitors give the same results in one shared pass."""
+        # Arrange
+        separate = [FieldInventoryVisitor(), CleanVisitor(), SchemaInferenceVisitor()]
+        combined = [FieldInventoryVisitor(), CleanVisitor(), SchemaInferenceVisitor()]
+
+        # Act
+        for visitor in separate:
+            walk(SAMPLE, visitor)
+        walk(SAMPLE, *combined)
+
+        # Assert
+        assert combined[0].fields == separate[0].fields
+        assert combined[1].result == separate[1].result
+        assert combined[2].tree == separate[2].tree
+        assert combined[2].tree["items"] == [{"id": "integer", "price": "float|null"}]
+
+    def test_sampled_walk(self):
+        """Test that a sampler bounds visited elements and weights the nodes."""
+        # Arrange
+        visitor = RecordingVisitor()
+        weights = {}
+        visitor.leave = lambda node: weights.setdefault(node.schema_path, node.weight)
+        sampler = ReservoirSampler(max_elements=4, seed=1)
+        data = {"rows": [{"tags": list(range(10))} for _ in range(100)]}
+
+        # Act
+        walk(data, visitor, sampler=sampler)
+
+        # Assert
+        assert len(visitor.events) == 1 + 1 + 4 * (1 + 1 + 4)
+        assert weights["rows"] == 1.0
+        assert weights["rows[]"] == 25.0
+        assert weights["rows[].tags[]"] == 62.5
+        assert sampler.stats()["arrays_sampled"] == 5
+
+    def test_reservoir_sample(self):
+        """Test that samples are sorted, deterministic and cover every index."""
+        # Arrange
+        first = ReservoirSampler(max_elements=5, seed=42)
+        second = ReservoirSampler(max_elements=5, seed=42)
+
+        # Act
+        samples = [first.sample(50) for _ in range(200)]
+
+        # Assert
+        assert samples == [second.sample(50) for _ in range(200)]
+        assert all(sample == sorted(set(sample)) for sample in samples)
+        assert {index for sample in samples for index in sample} == set(range(50))
+        assert first.sample(3) == [0, 1, 2]
+
+    def test_scalar_root(self):
+        """Test that a scalar document is visited as the root."""
+        # Arrange
+        visitor = RecordingVisitor()
+
+        # Act
+        walk("text", visitor)
+
+        # Assert
+        assert visitor.events == [("enter", ""), ("leave", "")]
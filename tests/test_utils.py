@@ -4,6 +4,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
+from api_intelligence_mcp.utils.lru_cache import LRUCache
 from api_intelligence_mcp.utils.pylogger import (
     AWS_LOGGERS,
     ERROR_ONLY_LOGGERS,
@@ -578,3 +579,71 @@ class TestPylogger:
 
         # Assert - the flag should be True after force_reconfigure (since it calls get_python_logger)
         assert pylogger_module._LOGGING_CONFIGURED is True
+
+
+class TestLRUCache:
+    """Test the LRUCache utility."""
+
+    def test_get_and_set(self):
+        """Test basic storage with hit and miss counters."""
+        # Arrange
+        cache = LRUCache(max_entries=2)
+
+        # Act
+        cache.set("a", 1)
+        hit = cache.get("a")
+        miss = cache.get("b")
+
+        # Assert
+        assert hit == 1
+        assert miss is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_evicts_least_recently_used_entry(self):
+        """Test that the least recently used entry is evicted first."""
+        # Arrange
+        cache = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        # Act
+        cache.set("c", 3)
+
+        # Assert
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_byte_budget(self):
+        """Test that the byte budget evicts entries and rejects oversized ones."""
+        # Arrange
+        cache = LRUCache(max_entries=10, max_bytes=100)
+
+        # Act
+        cache.set("a", 1, size=60)
+        cache.set("b", 2, size=60)
+        stored = cache.set("c", 3, size=101)
+
+        # Assert
+        assert stored is False
+        assert "a" not in cache
+        assert cache.size_bytes == 60
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are treated as misses."""
+        # Arrange
+        cache = LRUCache(max_entries=2)
+
+        # Act
+        with patch("api_intelligence_mcp.utils.lru_cache.time") as mock_time:
+            mock_time.monotonic.return_value = 100.0
+            cache.set("a", 1, ttl=5)
+            mock_time.monotonic.return_value = 106.0
+            value = cache.get("a")
+
+        # Assert
+        assert value is None
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 0
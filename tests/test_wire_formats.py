@@ -0,0 +1,93 @@
+"""Tests for the wire formats of the encoding cost tool."""
+
+import pytest
+
+from api_intelligence_mcp.src.tools.wire_formats import (
+    cbor_decode,
+    cbor_encode,
+    check_compression_levels,
+    msgpack_decode,
+    msgpack_encode,
+    wire_formats,
+)
+
+DOCUMENT = {
+    "ints": [0, 1, -1, -33, 127, 128, 255, 256, 65536, 2**32, 2**64 - 1, -(2**63)],
+    "short": "x",
+    "long": "é" * 200,
+    "float": 1.5,
+    "null": None,
+    "flags": [True, False],
+    "empty": {"object": {}, "array": []},
+    "wide": {str(index): index for index in range(20)},
+}
+
+
+class TestPurePythonCodecs:
+    """Test the pure-Python MessagePack and CBOR codecs."""
+
+    @pytest.mark.parametrize(
+        "encode, decode",
+        [(msgpack_encode, msgpack_decode), (cbor_encode, cbor_decode)],
+    )
+    def test_round_trip(self, encode, decode):
+        """Test that decoding gives back the encoded document."""
+        # Arrange
+        deep: list = []
+        innermost = deep
+        for _ in range(300):
+            innermost.append({"child": []})
+            innermost = innermost[0]["child"]
+
+        # Act / Assert
+        for data in (DOCUMENT, [DOCUMENT] * 17, deep, "text", 7, None):
+            assert decode(encode(data)) == data
+
+    def test_known_encodings(self):
+        """Test encodings against the examples of the specifications."""
+        # Act / Assert
+        assert msgpack_encode({"compact": True, "schema": 0}).hex() == (
+            "82a7636f6d70616374c3a6736368656d6100"
+        )
+        assert cbor_encode({"a": 1, "b": [2, 3]}).hex() == "a26161016162820203"
+        assert cbor_encode(-1000).hex() == "3903e7"
+        assert cbor_encode(2**64).hex() == "c249010000000000000000"
+
+    def test_large_integers(self):
+        """Test that CBOR writes bignums where MessagePack has no encoding."""
+        # Act / Assert
+        assert cbor_decode(cbor_encode([2**70, -(2**70)])) == [2**70, -(2**70)]
+        with pytest.raises(OverflowError):
+            msgpack_encode(2**64)
+
+    def test_rejects_invalid_input(self):
+        """Test that values outside JSON and malformed bytes are rejected."""
+        # Act / Assert
+        with pytest.raises(TypeError):
+            cbor_encode({1: "a"})
+        with pytest.raises(ValueError):
+            msgpack_decode(msgpack_encode([1, 2])[:-1])
+        with pytest.raises(ValueError):
+            cbor_decode(cbor_encode("a") + b"\x00")
+
+
+class TestWireFormats:
+    """Test the format registry and option checks."""
+
+    def test_pure_python_fallback(self):
+        """Test that the binary formats fall back to the pure-Python codecs."""
+        # Act
+        formats = wire_formats(prefer_packages=False)
+
+        # Assert
+        assert list(formats) == ["json_pretty", "json", "msgpack", "cbor"]
+        assert formats["cbor"].implementation == "pure-python"
+        assert formats["json"].encode({"a": [1, 2]}) == b'{"a":[1,2]}'
+
+    def test_compression_levels(self):
+        """Test the default and validated compression levels."""
+        # Act / Assert
+        assert check_compression_levels(None) == (1, 6, 9)
+        assert check_compression_levels([9, 1, 9]) == (9, 1)
+        with pytest.raises(ValueError):
+            check_compression_levels([10])